@@ -130,6 +130,10 @@ def dump_yaml(data, stream, default_flow_style=None, width=None):
     dumper.close()
 
 
+# Functions only for inference, which have no backward function.
+inference_only_functions = ['FusedElementwise']
+
+
 def info_to_list(info):
     '''Returns a list of (name, snake_name, [argument types as c++ type])'''
     items = []
@@ -258,6 +262,8 @@ def generate_skeleton_backward_function_impl(function_info, template, output_dir
     import os
 
     for name, func in function_info.items():
+        if name in inference_only_functions:
+            continue
         path_o = join(output_dir, output_format % func['snake_name'])
         if os.path.exists(path_o):
             continue
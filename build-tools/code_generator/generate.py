@@ -280,7 +280,8 @@ def generate_function_cpp_interface(function_info):
 
 
 def generate_backward_function_mapping(function_info):
-    function_list = utils.info_to_list(function_info)
+    function_list = [f for f in utils.info_to_list(function_info)
+                     if f[0] not in utils.inference_only_functions]
     utils.generate_from_template(
         join(base, 'python/src/nnabla/backward_functions.py.tmpl'),
         function_info=function_info, function_list=function_list)
@@ -44,5 +44,37 @@ public:
   virtual ~CpuCachedArray();
   static Context filter_context(const Context &ctx);
 };
+
+/** CPU array on disk.
+
+    The memory is mapped to a file on disk (see CpuDiskMemory), so that it can
+    be used as the host of SwapInOutScheduler with CPU arrays as the device,
+    which swaps out data to disk. This is in an array group different from
+    the other CPU arrays.
+ */
+class NBLA_API CpuDiskArray : public CpuArray {
+public:
+  explicit CpuDiskArray(const Size_t size, dtypes dtype, const Context &ctx);
+  virtual ~CpuDiskArray();
+  static Context filter_context(const Context &ctx);
+};
+
+/** Synchronizer between CpuDiskArray and the other CPU arrays.
+
+    A copy from disk with AsyncFlag::ASYNC is done on a background thread, and
+    the destination array waits for it when it is used next. A copy to disk is
+    synchronous, and is written back to the file asynchronously by the OS.
+ */
+NBLA_API void synchronizer_cpu_disk(Array *src, Array *dst,
+                                    const int async_flags = AsyncFlag::NONE);
+
+/** Wait for all asynchronous copies from CpuDiskArray.
+ */
+NBLA_API void cpu_disk_array_synchronize();
+
+/** Get the total time in seconds waited for asynchronous copies from
+    CpuDiskArray.
+ */
+NBLA_API double cpu_disk_array_wait_time();
 }
 #endif
@@ -193,6 +193,21 @@ public:
   all_reduce_callback(NdArrayPtr ndarray, size_t pack_size,
                       bool division = false, const string &group = "world");
 
+  /** all_reduce over parameters in buckets during backward.
+
+  @param ndarray_list Vector of NdArrayPtr
+  @param bucket_size The number of values contained in a bucket.
+  @param division Divide the reduced value.
+  @param fp16_compression Transfer the values in half precision.
+  @param overlap All-reduce on a background thread during backward.
+  @param group Name of a group.
+  @sa BucketedAllReduceCallback
+   */
+  CommunicatorBackwardCallbackPtr bucketed_all_reduce_callback(
+      const vector<NdArrayPtr> &ndarray_list, size_t bucket_size,
+      bool division = false, bool fp16_compression = false,
+      bool overlap = false, const string &group = "world");
+
   /** reducescatter.
 
    @param ndarray_list Vector of NdArrayPtr
@@ -0,0 +1,94 @@
+// Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef __NBLA_COMMUNICATOR_BUCKETED_ALL_REDUCE_CALLBACK_HPP__
+#define __NBLA_COMMUNICATOR_BUCKETED_ALL_REDUCE_CALLBACK_HPP__
+
+#include <nbla/communicator.hpp>
+#include <nbla/computation_graph/variable.hpp>
+
+#include <memory>
+#include <string>
+#include <unordered_map>
+
+namespace nbla {
+
+/** All-reduce of gradients in buckets during backward.
+
+A gradient is ready when all the functions using it finish backward. Ready
+gradients are packed into a bucket in the order they become ready, which is the
+reverse topological order of the graph, and the bucket is all-reduced when it
+has at least `bucket_size` elements. The rest are all-reduced at the end of
+backward.
+
+If `overlap` is true, buckets are all-reduced in order on a background thread
+while backward continues, and the end of backward waits for them. Functions
+communicating during backward (e.g. SyncBatchNormalization) must not be used
+with overlap, since their collectives would race with the buckets.
+
+If `fp16_compression` is true, gradients are transferred in half precision.
+
+All processes must create buckets in the same order, i.e. run backward of the
+same graph.
+ */
+class NBLA_API BucketedAllReduceCallback : public CommunicatorBackwardCallback {
+  struct Worker;
+
+  Communicator *comm_;
+  const Context ctx_;
+  const vector<NdArrayPtr> arrays_;
+  const size_t bucket_size_;
+  const bool division_;
+  const bool fp16_compression_;
+  const bool overlap_;
+  const string group_;
+
+  unordered_map<NdArray *, size_t> indices_;
+  vector<size_t> uses_;
+  vector<bool> done_;
+  vector<size_t> bucket_;
+  size_t bucket_elements_{0};
+  vector<NdArrayPtr> halves_;
+  unique_ptr<Worker> worker_;
+
+  void add(size_t i);
+  void flush();
+  void all_reduce(const vector<size_t> &bucket);
+
+public:
+  /** Constructor.
+
+      @param comm Communicator.
+      @param ctx Context of the gradients.
+      @param ndarray_list Gradients.
+      @param bucket_size Minimum number of elements of a bucket.
+      @param division Divide the reduced value.
+      @param fp16_compression Transfer in half precision.
+      @param overlap All-reduce on a background thread.
+      @param group Name of a group.
+   */
+  BucketedAllReduceCallback(Communicator *comm, const Context &ctx,
+                            const vector<NdArrayPtr> &ndarray_list,
+                            size_t bucket_size, bool division = false,
+                            bool fp16_compression = false, bool overlap = true,
+                            const string &group = "world");
+  ~BucketedAllReduceCallback();
+
+  virtual void on_finish_function_backward(const CgFunctionPtr &ptr);
+  virtual void on_finish_backward();
+
+  DISABLE_COPY_AND_ASSIGN(BucketedAllReduceCallback);
+};
+}
+#endif
@@ -31,6 +31,16 @@ implement a new DataParallelcommunicator class.
 MultiProcessDataParallelCommunicator exchanges gradients parameters or
 parameters itself.
 
+On CPU, processes on a single host exchange data through a POSIX shared memory
+segment. The rank and the number of processes are given by the environment
+variables `NNABLA_COMM_RANK` and `NNABLA_COMM_SIZE`, and the segment is
+identified by `NNABLA_COMM_ID`. They are set by `nnabla_cli launch`. Without
+them, the communicator works as a single process. Data are transferred through
+a buffer of `NNABLA_COMM_BUFFER_SIZE` bytes (4 MiB by default) per process,
+and each process reduces a part of the buffer. all_reduce transfers arrays in
+half precision if they are half in all processes. Ranks given to collectives
+are the indices in the group.
+
 */
 template <typename T>
 class NBLA_API MultiProcessDataParallelCommunicator : public Communicator {
@@ -66,6 +76,9 @@ public:
   */
   virtual void init();
 
+  virtual void barrier();
+  virtual void abort();
+
   virtual string new_group(pair<string, vector<int>> name_ranks_pair);
   virtual unordered_map<string, vector<int>> list_groups();
   virtual bool find_self(const string &group);
@@ -82,6 +95,9 @@ public:
                           const string &group = "world");
   virtual void all_reduce(NdArrayPtr ndarray, bool division = false,
                           bool inplace = false, const string &group = "world");
+  virtual CommunicatorBackwardCallbackPtr
+  all_reduce_callback(const vector<NdArrayPtr> &ndarray_list, size_t pack_size,
+                      bool division = false, const string &group = "world");
   virtual void reduce_scatter(const vector<NdArrayPtr> &ndarray_list,
                               NdArrayPtr ndarray, bool division = false,
                               const string &group = "world");
@@ -106,6 +122,15 @@ public:
 protected:
   unordered_map<string, vector<int>> groups_;
 
+private:
+  struct SharedMemory;
+  shared_ptr<SharedMemory> shm_;
+
+  vector<int> group_ranks(const string &group);
+  template <typename U>
+  void all_reduce_chunks(const vector<NdArrayPtr> &ndarray_list,
+                         bool division, const vector<int> &ranks, int g);
+
   DISABLE_COPY_AND_ASSIGN(MultiProcessDataParallelCommunicator);
 };
 /*@}*/
@@ -0,0 +1,104 @@
+// Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef __NBLA_COMPUTATION_GRAPH_MEMORY_PLANNER_HPP__
+#define __NBLA_COMPUTATION_GRAPH_MEMORY_PLANNER_HPP__
+
+#include <nbla/computation_graph/function.hpp>
+#include <nbla/computation_graph/variable.hpp>
+#include <nbla/nd_array.hpp>
+
+#include <memory>
+#include <vector>
+
+namespace nbla {
+
+/** Static memory plan of intermediate buffers for inference.
+
+    A forward propagation up to the outputs is executed once to determine the
+    order of functions and data types of buffers. From the liveness of each
+    buffer in the order, buffers are assigned to offsets of a single arena so
+    that buffers alive at the same time do not overlap, and the data of
+    intermediate variables are bound to the arena. Following forward calls
+    reuse the arena without allocating memory. The plan is created again when
+    the graph is modified.
+
+    Graph inputs, outputs, persistent variables and variables referenced by
+    functions outside of the graph are not planned. Backward must not be
+    called on a planned graph because intermediate data are overwritten.
+ */
+class MemoryPlan {
+  struct Buffer {
+    shared_ptr<SyncedArray> array; ///< Shared by in-placed variables.
+    NdArrayPtr ndarray;            ///< One of the variables using the array.
+    dtypes dtype;
+    Size_t nbytes{0};
+    Size_t offset{0};
+    int begin{-1}; ///< Index of the function which first uses the buffer.
+    int end{-1};   ///< Index of the function which last uses the buffer.
+    bool planned{true};
+    Array *bound{nullptr};
+  };
+
+  vector<CgVariablePtr> outputs_;
+  Context ctx_;
+  NdArrayPtr arena_;
+  vector<Buffer> buffers_;
+  vector<pair<CgVariablePtr, uint64_t>> versions_;
+  Size_t arena_size_{0};
+  Size_t total_size_{0};
+
+  void plan(function_hook_type function_pre_hook,
+            function_hook_type function_post_hook);
+  void bind(Buffer &buffer);
+  void unbind();
+  bool valid() const;
+
+public:
+  typedef shared_ptr<MemoryPlan> Ptr;
+
+  /** Create a plan by executing forward up to the outputs.
+
+      @param[in] outputs Outputs of the graph.
+      @param[in] ctx Context where the arena is allocated.
+   */
+  NBLA_API MemoryPlan(const vector<CgVariablePtr> &outputs, const Context &ctx);
+
+  /** Unbind the intermediate variables from the arena.
+   */
+  NBLA_API ~MemoryPlan();
+
+  /** Forward up to the outputs using the arena.
+   */
+  NBLA_API void forward(function_hook_type function_pre_hook = nullptr,
+                        function_hook_type function_post_hook = nullptr);
+
+  /** Size of the arena in bytes, i.e. peak memory of planned buffers.
+   */
+  inline Size_t arena_size() const { return arena_size_; }
+
+  /** Total size of planned buffers in bytes without sharing memory.
+   */
+  inline Size_t total_size() const { return total_size_; }
+
+  /** Number of buffers assigned to the arena.
+   */
+  NBLA_API size_t num_planned_buffers() const;
+
+  DISABLE_COPY_AND_ASSIGN(MemoryPlan);
+};
+
+typedef MemoryPlan::Ptr MemoryPlanPtr;
+}
+#endif
@@ -18,6 +18,7 @@
 #include <nbla/function.hpp>
 #include <nbla/variable.hpp>
 
+#include <cstdint>
 #include <functional>
 #include <memory>
 #include <unordered_map>
@@ -32,6 +33,7 @@ using std::string;
 // Forward declaration
 class CgFunction;
 typedef shared_ptr<CgFunction> CgFunctionPtr;
+class CgExecutionPlan;
 
 /** Callback functions during backward.
  */
@@ -101,8 +103,13 @@ class CgVariable {
   size_t function_reference_count_{0}; ///< Number of function references
   bool allow_modify_data_{true};       ///< Whether the data can be in-placed.
   bool persistent_{false};             ///<Persistency flag against clearing.
+  bool recompute_{false}; ///< Recomputation flag in backward.
+  int recompute_segment_{0}; ///< Segment of the recomputation.
   bool prohibit_clear_data_{false};
   string name_{""};
+  uint64_t version_{0}; ///< Incremented when the variable is modified.
+  bool compiled_{false};
+  shared_ptr<CgExecutionPlan> plan_; ///< Captured by compiled forward.
 
 public:
   typedef shared_ptr<CgVariable> Ptr;
@@ -158,11 +165,17 @@ public:
 
   /** Set need grad flag.
    */
-  inline void set_need_grad(bool b) { need_grad_ = b ? NG_TRUE : NG_FALSE; }
+  inline void set_need_grad(bool b) {
+    need_grad_ = b ? NG_TRUE : NG_FALSE;
+    version_++;
+  }
 
   /** Unset need grad flag.
    */
-  inline void unset_need_grad() { need_grad_ = NG_NONE; }
+  inline void unset_need_grad() {
+    need_grad_ = NG_NONE;
+    version_++;
+  }
 
   /** Get need grad state flag.
    */
@@ -192,7 +205,10 @@ public:
 
   /** Set prohibit_clear_data_ flag.
    */
-  inline void set_prohibit_clear_data(bool b) { prohibit_clear_data_ = b; }
+  inline void set_prohibit_clear_data(bool b) {
+    prohibit_clear_data_ = b;
+    version_++;
+  }
 
   /** Set parent function.
 
@@ -200,7 +216,10 @@ public:
 
       @note Users usually don't use this directly. Used in connect function.
    */
-  inline void set_parent(CgFunctionPtr func) { parent_ = func; }
+  inline void set_parent(CgFunctionPtr func) {
+    parent_ = func;
+    version_++;
+  }
 
   /** Get parent function which produces outputs to this variable.
    */
@@ -319,12 +338,81 @@ public:
 
       @param[in] p Persistent flag.
    */
-  inline void set_persistent(bool p) { persistent_ = p; }
+  inline void set_persistent(bool p) {
+    persistent_ = p;
+    version_++;
+  }
 
   /** Get persistent flag.
    */
   inline bool persistent() const { return persistent_; }
 
+  /** Set recompute flag.
+
+      If it's true, the variable data is cleared during forward propagation
+      with clear_no_need_grad=true even if it is required for backward, and is
+      recomputed by executing forward of its parent function again when
+      backward requires it. Inputs of the parent function without the flag are
+      kept for the recomputation. A variable with the flag is still kept as a
+      checkpoint if it is used by a function whose outputs are not recomputed
+      in the same segment (see set_recompute_segment()), so that backward
+      recomputes one segment at a time. This trades computation for memory of
+      intermediate activations.
+
+      @param[in] b Recompute flag.
+      @note The parent function must compute the same outputs again, i.e. it
+            must not be stochastic nor update its states in forward, and its
+            inputs must not be modified in-place by other functions.
+   */
+  inline void set_recompute(bool b) {
+    recompute_ = b;
+    version_++;
+  }
+
+  /** Get recompute flag.
+   */
+  inline bool recompute() const { return recompute_; }
+
+  /** Set segment of recomputation.
+
+      Variables with the recompute flag in the same segment are recomputed
+      together. Those used by functions in other segments are boundaries of
+      the segment, and are kept during forward as checkpoints.
+
+      @param[in] s Segment ID.
+   */
+  inline void set_recompute_segment(int s) {
+    recompute_segment_ = s;
+    version_++;
+  }
+
+  /** Get segment of recomputation.
+   */
+  inline int recompute_segment() const { return recompute_segment_; }
+
+  /** Get version of the variable.
+
+      It is incremented when the properties of the variable which affect the
+      execution of the graph, e.g. parent, function references, need_grad and
+      persistent flags, are modified.
+   */
+  inline uint64_t version() const { return version_; }
+
+  /** Set compiled flag.
+
+      If it's true, forward and backward from this variable capture the order
+      of functions, setup state and clear flags of buffers at the first call,
+      and replay them while none of the variables in the graph is modified.
+      A modified graph is captured again at the next call.
+
+      @param[in] b Compiled flag.
+   */
+  NBLA_API void set_compiled(bool b);
+
+  /** Get compiled flag.
+   */
+  inline bool compiled() const { return compiled_; }
+
   /** Set variable name
    */
   inline void set_name(string name) { name_ = name; }
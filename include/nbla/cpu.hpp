@@ -28,6 +28,8 @@ using std::vector;
 using std::string;
 using std::unique_ptr;
 
+class ThreadPool;
+
 /**
 Singleton class for storing some handles or configs for CPU Computation.
 */
@@ -58,11 +60,16 @@ public:
    */
   shared_ptr<Allocator> naive_allocator();
 
+  /** Get an allocator of memory mapped to files on disk.
+   */
+  shared_ptr<Allocator> disk_allocator();
+
   /** Free all unused host memory caches
    */
   void free_unused_host_caches();
 
-  /** Synchronize host to device.
+  /** Synchronize host to device, and wait for asynchronous copies from
+      disk.
    */
   void device_synchronize(const string &device);
 
@@ -75,6 +82,10 @@ public:
    */
   void create_lms_streams(int device = -1) {}
 
+  /** Get the thread pool used by CPU Function implementations.
+   */
+  shared_ptr<ThreadPool> thread_pool();
+
 protected:
   vector<string> array_classes_; ///< Available array classes
 
@@ -85,6 +96,8 @@ protected:
    */
   shared_ptr<Allocator> naive_allocator_;
   shared_ptr<Allocator> caching_allocator_;
+  shared_ptr<Allocator> disk_allocator_;
+  shared_ptr<ThreadPool> thread_pool_;
 
 private:
   friend SingletonManager;
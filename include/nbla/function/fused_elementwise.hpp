@@ -0,0 +1,123 @@
+// Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef NBLA_FUNCTION_FUSED_ELEMENTWISE_HPP
+#define NBLA_FUNCTION_FUSED_ELEMENTWISE_HPP
+
+#include <nbla/cpu.hpp>
+#include <nbla/function.hpp>
+#include <nbla/function_registry.hpp>
+
+namespace nbla {
+
+NBLA_REGISTER_FUNCTION_HEADER(FusedElementwise, const vector<int> &,
+                              const vector<int> &, const vector<float> &,
+                              bool);
+
+/** Operations of FusedElementwise.
+
+    `v` is the value of the chain, `a` is the input specified by the operand
+    and `s` is the scalar value.
+ */
+namespace fused_elementwise {
+enum Op {
+  ADD2 = 0,            ///< v + a
+  SUB2 = 1,            ///< v - a
+  RSUB2 = 2,           ///< a - v
+  MUL2 = 3,            ///< v * a
+  DIV2 = 4,            ///< v / a
+  RDIV2 = 5,           ///< a / v
+  ADD_SCALAR = 6,      ///< v + s
+  MUL_SCALAR = 7,      ///< v * s
+  RSUB_SCALAR = 8,     ///< s - v
+  RDIV_SCALAR = 9,     ///< s / v
+  POW_SCALAR = 10,     ///< v ^ s
+  MAXIMUM_SCALAR = 11, ///< max(v, s)
+  MINIMUM_SCALAR = 12, ///< min(v, s)
+  RELU = 13,           ///< max(v, 0)
+  LEAKY_RELU = 14,     ///< v > 0 ? v : s * v
+  SIGMOID = 15,        ///< 1 / (1 + exp(-v))
+  TANH = 16,           ///< tanh(v)
+  EXP = 17,            ///< exp(v)
+  LOG = 18,            ///< log(v)
+  ABS = 19,            ///< |v|
+  NUM_OPS = 20,
+};
+}
+
+/** Chain of elementwise operations executed in a single pass.
+
+The first input is the initial value of the chain, and the operations are
+applied in order. Operations are applied to a tile of the output at a time, so
+that the tile stays in cache through the chain and intermediate arrays are not
+allocated.
+
+Inputs:
+- N-D arrays of the same shape.
+
+Outputs:
+- N-D array.
+
+@tparam T Data type for computation.
+@param ops Operations. See fused_elementwise::Op.
+@param operands Index of the input used by each binary operation, or -1.
+@param values Scalar value of each operation.
+@param inplace The output array is shared with the first input array if true.
+\ingroup FunctionImplGrp
+ */
+template <typename T>
+class FusedElementwise
+    : public BaseFunction<const vector<int> &, const vector<int> &,
+                          const vector<float> &, bool> {
+protected:
+  const vector<int> ops_;
+  const vector<int> operands_;
+  const vector<float> values_;
+  bool inplace_;
+
+public:
+  FusedElementwise(const Context &ctx, const vector<int> &ops,
+                   const vector<int> &operands, const vector<float> &values,
+                   bool inplace)
+      : BaseFunction(ctx, ops, operands, values, inplace), ops_(ops),
+        operands_(operands), values_(values), inplace_(inplace) {}
+  virtual ~FusedElementwise() {}
+  virtual shared_ptr<Function> copy() const {
+    return create_FusedElementwise(ctx_, ops_, operands_, values_, inplace_);
+  }
+  virtual int min_inputs() { return 1; }
+  virtual int min_outputs() { return 1; }
+  virtual vector<dtypes> in_types() { return vector<dtypes>{get_dtype<T>()}; }
+  virtual vector<dtypes> out_types() { return vector<dtypes>{get_dtype<T>()}; }
+  virtual vector<string> allowed_array_classes() {
+    return SingletonManager::get<Cpu>()->array_classes();
+  }
+  virtual string name() { return "FusedElementwise"; }
+  virtual int inplace_data(int i) const {
+    return (inplace_ && i == 0) ? Function::INPLACE : Function::NOT_INPLACE;
+  }
+  virtual int inplace_data_with(int i) const { return 0; }
+
+protected:
+  NBLA_API virtual void setup_impl(const Variables &inputs,
+                                   const Variables &outputs);
+  NBLA_API virtual void forward_impl(const Variables &inputs,
+                                     const Variables &outputs);
+  NBLA_API virtual void backward_impl(const Variables &inputs,
+                                      const Variables &outputs,
+                                      const vector<bool> &propagate_down,
+                                      const vector<bool> &accum);
+};
+}
+#endif
@@ -22,6 +22,7 @@
 #include <nbla/function.hpp>
 #include <nbla/function_registry.hpp>
 #include <nbla/half.hpp>
+#include <nbla/thread_pool.hpp>
 
 namespace nbla {
 
@@ -269,17 +270,19 @@ void transform_binary(const Size_t size, const T *x0, const T *x1, T *y,
   // a decrease in precision during computation.
   using PRECISE_T = typename force_float<T>::type;
 
-  for (Size_t idx = 0; idx < size; ++idx) {
-    Size_t idx0 = 0;
-    Size_t idx1 = 0;
-    for (Size_t i = 0; i < ndim; ++i) {
-      Size_t dim_idx = (idx / strides_y[i]) % shape_y[i];
-      idx0 += dim_idx * strides_x0[i];
-      idx1 += dim_idx * strides_x1[i];
+  parallel_for(size, parallel_grain_size, [&](Size_t begin, Size_t end) {
+    for (Size_t idx = begin; idx < end; ++idx) {
+      Size_t idx0 = 0;
+      Size_t idx1 = 0;
+      for (Size_t i = 0; i < ndim; ++i) {
+        Size_t dim_idx = (idx / strides_y[i]) % shape_y[i];
+        idx0 += dim_idx * strides_x0[i];
+        idx1 += dim_idx * strides_x1[i];
+      }
+      y[idx] = op(static_cast<PRECISE_T>(x0[idx0]),
+                  static_cast<PRECISE_T>(x1[idx1]));
     }
-    y[idx] =
-        op(static_cast<PRECISE_T>(x0[idx0]), static_cast<PRECISE_T>(x1[idx1]));
-  }
+  });
 }
 
 template <typename T, typename BinaryOp>
@@ -20,6 +20,7 @@
 #include <nbla/cpu.hpp>
 #include <nbla/function.hpp>
 #include <nbla/function_registry.hpp>
+#include <nbla/thread_pool.hpp>
 
 namespace nbla {
 
@@ -92,20 +93,22 @@ public:
 
 template <typename T, typename UnaryOp>
 void transform_unary(int size, const T *x, T *y, UnaryOp op) {
-#ifdef _OPENMP
-#pragma omp parallel for schedule(static)
-#endif
-  for (int idx = 0; idx < size; ++idx) {
-    y[idx] = op(x[idx]);
-  }
+  parallel_for(size, parallel_grain_size, [&](Size_t begin, Size_t end) {
+    for (Size_t idx = begin; idx < end; ++idx) {
+      y[idx] = op(x[idx]);
+    }
+  });
 }
 
 template <typename T, typename UnaryOp, bool accum>
 void transform_unary_grad(int size, const T *dy, const T *x, const T *y, T *g,
                           const bool inplace, UnaryOp op) {
-  for (int idx = 0; idx < size; ++idx) {
-    g[idx] = (accum ? g[idx] : (T)0) + op.g(dy[idx], x[idx], y[idx], inplace);
-  }
+  parallel_for(size, parallel_grain_size, [&](Size_t begin, Size_t end) {
+    for (Size_t idx = begin; idx < end; ++idx) {
+      g[idx] =
+          (accum ? g[idx] : (T)0) + op.g(dy[idx], x[idx], y[idx], inplace);
+    }
+  });
 }
 
 template <typename T, typename UnaryOp, typename... Args>
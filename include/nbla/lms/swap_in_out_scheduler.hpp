@@ -20,6 +20,7 @@
 #include <unordered_map>
 #include <vector>
 
+#include <nbla/array_registry.hpp>
 #include <nbla/backend_registry.hpp>
 #include <nbla/computation_graph/function.hpp>
 #include <nbla/synced_array.hpp>
@@ -94,6 +95,15 @@ using std::set;
                  [&]() { swap_in_out_scheduler.post_update_callback(); });
     scheduler.end_scheduling();
     @endcode
+
+    Both contexts can be CPU; with a host context of CpuDiskArray, arrays are
+    swapped out to files on disk, and swapped in from them asynchronously
+    ahead of their use. `max` is the size of RAM managed by this class then.
+    @code
+    SwapInOutScheduler scheduler(Context({"cpu:float"}, "CpuDiskArray", "0"),
+                                 Context({"cpu:float"}, "CpuCachedArray", "0"),
+                                 16e9);
+    @endcode
  */
 class SwapInOutScheduler {
   // Notation: "sa" stands for SyncedArray
@@ -131,6 +141,9 @@ class SwapInOutScheduler {
   const Context host_ctx;   // Host context, the distination of swap out.
   const Context device_ctx; // Device context
 
+  // Host and device are in the same backend, e.g. CPU and disk.
+  const bool same_backend;
+
   // The maximum size of usable GPU memory [byte]
   const size_t max_bytes;
   const size_t max_prefetch_bytes;
@@ -179,6 +192,14 @@ public:
   //---------------------------------------------------
   //               User interfaces
   //---------------------------------------------------
+  /** Statistics of swapping.
+   */
+  struct Stats {
+    size_t swap_in_bytes = 0;  ///< Bytes swapped in to the device.
+    size_t swap_out_bytes = 0; ///< Bytes swapped out to the host.
+    double stall_time = 0;     ///< Seconds computation waited for swapping.
+  };
+
   /** Constructor.
 
   @params h_ctx Host context used as the destination of swap-out.
@@ -229,7 +250,22 @@ public:
    */
   NBLA_API void post_update_callback();
 
+  /** Get statistics of swapping since construction or reset_stats().
+
+      The stall time is the time spent in the callbacks of this class issuing
+      swap in/out and waiting for them, and waiting for asynchronous copies
+      from CpuDiskArray.
+   */
+  NBLA_API Stats stats() const;
+
+  /** Reset statistics of swapping.
+   */
+  NBLA_API void reset_stats();
+
 private:
+  Stats swap_stats;
+  double disk_wait_time = 0; // Wait time from disk at start_scheduling().
+
   //---------------------------------------------------
   //                   Scheduler
   //---------------------------------------------------
@@ -348,6 +384,12 @@ private:
   }
 
   bool context_checker(const Context query_ctx, const Context ctx) {
+    // Array classes of the same backend are distinguished by array groups.
+    if (same_backend) {
+      return ArrayGroup::get_group(query_ctx.array_class) ==
+             ArrayGroup::get_group(ctx.array_class);
+    }
+
     auto array_classes = BackendUtils::array_classes(ctx);
 
     return std::find(array_classes.begin(), array_classes.end(),
@@ -364,6 +406,12 @@ private:
   // Subprocesses of swap_out()
   void swap_out_first_iter();
 
+  // Return true when the head array is on the host.
+  bool on_host(const SyncedArrayPtr p);
+
+  // Count bytes of an array to be swapped out to the host.
+  void count_swap_out(const SyncedArrayPtr p);
+
   // Swap out disordered arrays in finalization
   void swap_out_wrong_order();
 
@@ -31,6 +31,40 @@ public:
   CpuMemory(size_t bytes, const string &device_id);
   ~CpuMemory();
 
+protected:
+  bool alloc_impl() override;
+  shared_ptr<Memory> divide_impl(size_t second_start) override;
+  void merge_next_impl(Memory *from) override;
+  void merge_prev_impl(Memory *from) override;
+};
+
+/** Cpu memory mapped to a file on disk.
+
+    A memory block is a shared mapping of a temporary file created in the
+    directory given by CpuDiskMemory::set_directory, or the environment
+    variable NNABLA_DISK_ARRAY_DIR (TMPDIR or /tmp by default). The file is
+    unlinked right after creation, so it is removed when the memory is freed.
+    Pages are written back to the file and evicted by the OS, which allows
+    data larger than RAM.
+
+    This is available only on POSIX systems, and can not be divided or merged
+    by caching allocators.
+
+    \ingroup MemoryImplGrp
+ */
+class NBLA_API CpuDiskMemory : public Memory {
+public:
+  CpuDiskMemory(size_t bytes, const string &device_id);
+  ~CpuDiskMemory();
+
+  /** Set the directory where files are created.
+   */
+  static void set_directory(const string &directory);
+
+  /** Get the directory where files are created.
+   */
+  static string directory();
+
 protected:
   bool alloc_impl() override;
   shared_ptr<Memory> divide_impl(size_t second_start) override;
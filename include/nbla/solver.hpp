@@ -29,6 +29,7 @@ namespace nbla {
 using std::string;
 using std::vector;
 using std::shared_ptr;
+using std::unique_ptr;
 using std::unordered_map;
 
 typedef std::function<void(void)> update_hook_type;
@@ -116,6 +117,13 @@ protected:
   Context ctx_;                          ///< Stores Context.
   unordered_map<string, Params> params_; ///< Hash map of parameters
   bool setup_called_;
+  bool fused_; ///< Whether parameters are updated as a flat parameter.
+
+private:
+  struct FlatParams;
+  unique_ptr<FlatParams> flat_; ///< Parameters packed in contiguous arrays.
+
+  FlatParams *flat_params(bool with_states = false);
 
 public:
   /** Constructor takes at least context and parameters.
@@ -134,6 +142,24 @@ public:
   ///< Set learning rate
   virtual void set_learning_rate(float learning_rate) = 0;
 
+  /** Enable or disable the fused (flat parameter) mode.
+
+  In the fused mode, parameters, gradients and states are packed into
+  contiguous arrays which the Variable%s borrow, and each of update(),
+  weight_decay(), scale_grad() and check_*_grad() processes them as one flat
+  parameter in a single pass split into threads. clip_grad_by_norm() and
+  solvers not updating elementwise (see update_elementwise()) process the
+  packed parameters one by one, and zero_grad() zeros the packed gradients
+  while gradients not computed since then are still skipped. Callbacks are
+  called once per call instead of once per parameter. The fused mode is
+  ignored unless the solver runs on CPU.
+  */
+  void set_fused(bool fused);
+
+  /** Whether the fused mode is enabled.
+   */
+  bool fused() const { return fused_; }
+
   /** Zeroing grads for all #params_. This is usually called before running
   a sequence of Function::backward() for propagating whole computation graph.
   */
@@ -240,6 +266,13 @@ protected:
    */
   void setup();
 
+  /** Whether update_impl() updates each element independently of the others
+  given the same iteration `t`, so that it can update parameters concatenated
+  into a flat parameter. The fused mode does not use threads for solvers
+  returning false.
+  */
+  virtual bool update_elementwise() { return true; }
+
   /** Set state (e.g. momentum).
 
   @param key Key of parameter.
@@ -63,6 +63,8 @@ protected:
   virtual void set_state_impl(const string &key, VariablePtr param) override;
   virtual void remove_state_impl(const string &key) override;
   virtual void update_impl(const string &key, VariablePtr param) override;
+  // Local learning rates are computed for each parameter.
+  virtual bool update_elementwise() override { return false; }
   NBLA_DECL_WEIGHT_DECAY();
   NBLA_DECL_CLIP_GRAD_BY_NORM();
   NBLA_DECL_CHECK_INF_GRAD();
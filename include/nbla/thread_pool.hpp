@@ -0,0 +1,119 @@
+// Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef __NBLA_THREAD_POOL_HPP__
+#define __NBLA_THREAD_POOL_HPP__
+
+#include <nbla/common.hpp>
+#include <nbla/cpu.hpp>
+#include <nbla/defs.hpp>
+#include <nbla/singleton_manager.hpp>
+
+#include <functional>
+#include <memory>
+#include <mutex>
+
+namespace nbla {
+
+/** Pool of worker threads for intra-op parallelism of CPU functions.
+
+    Workers are started at the first run and wait for tasks. The caller of a
+    run also executes tasks, so a run is executed by `num_threads` threads in
+    total. Runs are not executed concurrently; a run called while another run
+    is in progress, or called from a task, is executed by the caller alone.
+ */
+class NBLA_API ThreadPool {
+  struct Workers;
+  unique_ptr<Workers> workers_;
+  int num_threads_;
+  std::mutex mtx_; ///< Serializes runs and configuration.
+
+  void start();
+  void stop();
+
+public:
+  /** Constructor.
+
+      @param[in] num_threads Number of threads including the caller. The
+      number of CPU cores is used if it is not positive.
+   */
+  ThreadPool(int num_threads);
+  ~ThreadPool();
+
+  /** Number of threads executing a run.
+   */
+  int num_threads() const { return num_threads_; }
+
+  /** Set the number of threads. Workers are restarted.
+   */
+  void set_num_threads(int num_threads);
+
+  /** Execute `task(i)` for each i in [0, num_tasks) and wait for completion.
+
+      The first exception thrown by tasks is rethrown after all the tasks
+      finish.
+   */
+  void run(Size_t num_tasks, const std::function<void(Size_t)> &task);
+
+  /** Whether the calling thread is executing a task of a run.
+   */
+  static bool in_parallel_region();
+
+  /** Forget the workers which do not exist in a forked child process.
+   */
+  void reset_after_fork();
+
+  DISABLE_COPY_AND_ASSIGN(ThreadPool);
+};
+
+/** Minimum number of elements per thread in elementwise loops.
+ */
+const Size_t parallel_grain_size = 32768;
+
+/** Number of chunks into which parallel_for splits `size` iterations.
+
+    It is at most the number of threads and each chunk has at least `grain`
+    iterations. It is 1 in a parallel region.
+ */
+NBLA_API Size_t parallel_num_chunks(Size_t size, Size_t grain);
+
+/** Execute `f(chunk, begin, end)` for chunks of [0, size) in parallel.
+
+    Chunks are numbered from 0 to parallel_num_chunks(size, grain) - 1, which
+    is useful to give each chunk its own work buffer.
+ */
+template <typename F>
+void parallel_for_chunks(Size_t size, Size_t grain, F f) {
+  const Size_t chunks = parallel_num_chunks(size, grain);
+  if (chunks <= 1) {
+    if (size > 0) {
+      f(0, 0, size);
+    }
+    return;
+  }
+  SingletonManager::get<Cpu>()->thread_pool()->run(
+      chunks, [&f, size, chunks](Size_t c) {
+        f(c, size * c / chunks, size * (c + 1) / chunks);
+      });
+}
+
+/** Execute `f(begin, end)` for chunks of [0, size) in parallel.
+ */
+template <typename F> void parallel_for(Size_t size, Size_t grain, F f) {
+  parallel_for_chunks(size, grain, [&f](Size_t, Size_t begin, Size_t end) {
+    f(begin, end);
+  });
+}
+}
+#endif
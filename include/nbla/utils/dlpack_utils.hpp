@@ -33,6 +33,16 @@ NBLA_API NdArrayPtr from_dlpack(DLManagedTensor *from);
  */
 NBLA_API void from_dlpack(DLManagedTensor *from, NdArray *to);
 
+/** NNabla borrows a part of the array in a NdArray via DLPack.
+
+    The array in `to` is cleared and replaced with an array of `dtype` sharing
+    the memory of `from` from `byte_offset` bytes. The shape of `to` is kept.
+    The memory of `from` is kept alive while it is borrowed.
+ */
+NBLA_API void borrow_array(NdArray *from, Size_t byte_offset,
+                           const dtypes dtype, const Context &ctx,
+                           NdArray *to);
+
 /** NNabla lends the head array in a NdArray as a DLPack Tensor.
 */
 NBLA_API DLManagedTensor *to_dlpack(NdArray *array);
@@ -50,5 +60,9 @@ NBLA_API void call_deleter(DLManagedTensor *dlp);
 /** Convert DLDataType to Nnabla dtype
 */
 dtypes convert_dlpack_type_to_dtype(const DLDataType &dlp_type);
+
+/** Convert Nnabla dtype to DLDataType
+*/
+NBLA_API DLDataType convert_dtype_to_dlpack_type(const dtypes dtype);
 }
 #endif
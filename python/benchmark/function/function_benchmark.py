@@ -97,6 +97,7 @@ class FunctionBenchmarkWriter:
         print('func_kwargs = {}'.format(repr(fb.func_kwargs)), file=self.file)
         print('ext = ({}, {})'.format(
             repr(fb.ext), repr(fb.ext_kwargs)), file=self.file)
+        print('num_threads = {}'.format(fb.num_threads), file=self.file)
         if self.setup_stat is not None:
             self._write_a_stat('setup', self.setup_stat)
         if self.foward_stat is not None:
@@ -124,7 +125,7 @@ class FunctionBenchmarkCsvWriter(FunctionBenchmarkWriter):
     def write_header(self):
         fields = [
             'module', 'function', 'class', 'inspecs',
-            'func_args', 'func_kwargs', 'ext', 'ext_kwargs',
+            'func_args', 'func_kwargs', 'ext', 'ext_kwargs', 'num_threads',
             'setup [ms/run]', 'setup [run]',
             'forward [ms/run]', 'forward [run]',
             'backward [ms/run]', 'backward [run]',
@@ -140,7 +141,7 @@ class FunctionBenchmarkCsvWriter(FunctionBenchmarkWriter):
             fb.module, fb.func.__name__, fb.func_ins.name,
             repr(fb.inspecs),
             repr(fb.func_args), repr(fb.func_kwargs),
-            fb.ext, repr(fb.ext_kwargs),
+            fb.ext, repr(fb.ext_kwargs), str(fb.num_threads),
         ]
         values.extend(self._stat_as_a_list(fb.setup_stat))
         values.extend(self._stat_as_a_list(fb.forward_stat))
@@ -218,6 +219,7 @@ class FunctionBenchmark:
         self.ctx = self.mod_ext.context(**ext_kwargs)
         self.min_run = min_run
         self.min_time = min_time
+        self.num_threads = nn.get_num_threads()
 
     def _calc_benchmark_stat(self, f):
         timer = Timer()
@@ -324,6 +326,7 @@ class FunctionBenchmark:
     def benchmark(self):
         """Do all benchmarks of setup, forward and backward.
         """
+        self.num_threads = nn.get_num_threads()
         self.benchmark_setup()
         self.benchmark_forward()
         self.benchmark_backward()
@@ -0,0 +1,59 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+
+import nnabla as nn
+import nnabla.initializer as I
+import nnabla.functions as F
+import nnabla.parametric_functions as PF
+
+from function_benchmark import FunctionBenchmark, Inspec
+
+
+def scaling_params():
+    """(func, inspecs, func_kwargs)"""
+    u = I.UniformInitializer((0.5, 1.0))
+    params = []
+    params.append((PF.convolution, [Inspec((32, 64, 56, 56))],
+                   dict(outmaps=64, kernel=(3, 3), pad=(1, 1))))
+    params.append((PF.deconvolution, [Inspec((32, 64, 28, 28))],
+                   dict(outmaps=64, kernel=(4, 4), pad=(1, 1), stride=(2, 2))))
+    params.append((PF.affine, [Inspec((256, 4096))], dict(n_outmaps=4096)))
+    params.append((F.sum, [Inspec((64, 512, 7, 7))], dict(axis=(2, 3))))
+    params.append((F.mean, [Inspec((2048, 8192))], dict(axis=None)))
+    params.append((F.tanh, [Inspec((64, 128, 56, 56))], {}))
+    params.append((F.mul2, [Inspec((64, 128, 56, 56), u),
+                            Inspec((64, 128, 56, 56), u)], {}))
+    return params
+
+
+@pytest.fixture
+def num_threads_scope():
+    num_threads = nn.get_num_threads()
+    yield
+    nn.set_num_threads(num_threads)
+
+
+@pytest.mark.parametrize('func, inspecs, func_kwargs', scaling_params())
+@pytest.mark.parametrize('num_threads', [1, 2, 4, 8])
+def test_num_threads(func, inspecs, func_kwargs, num_threads, nnabla_opts,
+                     num_threads_scope):
+    nn.set_num_threads(num_threads)
+    fb = FunctionBenchmark(
+        func, inspecs, [], func_kwargs,
+        nnabla_opts.ext, nnabla_opts.ext_kwargs)
+    fb.benchmark()
+    fb.write(writer=nnabla_opts.function_benchmark_writer)
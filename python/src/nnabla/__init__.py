@@ -19,6 +19,8 @@ from ._init import (
     prefer_cached_array,
     reset_array_preference,
     array_classes,
+    set_num_threads,
+    get_num_threads,
     add_available_context,
     available_contexts
 )
@@ -37,7 +39,8 @@ from .parameter import (
 from .context import (
     context_scope, set_default_context, get_current_context)
 from .auto_forward import auto_forward, set_auto_forward, get_auto_forward
-from ._computation_graph import forward_all
+from .recompute import recompute, set_recompute, get_recompute, recompute_summary
+from ._computation_graph import forward_all, compile, MemoryPlan
 from .grad import grad
 from .callback import (
     set_function_pre_hook,
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from libcpp.vector cimport vector
+from libcpp.memory cimport shared_ptr
 from libcpp cimport bool as cpp_bool
 from _nd_array cimport *
 from function cimport *
@@ -31,3 +32,17 @@ cdef extern from "nbla/computation_graph/computation_graph.hpp" namespace "nbla"
                      cpp_bool,
                      cpp_bool,
 		     function_hook_type, function_hook_type) nogil except+
+
+
+cdef extern from "nbla/computation_graph/memory_planner.hpp" namespace "nbla":
+    cdef cppclass CMemoryPlan "nbla::MemoryPlan":
+        CMemoryPlan(const vector[CgVariablePtr] &, const CContext &) except+
+        void forward(function_hook_type, function_hook_type) nogil except+
+        Size_t arena_size()
+        Size_t total_size()
+        size_t num_planned_buffers()
+
+
+cdef class MemoryPlan:
+    cdef shared_ptr[CMemoryPlan] plan
+    cdef public object outputs
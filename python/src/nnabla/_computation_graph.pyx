@@ -14,6 +14,7 @@
 
 from libcpp cimport bool as cpp_bool
 from libcpp.vector cimport vector
+from libcpp.memory cimport shared_ptr
 from _variable cimport Variable as _Variable, create_function_hook_with_object
 from _computation_graph cimport forward_all as cforward_all
 
@@ -86,3 +87,124 @@ def forward_all(variables,
         cg_variables[i] = (<_Variable?> variables[i]).var
     with nogil:
         cforward_all(cg_variables, clear_buffer, clear_no_need_grad, function_pre_hook_c, function_post_hook_c)
+
+
+def compile(*variables):
+    '''Compile forward and backward from variables, so that repeated calls
+    replay captured execution plans without traversing the graph.
+    See also :meth:`nnabla.Variable.compile_forward`.
+
+    Args:
+        variables (:obj:`~nnabla.Variable`): Variables to compile.
+
+    Returns:
+        :obj:`~nnabla.Variable` or tuple of :obj:`~nnabla.Variable`: Given variables.
+
+    Example:
+
+        .. code-block:: python
+
+            import numpy as np
+            import nnabla as nn
+            import nnabla.parametric_functions as PF
+
+            x = nn.Variable((16, 8))
+            y = nn.compile(PF.affine(PF.affine(x, 8, name="a"), 1, name="b"))
+            for i in range(100):
+                x.d = np.random.randn(*x.shape)
+                y.forward()
+                y.backward()
+
+    '''
+    for v in variables:
+        (<_Variable?> v).compile_forward()
+    if len(variables) == 1:
+        return variables[0]
+    return variables
+
+
+cdef class MemoryPlan:
+    '''Static memory plan of intermediate buffers for inference.
+
+    A forward propagation up to the outputs is executed once when it is
+    created. From the liveness of intermediate buffers in the order of
+    functions, every buffer is assigned to an offset of a single arena
+    allocated in advance, so that buffers alive at the same time do not
+    overlap. Forward calls through this object reuse the arena without
+    allocating memory. The plan is created again when the graph is modified.
+
+    Graph inputs, outputs, persistent variables and variables referenced by
+    functions outside of the graph are not planned. Do not call backward on
+    the planned graph, since intermediate data are overwritten.
+
+    Args:
+        outputs (list of :obj:`~nnabla.Variable`): Outputs of the graph.
+        ctx (:obj:`~nnabla.Context`): Context where the arena is allocated.
+            If None, the current context is used.
+
+    Example:
+
+        .. code-block:: python
+
+            import nnabla as nn
+
+            plan = nn.MemoryPlan([y])
+            print(plan.arena_size, plan.total_size)
+            for x_data in data:
+                x.d = x_data
+                plan.forward()
+                print(y.d)
+
+    '''
+
+    def __cinit__(self, outputs, ctx=None):
+        cdef vector[CgVariablePtr] cg_variables
+        if ctx is None:
+            import nnabla as nn
+            ctx = nn.get_current_context()
+        cdef CContext cctx = <CContext ?> ctx
+        self.outputs = list(outputs)
+        for v in self.outputs:
+            cg_variables.push_back((<_Variable?> v).var)
+        self.plan.reset(new CMemoryPlan(cg_variables, cctx))
+
+    def forward(self, function_pre_hook=None, function_post_hook=None):
+        '''Performs a forward propagation up to the outputs using the arena.
+
+        Args:
+            function_pre_hook(callable):
+                This callable object is called immediately before each function is executed.
+                It must take :obj:`~nnabla.function.Function` as an input.
+                The default is None.
+            function_post_hook(callable):
+                This callable object is called immediately after each function is executed.
+                It must take :obj:`~nnabla.function.Function` as an input.
+                The default is None.
+
+        '''
+        cdef function_hook_type function_pre_hook_c
+        cdef function_hook_type function_post_hook_c
+        if function_pre_hook is not None:
+            function_pre_hook_c = create_function_hook_with_object(function_pre_hook)
+        if function_post_hook is not None:
+            function_post_hook_c = create_function_hook_with_object(function_post_hook)
+        with nogil:
+            self.plan.get().forward(function_pre_hook_c, function_post_hook_c)
+
+    @property
+    def arena_size(self):
+        '''Size of the arena in bytes, i.e. peak memory of planned buffers.
+        '''
+        return self.plan.get().arena_size()
+
+    @property
+    def total_size(self):
+        '''Total size of planned buffers in bytes without sharing memory.
+        '''
+        return self.plan.get().total_size()
+
+    @property
+    def num_planned_buffers(self):
+        '''Number of buffers assigned to the arena.
+        '''
+        return self.plan.get().num_planned_buffers()
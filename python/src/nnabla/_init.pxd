@@ -34,6 +34,10 @@ cdef extern from "nbla/cpu.hpp" namespace "nbla":
     vector[string] _cpu_array_classes "nbla::SingletonManager::get<nbla::Cpu>()->array_classes" () except +
     void _cpu_set_array_classes "nbla::SingletonManager::get<nbla::Cpu>()->_set_array_classes" (const vector[string] & a) except +
 
+cdef extern from "nbla/thread_pool.hpp" namespace "nbla":
+    int _cpu_get_num_threads "nbla::SingletonManager::get<nbla::Cpu>()->thread_pool()->num_threads" () except +
+    void _cpu_set_num_threads "nbla::SingletonManager::get<nbla::Cpu>()->thread_pool()->set_num_threads" (int num_threads) except +
+
 
 cdef extern from "nbla/singleton_manager.hpp" namespace "nbla":
     cdef cppclass SingletonManager:
@@ -16,7 +16,8 @@ from .logger import logger
 cimport _init
 from _init cimport(
     register_gc, SingletonManager,
-    _cpu_array_classes, _cpu_set_array_classes)
+    _cpu_array_classes, _cpu_set_array_classes,
+    _cpu_get_num_threads, _cpu_set_num_threads)
 
 available_contexts = []
 
@@ -129,6 +130,46 @@ def array_classes():
     return _cpu_array_classes()
 
 ###############################################################################
+# Thread API
+###############################################################################
+
+
+def set_num_threads(int num_threads):
+    """Set the number of threads used by CPU functions.
+
+    Convolution, deconvolution, affine, reductions and large element-wise
+    functions split their outer loops among the threads. Functions are
+    executed by a single thread in total if 1 is given.
+
+    Args:
+        num_threads (int): Number of threads. If 0 or less, the
+            `NNABLA_NUM_THREADS` environment variable or the number of CPU
+            cores is used.
+
+    """
+    _cpu_set_num_threads(num_threads)
+
+
+def get_num_threads():
+    """Get the number of threads used by CPU functions.
+
+    Returns:
+        int: Number of threads.
+
+    """
+    return _cpu_get_num_threads()
+
+
+def _init_num_threads():
+    from .config import nnabla_config
+    num_threads = int(nnabla_config.get('CPU', 'num_threads'))
+    if num_threads > 0:
+        set_num_threads(num_threads)
+
+
+_init_num_threads()
+
+###############################################################################
 
 
 def device_synchronize(str device):
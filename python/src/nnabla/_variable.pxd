@@ -82,6 +82,12 @@ cdef extern from "nbla/computation_graph/variable.hpp" namespace "nbla":
         void backward(NdArrayPtr grad, cpp_bool clear_buffer, vector[CommunicatorBackwardCallbackPtr] communicator_callbacks, function_hook_type function_pre_hook, function_hook_type function_post_hook, cpp_bool clear_initial_grad) nogil except+
         void set_persistent(cpp_bool b)
         cpp_bool persistent()
+        void set_recompute(cpp_bool b)
+        cpp_bool recompute()
+        void set_recompute_segment(int s)
+        int recompute_segment()
+        void set_compiled(cpp_bool b) except+
+        cpp_bool compiled()
         string name() except +
         void set_name(string name) except +
         vector[CgFunctionPtr] function_references() except+
@@ -874,6 +874,71 @@ cdef class Variable:
     def persistent(self, cpp_bool b):
         self.varp.set_persistent(b)
 
+    @property
+    def recompute(self):
+        """
+        Returns the recompute flag of this variable. If True, the variable
+        data is cleared during :meth:`nnabla._variable.Variable.forward`
+        with `clear_no_need_grad=True` even if backward requires it, and
+        is recomputed by executing forward of the parent function again
+        during :meth:`nnabla._variable.Variable.backward`. This reduces
+        memory of intermediate activations in exchange for computation.
+        A variable used by a function whose outputs are not recomputed in
+        the same :func:`nnabla.recompute` context is kept as a checkpoint.
+        This method can also be called as a setter.
+
+        See :func:`nnabla.recompute` to set the flag to variables created in
+        a scope.
+
+        Args:
+            b(bool)
+
+        Returns:
+            bool
+
+        """
+        return self.varp.recompute()
+
+    @recompute.setter
+    def recompute(self, cpp_bool b):
+        self.varp.set_recompute(b)
+
+    def compile_forward(self, cpp_bool compiled=True):
+        """
+        Compile forward and backward from this variable.
+
+        The first :meth:`nnabla._variable.Variable.forward` (and
+        :meth:`nnabla._variable.Variable.backward`) after compiling captures
+        the order of functions, setup state and clear flags of buffers, and
+        the following calls replay them without traversing the graph.
+        The capture is done again automatically when the graph is modified,
+        e.g. by connecting a new function to a variable in the graph,
+        or changing `need_grad` or `persistent` flags.
+        This reduces overhead of graph traversal for graphs of many small
+        functions executed repeatedly.
+
+        Args:
+            compiled (bool): If False, the compiled plan is discarded.
+
+        Returns:
+            :obj:`~nnabla.Variable`: This variable.
+
+        """
+        self.varp.set_compiled(compiled)
+        return self
+
+    @property
+    def compiled(self):
+        """
+        Returns whether forward and backward from this variable are compiled.
+        See :meth:`nnabla._variable.Variable.compile_forward`.
+
+        Returns:
+            bool
+
+        """
+        return self.varp.compiled()
+
     @property
     def name(self):
         return self.varp.name()
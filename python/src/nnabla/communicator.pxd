@@ -52,6 +52,7 @@ cdef extern from "nbla/communicator.hpp" namespace "nbla":
         void all_reduce(shared_ptr[CNdArray] data, cpp_bool division, cpp_bool inplace, const string & group) nogil except +
         CommunicatorBackwardCallbackPtr all_reduce_callback(const vector[shared_ptr[CNdArray]] & ndarray_list, size_t pack_size, cpp_bool division, const string & group) except +
         CommunicatorBackwardCallbackPtr all_reduce_callback(shared_ptr[CNdArray] data, size_t pack_size, cpp_bool division, const string & group) except +
+        CommunicatorBackwardCallbackPtr bucketed_all_reduce_callback(const vector[shared_ptr[CNdArray]] & ndarray_list, size_t bucket_size, cpp_bool division, cpp_bool fp16_compression, cpp_bool overlap, const string & group) except +
         void reduce_scatter(const vector[shared_ptr[CNdArray]] & ndarray_list, shared_ptr[CNdArray] ndarray, cpp_bool division, const string & group) nogil except +
         void bcast(const vector[shared_ptr[CNdArray]] & ndarray_list, int src, cpp_bool inplace, const string & group) nogil except +
         void bcast(shared_ptr[CNdArray] ndarray, int src, cpp_bool inplace, const string & group) nogil except +
@@ -526,6 +526,55 @@ cdef class Communicator:
         return CommunicatorBackwardCallback.create_from_ccallback(
             self.communicatorp.all_reduce_callback(cndarray_list, pack_size, division, group))
 
+    def bucketed_all_reduce_callback(self, data, size_t bucket_size=2 << 20, cpp_bool division=False,
+                                     cpp_bool fp16_compression=False, cpp_bool overlap=False,
+                                     string group="world"):
+        """All reduce over gradients in buckets during backward.
+
+        A gradient is packed into a bucket when all the functions using it
+        finish backward, and a bucket is all-reduced when it has at least
+        `bucket_size` values. Buckets are formed in the order the gradients
+        become ready, so that communication of gradients near the loss
+        starts while backward of the preceding layers continues.
+
+        Note:
+            With `overlap`, collectives are called from a background thread.
+            Do not use it with functions communicating during backward
+            (e.g. `sync_batch_normalization`).
+
+        Args:
+            data (:obj:`NdArray` or list of :obj:`NdArray`)
+            bucket_size (int): The minimum number of values in a bucket.
+            division (bool): Flag to divide the reduce data by the
+                number of `contexts` added, or the number of devices.
+            fp16_compression (bool): Transfer the values in half precision.
+            overlap (bool): All-reduce buckets on a background thread while
+                backward continues. Backward returns after all buckets are
+                reduced.
+            group (string): Name of a group. This groups is used when the collective is called.
+
+        Example:
+
+        .. code-block:: python
+
+            loss.forward()
+            solver.zero_grad()
+            loss.backward(communicator_callbacks=comm.bucketed_all_reduce_callback(
+                [v.grad for v in nn.get_parameters().values()], 1024 * 1024,
+                division=True))
+            solver.update()
+
+        """
+        cdef vector[shared_ptr[CNdArray]] cndarray_list
+        if type(data) == list:
+            for x in data:
+                cndarray_list.push_back((< NdArray > x).arr)
+        else:
+            cndarray_list.push_back((< NdArray > data).arr)
+        return CommunicatorBackwardCallback.create_from_ccallback(
+            self.communicatorp.bucketed_all_reduce_callback(
+                cndarray_list, bucket_size, division, fp16_compression, overlap, group))
+
 
 def DataParallelCommunicator(CContext ctx):
     """Data Parallel Communicator for Distributed Training.
@@ -622,11 +671,26 @@ def MultiProcessDataParallelCommunicator(CContext ctx):
             # Update
             solver.update()
 
+    With a CPU context, processes on a single host communicate through shared
+    memory. The processes are launched by ``nnabla_cli launch`` instead of
+    ``mpirun``, and each process uses the CPU cores divided among the
+    processes.
+
+    .. code-block:: python
+
+        # Run like `nnabla_cli launch -n 4 python <code_snippet.py>`
+        from nnabla.ext_utils import get_extension_context
+        ctx = get_extension_context("cpu")
+        comm = C.MultiProcessCommunicator(ctx)
+        comm.init()
+
     """
 
     import platform
     import ctypes
-    if platform.system() == 'Linux':
+    cpu = all(b.split(':')[0] == 'cpu' for b in ctx.backend)
+    # The CPU communicator does not use MPI.
+    if platform.system() == 'Linux' and not cpu:
         mpi_loaded = False
         for libmpi in ['libmpi.so', 'libmpi.so.12', 'libmpi.so.20', 'libmpi.so.40']:
             try:
@@ -647,7 +711,7 @@ def MultiProcessDataParallelCommunicator(CContext ctx):
                 '###########################################################################\n'
             import nnabla as nn
             nn.logger.warn(msg)
-    else:
+    elif platform.system() != 'Linux':
         raise Exception(
             "MultiProcessDataParallelCommunicator is not supported other than linux.")
     return Communicator.create(create_MultiProcessDataParallelCommunicatorCommunicator(ctx))
@@ -56,8 +56,45 @@ class LoopControlFunction:
         self.arguments = {}
 
 
+__stochastic_functions__ = ['Dropout', 'Rand', 'Randint', 'Randn',
+                            'RandBinomial', 'RandBeta', 'RandGamma',
+                            'RandomChoice', 'RandomCrop', 'RandomFlip',
+                            'RandomShift', 'RandomErase', 'ImageAugmentation']
+__stateful_functions__ = ['INQAffine', 'INQConvolution', 'MinMaxQuantize',
+                          'VATNoise', 'Sink']
+
+
+def is_deterministic_function(type_name, args):
+    """Returns whether a function always computes the same outputs from the
+    same inputs without side effects, so that it can be shared or evaluated
+    in advance.
+
+    Args:
+        type_name (str): Type name of the function, e.g. ``ReLU``.
+        args (dict): Arguments of the function.
+
+    Returns:
+        bool
+    """
+    args = args or {}
+    if type_name in __stochastic_functions__ + __stateful_functions__ \
+            + __loop_control_functions__:
+        return False
+    if type_name in ['BatchNormalization', 'FusedBatchNormalization',
+                     'SyncBatchNormalization']:
+        # Running statistics are updated with batch statistics.
+        return not args.get('batch_stat', True)
+    if type_name == 'MeanSubtraction':
+        # Running mean is updated unless update_running_mean is False.
+        return not args.get('update_running_mean', True)
+    if type_name == 'SpectralNorm':
+        # The power iteration updates `u` unless test is True.
+        return bool(args.get('test', False))
+    return True
+
+
 def load(filename, batch_size=None, exclude_parameter=False, parameter_only=False,
-         extension='.nntxt', parameter_scope=None, rng=None):
+         extension='.nntxt', parameter_scope=None, rng=None, lazy=False):
     """load
     Load network from files
 
@@ -71,6 +108,9 @@ def load(filename, batch_size=None, exclude_parameter=False, parameter_only=Fals
                                        loaded parameters will be created in created proto_graph's parameter_scope. This
                                        parameter_scope is default initialized with empty dictionary.
         rng (random state): User may specify random state, which cause parameters are initialized by determined random seed.
+        lazy (bool): If True, parameters stored uncompressed in `.params` or `.h5` files are memory-mapped
+                     copy-on-write instead of being copied, so that pages are read when touched and shared
+                     among processes loading the same file. Default is False.
 
     Returns:
         ProtoGraph:
@@ -123,6 +163,7 @@ def load(filename, batch_size=None, exclude_parameter=False, parameter_only=Fals
 
     ctx.exclude_parameter = exclude_parameter
     ctx.parameter_only = parameter_only
+    ctx.lazy = lazy
     ctx.proto = nnabla_pb2.NNablaProtoBuf()
     if parameter_scope is None:
         ctx.parameter_scope = OrderedDict()
@@ -905,6 +946,126 @@ class ProtoNetwork:
         self.functions = OrderedDict([(pf.name, pf) for pf in
                                       filter(lambda pf: pf.inputs or pf.outputs, self.functions.values())])
 
+    def _update_links(self):
+        for pv in chain(self.variables.values(), self.parameters.values()):
+            pv.parent = None
+            pv.required = []
+        for pf in self.functions.values():
+            for k in pf.inputs:
+                pv = self.variables[k] if k in self.variables else self.parameters[k]
+                pv.required.append(pf.name)
+            for k in pf.outputs:
+                self.variables[k].parent = pf.name
+        self._update_network_ports()
+
+    def eliminate_common_subexpressions(self):
+        """This function creates a new proto network, in which functions
+        computing the same outputs are merged. Two functions are merged if
+        they have the same type, arguments and inputs, and they are
+        deterministic (see :func:`is_deterministic_function`). The outputs of
+        the network are kept as they are.
+
+        Returns:
+            ProtoNetwork: A new proto network.
+
+        Example:
+
+            .. code-block:: python
+
+                g = nn.graph_def.load("my_model.nnp")
+                n = g.default_graph().eliminate_common_subexpressions()
+                y = n(x)
+        """
+        n = self.clone()
+        renames = {}
+        merged = {}
+        for pf in list(n.forward_sequence()):
+            pf.inputs = [renames.get(k, k) for k in pf.inputs]
+            if pf.repeat_id or not is_deterministic_function(pf.type, pf.args) \
+                    or any(k in n.outputs for k in pf.outputs):
+                continue
+            args = sorted((pf.args or {}).items())
+            key = (pf.type, repr(args), tuple(pf.inputs), len(pf.outputs))
+            if key not in merged:
+                merged[key] = pf
+                continue
+            for k0, k1 in zip(pf.outputs, merged[key].outputs):
+                renames[k0] = k1
+            del n.functions[pf.name]
+        n._update_links()
+        return n
+
+    def fold_constants(self, max_expansion=1.0):
+        """This function creates a new proto network, in which functions
+        depending only on parameters are evaluated in advance, and replaced
+        by new parameters holding their outputs, e.g. ``WeightStandardization``
+        applied to a weight. The new parameters are set into the parameter
+        scope of the proto graph, and their gradients are not computed.
+        Therefore, the new network is for inference.
+
+        Args:
+            max_expansion (float, optional, default=1.0):
+                A function is not evaluated if the size of its outputs is
+                larger than the size of its inputs multiplied by this value,
+                so that parameters are not expanded by e.g. ``Broadcast``.
+
+        Returns:
+            ProtoNetwork: A new proto network.
+        """
+        from nnabla.parameter import get_parameter_or_create, get_parameters, set_parameter
+        from nnabla.utils.load_function import _create_function_instance
+        n = self.clone()
+        values = OrderedDict()
+        with nn.parameter_scope('', self.owner().parameter_scope):
+            for pf in list(n.forward_sequence()):
+                if not pf.inputs or pf.repeat_id \
+                        or not is_deterministic_function(pf.type, pf.args) \
+                        or not all(k in n.parameters or k in values for k in pf.inputs) \
+                        or any(k in n.outputs for k in pf.outputs):
+                    continue
+                outputs = [n.variables[k] for k in pf.outputs]
+                if any(d < 1 for pv in outputs for d in pv.shape):
+                    continue
+                inputs = []
+                for k in pf.inputs:
+                    if k in values:
+                        inputs.append(values[k])
+                        continue
+                    pv = n.parameters[k]
+                    inputs.append(get_parameter_or_create(
+                        pv.name, pv.shape, pv.initializer))
+                in_size = sum(v.size for v in inputs)
+                out_size = sum(int(np.prod(pv.shape)) for pv in outputs)
+                if out_size > in_size * max_expansion:
+                    continue
+                func = _create_function_instance(
+                    self.current_context, pf.proto)
+                ys = func(*inputs, n_outputs=len(pf.outputs),
+                          auto_forward=True)
+                if not isinstance(ys, tuple):
+                    ys = (ys,)
+                for k, y in zip(pf.outputs, ys):
+                    values[k] = y
+                del n.functions[pf.name]
+
+            # Outputs of evaluated functions still used become parameters.
+            used = set(k for pf in n.functions.values() for k in pf.inputs)
+            names = {k: 1 for k in get_parameters(grad_only=False)}
+            for k, y in values.items():
+                pv = n.variables.pop(k)
+                if k not in used:
+                    continue
+                name = _get_unique_name(names, k)
+                p = nn.Variable(y.shape, need_grad=False)
+                p.data = y.data
+                set_parameter(name, p)
+                n.parameters[name] = ProtoVariable(
+                    pv.shape, name, False, 'Parameter')
+                for pf in n.functions.values():
+                    pf.inputs = [name if i == k else i for i in pf.inputs]
+        n._update_links()
+        return n
+
     def _patch_by_network_pass(self, callback):
         class VariableDelegate:
             def __init__(self, pv, pn):
@@ -19,6 +19,9 @@ from .batch_normalization_folding import (BatchNormalizationFoldingModifier,
                                           BatchNormalizationFoldingOppositeModifierInner)
 from .batch_normalization_self_folding import BatchNormalizationSelfFoldingModifier
 from .fused_batch_normalization import FusedBatchNormalizationModifier
+from .elementwise_fusion import ElementwiseFusionModifier
+from .common_subexpression_elimination import CommonSubexpressionEliminationModifier
+from .constant_folding import ConstantFoldingModifier
 from .unfused_batch_normalization import UnfusedBatchNormalizationModifier
 from .channel_last import ChannelLastModifier
 from .channel_first import ChannelFirstModifier
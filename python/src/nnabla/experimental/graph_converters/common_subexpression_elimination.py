@@ -0,0 +1,61 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from nnabla.core.graph_def import is_deterministic_function
+
+from .graph_converter import FunctionModifier
+
+
+class CommonSubexpressionEliminationModifier(FunctionModifier):
+    """
+    Functions computing the same output are merged into one.
+
+    Two functions are merged if they have the same type, arguments and
+    inputs, and they are deterministic (see
+    :func:`nnabla.core.graph_def.is_deterministic_function`). Functions with
+    multiple outputs are not merged.
+
+    Examples:
+
+    .. code-block:: python
+
+       pred = Model(...)
+
+       import nnabla.experimental.graph_converters as GC
+
+       modifiers = [GC.CommonSubexpressionEliminationModifier()]
+       gc = GC.GraphConverter(modifiers)
+       pred = gc.convert(pred)
+    """
+
+    def __init__(self):
+        super(CommonSubexpressionEliminationModifier, self).__init__()
+        self._outputs = {}  # key: output
+
+    def modify(self, f, inputs):
+        if len(f.outputs) != 1 \
+                or not is_deterministic_function(f.info.type_name, f.info.args):
+            return
+
+        # Inputs are compared by their data, since the inputs of the graph
+        # are copied for each function.
+        key = (f.info.type_name, repr(sorted(f.info.args.items())),
+               tuple(i.data for i in inputs))
+        if key not in self._outputs:
+            self._outputs[key] = self._call_function(
+                f.info.type_name, inputs, f.info.args)
+        return self._outputs[key]
+
+    def __finish__(self):
+        self._outputs = {}
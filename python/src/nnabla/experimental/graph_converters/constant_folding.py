@@ -0,0 +1,94 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import nnabla as nn
+
+from nnabla.core.graph_def import is_deterministic_function
+
+from .graph_converter import FunctionModifier
+
+
+class ConstantFoldingModifier(FunctionModifier):
+    """
+    Functions depending only on parameters are evaluated in advance.
+
+    A function whose inputs are all parameters (or outputs of evaluated
+    functions) is replaced by a new parameter holding its output, e.g.
+    `WeightStandardization`, `WeightNormalization` or `SpectralNorm` with
+    `test=True` applied to a weight. The new parameters are named
+    `<scope>/<function type>_folded` under the parameter scope of the first
+    input, and their gradients are not computed. Therefore, the converted
+    graph is for inference.
+
+    Args:
+        max_expansion (float): A function is not evaluated if the size of its
+            output is larger than the size of its inputs multiplied by this
+            value, so that parameters are not expanded by e.g. `Broadcast`.
+
+    Examples:
+
+    .. code-block:: python
+
+       pred = Model(...)
+
+       import nnabla.experimental.graph_converters as GC
+
+       modifiers = [GC.ConstantFoldingModifier()]
+       gc = GC.GraphConverter(modifiers)
+       pred = gc.convert(pred)
+    """
+
+    def __init__(self, max_expansion=1.0):
+        super(ConstantFoldingModifier, self).__init__()
+        self._max_expansion = max_expansion
+        self._constants = None  # data: parameter name
+
+    def _is_constant(self, v):
+        if self._constants is None:
+            self._constants = {p.data: k for k, p in
+                               nn.get_parameters(grad_only=False).items()}
+        return v.parent is None and v.data in self._constants
+
+    def _unique_name(self, v, type_name):
+        # Under the scope of the parameter `v`
+        params = nn.get_parameters(grad_only=False)
+        scope = '/'.join(self._constants[v.data].split('/')[:-1])
+        prefix = '{}/{}_folded'.format(scope, type_name) if scope \
+            else '{}_folded'.format(type_name)
+        name = prefix
+        cnt = 1
+        while name in params:
+            name = '{}_{}'.format(prefix, cnt)
+            cnt += 1
+        return name
+
+    def modify(self, f, inputs):
+        if not inputs or len(f.outputs) != 1 \
+                or not is_deterministic_function(f.info.type_name, f.info.args) \
+                or not all(self._is_constant(i) for i in inputs):
+            return
+        if f.outputs[0].size > sum(i.size for i in inputs) * self._max_expansion:
+            return
+
+        o = self._call_function(f.info.type_name, inputs, f.info.args)
+        o.forward()
+        c = nn.Variable(o.shape, need_grad=False)
+        c.data = o.data
+        name = self._unique_name(inputs[0], f.info.type_name)
+        nn.parameter.set_parameter(name, c)
+        self._constants[c.data] = name
+        return c
+
+    def __finish__(self):
+        self._constants = None
@@ -0,0 +1,171 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import nnabla.functions as F
+
+from .graph_converter import FunctionModifier
+
+
+# Operation codes of `FusedElementwise`.
+ADD2, SUB2, RSUB2, MUL2, DIV2, RDIV2 = range(6)
+ADD_SCALAR, MUL_SCALAR, RSUB_SCALAR, RDIV_SCALAR, POW_SCALAR = range(6, 11)
+MAXIMUM_SCALAR, MINIMUM_SCALAR = range(11, 13)
+RELU, LEAKY_RELU, SIGMOID, TANH, EXP, LOG, ABS = range(13, 20)
+
+
+class ElementwiseFusionModifier(FunctionModifier):
+    """
+    Chains of element-wise functions are fused into one `FusedElementwise`.
+
+    A chain such as `Add2 -> ReLU` or `MulScalar -> AddScalar -> Tanh`
+    is replaced by a `FusedElementwise` which computes the whole chain in a
+    single pass without intermediate arrays. Only functions whose inputs have
+    the same shape (without broadcast) are fused.
+
+    If `epilogue` is True, a chain (including a single activation) which
+    follows `Affine`, `Convolution` or `Deconvolution` is executed in-place on
+    the output of the layer, so that no array is allocated for the chain.
+
+    The converted graph is for inference only. `FusedElementwise` does not
+    support backward, and it is not in the registry of backward functions
+    used by :func:`nnabla.grad`.
+
+    Args:
+        epilogue (bool): Fuse chains following layers in-place.
+
+    Examples:
+
+    .. code-block:: python
+
+       pred = Model(...)
+
+       import nnabla.experimental.graph_converters as GC
+
+       modifiers = [GC.ElementwiseFusionModifier()]
+       gc = GC.GraphConverter(modifiers)
+       pred = gc.convert(pred)
+    """
+
+    def __init__(self, epilogue=True):
+        super(ElementwiseFusionModifier, self).__init__()
+        self._epilogue = epilogue
+        self._binary_set = {
+            'Add2': (ADD2, ADD2),
+            'Sub2': (SUB2, RSUB2),
+            'Mul2': (MUL2, MUL2),
+            'Div2': (DIV2, RDIV2),
+        }
+        self._scalar_set = {
+            'AddScalar': (ADD_SCALAR, 'val'),
+            'MulScalar': (MUL_SCALAR, 'val'),
+            'RSubScalar': (RSUB_SCALAR, 'val'),
+            'RDivScalar': (RDIV_SCALAR, 'val'),
+            'PowScalar': (POW_SCALAR, 'val'),
+            'MaximumScalar': (MAXIMUM_SCALAR, 'val'),
+            'MinimumScalar': (MINIMUM_SCALAR, 'val'),
+            'LeakyReLU': (LEAKY_RELU, 'alpha'),
+        }
+        self._unary_set = {
+            'ReLU': RELU,
+            'Sigmoid': SIGMOID,
+            'Tanh': TANH,
+            'Exp': EXP,
+            'Log': LOG,
+            'Abs': ABS,
+        }
+        self._layer_set = ['Affine', 'Convolution', 'Deconvolution']
+        self._chains = {}  # output of the last function: chain
+
+    def _is_fusible(self, f):
+        name = f.info.type_name
+        if name in self._binary_set:
+            return f.inputs[0].shape == f.inputs[1].shape
+        return name in self._scalar_set or name in self._unary_set
+
+    def _chain_input(self, f):
+        # Index of the input of `f` through which a chain continues. It is the
+        # first input computed by a fusible function and used only once.
+        for i, v in enumerate(f.inputs):
+            if v.parent is None or v.persistent \
+                    or len(v.function_references) != 1 \
+                    or len([x for x in f.inputs if x == v]) != 1:
+                continue
+            if self._is_fusible(v.parent):
+                return i
+        return None
+
+    def _continues(self, f):
+        # Whether the chain continues to the function using the output of `f`.
+        o = f.outputs[0]
+        funcs = o.function_references
+        if len(funcs) != 1 or not self._is_fusible(funcs[0]):
+            return False
+        i = self._chain_input(funcs[0])
+        return i is not None and funcs[0].inputs[i] == o
+
+    def _add_operand(self, chain, v):
+        for i, x in enumerate(chain['inputs']):
+            if x == v:
+                return i
+        chain['inputs'].append(v)
+        return len(chain['inputs']) - 1
+
+    def modify(self, f, inputs):
+        if not self._is_fusible(f):
+            return
+
+        # Continue the chain which ends at an input of `f`, or start a new one.
+        chain = None
+        j = self._chain_input(f)
+        if j is not None and f.inputs[j] in self._chains:
+            chain = self._chains.pop(f.inputs[j])
+        else:
+            j = 0
+        if chain is None:
+            head = f.inputs[0]
+            chain = dict(inputs=[inputs[0]], ops=[], operands=[], values=[],
+                         inplace=self._epilogue and head.parent is not None
+                         and head.parent.info.type_name in self._layer_set
+                         and len(head.function_references) == 1)
+
+        name = f.info.type_name
+        if name in self._binary_set:
+            op = self._binary_set[name][j]
+            operand = self._add_operand(chain, inputs[1 - j])
+            value = 0.0
+        elif name in self._scalar_set:
+            op, key = self._scalar_set[name]
+            operand = -1
+            value = float(f.info.args[key])
+        else:
+            op = self._unary_set[name]
+            operand = -1
+            value = 0.0
+        chain['ops'].append(op)
+        chain['operands'].append(operand)
+        chain['values'].append(value)
+
+        if self._continues(f):
+            self._chains[f.outputs[0]] = chain
+            return chain['inputs'][0]
+
+        inplace = chain['inplace'] and 0 not in chain['operands']
+        if len(chain['ops']) == 1 and not inplace:
+            return
+        return F.fused_elementwise(*chain['inputs'], ops=chain['ops'],
+                                   operands=chain['operands'],
+                                   values=chain['values'], inplace=inplace)
+
+    def __finish__(self):
+        self._chains = {}
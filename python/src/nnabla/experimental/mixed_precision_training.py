@@ -28,6 +28,9 @@ class DynamicLossScalingUpdater(object):
         weight_decay (:obj:`float`): Decay constant. Default is `None`, not applying the weight decay.
         comm (:obj:`nnabla.communicators.Communicator`): Communicator when to do distributed training. Default is :obj:`None`.
         grads (:obj:`list` of :obj:`nnabla.NdArray`): The list of gradients to be exchanged when to do distributed training. Default is the empty :obj:`list`.
+        bucket_size (:obj:`int`): If specified, gradients are all-reduced in buckets of this number of values during the last backward, overlapping with the computation. Default is :obj:`None`, all-reducing after backward.
+        fp16_compression (:obj:`bool`): Transfer gradients in half precision in the bucketed all-reduce. Default is :obj:`False`.
+        overlap (:obj:`bool`): All-reduce buckets on a background thread while the backward continues. Default is :obj:`False`.
 
     Attributes:
         solver (:obj:`nnabla.solvers.Solver`): Solver object. E.g., Momentum or Adam.
@@ -41,6 +44,9 @@ class DynamicLossScalingUpdater(object):
         weight_decay (:obj:`float`): Decay constant. Default is `None`, not applying the weight decay.
         comm (:obj:`nnabla.communicators.Communicator`): Communicator when to do distributed training.
         grads (:obj:`list` of :obj:`nnabla.NdArray`): The list of gradients to be exchanged when to do distributed training.
+        bucket_size (:obj:`int`): Number of values of a bucket of the all-reduce during backward.
+        fp16_compression (:obj:`bool`): Transfer gradients in half precision in the bucketed all-reduce.
+        overlap (:obj:`bool`): All-reduce buckets on a background thread in the bucketed all-reduce.
 
     Example:
 
@@ -67,7 +73,8 @@ class DynamicLossScalingUpdater(object):
                  scale=8.0, scaling_factor=2.0, N=2000, clear_buffer=True,
                  accum_grad=1, weight_decay=None,
                  comm=None,
-                 grads=[]):
+                 grads=[], bucket_size=None, fp16_compression=False,
+                 overlap=False):
         self.solver = solver
         self.loss = loss
         self.data_feeder = data_feeder
@@ -79,6 +86,9 @@ class DynamicLossScalingUpdater(object):
         self.weight_decay = weight_decay
         self.comm = comm
         self.grads = grads
+        self.bucket_size = bucket_size
+        self.fp16_compression = fp16_compression
+        self.overlap = overlap
         self._counter = 0
         self._recursive_count = 0
         self._max_recursive_count = 100
@@ -92,7 +102,8 @@ class DynamicLossScalingUpdater(object):
         2. feed data
         3. loss.forward
         4. loss.backward
-        5. comm.all_reduce (if it is specified)
+        5. comm.all_reduce (if it is specified, during the last loss.backward
+           if `bucket_size` is specified)
         6. solver.update
 
         """
@@ -100,19 +111,29 @@ class DynamicLossScalingUpdater(object):
         # Initialize gradients.
         self.solver.zero_grad()
 
+        all_reduce = self.comm and len(self.grads) != 0
+        bucketed = all_reduce and self.bucket_size is not None
+
         # Forward and backward
-        for _ in range(self.accum_grad):
+        for i in range(self.accum_grad):
             # feed data
             self.data_feeder()
 
             # forward
             self.loss.forward(clear_no_need_grad=self.clear_buffer)
 
-            # backward with scale
-            self.loss.backward(self.scale, clear_buffer=self.clear_buffer)
+            # backward with scale, all-reducing gradients in the last one
+            callback = None
+            if bucketed and i == self.accum_grad - 1:
+                callback = self.comm.bucketed_all_reduce_callback(
+                    self.grads, self.bucket_size, division=False,
+                    fp16_compression=self.fp16_compression,
+                    overlap=self.overlap)
+            self.loss.backward(self.scale, clear_buffer=self.clear_buffer,
+                               communicator_callbacks=callback)
 
         # AllReduce
-        if self.comm and len(self.grads) != 0:
+        if all_reduce and not bucketed:
             self.comm.all_reduce(self.grads, division=False, inplace=False)
 
         # Check Inf/NaN in grads
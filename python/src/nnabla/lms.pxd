@@ -14,11 +14,17 @@
 
 from libcpp cimport bool as cpp_bool
 from libcpp.memory cimport shared_ptr
+from libcpp.string cimport string
 from nnabla._context cimport CContext
 from nnabla.function cimport CgFunctionPtr
 
 
 cdef extern from "nbla/lms/swap_in_out_scheduler.hpp" namespace "nbla":
+    cdef cppclass CSwapInOutSchedulerStats "nbla::SwapInOutScheduler::Stats":
+        size_t swap_in_bytes
+        size_t swap_out_bytes
+        double stall_time
+
     cdef cppclass CSwapInOutScheduler "nbla::SwapInOutScheduler":
         CSwapInOutScheduler(const CContext &h_ctx, const CContext &d_ctx, 
                             const size_t s, const size_t l,
@@ -30,6 +36,12 @@ cdef extern from "nbla/lms/swap_in_out_scheduler.hpp" namespace "nbla":
         void post_function_callback(const CgFunctionPtr &ptr) except +
         void pre_update_callback() except +
         void post_update_callback() except +
+        CSwapInOutSchedulerStats stats() except +
+        void reset_stats() except +
+
+
+cdef extern from "nbla/memory/cpu_memory.hpp" namespace "nbla":
+    void set_disk_directory "nbla::CpuDiskMemory::set_directory"(const string & directory) except +
 
 
 cdef class SwapInOutScheduler:
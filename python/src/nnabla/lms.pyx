@@ -90,6 +90,32 @@ cdef class SwapInOutScheduler:
         # In default, the chunk size is set as 20MB (20 << 20).
         from nnabla_ext.cuda.init import set_cuda_virtual_memory_chunk_size
         set_cuda_virtual_memory_chunk_size(2 << 20)  # Set 2MB, for example.
+
+    Both contexts can be CPU to execute networks larger than RAM. With the
+    host context of `CpuDiskArray`, arrays are swapped out to memory-mapped
+    files on disk, and swapped in from them on a background thread ahead of
+    their use in the recorded order. `size` is the budget of RAM then. The
+    directory of the files is set by :func:`set_disk_array_directory`, or
+    the environment variable `NNABLA_DISK_ARRAY_DIR` (`TMPDIR` or `/tmp` by
+    default). The files are deleted when the arrays are freed.
+
+    Example:
+
+    .. code-block:: python
+
+        from nnabla.lms import SwapInOutScheduler, set_disk_array_directory
+
+        set_disk_array_directory('/path/to/fast/ssd')
+        host_ctx = nn.Context(['cpu:float'], 'CpuDiskArray', '0')
+        device_ctx = get_extension_context('cpu', type_config='float')
+        scheduler = SwapInOutScheduler(host_ctx, device_ctx, size=8 << 30)
+        nn.set_default_context(device_ctx)
+
+        for i in range(iteration):
+            with scheduler:
+                ...
+        # Bytes swapped in/out and seconds computation waited for them.
+        print(scheduler.stats())
     """
 
     def __cinit__(self, h_ctx, d_ctx, size, prefetch_size=None,
@@ -175,6 +201,29 @@ cdef class SwapInOutScheduler:
         """
         self.scheduler.get().post_update_callback()
 
+    def stats(self):
+        """
+        Statistics of swapping since the construction or :meth:`reset_stats`.
+
+        Returns:
+            dict: With the following keys.
+
+            * ``swap_in_bytes``: Bytes swapped in to the device.
+            * ``swap_out_bytes``: Bytes swapped out to the host.
+            * ``stall_time``: Seconds the computation waited for issuing
+              swap in/out and for their completion.
+        """
+        cdef CSwapInOutSchedulerStats s = self.scheduler.get().stats()
+        return dict(swap_in_bytes=s.swap_in_bytes,
+                    swap_out_bytes=s.swap_out_bytes,
+                    stall_time=s.stall_time)
+
+    def reset_stats(self):
+        """
+        Reset the statistics of swapping.
+        """
+        self.scheduler.get().reset_stats()
+
     def __enter__(self):
         self.start_scheduling()
 
@@ -193,3 +242,16 @@ cdef class SwapInOutScheduler:
 
         self.end_scheduling()
 
+
+
+def set_disk_array_directory(directory):
+    """
+    Set the directory of files created by `CpuDiskArray`.
+
+    It overrides the environment variable `NNABLA_DISK_ARRAY_DIR`, and
+    affects arrays allocated afterwards.
+
+    Args:
+        directory (str): Path to an existing directory.
+    """
+    lms.set_disk_directory(directory)
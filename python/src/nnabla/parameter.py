@@ -336,11 +336,18 @@ def set_parameter_from_proto(proto):
         var.d = param
 
 
-def load_parameters(path, proto=None, needs_proto=False, extension=".nntxt"):
+def load_parameters(path, proto=None, needs_proto=False, extension=".nntxt", lazy=False, names=None):
     """Load parameters from a file with the specified format.
 
     Args:
       path : path or file object
+      lazy (bool): If True, parameters stored uncompressed in ``.params`` or
+        ``.h5`` files (also in ``.nnp``) are memory-mapped copy-on-write
+        instead of being copied. Pages are read when they are touched and
+        are shared among processes loading the same file until written.
+      names (list of str): Names of parameters to be loaded from a sharded
+        checkpoint (``.ckpt``). Only shards containing them are read. If
+        None, all parameters are loaded.
     """
     if isinstance(path, str):
         _, ext = os.path.splitext(path)
@@ -353,20 +360,38 @@ def load_parameters(path, proto=None, needs_proto=False, extension=".nntxt"):
     else:
         ctx.proto = proto
     ctx.needs_proto = needs_proto
+    ctx.lazy = lazy
+    ctx.names = names
     # Get parameter file loaders
     file_loaders = get_parameter_file_loader()
     load_files(ctx, file_loaders, path, ext)
     return ctx.proto
 
 
-def save_parameters(path, params=None, extension=None):
+def save_parameters(path, params=None, extension=None, rank=0, num_ranks=1,
+                    barrier=None):
     """Save all parameters into a file with the specified format.
 
-    Currently hdf5 and protobuf formats are supported.
+    Currently hdf5 (``.h5``), protobuf (``.protobuf``) and raw binary
+    (``.params``) formats are supported. ``.params`` stores each parameter
+    as contiguous little-endian bytes with its dtype and shape, and is the
+    fastest to save and load.
+
+    Sharded checkpoint (``.ckpt``) writes a manifest and shards in
+    ``.params`` format next to it. When it is saved to the same path again,
+    only parameters whose contents changed are written. Each rank of a
+    data-parallel job can write its part of parameters in parallel by
+    specifying ``rank`` and ``num_ranks``. Rank 0 writes the manifest, and
+    removes parts written with another number of ranks if ``barrier`` is
+    given or it is the only writer.
 
     Args:
       path : path or file object
       params (dict, optional): Parameters to be saved. Dictionary is of a parameter name (:obj:`str`) to :obj:`~nnabla.Variable`.
+      rank (int, optional): Rank of the caller, used for ``.ckpt``.
+      num_ranks (int, optional): Number of ranks writing ``.ckpt`` together.
+      barrier (callable, optional): Function to synchronize the ranks writing
+        ``.ckpt``, e.g. ``comm.barrier`` of a communicator.
     """
     if isinstance(path, str):
         _, ext = os.path.splitext(path)
@@ -375,6 +400,9 @@ def save_parameters(path, params=None, extension=None):
     ctx = FileHandlerContext()
     ctx.parameters = get_parameters(
         grad_only=False) if params is None else params
+    ctx.rank = rank
+    ctx.num_ranks = num_ranks
+    ctx.barrier = barrier
     file_savers = get_parameter_file_savers()
     supported = save_files(ctx, file_savers, path, ext)
     assert supported, 'Only supported {}.'.format(
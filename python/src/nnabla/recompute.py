@@ -0,0 +1,147 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import contextmanager
+
+# State of recomputation of variables created by functions.
+__recompute_state = False
+# Segment of recomputation. Each context creates a new one.
+__recompute_segment = 0
+__num_recompute_segments = 0
+
+
+@contextmanager
+def recompute(recompute=True):
+    """
+    Context for recomputation of intermediate variables in backward.
+
+    Outputs of functions created in this context have the
+    :attr:`~nnabla.Variable.recompute` flag. Their data are cleared during
+    forward with `clear_no_need_grad=True`, and recomputed from the inputs
+    of the context when backward requires them. Each context is a segment
+    of recomputation: outputs used outside the context, e.g. the output of
+    a block used by the next block, are kept as checkpoints. Wrapping each
+    block of a deep network therefore keeps the checkpoints of all blocks
+    plus the intermediate values of one block during backward, at the cost
+    of one more forward of each block.
+
+    Outputs of stochastic functions (e.g. `dropout`) and functions updating
+    their states (e.g. `batch_normalization` with `batch_stat=True`) are not
+    flagged, since the recomputation would compute different values.
+
+    Args:
+        recompute (bool): Whether to set the recompute flag.
+
+    Example:
+
+    .. code-block:: python
+
+        h = x
+        for i in range(num_blocks):
+            with nn.parameter_scope('block{}'.format(i)), nn.recompute():
+                h = F.relu(PF.affine(h, 256))
+                h = F.relu(PF.affine(h, 256))
+        loss = F.mean(F.squared_error(PF.affine(h, 1), t))
+        loss.forward(clear_no_need_grad=True)
+        loss.backward(clear_buffer=True)
+
+    """
+    global __recompute_state
+    global __recompute_segment
+    global __num_recompute_segments
+    prev = __recompute_state
+    prev_segment = __recompute_segment
+    __recompute_state = recompute
+    if recompute:
+        __num_recompute_segments += 1
+        __recompute_segment = __num_recompute_segments
+    try:
+        yield
+    finally:
+        __recompute_state = prev
+        __recompute_segment = prev_segment
+
+
+def get_recompute():
+    """Get the state of recomputation.
+
+    When it is true, outputs of functions created have the recompute flag.
+
+    Returns: bool
+    """
+    return __recompute_state
+
+
+def get_recompute_segment():
+    """Get the segment of recomputation.
+
+    Variables created in the same :func:`recompute` context share a segment,
+    and those used by another segment are kept as checkpoints.
+
+    Returns: int
+    """
+    return __recompute_segment
+
+
+def set_recompute(recompute):
+    """Set the default state of recomputation.
+
+    Args:
+        recompute (bool): Whether outputs of functions created have the
+            recompute flag.
+    """
+    global __recompute_state
+    __recompute_state = recompute
+
+
+def recompute_summary(variable):
+    """Summarize the memory and computation traded by recomputation in the
+    graph of a variable.
+
+    Memory is counted by the number of values of variables, which is an upper
+    bound since some variables are not cleared during forward, e.g.
+    in-placed or persistent ones, or checkpoints at the boundaries of
+    :func:`recompute` contexts.
+
+    Args:
+        variable (:obj:`~nnabla.Variable`): Root variable of the graph.
+
+    Returns:
+        dict: With the following keys.
+
+        * ``num_variables``: Number of variables with the recompute flag.
+        * ``recomputed_values``: Number of values of them, freed after forward.
+        * ``total_values``: Number of values of all intermediate variables.
+        * ``recomputed_functions``: Number of functions executed again in
+          backward.
+        * ``total_functions``: Number of functions in the graph.
+
+    """
+    summary = dict(num_variables=0, recomputed_values=0, total_values=0,
+                   recomputed_functions=0, total_functions=0)
+
+    def visit(f):
+        summary['total_functions'] += 1
+        recomputed = False
+        for o in f.outputs:
+            summary['total_values'] += o.size
+            if o.recompute:
+                summary['num_variables'] += 1
+                summary['recomputed_values'] += o.size
+                recomputed = True
+        if recomputed:
+            summary['recomputed_functions'] += 1
+
+    variable.visit(visit)
+    return summary
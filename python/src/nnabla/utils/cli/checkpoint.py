@@ -0,0 +1,215 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Checkpoint writer of nnabla_cli train.
+
+Parameters and solver states are copied into host memory on the training
+thread, and the copies are written into a .nnp file on a background thread,
+so that training continues while the checkpoint is written. The file is
+written with a temporary name and renamed when it is complete.
+'''
+
+from collections import OrderedDict
+import glob
+import numpy
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+
+from nnabla.logger import logger
+from nnabla.solver import _save_states_h5
+from nnabla.utils.get_file_handle import FileHandlerContext, get_parameter_file_savers, save_files
+
+
+class _HostParameter(object):
+    '''Copy of a parameter in host memory, which can be saved by parameter
+    file savers in place of :obj:`~nnabla.Variable`.
+    '''
+
+    def __init__(self, variable):
+        self.d = numpy.array(variable.d, copy=True)
+        self.need_grad = variable.need_grad
+
+
+def _snapshot_solver_states(solver):
+    # Host copy of states, written in the format of Solver.save_states.
+    states = OrderedDict()
+    for pname, state in solver.get_states().items():
+        pstate = OrderedDict((sname, numpy.array(vx.d, copy=True))
+                             for sname, vx in state.pstate.items())
+        states[pname] = (state.t, pstate)
+    return states
+
+
+class _Checkpoint(object):
+    pass
+
+
+def _checkpoint_order(filename):
+    '''
+    Sort key of checkpoints by the epoch or iteration number, which is the
+    last number in the file name, and by modification time if it is missing.
+    '''
+    numbers = re.findall(r'\d+', os.path.basename(filename))
+    number = int(numbers[-1]) if numbers else -1
+    return number, os.path.getmtime(filename), filename
+
+
+class CheckpointWriter(object):
+    '''CheckpointWriter
+    Writes checkpoint .nnp files.
+
+    Only one checkpoint is written at a time. When a checkpoint is requested
+    while the previous one is being written, it waits for the previous one,
+    so that at most two copies of parameters are kept in host memory.
+
+    Args:
+        async_write (bool): If True, checkpoints are written on a background
+            thread. Otherwise, they are written on the calling thread.
+        keep_last (int): Number of checkpoints which are kept for each
+            ``keep_pattern``. If 0, old checkpoints are not removed.
+    '''
+
+    def __init__(self, async_write=True, keep_last=1):
+        self._async_write = async_write
+        self._keep_last = keep_last
+        self._thread = None
+        self._error = None
+        self._completed = []
+        self._lock = threading.Lock()
+
+    def save(self, filename, contents, parameters, param_ext='.h5',
+             optimizers=None, keep_pattern=None, on_saved=None):
+        '''
+        Request to write a checkpoint.
+
+        Args:
+            filename (str): Filename of .nnp file.
+            contents (dict): Dictionary of a member name to its data.
+            parameters (dict): Dictionary of a parameter name to
+                :obj:`~nnabla.Variable`.
+            param_ext (str): Format of parameters, one of ``.h5``,
+                ``.protobuf`` and ``.params``.
+            optimizers (dict): Dictionary of a member name to
+                :obj:`~nnabla.solver.Solver` whose states are saved as .h5.
+            keep_pattern (str): Glob pattern of checkpoints of which
+                ``keep_last`` newest ones are kept.
+            on_saved (callable): Called by :py:meth:`collect` or
+                :py:meth:`wait` on the calling thread after the checkpoint
+                is written.
+        '''
+        start = time.time()
+        self.wait()
+
+        checkpoint = _Checkpoint()
+        checkpoint.filename = filename
+        checkpoint.contents = contents
+        checkpoint.parameters = OrderedDict(
+            (k, _HostParameter(v)) for k, v in parameters.items())
+        checkpoint.param_name = 'parameter{}'.format(param_ext)
+        checkpoint.optimizers = OrderedDict(
+            (k, _snapshot_solver_states(s)) for k, s in (optimizers or {}).items())
+        checkpoint.keep_pattern = keep_pattern
+        checkpoint.on_saved = on_saved
+        checkpoint.stall_time = time.time() - start
+
+        if self._async_write:
+            self._thread = threading.Thread(
+                target=self._write_checkpoint, args=(checkpoint,))
+            self._thread.daemon = True
+            self._thread.start()
+        else:
+            self._write_checkpoint(checkpoint)
+            self.collect()
+
+    def _write_checkpoint(self, checkpoint):
+        start = time.time()
+        filename = checkpoint.filename
+        tmpdir = tempfile.mkdtemp(
+            dir=os.path.dirname(os.path.abspath(filename)))
+        try:
+            tmpname = os.path.join(tmpdir, os.path.basename(filename))
+            with zipfile.ZipFile(tmpname, 'w') as nnp:
+                for name, data in checkpoint.contents.items():
+                    nnp.writestr(name, data)
+
+                ctx = FileHandlerContext()
+                ctx.parameters = checkpoint.parameters
+                param_filename = os.path.join(tmpdir, checkpoint.param_name)
+                save_files(ctx, get_parameter_file_savers(), param_filename)
+                nnp.write(param_filename, checkpoint.param_name)
+                os.unlink(param_filename)
+
+                for name, states in checkpoint.optimizers.items():
+                    opti_filename = os.path.join(tmpdir, 'optimizer.h5')
+                    _save_states_h5(opti_filename, states)
+                    nnp.write(opti_filename, name)
+                    os.unlink(opti_filename)
+            # Replace atomically, so that an incomplete checkpoint is not seen.
+            os.replace(tmpname, filename)
+            self._remove_old_checkpoints(checkpoint)
+            logger.log(99, 'Checkpoint saved: {} (training stalled {:.2f}s, written in {:.2f}s)'.format(
+                filename, checkpoint.stall_time, time.time() - start))
+            with self._lock:
+                self._completed.append(checkpoint)
+        except Exception as e:
+            logger.critical('Failed to save checkpoint {}.'.format(filename))
+            with self._lock:
+                self._error = e
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def _remove_old_checkpoints(self, checkpoint):
+        if checkpoint.keep_pattern is None or self._keep_last <= 0:
+            return
+        exists = [f for f in glob.glob(checkpoint.keep_pattern)
+                  if os.path.abspath(f) != os.path.abspath(checkpoint.filename)]
+        exists.sort(key=_checkpoint_order)
+        for f in exists[:max(len(exists) - self._keep_last + 1, 0)]:
+            os.unlink(f)
+
+    def collect(self):
+        '''
+        Call ``on_saved`` of written checkpoints, and raise an error which
+        occurred while writing.
+        '''
+        with self._lock:
+            completed, self._completed = self._completed, []
+            error, self._error = self._error, None
+        for checkpoint in completed:
+            if checkpoint.on_saved is not None:
+                checkpoint.on_saved()
+        if error is not None:
+            raise error
+
+    def wait(self):
+        '''
+        Wait for the checkpoint being written.
+        '''
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.collect()
+
+    def close(self):
+        '''
+        Wait for the checkpoint being written when no more checkpoints are
+        requested.
+        '''
+        self.wait()
@@ -96,6 +96,9 @@ def main():
     from nnabla.utils.cli.draw_graph import add_draw_graph_command
     add_draw_graph_command(subparsers)
 
+    from nnabla.utils.cli.launch import add_launch_command
+    add_launch_command(subparsers)
+
     # Version
     subparser = subparsers.add_parser(
         'version', help='Print version and build number.')
@@ -132,7 +135,10 @@ def cli_main(parser, args):
 
     if args.mpi:
         from nnabla.utils.communicator_util import create_communicator
-        comm = create_communicator()
+        # Communicator follows the extension of --context if it is given.
+        context = getattr(args, 'context', None)
+        comm = create_communicator(
+            extension_module=context.split(':')[0] if context else None)
         try:
             return_value = args.func(args)
         except:
@@ -78,11 +78,13 @@ def compare_optimizer(config, parameters, config_cpu, parameters_cpu, result_arr
         for v, d in o.dataset_assign.items():
             let_data_to_variable(v.variable_instance, data[
                                  di.variables.index(d)],
-                                 data_name=d, variable_name=v.name)
+                                 data_name=d, variable_name=v.name,
+                                 scale=di.normalization_scales.get(d))
         for v, d in o_cpu.dataset_assign.items():
             let_data_to_variable(v.variable_instance, data[
                                  di.variables.index(d)],
-                                 data_name=d, variable_name=v.name)
+                                 data_name=d, variable_name=v.name,
+                                 scale=di.normalization_scales.get(d))
 
         # Generate data
         generated = {}
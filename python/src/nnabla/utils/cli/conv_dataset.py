@@ -47,8 +47,15 @@ def conv_dataset_command(args):
             "The numbers of threads [{}] must be positive integer.".format(args.num_of_threads))
         return False
 
+    if args.num_of_processes is not None and args.num_of_processes < 0:
+        print(
+            "The numbers of processes [{}] must be positive integer.".format(args.num_of_processes))
+        return False
+
     if os.path.exists(args.destination):
-        if not args.force:
+        if args.resume and os.path.isdir(args.destination):
+            print('Resume destination [{}].'.format(args.destination))
+        elif not args.force:
             print(
                 'File or directory [{}] is exists use `-F` option to overwrite it.'.format(args.destination))
             return False
@@ -68,11 +75,13 @@ def conv_dataset_command(args):
 
         if os.path.exists(args.source):
             cc = CreateCache(args.source, shuffle=args.shuffle,
-                             num_of_threads=args.num_of_threads)
+                             num_of_threads=args.num_of_threads,
+                             num_of_processes=args.num_of_processes or 0)
             print('Number of Data: {}'.format(cc._size))
             print('Shuffle:        {}'.format(cc._shuffle))
             print('Normalize:      {}'.format(args.normalize))
-            cc.create(args.destination, normalize=args.normalize)
+            cc.create(args.destination, normalize=args.normalize,
+                      resume=args.resume)
         else:
             with CsvDataSource(args.source, shuffle=args.shuffle, normalize=args.normalize) as source:
                 _convert(args, source)
@@ -97,6 +106,10 @@ def add_conv_dataset_command(subparsers):
                            help='normalize data range', required=False)
     subparser.add_argument('-t', "--num_of_threads", type=int, required=False,
                            help='use multithreading to convert cache, default to 10')
+    subparser.add_argument('-p', "--num_of_processes", type=int, required=False,
+                           help='use multiprocessing to convert cache instead of multithreading')
+    subparser.add_argument('-r', '--resume', action='store_true', required=False,
+                           help='resume creating cache listed in cache_index.csv of destination')
     subparser.add_argument('source')
     subparser.add_argument('destination')
     subparser.set_defaults(func=conv_dataset_command)
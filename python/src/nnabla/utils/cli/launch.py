@@ -0,0 +1,119 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+from nnabla.logger import logger
+
+
+def launch(command, num_processes, num_threads=None):
+    '''Run a command in processes communicating by the CPU communicator.
+
+    Each process is given the environment variables read by
+    `MultiProcessDataParallelCommunicator` with a CPU context. If a process
+    fails, the others are terminated.
+
+    Args:
+        command (list of str): Command and its arguments.
+        num_processes (int): Number of processes.
+        num_threads (int): Number of threads of each process. By default, CPU
+            cores are divided among the processes.
+
+    Returns:
+        int: The first non-zero exit code of the processes, or 0.
+    '''
+    if num_threads is None:
+        num_threads = os.environ.get(
+            'NNABLA_NUM_THREADS',
+            max(1, multiprocessing.cpu_count() // num_processes))
+    comm_id = '{}_{}'.format(os.getpid(), uuid.uuid4().hex[:8])
+    procs = []
+    for rank in range(num_processes):
+        env = dict(os.environ)
+        env['NNABLA_COMM_RANK'] = str(rank)
+        env['NNABLA_COMM_SIZE'] = str(num_processes)
+        env['NNABLA_COMM_ID'] = comm_id
+        env['NNABLA_NUM_THREADS'] = str(num_threads)
+        procs.append(subprocess.Popen(command, env=env))
+
+    returncode = 0
+    try:
+        running = list(procs)
+        while running:
+            for p in list(running):
+                ret = p.poll()
+                if ret is None:
+                    continue
+                running.remove(p)
+                if ret != 0 and returncode == 0:
+                    logger.error('Process {} exited with {}.'.format(
+                        procs.index(p), ret))
+                    returncode = ret
+                    for q in running:
+                        q.terminate()
+            time.sleep(0.1)
+    finally:
+        for p in procs:
+            if p.poll() is None:
+                p.kill()
+                p.wait()
+    return returncode
+
+
+def launch_command(args):
+    if not args.command:
+        logger.error('Command is not specified.')
+        return False
+    command = args.command
+    if command[0] == '--':
+        command = command[1:]
+    return launch(command, args.num_processes, args.num_threads) == 0
+
+
+def add_launch_command(subparsers):
+    desc = '''Run a command in processes on this host for distributed training
+with the CPU communicator.
+
+Example:
+
+    nnabla_cli launch -n 4 python train.py --context cpu'''
+
+    from argparse import RawTextHelpFormatter, REMAINDER
+    subparser = subparsers.add_parser(
+        'launch',
+        formatter_class=RawTextHelpFormatter,
+        description=desc,
+        help='Run processes for distributed training on CPU.')
+    subparser.add_argument('-n', '--num-processes', type=int, default=2,
+                           help='Number of processes.')
+    subparser.add_argument('-t', '--num-threads', type=int, default=None,
+                           help='Number of threads of each process. CPU cores are divided among the processes by default.')
+    subparser.add_argument('command', nargs=REMAINDER,
+                           help='Command and its arguments.')
+    subparser.set_defaults(func=launch_command)
+    return subparser
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers()
+    add_launch_command(subparsers)
+    args = parser.parse_args(['launch'] + sys.argv[1:])
+    sys.exit(0 if args.func(args) else 1)
@@ -99,13 +99,17 @@ def profile_optimizer(config, result_array, synchronize):
 
         # Let data
         data = load_dataset()
+        scales = {}
+        for di in opt.data_iterators:
+            scales.update(di.normalization_scales)
         for v, d in o.dataset_assign.items():
             def let_data():
                 if d not in data:
                     raise ValueError(
                         'Data "' + d + '" is not found in dataset.')
                 let_data_to_variable(v.variable_instance, data=data[d],
-                                     data_name=d, variable_name=v.name)
+                                     data_name=d, variable_name=v.name,
+                                     scale=scales.get(d))
             profile(config, 'let_data (%s to %s)' %
                     (d, v.name), let_data, result_dict, synchronize)
 
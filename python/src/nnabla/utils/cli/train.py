@@ -25,7 +25,6 @@ import zipfile
 import nnabla as nn
 from nnabla.logger import logger
 from nnabla import available_contexts
-from nnabla.parameter import save_parameters
 
 from nnabla.utils.progress import configure_progress, progress
 import nnabla.utils.callback as callback
@@ -33,11 +32,12 @@ import nnabla.utils.callback as callback
 from nnabla.utils.cli.utility import let_data_to_variable
 from nnabla.utils.cli.utility import measure_cpu_gpu_instant_load
 from nnabla.utils.cli.utility import get_cpu_gpu_average_load
-from nnabla.utils.cli.utility import save_optimizer_states
 from nnabla.utils.cli.utility import NodeTimeInfoCollector
 from nnabla.utils.cli.utility import load_train_state
+from nnabla.utils.cli.utility import optimizer_states_name
 from nnabla.utils.cli.utility import str_to_num
 from nnabla.utils.cli.utility import lms_scheduler
+from nnabla.utils.cli.checkpoint import CheckpointWriter
 
 from nnabla.utils.nnp_format import nnp_version
 from nnabla.utils.communicator_util import current_communicator, single_or_rankzero
@@ -51,10 +51,31 @@ try:
 except Exception:
     _OPTIMIZER_CHECKPOINT_INTERVAL = 5
 
+try:
+    _ALL_REDUCE_BUCKET_SIZE = int(
+        nnabla_config.get('MULTINODE', 'all_reduce_bucket_size'))
+    _ALL_REDUCE_PACK_SIZE = int(
+        nnabla_config.get('MULTINODE', 'all_reduce_pack_size'))
+    _ALL_REDUCE_OVERLAP = nnabla_config.get(
+        'MULTINODE', 'all_reduce_overlap') == 'True'
+    _ALL_REDUCE_FP16_COMPRESSION = nnabla_config.get(
+        'MULTINODE', 'all_reduce_fp16_compression') == 'True'
+except Exception:
+    _ALL_REDUCE_BUCKET_SIZE = 0
+    _ALL_REDUCE_PACK_SIZE = 2 << 20
+    _ALL_REDUCE_OVERLAP = False
+    _ALL_REDUCE_FP16_COMPRESSION = False
+
 
 _save_parameter_info = {}
 
 
+def _create_checkpoint_writer():
+    return CheckpointWriter(
+        async_write=nnabla_config.get('CHECKPOINT', 'async_write') == 'True',
+        keep_last=int(nnabla_config.get('CHECKPOINT', 'keep_last')))
+
+
 nodeTimeCollector = NodeTimeInfoCollector()
 
 
@@ -75,7 +96,6 @@ def _save_parameters(args, suffix, epoch, train_config, force=False):
     epochdiff = epoch - _save_parameter_info[suffix]['epoch']
 
     globname = os.path.join(args.outdir, 'results_{}_*.nnp'.format(suffix))
-    exists = glob.glob(globname)
 
     base = os.path.join(args.outdir, 'results_{}_{}'.format(suffix, epoch))
     base_candidate = callback.result_base(base, suffix, args.outdir)
@@ -89,42 +109,29 @@ def _save_parameters(args, suffix, epoch, train_config, force=False):
 
     if force or (not os.path.exists(filename) and (timediff > 180.0 or epochdiff > 10)):
 
-        # Remove existing nnp before saving new file.
-        for exist in exists:
-            os.unlink(exist)
-
-        version_filename = base + '_version.txt'
-
-        with open(version_filename, 'w') as file:
-            file.write('{}\n'.format(nnp_version()))
-
-        param_filename = f'{base}_param{nnabla_config.get("MISC", "nnp_param_format")}'
-        save_parameters(param_filename)
-
         need_save_opti = train_config.optimizers and epoch % _OPTIMIZER_CHECKPOINT_INTERVAL == 0
+        optimizers = OrderedDict()
         if need_save_opti:
-            opti_filenames = save_optimizer_states(
-                base, '.h5', train_config)
-
-        with zipfile.ZipFile(filename, 'w') as nnp:
-            nnp.write(version_filename, 'nnp_version.txt')
-            nnp.write(_save_parameter_info['config'], os.path.basename(
-                _save_parameter_info['config']))
-            nnp.write(param_filename, f'parameter{nnabla_config.get("MISC", "nnp_param_format")}')
-            if need_save_opti:
-                for f in opti_filenames:
-                    nnp.write(f, f[len(base) + 1:])
-
-        os.unlink(version_filename)
-        os.unlink(param_filename)
-        if need_save_opti:
-            for f in opti_filenames:
-                os.unlink(f)
+            for o in train_config.optimizers.values():
+                name = optimizer_states_name(o.optimizer) + '.optimizer'
+                optimizers[name] = o.optimizer.solver
+
+        with open(_save_parameter_info['config'], 'rb') as f:
+            config_data = f.read()
+        contents = OrderedDict([
+            ('nnp_version.txt', '{}\n'.format(nnp_version())),
+            (os.path.basename(_save_parameter_info['config']), config_data)])
+
+        train_config.checkpoint_writer.save(
+            filename, contents, nn.get_parameters(grad_only=False),
+            param_ext=nnabla_config.get('MISC', 'nnp_param_format'),
+            optimizers=optimizers, keep_pattern=globname,
+            on_saved=callback.save_train_snapshot)
 
         _save_parameter_info[suffix]['epoch'] = epoch
         _save_parameter_info[suffix]['time'] = current_time
-
-        callback.save_train_snapshot()
+    else:
+        train_config.checkpoint_writer.collect()
 
 
 def _update(iter, config, cost, scheduler):
@@ -168,10 +175,12 @@ def _update(iter, config, cost, scheduler):
         if (o.start_iter == 0 or iter + 1 >= o.start_iter) and (o.end_iter == 0 or iter + 1 <= o.end_iter):
             # Load dataset
             data = OrderedDict()
+            scales = {}
             for di in opt.data_iterators:
                 if di not in loaded_data:
                     loaded_data[di] = di.next()
                 data.update(zip(di.variables, loaded_data[di]))
+                scales.update(di.normalization_scales)
             for v, d in o.dataset_assign.items():
                 # TODO: here we consume a bit more memory for loading all edge nodes to cuda
                 # dest_context = config.global_config.default_context if not o.forward_sequence or v not in o.forward_sequence[
@@ -184,7 +193,8 @@ def _update(iter, config, cost, scheduler):
                 elif d in data:
                     let_data_to_variable(v.variable_instance, data[
                                          d], ctx=dest_context,
-                                         data_name=d, variable_name=v.name)
+                                         data_name=d, variable_name=v.name,
+                                         scale=scales.get(d))
                 else:
                     raise ValueError('Variable "{}" is not found in dataset "{}", optimizer "{}"'.format(
                         d, ', '.join(o.data_iterators.keys()), o.name))
@@ -229,8 +239,16 @@ def _update(iter, config, cost, scheduler):
                     # Backward
                     if o.comm and iter % o.update_interval == o.update_interval - 1:
                         params = [x.grad for x in o.parameters.values()]
+                        if _ALL_REDUCE_BUCKET_SIZE > 0:
+                            comm_callback = comm.bucketed_all_reduce_callback(
+                                params, _ALL_REDUCE_BUCKET_SIZE, division=True,
+                                fp16_compression=_ALL_REDUCE_FP16_COMPRESSION,
+                                overlap=_ALL_REDUCE_OVERLAP)
+                        else:
+                            comm_callback = comm.all_reduce_callback(
+                                params, _ALL_REDUCE_PACK_SIZE, division=True)
                         o.target.backward(grad=1.0 / l_size,
-                                          clear_buffer=True, communicator_callbacks=comm.all_reduce_callback(params, 2 << 20, division=True))
+                                          clear_buffer=True, communicator_callbacks=comm_callback)
                     else:
                         o.target.backward(grad=1.0 / l_size, clear_buffer=True)
 
@@ -286,8 +304,10 @@ def _evaluate(args, config, monitoring_report, best_error, epoch, scheduler):
         for i in range(data_size // batch_size):
             # Load dataset
             data = OrderedDict()
+            scales = {}
             for di in mon.data_iterators:
                 data.update(zip(di.variables, di.next()))
+                scales.update(di.normalization_scales)
 
             # Set data to variable
             for v, d in m.dataset_assign.items():
@@ -295,7 +315,8 @@ def _evaluate(args, config, monitoring_report, best_error, epoch, scheduler):
                 dest_context = config.global_config.default_context
                 let_data_to_variable(v.variable_instance, data[
                                      d], ctx=dest_context,
-                                     data_name=d, variable_name=v.name)
+                                     data_name=d, variable_name=v.name,
+                                     scale=scales.get(d))
 
             # Generate data
             for v, generator in m.generator_assign.items():
@@ -431,6 +452,15 @@ def _format_cgload_log(cg_load):
 
 
 def _train(args, config):
+    config.checkpoint_writer = _create_checkpoint_writer()
+    try:
+        return _train_epochs(args, config)
+    finally:
+        # Wait for the last checkpoint being written.
+        config.checkpoint_writer.close()
+
+
+def _train_epochs(args, config):
     global _save_parameter_info
     comm = current_communicator()
     _CGLOAD_LOG_INTERVAL = 20
@@ -676,7 +706,6 @@ def train_command(args):
     result = False
     restart = False
     if max_iteration > 0:
-        rng = np.random.RandomState(comm.rank if comm else 0)
         with ExitStack() as stack:
             # Create data_iterator instance only once for each dataset in optimizers
             optimizer_data_iterators = {}
@@ -685,8 +714,8 @@ def train_command(args):
                     if di not in optimizer_data_iterators:
                         di_instance = stack.enter_context(di())
                         if comm and comm.size > 1:
-                            di_instance = di_instance.slice(
-                                rng, comm.size, comm.rank)
+                            di_instance = di_instance.shard(
+                                comm.size, comm.rank)
                         optimizer_data_iterators[di] = di_instance
                     else:
                         di_instance = optimizer_data_iterators[di]
@@ -699,8 +728,8 @@ def train_command(args):
                     if di not in monitor_data_iterators:
                         di_instance = stack.enter_context(di())
                         if comm and comm.size > 1:
-                            di_instance = di_instance.slice(
-                                rng, comm.size, comm.rank)
+                            di_instance = di_instance.shard(
+                                comm.size, comm.rank)
                         monitor_data_iterators[di] = di_instance
                     else:
                         di_instance = monitor_data_iterators[di]
@@ -712,7 +741,11 @@ def train_command(args):
         # save parameters without training (0 epoch learning)
         logger.log(99, '0 epoch learning. (Just save parameter.)')
         if single_or_rankzero():
-            _save_parameters(args, None, 0, config, True)
+            config.checkpoint_writer = _create_checkpoint_writer()
+            try:
+                _save_parameters(args, None, 0, config, True)
+            finally:
+                config.checkpoint_writer.close()
         result = True
 
     if single_or_rankzero() and not restart:
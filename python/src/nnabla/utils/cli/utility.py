@@ -116,9 +116,12 @@ def compute_full_path(root_path, file_path):
     return full_path
 
 
-def let_data_to_variable(variable, data, ctx=None, data_name=None, variable_name=None):
+def let_data_to_variable(variable, data, ctx=None, data_name=None, variable_name=None, scale=None):
     try:
-        if data.dtype <= np.float64:
+        if scale is not None:
+            # Write only, normalized values of previous data are not needed.
+            variable.data.get_data('w', dtype=data.dtype)[...] = data
+        elif data.dtype <= np.float64:
             variable.data.cast(data.dtype)[...] = data
         else:
             variable.d = data
@@ -143,6 +146,11 @@ def let_data_to_variable(variable, data, ctx=None, data_name=None, variable_name
             else:
                 raise
 
+    # Deferred normalization is applied to the data on the destination, so
+    # that data are copied in the stored dtype.
+    if scale is not None:
+        variable.data *= scale
+
 
 def collect_and_shape_result(c_load, g_load):
     # c_load : float e.g. 58.5
@@ -249,6 +257,15 @@ def _create_optimizer_lite(opti):
     return proto_o
 
 
+def optimizer_states_name(optimizer):
+    '''
+    Name of .h5 file of solver states of an optimizer in .nnp file, to which
+    ``.optimizer`` is appended.
+    '''
+    return '{}_{}_optimizer.h5'.format(
+        optimizer.name, re.sub(r'(|Cuda)$', '', str(optimizer.solver.name)))
+
+
 def save_optimizer_states(filebase, ext, train_config):
     filelist = []
     if ext == '.protobuf':
@@ -263,11 +280,8 @@ def save_optimizer_states(filebase, ext, train_config):
             filelist.append(filename)
     else:
         for o in train_config.optimizers.values():
-            f_name = '{}_{}_optimizer.h5'.format(
-                o.optimizer.name,
-                re.sub(r'(|Cuda)$', '', str(o.optimizer.solver.name))
-            )
-            filename = '{}_{}'.format(filebase, f_name)
+            filename = '{}_{}'.format(
+                filebase, optimizer_states_name(o.optimizer))
             o.optimizer.solver.save_states(filename)
             name_ext = '{}.optimizer'.format(filename)
             os.rename(filename, name_ext)
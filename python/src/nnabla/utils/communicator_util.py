@@ -23,18 +23,25 @@ def current_communicator():
     return _current_communicator
 
 
-def create_communicator(ignore_error=False):
+def create_communicator(ignore_error=False, extension_module=None):
     global _current_communicator
 
-    from nnabla.ext_utils import get_extension_context
-    extension_module = "cudnn"
+    from nnabla.ext_utils import get_extension_context, import_extension_module
+    if extension_module is None:
+        # CPU communicator is used if cudnn is not installed.
+        try:
+            import_extension_module("cudnn")
+            extension_module = "cudnn"
+        except ImportError:
+            extension_module = "cpu"
     context = get_extension_context(extension_module)
     try:
         logger.log(99, 'Create communicator with contexts {}'.format(context))
         _current_communicator = C.MultiProcessCommunicator(context)
         _current_communicator.init()
-        context.device_id = str(_current_communicator.rank %
-                                _current_communicator.size)
+        if extension_module != "cpu":
+            context.device_id = str(_current_communicator.rank %
+                                    _current_communicator.size)
         if _current_communicator.size == 1:
             _current_communicator = None
     except:
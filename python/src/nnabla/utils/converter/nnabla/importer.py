@@ -86,6 +86,16 @@ class NnpImporter:
                     else:
                         parameter.need_grad = False
 
+        elif e == '.params':
+            from nnabla.utils.get_file_handle import read_raw_parameters
+            with open(filename, 'rb') as f:
+                for entry, data in read_raw_parameters(f):
+                    parameter = self._nnp.parameter.add()
+                    parameter.variable_name = entry.name
+                    parameter.shape.dim.extend(entry.shape)
+                    parameter.data.extend(data.flatten())
+                    parameter.need_grad = entry.need_grad
+
         elif e == '.protobuf':
             with open(filename, 'rb') as f:
                 self._nnp.MergeFromString(f.read())
@@ -137,7 +147,7 @@ class NnpImporter:
                                 with open(os.path.join(tmpdir, name), 'rt') as f:
                                     text_format.Merge(f.read(), self._nnp)
                         for name in nnpzip.namelist():  # Param
-                            if os.path.splitext(name)[1].lower() in ['.protobuf', '.h5']:
+                            if os.path.splitext(name)[1].lower() in ['.protobuf', '.h5', '.params']:
                                 nnpzip.extract(name, tmpdir)
                                 self.load_parameters(
                                     os.path.join(tmpdir, name))
@@ -146,7 +156,7 @@ class NnpImporter:
             elif ext in ['.nntxt', '.prototxt']:
                 with open(ifile, 'rt') as f:
                     text_format.Merge(f.read(), self._nnp)
-            elif ext in ['.protobuf', '.h5']:
+            elif ext in ['.protobuf', '.h5', '.params']:
                 self.load_parameters(ifile)
             else:
                 other_files.append(ifile)
@@ -1,12 +1,15 @@
 import os
 import csv
 import h5py
+import multiprocessing
 import numpy
 import shutil
 import collections
+import time
 from contextlib import closing
 from multiprocessing.pool import ThreadPool
 
+from nnabla.utils.data_source import MmapCacheWriter
 from nnabla.utils.data_source_implements import CsvDataSource
 from nnabla.utils.data_source_loader import FileReader
 
@@ -14,29 +17,51 @@ from nnabla.config import nnabla_config
 from nnabla.logger import logger
 from nnabla.utils.progress import progress
 
+# CreateCache instance of a worker process, which is set by the initializer
+# of the process pool.
+_worker_create_cache = None
+
+
+def _init_worker(create_cache):
+    global _worker_create_cache
+    _worker_create_cache = create_cache
+
+
+def _save_cache_worker(args):
+    return _worker_create_cache._save_cache(args)
+
+
+def _convert_chunk_worker(args):
+    return _worker_create_cache._convert_chunk(args)
+
 
 class CreateCache(CsvDataSource):
     '''Create dataset cache from local file.
 
     If you want to create cache data from remote resource, use data_iterator_csv_dataset instead.
 
+    Args:
+        input_csv_filename (str): Location of dataset CSV file.
+        rng (None or :obj:`numpy.random.RandomState`): Numpy random number
+            generator.
+        shuffle (bool): Indicates whether the dataset is shuffled or not.
+        num_of_threads (int): Number of threads to create cache files.
+        num_of_processes (int): If larger than 0, rows are converted by this
+            number of worker processes instead of threads.
     '''
 
-    def _save_cache(self, args):
-        position = args[0]
-        cache_csv = args[1]
-        # conv dataset
-        cache_data = [tuple(self._process_row(row)) for row in cache_csv]
-
-        start_position = position + 1 - len(cache_data)
-        end_position = position
-        cache_filename = os.path.join(
+    def _cache_file_name(self, start_position, end_position):
+        return os.path.join(
             self._cache_dir, '{}_{:08d}_{:08d}{}'.format(self._cache_file_name_prefix,
                                                          start_position,
                                                          end_position,
                                                          self._cache_file_format))
 
-        logger.info('Creating cache file {}'.format(cache_filename))
+    def _convert_chunk(self, args):
+        position = args[0]
+        cache_csv = args[1]
+        # conv dataset
+        cache_data = [tuple(self._process_row(row)) for row in cache_csv]
 
         data = collections.OrderedDict(
             [(n, []) for n in self._variables])
@@ -47,9 +72,19 @@ class CreateCache(CsvDataSource):
                 else:
                     d = numpy.array(cd[i]).astype(numpy.float32)
                 data[n].append(d)
+        return position, data
+
+    def _write_chunk(self, position, data):
+        num_of_data = len(data[self._variables[0]])
+        start_position = position + 1 - num_of_data
+        end_position = position
+        cache_filename = self._cache_file_name(start_position, end_position)
 
+        logger.info('Creating cache file {}'.format(cache_filename))
         try:
-            if self._cache_file_format == ".h5":
+            if self._cache_file_format == ".mmap":
+                self._mmap_writer.write(start_position, list(data.values()))
+            elif self._cache_file_format == ".h5":
                 h5 = h5py.File(cache_filename, 'w')
                 for k, v in data.items():
                     h5.create_dataset(k, data=v)
@@ -80,9 +115,44 @@ class CreateCache(CsvDataSource):
                             k, size, d.shape))
             raise
 
-        return cache_filename, len(cache_data)
+        return cache_filename, num_of_data
 
-    def __init__(self, input_csv_filename, rng=None, shuffle=False, num_of_threads=None):
+    def _save_cache(self, args):
+        return self._write_chunk(*self._convert_chunk(args))
+
+    def _create_chunks(self, chunks):
+        # Yields (file_path, data_nums) of each chunk as it is created.
+        if self._num_of_processes > 0:
+            try:
+                ctx = multiprocessing.get_context('fork')
+            except ValueError:
+                ctx = multiprocessing.get_context()
+            with closing(ctx.Pool(processes=self._num_of_processes,
+                                  initializer=_init_worker,
+                                  initargs=(self,))) as pool:
+                if self._cache_file_format == ".mmap":
+                    # Converted data are written into memory map by this process.
+                    for position, data in pool.imap_unordered(_convert_chunk_worker, chunks):
+                        yield self._write_chunk(position, data)
+                else:
+                    for row in pool.imap_unordered(_save_cache_worker, chunks):
+                        yield row
+        else:
+            with closing(ThreadPool(processes=self._num_of_threads)) as pool:
+                for row in pool.imap_unordered(self._save_cache, chunks):
+                    yield row
+
+    def _read_cache_index(self, index_filename):
+        # Returns chunks which are already created.
+        created = {}
+        if os.path.exists(index_filename):
+            with open(index_filename, 'r') as f:
+                for row in csv.reader(f):
+                    if os.path.exists(os.path.join(self._cache_dir, row[0])):
+                        created[row[0]] = int(row[1])
+        return created
+
+    def __init__(self, input_csv_filename, rng=None, shuffle=False, num_of_threads=None, num_of_processes=0):
         self._cache_size = int(nnabla_config.get(
             'DATA_ITERATOR', 'data_source_file_cache_size'))
         logger.info('Cache size is {}'.format(self._cache_size))
@@ -126,8 +196,27 @@ class CreateCache(CsvDataSource):
             self._num_of_threads = int(nnabla_config.get(
                 'DATA_ITERATOR', 'data_source_file_cache_num_of_threads'))
         logger.info('Num of thread is {}'.format(self._num_of_threads))
-
-    def create(self, output_cache_dirname, normalize=True, cache_file_name_prefix='cache'):
+        self._num_of_processes = num_of_processes
+        if self._num_of_processes > 0:
+            logger.info('Num of process is {}'.format(self._num_of_processes))
+
+    def create(self, output_cache_dirname, normalize=True, cache_file_name_prefix='cache', resume=False):
+        '''
+        Create cache files.
+
+        Each cache file is written as soon as its rows are converted, and
+        cache_index.csv is updated at the same time.
+
+        Args:
+            output_cache_dirname (str): Location of cache files.
+            normalize (bool): If True, each sample in the data gets normalized
+                by a factor of 255.
+            cache_file_name_prefix (str): Beginning of the filenames of cache
+                files.
+            resume (bool): If True, cache files listed in existing
+                cache_index.csv are not created again. The same order of data
+                (e.g. same ``rng`` with ``shuffle``) must be used.
+        '''
 
         self._normalize = normalize
         self._cache_file_name_prefix = cache_file_name_prefix
@@ -149,20 +238,68 @@ class CreateCache(CsvDataSource):
         if len(csv_row):
             csv_position_and_data.append((self._size-1, csv_row))
 
+        index_filename = os.path.join(output_cache_dirname, "cache_index.csv")
+        if self._cache_file_format == ".mmap":
+            if resume:
+                logger.warning(
+                    'Resume is not supported with .mmap format, create all cache.')
+            self._mmap_writer = MmapCacheWriter(output_cache_dirname,
+                                                self._variables,
+                                                self._size,
+                                                cache_file_name_prefix)
+            created = {}
+        elif resume:
+            created = self._read_cache_index(index_filename)
+            logger.info('Resume from {} created cache files.'.format(
+                len(created)))
+        else:
+            created = {}
+
+        # Skip chunks which are already created.
+        chunks = []
+        chunk_positions = {}
+        cache_index_rows = []
+        for position, rows in csv_position_and_data:
+            filename = os.path.basename(self._cache_file_name(
+                position + 1 - len(rows), position))
+            if filename in created and created[filename] == len(rows):
+                cache_index_rows.append((position, filename, len(rows)))
+            else:
+                chunks.append((position, rows))
+                chunk_positions[filename] = position
+
         progress('Create cache', 0)
-        with closing(ThreadPool(processes=self._num_of_threads)) as pool:
-            cache_index_rows = pool.map(
-                self._save_cache, csv_position_and_data)
+        start_time = time.time()
+        num_of_data = 0
+        with open(index_filename, 'a' if resume else 'w') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            # row: (file_path, data_nums)
+            for row in self._create_chunks(chunks):
+                filename = os.path.basename(row[0])
+                cache_index_rows.append(
+                    (chunk_positions[filename], filename, row[1]))
+                num_of_data += row[1]
+                if self._cache_file_format != ".mmap":
+                    writer.writerow((filename, row[1]))
+                    f.flush()
+                progress('Create cache', len(
+                    cache_index_rows) * 1.0 / len(csv_position_and_data))
+        elapsed = time.time() - start_time
         progress('Create cache', 1.0)
+        logger.log(99, 'Created {} data in {} cache files, {:.2f} sec ({:.2f} data/sec).'.format(
+            num_of_data, len(chunks), elapsed, num_of_data / elapsed if elapsed > 0 else 0.0))
 
         # Create Index
-        index_filename = os.path.join(output_cache_dirname, "cache_index.csv")
-        with open(index_filename, 'w') as f:
-            writer = csv.writer(f, lineterminator='\n')
-            for row in cache_index_rows:
-                if row:
-                    # row: (file_path, data_nums)
-                    writer.writerow((os.path.basename(row[0]), row[1]))
+        if self._cache_file_format == ".mmap":
+            # Memory-mapped cache has its own index and info.
+            os.remove(index_filename)
+            self._mmap_writer.close()
+        else:
+            # Rewrite index in order of data.
+            with open(index_filename, 'w') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                for _, filename, length in sorted(cache_index_rows):
+                    writer.writerow((filename, length))
 
         # Create Info
         if self._cache_file_format == ".npy":
@@ -20,6 +20,7 @@ Detailed design document is :doc:`/doc/designs/data_iterator`.
 '''
 
 import atexit
+import collections
 import numpy
 import six
 import threading
@@ -27,15 +28,34 @@ import threading
 from .data_source import DataSourceWithFileCache
 from .data_source import DataSourceWithMemoryCache
 from .data_source import SlicedDataSource
+from .data_source import ShardedDataSource
 
 from .data_source_implements import SimpleDataSource
 from .data_source_implements import CsvDataSource
 from .data_source_implements import CacheDataSource
 from .data_source_implements import ConcatDataSource
 
+from . import data_iterator_worker
+
+from nnabla.config import nnabla_config
 from nnabla.logger import logger
 
 
+def _cache_file_length(data_source):
+    '''
+    Number of data in a cache file read by data_source, or 1 if data are not
+    read from cache files or can be read randomly (memory-mapped cache).
+    '''
+    ds = data_source
+    while ds is not None:
+        if isinstance(ds, CacheDataSource):
+            return ds._max_length if ds._cache_type != '.mmap' else 1
+        if isinstance(ds, DataSourceWithFileCache):
+            return ds._cache_size if ds._cache_file_format != '.mmap' else 1
+        ds = getattr(ds, '_data_source', None)
+    return 1
+
+
 class DataIterator(object):
     '''DataIterator
     Collect data from `data_source` and yields bunch of data.
@@ -58,7 +78,27 @@ class DataIterator(object):
         stop_exhausted (bool): If ``stop_exhausted`` is set to False, iterator will be reset
             so that iteration can be continued. If ``stop_exhausted`` is set to True, iterator
             will raise StopIteration to stop the loop.
-
+        num_workers (int): If ``num_workers`` is larger than 0, data are loaded
+            by this number of worker processes, and ``use_thread`` is ignored.
+            It is effective only if ``data_source`` supports loading data by
+            keys (e.g. :py:class:`SimpleDataSource <nnabla.utils.data_source_implements.SimpleDataSource>`
+            and :py:class:`CsvDataSource <nnabla.utils.data_source_implements.CsvDataSource>`),
+            and Python 3.8 or later.
+            Minibatches are returned as views of shared memory,
+            which are valid until the next call of :py:meth:`next`.
+            Shapes of data must be the same for all samples, since they are
+            taken from the first minibatch. An error is raised if a sample
+            has a different shape.
+        prefetch_depth (int): Number of minibatches loaded in advance by worker
+            processes. Default is twice ``num_workers``.
+
+    Mini-batches are assembled with :py:meth:`DataSource.next_batch` into
+    batch buffers. If ``data_iterator_num_of_batch_buffers`` in
+    ``nnabla.conf`` is N (> 0), N preallocated buffers are reused in turn,
+    so that the arrays returned by :py:meth:`next` are overwritten after
+    N - 1 more calls. Otherwise new arrays are allocated for every batch.
+    Once data of a shape different from the buffers are found, buffers are
+    dropped and every batch is newly allocated.
 
     '''
 
@@ -69,7 +109,9 @@ class DataIterator(object):
                  use_thread=True,
                  epoch_begin_callbacks=[],
                  epoch_end_callbacks=[],
-                 stop_exhausted=False):
+                 stop_exhausted=False,
+                 num_workers=0,
+                 prefetch_depth=None):
         logger.info('Using DataIterator')
         if rng is None:
             rng = numpy.random.RandomState(313)
@@ -92,11 +134,39 @@ class DataIterator(object):
 
         self._size = data_source.size
 
-        self._reset()
+        self._num_of_batch_buffers = int(nnabla_config.get(
+            'DATA_ITERATOR', 'data_iterator_num_of_batch_buffers'))
+        if use_thread and self._num_of_batch_buffers == 1:
+            # One buffer is being filled while the other one is in use.
+            self._num_of_batch_buffers = 2
+        self._use_batch_buffers = True
+        self._batch_buffer_template = None
+        self._batch_buffers = []
+        self._batch_buffer_index = 0
+
+        self._num_of_workers = num_workers
+        if num_workers > 0:
+            if not data_iterator_worker.is_available():
+                logger.warning(
+                    'num_workers is ignored since shared memory is not available.')
+                self._num_of_workers = 0
+            elif data_source._sample_keys(numpy.arange(1)) is None:
+                logger.warning('num_workers is ignored since {} does not support loading data in worker processes.'.format(
+                    type(data_source).__name__))
+                self._num_of_workers = 0
+        if prefetch_depth is None:
+            prefetch_depth = 2 * self._num_of_workers
+        # One slot is used by consumer while the others are loaded.
+        self._prefetch_depth = max(prefetch_depth, 2)
+        self._worker_pool = None
+        self._worker_batches = collections.deque()
+        self._delivered_slot = None
+
         self._current_epoch = -1
+        self._reset()
         self._current_data = None
 
-        self._use_thread = use_thread
+        self._use_thread = use_thread and self._num_of_workers == 0
         if self._use_thread:
             self._next_thread = threading.Thread(target=self._next)
             self._next_thread.start()
@@ -122,6 +192,8 @@ class DataIterator(object):
                 atexit.unregister(self.close)
             if self._use_thread:
                 self._next_thread.join()
+            if self._worker_pool is not None:
+                self._worker_pool.close()
             self._data_source.close()
             self._closed = True
 
@@ -171,6 +243,18 @@ class DataIterator(object):
         '''
         return self._variables
 
+    @property
+    def normalization_scales(self):
+        '''normalization_scales
+
+        Scales of variables whose normalization is deferred.
+        See :py:meth:`DataSource.normalization_scales <nnabla.utils.data_source.DataSource.normalization_scales>`.
+
+        Returns:
+           dict: Scale for each variable name.
+        '''
+        return self._data_source.normalization_scales
+
     @property
     def batch_size(self):
         '''batch_size
@@ -188,28 +272,125 @@ class DataIterator(object):
         self._callback_epoch_begin()
         self._data_source.reset()
 
-    def _next(self):
-        data = [[] for x in self._variables]
+    def _next_batch_buffer(self):
+        if self._batch_buffer_template is None:
+            return None
+        if self._num_of_batch_buffers == 0:
+            return [numpy.empty_like(t) for t in self._batch_buffer_template]
+        self._batch_buffer_index = (
+            self._batch_buffer_index + 1) % self._num_of_batch_buffers
+        if self._batch_buffer_index == len(self._batch_buffers):
+            self._batch_buffers.append(
+                [numpy.empty_like(t) for t in self._batch_buffer_template])
+        return self._batch_buffers[self._batch_buffer_index]
+
+    def _disable_batch_buffers(self):
+        self._use_batch_buffers = False
+        self._batch_buffer_template = None
+        self._batch_buffers = []
 
+    def _next(self):
         if self._data_source.position + self._batch_size > self._size:
             if self._stop_exhausted:
                 self._current_data = None
                 return
 
-        for b in range(self._batch_size):
-            d = self._data_source.next()
+        buffer = self._next_batch_buffer()
+        chunks = []
+        filled = 0
+        while filled < self._batch_size:
+            n = min(self._batch_size - filled,
+                    self._size - self._data_source.position)
+            out = None
+            if buffer is not None:
+                out = [b[filled:filled + n] for b in buffer]
+            d = self._data_source.next_batch(n, out)
             if d is None:
                 self._current_data = None
                 return
+            if out is not None and d is not out:
+                # Shapes of data differ from the buffer. Assemble batches
+                # per sample from now on.
+                self._disable_batch_buffers()
+                chunks = [[x[:filled] for x in buffer]] if filled else []
+                buffer = None
+            chunks.append(d)
+            filled += n
 
             if self._data_source.position >= self._size and not self._stop_exhausted:
                 self._reset()
 
-            for i, v in enumerate(self._variables):
-                data[i].append(d[i])
+        if buffer is None:
+            if len(chunks) == 1:
+                buffer = [numpy.asarray(x) for x in chunks[0]]
+            else:
+                buffer = [numpy.concatenate(x) for x in zip(*chunks)]
+            if self._use_batch_buffers:
+                self._batch_buffer_template = buffer
+                if self._num_of_batch_buffers > 0:
+                    self._batch_buffers.append(buffer)
+
+        self._current_data = (self._epoch, tuple(buffer))
+
+    def _plan_batch(self):
+        if self._data_source.position + self._batch_size > self._size:
+            if self._stop_exhausted:
+                return None
+
+        keys = []
+        num_of_resets = 0
+        while len(keys) < self._batch_size:
+            position = self._data_source.position
+            n = min(self._batch_size - len(keys), self._size - position)
+            keys += self._data_source._sample_keys(
+                numpy.arange(position, position + n))
+            self._data_source._position = position + n
 
-        self._current_data = (self._epoch, tuple(
-            [numpy.array(x) for x in data]))
+            if self._data_source.position >= self._size and not self._stop_exhausted:
+                # Epoch callbacks are called when this batch is delivered.
+                self._epoch += 1
+                self._data_source.reset()
+                num_of_resets += 1
+        return self._epoch, keys, num_of_resets
+
+    def _submit_batch(self, slot):
+        if self._worker_batches and self._worker_batches[-1] is None:
+            return
+        plan = self._plan_batch()
+        if plan is None:
+            self._worker_batches.append(None)
+            return
+        epoch, keys, num_of_resets = plan
+        self._worker_pool.submit(slot, keys)
+        self._worker_batches.append((slot, epoch, num_of_resets))
+
+    def _next_from_workers(self):
+        if self._worker_pool is None:
+            # The first batch is loaded in current process to know shapes
+            # and dtypes of data.
+            self._next()
+            if self._current_data is None:
+                raise StopIteration
+            self._current_epoch, data = self._current_data
+            self._worker_pool = data_iterator_worker.DataWorkerPool(
+                self._data_source, data, self._num_of_workers, self._prefetch_depth)
+            for slot in range(self._worker_pool.num_slots):
+                self._submit_batch(slot)
+            return data
+
+        if self._delivered_slot is not None:
+            self._submit_batch(self._delivered_slot)
+            self._delivered_slot = None
+        if self._worker_batches[0] is None:
+            raise StopIteration
+        slot, epoch, num_of_resets = self._worker_batches.popleft()
+        data = self._worker_pool.get(slot)
+        for _ in range(num_of_resets):
+            self._callback_epoch_end()
+            self._callback_epoch_begin()
+        self._current_epoch = epoch
+        self._delivered_slot = slot
+        return tuple(data)
 
     def next(self):
         '''next
@@ -223,6 +404,9 @@ class DataIterator(object):
         Returns:
             tuple: tuple of data for mini-batch in numpy.ndarray.
         '''
+        if self._num_of_workers > 0:
+            return self._next_from_workers()
+
         if self._use_thread:
             # Wait for finish previous thread.
             self._next_thread.join()
@@ -349,6 +533,55 @@ class DataIterator(object):
                     slice_end=slice_end),
                 self._batch_size)
 
+    def shard(self, num_of_shards, shard_pos, seed=0, drop_last=False, block_size=None):
+        '''
+        Shards the data iterator for distributed training.
+
+        Unlike :py:meth:`slice`, data of the new data iterator are reshuffled
+        across all shards in every epoch, and each shard is computed from
+        ``seed`` and epoch without materializing the order of entire data.
+        Data are shuffled in blocks of consecutive data, so that each shard
+        reads cache files as a whole instead of jumping between them.
+
+        If the data iterator has a memory cache, the new data iterator also
+        has it. Data of the first epoch are cached then, and they are shuffled
+        within the shard in later epochs as :py:meth:`slice`.
+
+        Args:
+            num_of_shards(int): Total number of shards, e.g. number of processes.
+            shard_pos(int): Position of the shard, e.g. rank of the process.
+            seed(int): Seed of shuffle. It must be the same in all shards.
+            drop_last(bool): If True, the last data which cannot be divided equally into shards are dropped.
+                Otherwise, shards are padded with the first data in the epoch.
+            block_size(int): Number of consecutive data shuffled as a block.
+                If None, it is the number of data in a cache file if the data
+                are read from cache files, otherwise 1.
+
+        Example:
+
+        .. code-block:: python
+
+            di = data_iterator_simple(load_func, 1000, batch_size=3, shuffle=True)
+            di_shard = di.shard(comm.size, comm.rank)
+
+        '''
+        ds = self._data_source
+        # Memory cache is filled in sequential order, so it wraps the shard.
+        memory_cache = None
+        while isinstance(ds, DataSourceWithMemoryCache):
+            memory_cache = ds
+            ds = ds._data_source
+        if block_size is None:
+            block_size = _cache_file_length(ds)
+        ds = ShardedDataSource(ds, num_of_shards, shard_pos,
+                               shuffle=ds.shuffle, seed=seed,
+                               drop_last=drop_last, block_size=block_size)
+        if memory_cache is not None:
+            ds = DataSourceWithMemoryCache(
+                ds, shuffle=memory_cache.shuffle,
+                rng=numpy.random.RandomState([seed, shard_pos]))
+        return DataIterator(ds, self._batch_size)
+
     def _callback_epoch_end(self):
         for callback in self._epoch_end_callbacks:
             callback(self.epoch)
@@ -383,7 +616,9 @@ def data_iterator(data_source,
                   cache_dir=None,
                   epoch_begin_callbacks=[],
                   epoch_end_callbacks=[],
-                  stop_exhausted=False):
+                  stop_exhausted=False,
+                  num_workers=0,
+                  prefetch_depth=None):
     '''data_iterator
     Helper method to use :py:class:`DataSource <nnabla.utils.data_source.DataSource>`.
 
@@ -434,11 +669,25 @@ def data_iterator(data_source,
         stop_exhausted (bool): If ``stop_exhausted`` is set to False, iterator will be reset
             so that iteration can be continued. If ``stop_exhausted`` is set to True, iterator
             will raise StopIteration to stop the loop.
+        num_workers (int):
+            If ``num_workers`` is larger than 0, data are loaded by this number
+            of worker processes, and ``use_thread`` is ignored.
+            See :py:class:`DataIterator <nnabla.utils.data_iterator.DataIterator>`.
+            In this case, ``with_memory_cache`` is ignored.
+            Shapes of data must be the same for all samples.
+            Default is 0.
+        prefetch_depth (int):
+            Number of minibatches loaded in advance by worker processes.
+            Default is twice ``num_workers``.
 
     Returns:
         :py:class:`DataIterator <nnabla.utils.data_iterator.DataIterator>`:
             Instance of DataIterator.
     '''
+    if num_workers > 0 and with_memory_cache:
+        logger.info(
+            'with_memory_cache is ignored since num_workers is specified.')
+        with_memory_cache = False
     if with_file_cache:
         ds = DataSourceWithFileCache(data_source=data_source,
                                      cache_dir=cache_dir,
@@ -453,7 +702,9 @@ def data_iterator(data_source,
                             use_thread=use_thread,
                             epoch_begin_callbacks=epoch_begin_callbacks,
                             epoch_end_callbacks=epoch_end_callbacks,
-                            stop_exhausted=stop_exhausted)
+                            stop_exhausted=stop_exhausted,
+                            num_workers=num_workers,
+                            prefetch_depth=prefetch_depth)
     else:
         if with_memory_cache:
             data_source = DataSourceWithMemoryCache(data_source,
@@ -463,7 +714,9 @@ def data_iterator(data_source,
                             use_thread=use_thread,
                             epoch_begin_callbacks=epoch_begin_callbacks,
                             epoch_end_callbacks=epoch_end_callbacks,
-                            stop_exhausted=stop_exhausted)
+                            stop_exhausted=stop_exhausted,
+                            num_workers=num_workers,
+                            prefetch_depth=prefetch_depth)
 
 
 def data_iterator_simple(load_func,
@@ -477,7 +730,9 @@ def data_iterator_simple(load_func,
                          cache_dir=None,
                          epoch_begin_callbacks=[],
                          epoch_end_callbacks=[],
-                         stop_exhausted=False):
+                         stop_exhausted=False,
+                         num_workers=0,
+                         prefetch_depth=None):
     """A generator that ``yield`` s minibatch data as a tuple, as defined in ``load_func`` .
     It can unlimitedly yield minibatches at your request, queried from the provided data.
 
@@ -524,6 +779,16 @@ def data_iterator_simple(load_func,
         stop_exhausted (bool): If ``stop_exhausted`` is set to False, iterator will be reset
             so that iteration can be continued. If ``stop_exhausted`` is set to True, iterator
             will raise StopIteration to stop the loop.
+        num_workers (int):
+            If ``num_workers`` is larger than 0, data are loaded by this number
+            of worker processes, and ``use_thread`` is ignored.
+            See :py:class:`DataIterator <nnabla.utils.data_iterator.DataIterator>`.
+            ``load_func`` is called in the worker processes.
+            Shapes of data must be the same for all samples.
+            Default is 0.
+        prefetch_depth (int):
+            Number of minibatches loaded in advance by worker processes.
+            Default is twice ``num_workers``.
 
 
     Returns:
@@ -562,7 +827,9 @@ def data_iterator_simple(load_func,
                          cache_dir=cache_dir,
                          epoch_begin_callbacks=epoch_begin_callbacks,
                          epoch_end_callbacks=epoch_end_callbacks,
-                         stop_exhausted=stop_exhausted)
+                         stop_exhausted=stop_exhausted,
+                         num_workers=num_workers,
+                         prefetch_depth=prefetch_depth)
 
 
 def data_iterator_csv_dataset(uri,
@@ -659,7 +926,8 @@ def data_iterator_cache(uri,
                         with_memory_cache=True,
                         epoch_begin_callbacks=[],
                         epoch_end_callbacks=[],
-                        stop_exhausted=False):
+                        stop_exhausted=False,
+                        deferred_normalization=False):
     '''data_iterator_cache
     Get data from the cache directory.
 
@@ -699,6 +967,12 @@ def data_iterator_cache(uri,
         stop_exhausted (bool): If ``stop_exhausted`` is set to False, iterator will be reset
             so that iteration can be continued. If ``stop_exhausted`` is set to True, iterator
             will raise StopIteration to stop the loop.
+        deferred_normalization (bool): If True with ``normalize``, uint8 and
+            uint16 data are provided in their stored dtype, and should be
+            multiplied by :py:meth:`DataIterator.normalization_scales` after
+            they are copied to the destination. It reduces the size of data
+            transferred to the device.
+            Default is False.
 
 
     Returns:
@@ -708,7 +982,8 @@ def data_iterator_cache(uri,
     ds = CacheDataSource(uri,
                          shuffle=shuffle,
                          rng=rng,
-                         normalize=normalize)
+                         normalize=normalize,
+                         deferred_normalization=deferred_normalization)
 
     return data_iterator(ds,
                          use_thread=use_thread,
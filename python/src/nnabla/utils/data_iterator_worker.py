@@ -0,0 +1,172 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Worker processes which load minibatches for :py:class:`DataIterator <nnabla.utils.data_iterator.DataIterator>`.
+
+Samples of a minibatch are specified by the keys obtained from
+:py:meth:`DataSource._sample_keys` in the main process, so that the order of
+data does not depend on the workers. Each worker loads samples with
+:py:meth:`DataSource._load_sample` and writes them into a slot of shared
+memory, which is handed to the consumer without copy.
+'''
+
+from six.moves import queue
+import multiprocessing
+import numpy
+import traceback
+
+from nnabla.logger import logger
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Shared memory is available from python 3.8
+    shared_memory = None
+
+_ALIGNMENT = 64
+
+
+def _slot_layout(template):
+    offsets = []
+    size = 0
+    for t in template:
+        offsets.append(size)
+        size += (t.nbytes + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+    return offsets, max(size, 1)
+
+
+def _slot_arrays(buf, template, offsets):
+    return [numpy.ndarray(t.shape, dtype=t.dtype, buffer=buf, offset=o)
+            for t, o in zip(template, offsets)]
+
+
+def _worker_loop(data_source, slots, template, task_queue, result_queue):
+    offsets, _ = _slot_layout(template)
+    arrays = [_slot_arrays(s.buf, template, offsets) for s in slots]
+    out = None
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        slot, keys = task
+        try:
+            out = arrays[slot]
+            for j, key in enumerate(keys):
+                for v, o, d in zip(data_source.variables, out,
+                                   data_source._load_sample(key)):
+                    if numpy.shape(d) != o.shape[1:]:
+                        raise ValueError(
+                            'Shape {} of {} of sample {} differs from {} of '
+                            'the first minibatch. Data of variable shapes '
+                            'cannot be loaded by worker processes.'.format(
+                                numpy.shape(d), v, key, o.shape[1:]))
+                    o[j] = d
+            result_queue.put((slot, None))
+        except Exception:
+            result_queue.put((slot, traceback.format_exc()))
+    del out, arrays
+    for s in slots:
+        s.close()
+
+
+def is_available():
+    return shared_memory is not None
+
+
+class DataWorkerPool(object):
+    '''DataWorkerPool
+    Loads minibatches in worker processes into shared memory slots.
+
+    Args:
+        data_source (:py:class:`DataSource <nnabla.utils.data_source.DataSource>`):
+             Data source which implements ``_sample_keys`` and ``_load_sample``.
+        template (list of :obj:`numpy.ndarray`): A minibatch whose shapes and
+             dtypes are used for slots. All samples must have the same shapes
+             as the samples of it.
+        num_workers (int): Number of worker processes.
+        num_slots (int): Number of shared memory slots, i.e., number of
+             minibatches which can be loaded in advance.
+    '''
+
+    def __init__(self, data_source, template, num_workers, num_slots):
+        self._template = [numpy.asarray(t) for t in template]
+        self._offsets, size = _slot_layout(self._template)
+        self._slots = [shared_memory.SharedMemory(create=True, size=size)
+                       for _ in range(num_slots)]
+        self._arrays = [_slot_arrays(s.buf, self._template, self._offsets)
+                        for s in self._slots]
+        self._done = {}
+
+        try:
+            ctx = multiprocessing.get_context('fork')
+        except ValueError:
+            ctx = multiprocessing.get_context()
+        self._task_queue = ctx.Queue()
+        self._result_queue = ctx.Queue()
+        self._workers = [ctx.Process(target=_worker_loop,
+                                     args=(data_source, self._slots, self._template,
+                                           self._task_queue, self._result_queue))
+                         for _ in range(num_workers)]
+        for w in self._workers:
+            w.daemon = True
+            w.start()
+        logger.info('DataWorkerPool started {} workers with {} slots of {} bytes.'.format(
+            num_workers, num_slots, size))
+        self._closed = False
+
+    @property
+    def num_slots(self):
+        return len(self._slots)
+
+    def submit(self, slot, keys):
+        '''
+        Request to load samples of ``keys`` into ``slot``.
+        '''
+        self._done.pop(slot, None)
+        self._task_queue.put((slot, keys))
+
+    def get(self, slot):
+        '''
+        Wait for ``slot`` to be loaded and returns views of it.
+        '''
+        while slot not in self._done:
+            try:
+                done_slot, error = self._result_queue.get(timeout=1.0)
+            except queue.Empty:
+                if not all(w.is_alive() for w in self._workers):
+                    raise RuntimeError('DataWorkerPool worker died.')
+                continue
+            self._done[done_slot] = error
+        error = self._done[slot]
+        if error is not None:
+            raise RuntimeError(
+                'Error occurred in DataWorkerPool worker.\n' + error)
+        return self._arrays[slot]
+
+    def close(self):
+        if not self._closed:
+            for _ in self._workers:
+                self._task_queue.put(None)
+            for w in self._workers:
+                w.join()
+            self._arrays = None
+            for s in self._slots:
+                try:
+                    s.close()
+                except BufferError:
+                    # Views of the slot are still used by the consumer.
+                    pass
+                s.unlink()
+            self._closed = True
@@ -24,6 +24,7 @@ from multiprocessing.pool import ThreadPool
 from shutil import rmtree
 import abc
 import atexit
+import copy
 
 # TODO temporary work around to suppress FutureWarning message.
 import warnings
@@ -31,11 +32,13 @@ warnings.simplefilter('ignore', category=FutureWarning)
 import h5py
 
 import csv
+import multiprocessing
 import numpy
 import os
 import six
 import tempfile
 import threading
+import time
 
 from nnabla.config import nnabla_config
 from nnabla.logger import logger
@@ -44,6 +47,492 @@ from nnabla.utils.communicator_util import single_or_rankzero
 from .data_source_loader import FileReader
 
 
+def _runs(keys):
+    '''
+    Yields (start, end) of each run of the same consecutive values in keys.
+    '''
+    start = 0
+    for end in range(1, len(keys) + 1):
+        if end == len(keys) or keys[end] != keys[start]:
+            yield start, end
+            start = end
+
+
+def _concatenate_chunks(chunks):
+    return [c[0] if len(c) == 1 else numpy.concatenate(c) for c in chunks]
+
+
+_FEISTEL_ROUNDS = 4
+
+
+def _feistel_mix(x, key):
+    x = (x ^ key) * numpy.uint64(0x9E3779B97F4A7C15)
+    x ^= x >> numpy.uint64(29)
+    x *= numpy.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> numpy.uint64(32)
+    return x
+
+
+def _permute_indexes(indexes, size, seed, inverse=False):
+    '''
+    Maps indexes in [0, size) to a pseudo-random permutation of [0, size)
+    determined by seed, without materializing the permutation. If inverse
+    is True, the inverse permutation is applied.
+
+    It is a Feistel network over the smallest even number of bits covering
+    size, and values out of range are mapped again (cycle walking).
+    '''
+    half_bits = max(1, (int(size - 1).bit_length() + 1) // 2)
+    half = numpy.uint64(half_bits)
+    mask = numpy.uint64((1 << half_bits) - 1)
+    keys = numpy.random.RandomState(seed).randint(
+        0, 2 ** 32, size=_FEISTEL_ROUNDS).astype(numpy.uint64)
+
+    def encrypt(x):
+        left = x >> half
+        right = x & mask
+        for key in keys:
+            left, right = right, left ^ (_feistel_mix(right, key) & mask)
+        return (left << half) | right
+
+    def decrypt(x):
+        left = x >> half
+        right = x & mask
+        for key in keys[::-1]:
+            left, right = right ^ (_feistel_mix(left, key) & mask), left
+        return (left << half) | right
+
+    permute = decrypt if inverse else encrypt
+    with numpy.errstate(over='ignore'):
+        result = permute(numpy.asarray(indexes, dtype=numpy.uint64))
+        pending = result >= size
+        while pending.any():
+            result[pending] = permute(result[pending])
+            pending = result >= size
+    return result.astype(numpy.int64)
+
+
+# Data source of a worker process of DataSourceWithFileCache, which is set
+# by the initializer of the process pool.
+_worker_data_source = None
+
+
+def _init_load_sample_worker(data_source):
+    global _worker_data_source
+    _worker_data_source = data_source
+
+
+def _load_sample_worker(key):
+    return _worker_data_source._load_sample(key)
+
+
+class MmapCacheWriter(object):
+    '''
+    Writes memory-mapped cache.
+
+    Memory-mapped cache consists of following files.
+
+    * ``PREFIX_data_N.npy``: All data of N-th variable in npy format.
+    * ``cache_info.csv``: Variable names and their data file names.
+    * ``cache_index.npy``: Fixed-width index of (start position, length)
+      of each written chunk.
+
+    Args:
+        cache_dir (str): Location of cache files.
+        variables (tuple of str): Variable names.
+        size (int): Number of data.
+        cache_file_name_prefix (str): Beginning of the filenames of cache files.
+    '''
+
+    def __init__(self, cache_dir, variables, size, cache_file_name_prefix='cache'):
+        self._cache_dir = cache_dir
+        self._variables = variables
+        self._size = size
+        self._file_names = ['{}_data_{}.npy'.format(cache_file_name_prefix, i)
+                            for i in range(len(variables))]
+        self._arrays = None
+        self._chunks = []
+        self._lock = threading.Lock()
+
+    def write(self, start, data):
+        '''
+        Write a chunk of data.
+
+        Args:
+            start (int): Position of the first data of the chunk.
+            data (list of list of :obj:`numpy.ndarray`): Data of each variable.
+        '''
+        with self._lock:
+            if self._arrays is None:
+                self._arrays = [numpy.lib.format.open_memmap(
+                    os.path.join(self._cache_dir, fn), mode='w+',
+                    dtype=d[0].dtype, shape=(self._size, ) + d[0].shape)
+                    for fn, d in zip(self._file_names, data)]
+            self._chunks.append((start, len(data[0])))
+        for a, d in zip(self._arrays, data):
+            a[start:start + len(d)] = d
+
+    @property
+    def file_names(self):
+        return [os.path.join(self._cache_dir, fn) for fn in self._file_names]
+
+    def close(self):
+        '''
+        Flush data and write cache_info.csv and cache_index.npy.
+        '''
+        if self._arrays is not None:
+            for a in self._arrays:
+                a.flush()
+            self._arrays = None
+        with open(os.path.join(self._cache_dir, 'cache_info.csv'), 'w') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            for variable, fn in zip(self._variables, self._file_names):
+                writer.writerow((variable, fn))
+        index = numpy.array(sorted(self._chunks),
+                            dtype=numpy.int64).reshape(-1, 2)
+        numpy.save(os.path.join(self._cache_dir, 'cache_index.npy'), index)
+
+
+class ColumnarStore(object):
+    '''
+    Stores samples in one contiguous array per variable.
+
+    Arrays are allocated when the first sample is appended, and grow
+    geometrically if ``capacity`` is not enough. If the size of arrays
+    exceeds ``max_memory`` and ``spill_dir`` is specified, arrays are
+    allocated as memory-mapped files in ``spill_dir`` instead.
+
+    If a sample has a shape different from the previous ones, samples are
+    stored in a list of samples instead, and :py:meth:`take` is not
+    available. Such samples can not be spilled to files, so samples are no
+    longer appended once their size exceeds ``max_memory``.
+
+    Args:
+        capacity (int): Expected number of samples.
+        max_memory (int): Max size of arrays in bytes kept in memory.
+            None means unlimited.
+        spill_dir (str): Directory for memory-mapped files. If None, arrays
+            are always kept in memory.
+    '''
+
+    def __init__(self, capacity=0, max_memory=None, spill_dir=None):
+        self._capacity = capacity
+        self._max_memory = max_memory
+        self._spill_dir = spill_dir
+        self._spill_files = []
+        self._arrays = None
+        self._samples = None
+        self._samples_nbytes = 0
+        self._full = False
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _allocate(self, shape, dtype, capacity, sample_nbytes):
+        if self._spill_dir is not None and self._max_memory is not None and \
+                sample_nbytes * capacity > self._max_memory:
+            fd, fn = tempfile.mkstemp(suffix='.npy', dir=self._spill_dir)
+            os.close(fd)
+            self._spill_files.append(fn)
+            return numpy.lib.format.open_memmap(
+                fn, mode='w+', dtype=dtype, shape=(capacity, ) + shape)
+        return numpy.empty((capacity, ) + shape, dtype=dtype)
+
+    def _reallocate(self, capacity, dtypes=None):
+        sample_nbytes = sum(a[0].nbytes for a in self._arrays)
+        arrays = []
+        for i, a in enumerate(self._arrays):
+            dtype = dtypes[i] if dtypes else a.dtype
+            new = self._allocate(a.shape[1:], dtype, capacity, sample_nbytes)
+            new[:self._size] = a[:self._size]
+            arrays.append(new)
+        self._arrays = arrays
+        self._capacity = capacity
+
+    def _fits(self, nbytes):
+        if self._full:
+            return False
+        if self._max_memory is not None and \
+                self._samples_nbytes + nbytes > self._max_memory:
+            logger.warning(
+                'Samples of variable shapes exceed {} bytes. Following '
+                'samples are not stored.'.format(self._max_memory))
+            self._full = True
+            return False
+        self._samples_nbytes += nbytes
+        return True
+
+    def append(self, sample):
+        '''
+        Append a sample.
+
+        Args:
+            sample (tuple): Data of each variable.
+
+        Returns:
+            bool: False if the sample is not stored since samples of variable
+            shapes exceed ``max_memory``.
+        '''
+        sample = [numpy.asarray(d) for d in sample]
+        if self._samples is None and self._arrays is not None and \
+                any(d.shape != a.shape[1:] for a, d in zip(self._arrays, sample)):
+            # Fall back to the per-sample store for variable-shaped data.
+            sample_nbytes = sum(a[0].nbytes for a in self._arrays)
+            self._samples = []
+            for i in range(self._size):
+                if not self._fits(sample_nbytes):
+                    break
+                self._samples.append(
+                    tuple(numpy.array(a[i]) for a in self._arrays))
+            self._size = len(self._samples)
+            self._release_arrays()
+        if self._samples is not None:
+            if not self._fits(sum(d.nbytes for d in sample)):
+                return False
+            self._samples.append(tuple(sample))
+            self._size += 1
+            return True
+        if self._arrays is None:
+            capacity = max(self._capacity, 1)
+            sample_nbytes = sum(d.nbytes for d in sample)
+            self._arrays = [self._allocate(d.shape, d.dtype, capacity, sample_nbytes)
+                            for d in sample]
+            self._capacity = capacity
+        else:
+            dtypes = [numpy.promote_types(a.dtype, d.dtype)
+                      for a, d in zip(self._arrays, sample)]
+            if self._size == self._capacity:
+                self._reallocate(self._capacity * 2, dtypes)
+            elif any(dt != a.dtype for dt, a in zip(dtypes, self._arrays)):
+                self._reallocate(self._capacity, dtypes)
+        for a, d in zip(self._arrays, sample):
+            a[self._size] = d
+        self._size += 1
+        return True
+
+    def __getitem__(self, index):
+        if self._samples is not None:
+            return self._samples[index]
+        return tuple(a[index] for a in self._arrays)
+
+    def take(self, indexes, out=None):
+        '''
+        Gather samples of ``indexes``.
+
+        Args:
+            indexes (:obj:`numpy.ndarray`): Indexes of samples.
+            out (None or list of :obj:`numpy.ndarray`): Destination arrays.
+
+        Returns:
+            list of :obj:`numpy.ndarray` or None: Gathered data of each
+            variable. None if samples are stored per sample.
+        '''
+        if self._samples is not None:
+            return None
+        if out is None:
+            return [numpy.take(a, indexes, axis=0) for a in self._arrays]
+        for a, o in zip(self._arrays, out):
+            # Indexes are valid, 'clip' avoids buffering of out.
+            numpy.take(a, indexes, axis=0, out=o, mode='clip')
+        return out
+
+    @property
+    def nbytes(self):
+        '''
+        Size of stored samples in bytes.
+        '''
+        if self._samples is not None:
+            return sum(d.nbytes for s in self._samples for d in s)
+        if self._arrays is None:
+            return 0
+        return sum(a[0].nbytes for a in self._arrays) * self._size
+
+    @property
+    def resident_size(self):
+        '''
+        Size of arrays allocated in memory in bytes, excluding memory-mapped files.
+        '''
+        if self._samples is not None:
+            return self.nbytes
+        if self._arrays is None:
+            return 0
+        return sum(a.nbytes for a in self._arrays if not isinstance(a, numpy.memmap))
+
+    def _release_arrays(self):
+        self._arrays = None
+        for fn in self._spill_files:
+            try:
+                os.remove(fn)
+            except OSError:
+                pass
+        self._spill_files = []
+
+    def close(self):
+        self._release_arrays()
+        self._samples = None
+        self._samples_nbytes = 0
+        self._full = False
+        self._size = 0
+
+
+class ShuffleBuffer(object):
+    '''
+    Draws samples of cache files at random from a buffer of samples.
+
+    Cache files are opened in random order, ``num_of_files`` at the same
+    time, and their samples are read one by one in random order into a
+    buffer of ``buffer_size`` samples. Each sample is drawn from a random
+    slot of the buffer and replaced with the next sample read. A cache
+    file is released as soon as all its samples are read into the buffer,
+    so that at most ``buffer_size`` samples and ``num_of_files`` cache
+    files are kept in memory, and each cache file is loaded only once per
+    epoch.
+
+    Args:
+        cache_files (list of tuple): Pairs of a key of cache file and the
+            number of samples in it.
+        buffer_size (int): Number of samples in the buffer.
+        num_of_files (int): Number of cache files opened at the same time.
+        rng (:obj:`numpy.random.RandomState`): Numpy random number generator.
+        load (function): Takes a key of cache file and a list of keys of
+            cache files to be loaded next, and returns a dict of arrays of
+            the cache file.
+        num_of_prefetch_files (int): Number of keys of cache files passed
+            to ``load`` to be prefetched.
+
+    Attributes:
+        order (list of tuple): Pairs of a key of cache file and an index in
+            it, in the order samples are drawn.
+        file_loads (int): Number of cache files loaded.
+        mean_buffer_fill (float): Mean number of samples in the buffer
+            when a sample is drawn.
+    '''
+
+    def __init__(self, cache_files, buffer_size, num_of_files, rng, load,
+                 num_of_prefetch_files=0):
+        self._load = load
+        self._num_of_prefetch_files = num_of_prefetch_files
+        pending = [cache_files[i]
+                   for i in rng.permutation(len(cache_files))]
+        pending.reverse()
+        total = sum(length for _, length in cache_files)
+        picks = rng.random_sample(total).tolist()
+        slots = rng.random_sample(total).tolist()
+
+        # Samples in the order they are read into the buffer, and the
+        # number of samples read before each sample is drawn.
+        self._reads = []
+        self._num_of_reads = []
+        opened = []
+        buf = []
+        self.order = []
+        for n in range(total):
+            while len(opened) < num_of_files and pending:
+                key, length = pending.pop()
+                opened.append([key, rng.permutation(length).tolist(), 0])
+            i = int(picks[n] * len(opened))
+            f = opened[i]
+            sample = (f[0], f[1][f[2]])
+            f[2] += 1
+            if f[2] == len(f[1]):
+                opened[i] = opened[-1]
+                opened.pop()
+            self._reads.append(sample)
+
+            if len(buf) < buffer_size:
+                buf.append(sample)
+            else:
+                j = int(slots[n] * buffer_size)
+                self.order.append(buf[j])
+                self._num_of_reads.append(n)
+                buf[j] = sample
+        self.order.extend(buf[j] for j in rng.permutation(len(buf)))
+        self._num_of_reads.extend([total] * len(buf))
+
+        self._file_load_order = []
+        self._last_reads = {}
+        for n, (key, _) in enumerate(self._reads):
+            if key not in self._last_reads:
+                self._file_load_order.append(key)
+            self._last_reads[key] = n
+
+        self._opened = {}
+        self._samples = {}
+        self._num_of_read_samples = 0
+        self._num_of_draws = 0
+        self._total_fill = 0
+        self.file_loads = 0
+
+    @property
+    def mean_buffer_fill(self):
+        if self._num_of_draws == 0:
+            return 0.0
+        return float(self._total_fill) / self._num_of_draws
+
+    def _read_sample(self):
+        n = self._num_of_read_samples
+        key, index = self._reads[n]
+        data = self._opened.get(key)
+        if data is None:
+            # Cache files are loaded in the order of _file_load_order.
+            start = self.file_loads + 1
+            data = self._load(key, self._file_load_order[
+                start:start + self._num_of_prefetch_files])
+            self.file_loads += 1
+            self._opened[key] = data
+        # Copy the sample so that the cache file can be released.
+        self._samples[(key, index)] = {
+            k: numpy.array(v[index]) for k, v in data.items()}
+        if self._last_reads[key] == n:
+            del self._opened[key]
+        self._num_of_read_samples += 1
+
+    def get(self, position):
+        '''
+        Returns a dict of the sample drawn at ``position``.
+        '''
+        while self._num_of_read_samples < self._num_of_reads[position]:
+            self._read_sample()
+        sample = self.order[position]
+        self._num_of_draws += 1
+        self._total_fill += len(self._samples)
+        data = self._samples.pop(sample, None)
+        if data is None:
+            # The sample was drawn already, e.g. the position is moved back.
+            key, index = sample
+            data = {k: v[index] for k, v in self._load(key, []).items()}
+        return data
+
+    def close(self):
+        self._opened = {}
+        self._samples = {}
+
+
+def is_mmap_cache(cache_dir):
+    '''
+    Whether the memory-mapped cache exists in cache_dir.
+    '''
+    return os.path.exists(os.path.join(cache_dir, 'cache_index.npy'))
+
+
+def load_mmap_cache(cache_dir):
+    '''
+    Open memory-mapped cache written by :py:class:`MmapCacheWriter`.
+
+    Returns:
+        tuple: OrderedDict of variable name and read-only
+        :obj:`numpy.ndarray` backed by memory map, and index of chunks.
+    '''
+    data = OrderedDict()
+    with open(os.path.join(cache_dir, 'cache_info.csv'), 'r') as f:
+        for row in csv.reader(f):
+            data[row[0]] = numpy.asarray(numpy.load(
+                os.path.join(cache_dir, row[1]), mmap_mode='r'))
+    index = numpy.load(os.path.join(cache_dir, 'cache_index.npy'))
+    return data, index
+
+
 class DataSource(object):
     '''
     This class contains various properties and methods for the data source, which are utilized by py:class:`DataIterator`.
@@ -106,11 +595,124 @@ class DataSource(object):
         '''
         return self._variables
 
+    @property
+    def normalization_scales(self):
+        '''normalization_scales
+
+        Scales of variables whose normalization is deferred to the consumer.
+        Data of these variables are provided in their stored integer dtype,
+        and should be multiplied by the scale after they are copied to the
+        destination.
+
+        Returns:
+           dict: Scale for each variable name.
+        '''
+        return {}
+
     def next(self):
         data = self._get_data(self._position)
         self._position += 1
         return data
 
+    def _get_batch(self, positions, out=None):
+        '''
+        Get data of several positions at once.
+
+        Data sources which can gather samples with fancy indexing should
+        override this. If ``out`` is given, data must be written into it.
+
+        Args:
+            positions (:obj:`numpy.ndarray`): Data positions.
+            out (None or list of :obj:`numpy.ndarray`): Destination arrays,
+                one per variable, whose first axis is ``len(positions)``.
+
+        Returns:
+            list of :obj:`numpy.ndarray` or None: None means that batched
+            access is not supported and per-sample access is used instead.
+        '''
+        return None
+
+    def next_batch(self, n, out=None):
+        '''next_batch
+
+        Get next ``n`` data as one array per variable.
+
+        Args:
+            n (int): Number of data.
+            out (None or list of :obj:`numpy.ndarray`): If specified, data
+                are written into these arrays. If shapes of data do not
+                match them, newly allocated arrays are returned instead.
+
+        Returns:
+            list of :obj:`numpy.ndarray`: Batched data. None if any of data
+            could not be obtained.
+        '''
+        positions = numpy.arange(self._position, self._position + n)
+        data = self._get_batch(positions, out)
+        if data is not None:
+            self._position = positions[-1] + 1
+            if out is not None and data is not out:
+                if any(numpy.shape(d) != o.shape for o, d in zip(out, data)):
+                    return data
+                for o, d in zip(out, data):
+                    o[...] = d
+                data = out
+            return data
+
+        # Fallback to per-sample access.
+        samples = []
+        for _ in range(n):
+            d = self.next()
+            if d is None:
+                return None
+            samples.append(d)
+        if out is None or any(numpy.shape(d) != o.shape[1:]
+                              for s in samples for o, d in zip(out, s)):
+            return [numpy.array([s[i] for s in samples])
+                    for i in range(len(samples[0]))]
+        for j, s in enumerate(samples):
+            for o, d in zip(out, s):
+                o[j] = d
+        return out
+
+    def _sample_keys(self, positions):
+        '''
+        Get keys of data at positions, which are passed to
+        :py:meth:`_load_sample` in worker processes of
+        :py:class:`DataIterator <nnabla.utils.data_iterator.DataIterator>`.
+
+        Data sources whose data can be loaded independently of their state
+        (e.g. order of data) should override this and :py:meth:`_load_sample`.
+
+        Args:
+            positions (:obj:`numpy.ndarray`): Data positions.
+
+        Returns:
+            list or None: Picklable keys. None means that loading data in
+            worker processes is not supported.
+        '''
+        return None
+
+    def _load_sample(self, key):
+        '''
+        Load data specified by a key obtained from :py:meth:`_sample_keys`.
+        '''
+        raise NotImplementedError
+
+    def _copy_in_original_order(self):
+        '''
+        Get a shallow copy of the data source which reads data in their
+        original order by position. This data source is left unchanged.
+
+        Data sources whose original order is not restored by
+        :py:meth:`reset` without shuffle, or whose state must not be shared
+        with the copy, should override this.
+        '''
+        data_source = copy.copy(self)
+        data_source._shuffle = False
+        data_source.reset()
+        return data_source
+
     @property
     def position(self):
         '''position
@@ -204,13 +806,21 @@ class DataSourceWithFileCache(DataSource):
 
             q.put((pos, d))
 
-        q = Queue()
-        with closing(ThreadPool(processes=self._num_of_threads)) as pool:
-            pool.map(get_data, [(pos, q) for pos in self._cache_positions])
-
-        while len(cache_data) < len(self._cache_positions):
-            index, data = q.get()
-            cache_data[index] = data
+        if self._process_pool is not None:
+            keys = self._data_source._sample_keys(
+                numpy.array(self._cache_positions))
+            for pos, d in zip(self._cache_positions,
+                              self._process_pool.map(_load_sample_worker, keys)):
+                cache_data[pos] = d
+        else:
+            q = Queue()
+            with closing(ThreadPool(processes=self._num_of_threads)) as pool:
+                pool.map(get_data, [(pos, q)
+                                    for pos in self._cache_positions])
+
+            while len(cache_data) < len(self._cache_positions):
+                index, data = q.get()
+                cache_data[index] = data
         start_position = self.position - len(cache_data) + 1
         end_position = self.position
         cache_filename = os.path.join(
@@ -231,7 +841,9 @@ class DataSourceWithFileCache(DataSource):
 
         logger.info('Creating cache file {}'.format(cache_filename))
         try:
-            if self._cache_file_format == ".h5":
+            if self._cache_file_format == ".mmap":
+                self._mmap_writer.write(start_position, list(data.values()))
+            elif self._cache_file_format == ".h5":
                 h5 = h5py.File(cache_filename, 'w')
                 for k, v in data.items():
                     h5.create_dataset(k, data=v)
@@ -274,19 +886,21 @@ class DataSourceWithFileCache(DataSource):
             if len(self._cache_positions) >= self._cache_size or self._total_cached_size >= self.size:
                 self._save_cache_to_file()
 
-    def _get_data_from_cache_file(self, position):
-        cache_file_index = self._cache_file_positions[position]
-        cache_data_position = \
-            self._cache_file_data_orders[cache_file_index][position -
-                                                           self._cache_file_start_positions[cache_file_index]]
-
+    def _load_cache_file(self, cache_file_index):
         if self._current_cache_file_index != cache_file_index:
             self._current_cache_file_index = cache_file_index
 
-            if self._cache_file_format == '.npy':
+            if self._cache_file_format == '.mmap':
+                # Views of memory map, data are read when they are accessed.
+                start = cache_file_index * self._cache_size
+                end = start + \
+                    len(self._cache_file_data_orders[cache_file_index])
+                self._current_cache_data = {
+                    k: v[start:end] for k, v in self._mmap_data.items()}
+            elif self._cache_file_format == '.npy':
                 self._current_cache_data = {}
                 if not os.path.exists(self._cache_file_names[cache_file_index]):
-                    return None
+                    return False
                 with open(self._cache_file_names[cache_file_index], 'rb') as f:
                     for v in self._variables:
                         self._current_cache_data[v] = numpy.load(
@@ -297,6 +911,24 @@ class DataSourceWithFileCache(DataSource):
                 for k, v in h5.items():
                     self._current_cache_data[k] = v[()]
                 h5.close()
+        return len(self._current_cache_data) > 0
+
+    def _load_buffered_cache_file(self, cache_file_index, cache_file_indexes_to_prefetch):
+        self._load_cache_file(cache_file_index)
+        return self._current_cache_data
+
+    def _get_data_from_cache_file(self, position):
+        if self._shuffle_buffer is not None:
+            d = self._shuffle_buffer.get(position)
+            return [d[v] for v in self.variables]
+
+        cache_file_index = self._cache_file_positions[position]
+        cache_data_position = \
+            self._cache_file_data_orders[cache_file_index][position -
+                                                           self._cache_file_start_positions[cache_file_index]]
+
+        if not self._load_cache_file(cache_file_index):
+            return None
 
         d = [self._current_cache_data[v][cache_data_position]
              for v in self.variables]
@@ -307,6 +939,51 @@ class DataSourceWithFileCache(DataSource):
             self._position = position
             return self._get_data_from_cache_file(position)
 
+    def _copy_in_original_order(self):
+        # The copy has its own state of reading cache files.
+        data_source = copy.copy(self)
+        data_source._shuffle = False
+        data_source._shuffle_buffer = None
+        data_source._thread_lock = threading.Lock()
+        data_source._current_cache_file_index = -1
+        data_source._current_cache_data = None
+        data_source._cache_file_order = sorted(self._cache_file_order)
+        data_source._cache_file_data_orders = [
+            sorted(orders) for orders in self._cache_file_data_orders]
+        data_source.reset()
+        return data_source
+
+    def _get_batch(self, positions, out=None):
+        with self._thread_lock:
+            if self._shuffle_buffer is not None:
+                samples = [self._shuffle_buffer.get(p) for p in positions]
+                data = [numpy.stack([sample[v] for sample in samples])
+                        for v in self._variables]
+                if out is None:
+                    return data
+                for o, d in zip(out, data):
+                    o[...] = d
+                return out
+
+            chunks = [[] for _ in self._variables]
+            file_indexes = [self._cache_file_positions[p] for p in positions]
+            for start, end in _runs(file_indexes):
+                cache_file_index = file_indexes[start]
+                if not self._load_cache_file(cache_file_index):
+                    return None
+                start_position = self._cache_file_start_positions[cache_file_index]
+                data_orders = self._cache_file_data_orders[cache_file_index]
+                indexes = [data_orders[p - start_position]
+                           for p in positions[start:end]]
+                for i, v in enumerate(self._variables):
+                    d = numpy.take(self._current_cache_data[v], indexes,
+                                   axis=0)
+                    if out is None:
+                        chunks[i].append(d)
+                    else:
+                        out[i][start:end] = d
+        return out if out is not None else _concatenate_chunks(chunks)
+
     def _create_cache(self):
         # Save all data into cache file(s).
         self._cache_positions = []
@@ -317,6 +994,21 @@ class DataSourceWithFileCache(DataSource):
         if single_or_rankzero():
             progress(None)
 
+        if self._num_of_processes > 0:
+            if self._data_source._sample_keys(numpy.arange(1)) is None:
+                logger.warning('{} does not support loading data in worker processes, use threads instead.'.format(
+                    type(self._data_source).__name__))
+            else:
+                try:
+                    ctx = multiprocessing.get_context('fork')
+                except ValueError:
+                    ctx = multiprocessing.get_context()
+                self._process_pool = ctx.Pool(
+                    processes=self._num_of_processes,
+                    initializer=_init_load_sample_worker,
+                    initargs=(self._data_source,))
+
+        start_time = time.time()
         while self._position < self._data_source._size:
 
             if single_or_rankzero():
@@ -327,6 +1019,21 @@ class DataSourceWithFileCache(DataSource):
             self._position += 1
         if len(self._cache_positions) > 0:
             self._save_cache_to_file()
+        elapsed = time.time() - start_time
+
+        if self._process_pool is not None:
+            self._process_pool.close()
+            self._process_pool.join()
+            self._process_pool = None
+        logger.info('Created cache of {} data in {:.2f} sec ({:.2f} data/sec).'.format(
+            self._data_source._size, elapsed,
+            self._data_source._size / elapsed if elapsed > 0 else 0.0))
+
+        if self._cache_file_format == ".mmap":
+            self._mmap_writer.close()
+            self._mmap_data = OrderedDict(
+                [(v, numpy.asarray(numpy.load(fn, mmap_mode='r')))
+                 for v, fn in zip(self._variables, self._mmap_writer.file_names)])
 
         if single_or_rankzero():
             progress(None)
@@ -344,11 +1051,13 @@ class DataSourceWithFileCache(DataSource):
                 num_of_cache_files - 1][0:self._data_source._size % self._cache_size]
 
         # Create Index
-        index_filename = os.path.join(self._cache_dir, "cache_index.csv")
-        with open(index_filename, 'w') as f:
-            writer = csv.writer(f, lineterminator='\n')
-            for fn, orders in zip(self._cache_file_names, self._cache_file_data_orders):
-                writer.writerow((os.path.basename(fn), len(orders)))
+        if self._cache_file_format != ".mmap":
+            index_filename = os.path.join(
+                self._cache_dir, "cache_index.csv")
+            with open(index_filename, 'w') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                for fn, orders in zip(self._cache_file_names, self._cache_file_data_orders):
+                    writer.writerow((os.path.basename(fn), len(orders)))
         # Create Info
         if self._cache_file_format == ".npy":
             info_filename = os.path.join(self._cache_dir, "cache_info.csv")
@@ -413,10 +1122,20 @@ class DataSourceWithFileCache(DataSource):
             'DATA_ITERATOR', 'data_source_file_cache_num_of_threads'))
         logger.info('Num of thread is {}'.format(self._num_of_threads))
 
+        self._num_of_processes = int(nnabla_config.get(
+            'DATA_ITERATOR', 'data_source_file_cache_num_of_processes'))
+        self._process_pool = None
+
         self._cache_file_format = nnabla_config.get(
             'DATA_ITERATOR', 'cache_file_format')
         logger.info('Cache file format is {}'.format(self._cache_file_format))
 
+        self._shuffle_buffer_size = int(nnabla_config.get(
+            'DATA_ITERATOR', 'cache_file_shuffle_buffer_size'))
+        self._shuffle_buffer_num_of_files = max(1, int(nnabla_config.get(
+            'DATA_ITERATOR', 'cache_file_shuffle_buffer_num_of_files')))
+        self._shuffle_buffer = None
+
         self._thread_lock = threading.Lock()
 
         self._size = data_source._size
@@ -433,6 +1152,9 @@ class DataSourceWithFileCache(DataSource):
         self._current_cache_file_index = -1
         self._current_cache_data = None
 
+        self._mmap_writer = None
+        self._mmap_data = None
+
         self.shuffle = shuffle
         self._original_order = list(range(self._size))
         self._order = list(range(self._size))
@@ -450,6 +1172,12 @@ class DataSourceWithFileCache(DataSource):
         self._closed = False
         atexit.register(self.close)
 
+        if self._cache_file_format == ".mmap":
+            self._mmap_writer = MmapCacheWriter(self._cache_dir,
+                                                self._variables,
+                                                self._size,
+                                                self._cache_file_name_prefix)
+
         self._create_cache()
         self._create_cache_file_position_table()
 
@@ -463,15 +1191,36 @@ class DataSourceWithFileCache(DataSource):
         if not self._closed:
             if six.PY3:
                 atexit.unregister(self.close)
+            self._mmap_data = None
+            self._current_cache_data = None
+            if self._shuffle_buffer is not None:
+                self._shuffle_buffer.close()
+                self._shuffle_buffer = None
             if self._tempdir_created:
                 # logger.info('Remove created tempdir {}'.format(self._cache_dir))
                 rmtree(self._cache_dir, ignore_errors=True)
             self._data_source.close()
             self._closed = True
 
+    @property
+    def normalization_scales(self):
+        return self._data_source.normalization_scales
+
     def reset(self):
         with self._thread_lock:
-            if self._shuffle:
+            if self._shuffle_buffer is not None:
+                self._shuffle_buffer.close()
+                self._shuffle_buffer = None
+            # Memory-mapped cache is read at random without the buffer.
+            if self._shuffle and self._shuffle_buffer_size > 0 and \
+                    self._cache_file_format != '.mmap':
+                self._shuffle_buffer = ShuffleBuffer(
+                    [(i, len(orders)) for i, orders in enumerate(
+                        self._cache_file_data_orders)],
+                    self._shuffle_buffer_size,
+                    self._shuffle_buffer_num_of_files, self._rng,
+                    self._load_buffered_cache_file)
+            elif self._shuffle:
                 self._cache_file_order = list(
                     self._rng.permutation(self._cache_file_order))
                 for i in range(len(self._cache_file_data_orders)):
@@ -506,16 +1255,28 @@ class DataSourceWithMemoryCache(DataSource):
 
     def _get_data(self, position):
         if self._on_memory:
-            if self._order[position] < len(self._cache):
-                data = self._cache[self._order[position]]
+            index = self._order[position]
+            if index < len(self._cache):
+                data = self._cache[index]
             else:
-                data = self._get_data_func(position)
-                self._cache.append(data)
+                # Samples not in the cache are loaded again if the cache is
+                # full.
+                data = self._get_data_func(index)
+                if index == len(self._cache):
+                    self._cache.append(data)
         else:
             data = self._data_source._get_data(position)
         self._position = position
         return data
 
+    def _get_batch(self, positions, out=None):
+        if not self._on_memory:
+            return self._data_source._get_batch(positions, out)
+        if len(self._cache) < self._size:
+            # Cache is filled by per-sample access during the first epoch.
+            return None
+        return self._cache.take(self._order[positions], out)
+
     def __init__(self, data_source, shuffle=False, rng=None):
         logger.info('Using DataSourceWithMemoryCache')
         super(DataSourceWithMemoryCache, self).__init__(
@@ -525,25 +1286,45 @@ class DataSourceWithMemoryCache(DataSource):
         self._size = data_source._size
         self._variables = data_source.variables
         self._data_source = data_source
-        self._order = list(range(self._size))
+        self._order = numpy.arange(self._size)
 
         self._on_memory = False
-        self._cache = []
+        self._cache = None
 
         data = self._get_data_func(0)
         self._data_size = 0
         for d in data:
             if isinstance(d, list):
                 d = numpy.array(d, dtype=numpy.float32)
+            d = numpy.asarray(d)
             self._data_size += d.size * d.itemsize
         total_size = self._data_size * self._size
+        spill_dir = None
         if total_size < self._buffer_max_size:
             logger.info('On-memory')
             self._on_memory = True
+        elif nnabla_config.get('DATA_ITERATOR', 'data_source_buffer_spill_to_file') == 'True':
+            spill_dir = nnabla_config.get(
+                'DATA_ITERATOR', 'data_source_file_cache_location') or tempfile.gettempdir()
+            logger.info('On-memory with spill to file')
+            self._on_memory = True
+        self._cache = ColumnarStore(
+            self._size, self._buffer_max_size, spill_dir)
         self._generation = -1
         self._closed = False
         atexit.register(self.close)
 
+    @property
+    def resident_size(self):
+        '''resident_size
+
+        Size of cached data kept in memory in bytes.
+
+        Returns:
+            int: Resident size.
+        '''
+        return self._cache.resident_size
+
     def __enter__(self):
         return self
 
@@ -555,16 +1336,22 @@ class DataSourceWithMemoryCache(DataSource):
             if six.PY3:
                 atexit.unregister(self.close)
             self._data_source.close()
+            if self._cache is not None:
+                self._cache.close()
             self._closed = True
 
+    @property
+    def normalization_scales(self):
+        return self._data_source.normalization_scales
+
     def reset(self):
         if self._on_memory:
             self._generation += 1
             if self._shuffle and self._generation > 0:
-                self._order = list(self._rng.permutation(self._size))
+                self._order = self._rng.permutation(self._size)
 
             else:
-                self._order = list(range(self._size))
+                self._order = numpy.arange(self._size)
 
             if self._position == 0:
                 self._generation = -1
@@ -600,6 +1387,10 @@ class SlicedDataSource(DataSource):
         self._generation = -1
         self.reset()
 
+    @property
+    def normalization_scales(self):
+        return self._data_source.normalization_scales
+
     def reset(self):
         self._data_source.reset()
         self._data_source._position = self._slice_start
@@ -610,3 +1401,125 @@ class SlicedDataSource(DataSource):
         self._position = position
         data = self._data_source._get_data(self._slice_start + position)
         return data
+
+    def _get_batch(self, positions, out=None):
+        return self._data_source._get_batch(self._slice_start + positions, out)
+
+    def _sample_keys(self, positions):
+        return self._data_source._sample_keys(self._slice_start + positions)
+
+    def _load_sample(self, key):
+        return self._data_source._load_sample(key)
+
+
+class ShardedDataSource(DataSource):
+    '''
+    Provides a shard of data source for distributed training.
+
+    Data are divided into blocks of ``block_size`` consecutive positions,
+    e.g. samples in a cache file. Order of blocks is determined by ``seed``
+    and epoch with a keyed pseudo-random permutation, so that each process
+    computes only its own shard without materializing and permuting the
+    order of entire data. Data in a shard are shuffled only within each
+    block, so that reading a shard keeps locality of the blocks. All shards
+    must be created with the same ``seed`` and ``block_size``.
+
+    Args:
+        data_source (:py:class:`DataSource <nnabla.utils.data_source.DataSource>`):
+             Instance of DataSource class which provides data. It is read in
+             its original order by position. If it is shuffled, a copy of it
+             is read instead, and its own order is left unchanged.
+        num_of_shards (int): Number of shards.
+        shard_pos (int): Position of the shard.
+        shuffle (bool): Indicates whether the dataset is shuffled or not.
+        seed (int): Seed of permutation shared by all shards.
+        drop_last (bool): If True, the last data which cannot be divided
+             equally into shards are dropped. Otherwise, shards are padded
+             with the first data in the epoch.
+        block_size (int): Number of consecutive positions of ``data_source``
+             shuffled as a block.
+    '''
+
+    def __init__(self, data_source, num_of_shards, shard_pos, shuffle=False, seed=0, drop_last=False,
+                 block_size=1):
+        logger.info('Using ShardedDataSource {}/{}'.format(
+            shard_pos, num_of_shards))
+        super(ShardedDataSource, self).__init__(shuffle=shuffle)
+
+        if data_source.shuffle:
+            data_source = data_source._copy_in_original_order()
+        self._data_source = data_source
+        self._variables = data_source.variables
+        self._num_of_shards = num_of_shards
+        self._shard_pos = shard_pos
+        self._seed = seed
+        self._block_size = max(1, block_size)
+        self._source_size = data_source.size
+        if drop_last:
+            self._size = self._source_size // num_of_shards
+        else:
+            self._size = -(-self._source_size // num_of_shards)
+        self._indexes = None
+        self._generation = -1
+        self.reset()
+
+    def _shard_indexes(self, epoch):
+        start = self._shard_pos * self._size
+        positions = numpy.arange(
+            start, start + self._size) % self._source_size
+        if not self._shuffle:
+            return positions
+
+        # Positions in the epoch are mapped to permuted blocks. Only the last
+        # block can be shorter, so start positions of blocks are computed
+        # from its slot instead of lengths of all blocks.
+        block_size = self._block_size
+        num_of_blocks = -(-self._source_size // block_size)
+        seed = [self._seed, epoch]
+        last_block = num_of_blocks - 1
+        last_length = self._source_size - last_block * block_size
+        last_slot = int(_permute_indexes(
+            [last_block], num_of_blocks, seed, inverse=True)[0])
+        last_start = last_slot * block_size
+        b = numpy.where(positions < last_start + last_length,
+                        positions // block_size,
+                        (positions + block_size - last_length) // block_size)
+        starts = b * block_size
+        starts[b > last_slot] -= block_size - last_length
+
+        # Only slots in this shard are permuted.
+        bounds = numpy.flatnonzero(numpy.diff(b)) + 1
+        firsts = numpy.concatenate([[0], bounds])
+        blocks = _permute_indexes(b[firsts], num_of_blocks, seed)
+        blocks = numpy.repeat(blocks, numpy.diff(numpy.append(firsts, len(b))))
+        indexes = blocks * block_size + positions - starts
+
+        # Shuffle within each block.
+        if block_size > 1:
+            rng = numpy.random.RandomState(
+                [self._seed, epoch, self._shard_pos])
+            for run in numpy.split(numpy.arange(len(b)), bounds):
+                indexes[run] = rng.permutation(indexes[run])
+        return indexes
+
+    @property
+    def normalization_scales(self):
+        return self._data_source.normalization_scales
+
+    def reset(self):
+        self._generation += 1
+        self._indexes = self._shard_indexes(self._generation)
+        super(ShardedDataSource, self).reset()
+
+    def _get_data(self, position):
+        self._position = position
+        return self._data_source._get_data(int(self._indexes[position]))
+
+    def _get_batch(self, positions, out=None):
+        return self._data_source._get_batch(self._indexes[positions], out)
+
+    def _sample_keys(self, positions):
+        return self._data_source._sample_keys(self._indexes[positions])
+
+    def _load_sample(self, key):
+        return self._data_source._load_sample(key)
@@ -18,14 +18,19 @@
 
 from collections import OrderedDict
 from time import sleep
-from six.moves import queue
+import copy
 import csv
+import itertools
 import numpy
 import os
 import threading
+import time
 import atexit
 
 from .data_source import DataSource
+from .data_source import _runs, _concatenate_chunks
+from .data_source import is_mmap_cache, load_mmap_cache
+from .data_source import ShuffleBuffer
 from .data_source_loader import FileReader, load
 from nnabla.logger import logger
 from nnabla.utils.communicator_util import current_communicator
@@ -42,11 +47,36 @@ class SimpleDataSource(DataSource):
     def _get_data(self, position):
         return self._load_func(self._order[position])
 
+    def _get_batch(self, positions, out=None):
+        if out is None:
+            return None
+        samples = [self._load_func(self._order[p]) for p in positions]
+        if any(numpy.shape(d) != o.shape[1:]
+               for s in samples for o, d in zip(out, s)):
+            # Variable-shaped samples do not fit into ``out``.
+            return [numpy.array([s[i] for s in samples])
+                    for i in range(len(out))]
+        for j, s in enumerate(samples):
+            for o, d in zip(out, s):
+                o[j] = d
+        return out
+
+    def _sample_keys(self, positions):
+        return [self._order[p] for p in positions]
+
+    def _load_sample(self, key):
+        return self._load_func(key)
+
     def reset(self):
         self._indexes = self._rng.permutation(
             self._size) if self._shuffle else numpy.arange(self._size)
         super(SimpleDataSource, self).reset()
 
+    def _copy_in_original_order(self):
+        data_source = super(SimpleDataSource, self)._copy_in_original_order()
+        data_source._order = list(range(self._size))
+        return data_source
+
     def __init__(self, load_func, num_examples, shuffle=False, rng=None):
         super(SimpleDataSource, self).__init__(shuffle=shuffle, rng=rng)
         super(SimpleDataSource, self).reset()
@@ -61,133 +91,174 @@ class SimpleDataSource(DataSource):
             self._order = list(range(self._size))
 
 
-class CachePrefetcher(object):
-    def __init__(self, cachedir, variables):
-        self._q = queue.Queue()
-        self.file_name = None
-        self._cachedir = cachedir
-        self._variables = variables
-        self._filereader = FileReader(self._cachedir)
-        self._current_data = None
-        self._thread = threading.Thread(target=self._worker)
-        self._thread.setDaemon(True)
-        self._thread.start()
-        self._closed = False
-        atexit.register(self.close)
-
-    def read_cache(self, file_name, variables):
-        retry = 1
-        while True:
-            if retry > 10:
-                logger.log(99, 'read_cache() retry count over give up.')
-                logger.log(
-                    99, 'Cache file {} not found. pid={}'.format(file_name, os.getpid()))
-                logger.log(99, 'Fatal Error! send SIGKILL to myself.')
-                os.kill(os.getpid(), 9)
+def _read_cache_file(file_name, variables):
+    retry = 1
+    while True:
+        if retry > 10:
+            logger.log(99, 'read_cache() retry count over give up.')
+            logger.log(
+                99, 'Cache file {} not found. pid={}'.format(file_name, os.getpid()))
+            logger.log(99, 'Fatal Error! send SIGKILL to myself.')
+            os.kill(os.getpid(), 9)
 
-            result = {}
-            try:
-                with FileReader(file_name).open(textmode=False) as f:
-                    for v in variables:
-                        result[v] = numpy.load(f, allow_pickle=True)
-                if set(result.keys()) == set(variables):
-                    break
-                else:
-                    logger.log(
-                        99, 'read_cache() fails retrying count {}/10.'.format(retry))
-                    retry += 1
-                    sleep(0.5)
-            except:
+        result = {}
+        try:
+            with FileReader(file_name).open(textmode=False) as f:
+                for v in variables:
+                    result[v] = numpy.load(f, allow_pickle=True)
+            if set(result.keys()) == set(variables):
+                break
+            else:
                 logger.log(
-                    99, 'Cache file {} not found, retry count {}.'.format(file_name, retry))
+                    99, 'read_cache() fails retrying count {}/10.'.format(retry))
                 retry += 1
                 sleep(0.5)
+        except:
+            logger.log(
+                99, 'Cache file {} not found, retry count {}.'.format(file_name, retry))
+            retry += 1
+            sleep(0.5)
 
-        return result
-
-    def _worker(self):
-        while True:
-            sleep(0.001)
-            cache_file_name = self._q.get()
-            self._current_data = {}
-            if cache_file_name is None:
-                self._q.task_done()
-                break
-            self._current_data = self.read_cache(
-                self.file_name, self._variables)
-            self._q.task_done()
-
-    def request(self, cache_file_name):
-        self.file_name = cache_file_name
-        self._q.put(cache_file_name)
-
-    def read(self):
-        self._q.join()
-        result = self._current_data
-        self.file_name = None
-        self._current_data = None
-        return result
-
-    def close(self):
-        if not self._closed:
-            self._q.join()
-            self._q.put(None)
-            self._q.join()
-            self._closed = True
+    return result
 
 
 class CacheReaderWithPrefetch(object):
-    def __init__(self, cachedir, num_threads, variables):
+    '''CacheReaderWithPrefetch
+    Reads npy cache files with prefetch threads.
+
+    Decoded cache files are kept in LRU order up to ``max_bytes``.
+    Files which are requested to prefetch are read by ``num_threads`` threads
+    while the total size is under ``max_bytes``. Files which are not
+    requested anymore are kept until the space is required, so that they are
+    reused without reading again if they are requested later.
+
+    Args:
+        cachedir (str): Cache directory.
+        num_threads (int): Number of prefetch threads.
+        variables (list of str): Variable names.
+        max_bytes (int): Total size of cache files kept in memory.
+    '''
+
+    def __init__(self, cachedir, num_threads, variables, max_bytes=None):
         self._variables = variables
-        self._cache_prefetchers = [CachePrefetcher(
-            cachedir, variables) for _ in range(num_threads)]
+        if max_bytes is None:
+            max_bytes = int(nnabla_config.get(
+                'DATA_ITERATOR', 'cache_file_prefetch_buffer_size'))
+        self._max_bytes = max_bytes
+        self._cond = threading.Condition()
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._requests = []
+        self._wanted = set()
+        self.num_of_misses = 0
         self._closed = False
+        self._threads = [threading.Thread(target=self._worker)
+                         for _ in range(num_threads)]
+        for t in self._threads:
+            t.daemon = True
+            t.start()
         atexit.register(self.close)
 
-    def open_and_prefetch_cache(self, file_name, file_names_to_prefetch):
-        cp_file_names = [cf.file_name for cf in self._cache_prefetchers]
-        # print('cp files', cp_file_names)
-        result = None
-        for cf in self._cache_prefetchers:
-            if cf.file_name == file_name:
-                result = cf.read()
+    def _evict(self, keep=None):
+        # Remove least recently used files which are not requested.
+        for fn in list(self._entries.keys()):
+            if self._total_bytes <= self._max_bytes:
                 break
-        if not result:
-            # print("no hit", file_name)
-            result = cf.read_cache(file_name, self._variables)
-        cp_file_names = [cf.file_name for cf in self._cache_prefetchers]
-        for i, fn in enumerate(cp_file_names):
-            if fn and fn not in file_names_to_prefetch:
-                self._cache_prefetchers[i].read()  # waste prefetched cache
-                # print("wasted", fn)
-        for fn in file_names_to_prefetch:
-            if fn not in cp_file_names:
-                try:
-                    index = cp_file_names.index(None)
-                    cp_file_names[index] = fn
-                    self._cache_prefetchers[index].request(
-                        cp_file_names[index])
-                except:
-                    continue
-        return result
+            entry = self._entries[fn]
+            if fn == keep or fn in self._wanted or entry['data'] is None:
+                continue
+            self._total_bytes -= entry['nbytes']
+            del self._entries[fn]
+
+    def _store(self, file_name, entry, data):
+        entry['data'] = data
+        entry['nbytes'] = sum(v.nbytes for v in data.values())
+        self._total_bytes += entry['nbytes']
+        self._evict(keep=file_name)
+        self._cond.notify_all()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._closed and \
+                        not (self._requests and self._total_bytes < self._max_bytes):
+                    self._cond.wait()
+                if self._closed:
+                    break
+                file_name = self._requests.pop(0)
+                entry = {'data': None, 'nbytes': 0}
+                self._entries[file_name] = entry
+            data = _read_cache_file(file_name, self._variables)
+            with self._cond:
+                self._store(file_name, entry, data)
+
+    def open_and_prefetch_cache(self, file_name, file_names_to_prefetch):
+        with self._cond:
+            self._wanted = set(file_names_to_prefetch or [])
+            self._requests = [fn for fn in file_names_to_prefetch or []
+                              if fn not in self._entries and fn != file_name]
+            entry = self._entries.get(file_name)
+            miss = entry is None
+            if miss:
+                self.num_of_misses += 1
+                entry = {'data': None, 'nbytes': 0}
+                self._entries[file_name] = entry
+            self._cond.notify_all()
+
+        if miss:
+            data = _read_cache_file(file_name, self._variables)
+            with self._cond:
+                self._store(file_name, entry, data)
+
+        with self._cond:
+            # Wait for the file which is being read by a prefetch thread.
+            while entry['data'] is None:
+                self._cond.wait()
+            if file_name in self._entries:
+                self._entries.move_to_end(file_name)
+            self._evict(keep=file_name)
+            self._cond.notify_all()
+            return entry['data']
 
     def close(self):
         if not self._closed:
-            for cf in self._cache_prefetchers:
-                cf.close()
-            self._closed = True
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            for t in self._threads:
+                t.join()
+            self._entries = OrderedDict()
+            self._total_bytes = 0
+
+
+def _normalization_scale(dtype):
+    if dtype == numpy.uint8:
+        return 1.0 / 255.0
+    elif dtype == numpy.uint16:
+        return 1.0 / 65535.0
+    return None
 
 
 class CacheDataSource(DataSource):
     '''
     Get data from file cache directly.
+
+    Args:
+        cachedir (str): Cache directory.
+        shuffle (bool): Indicates whether the dataset is shuffled or not.
+        rng (None or :obj:`numpy.random.RandomState`): Numpy random number
+            generator.
+        normalize (bool): If True, uint8 and uint16 data are normalized to [0, 1].
+        deferred_normalization (bool): If True with ``normalize``, uint8 and
+            uint16 data are provided as they are, and their scales are
+            available from :py:meth:`normalization_scales`. It reduces
+            the size of data passed to the destination.
     '''
 
-    def _get_next_data(self, filename, file_names_to_prefetch, retry=1):
-        if retry > 10:
-            logger.log(99, '_get_next_data() retry count over give up.')
-            raise
-        if self._cache_type == '.npy':
+    def _get_next_data(self, filename, file_names_to_prefetch):
+        if self._cache_type == '.mmap':
+            next_data = self._mmap_data
+        elif self._cache_type == '.npy':
             next_data = self._cache_reader_with_prefetch.open_and_prefetch_cache(
                 filename, file_names_to_prefetch)
         else:
@@ -196,52 +267,110 @@ class CacheDataSource(DataSource):
             with self._filereader.open_cache(filename) as cache:
                 for k, v in cache.items():
                     next_data[k] = v[()]
-
-        if current_communicator():
-            if set(self._variables) != set(next_data.keys()):
-                logger.log(99, '_get_next_data() fails at worker {} retrying count {}/10.'.format(
-                    current_communicator().rank, retry))
-                sleep(0.01)
-                return self._get_next_data(filename, file_names_to_prefetch, retry+1)
         return next_data
 
-    def _get_data(self, position):
-
-        self._position = position
-        if current_communicator():
-            try:
-                filename, index = self._order[position]
-            except IndexError:
-                logger.log(99, '_get_data() fails at worker {} retrying.'.format(
-                    current_communicator().rank))
-                sleep(0.01)
-                return self._get_data(position)
-        else:
-            filename, index = self._order[position]
-
+    def _open_cache_file(self, position, filename):
         if filename != self._current_filename:
             file_names_to_prefetch = None
             if self._cache_type == ".npy" and self._num_of_threads > 0:
                 file_names_to_prefetch = [o[0] for o in self._order[position + self._max_length:position + self._max_length *
-                                                                    self._num_of_threads:self._max_length]]
+                                                                    (self._prefetch_num_of_files + 1):self._max_length]]
 
             self._current_data = self._get_next_data(
                 filename, file_names_to_prefetch)
             self._current_filename = filename
 
-        data = [self._current_data[v][index] for v in self.variables]
-
-        if self._normalize:
-            new_data = []
-            for d in data:
-                if d.dtype == numpy.uint8:
-                    d = d.astype(numpy.float32) * (1.0 / 255.0)
-                elif d.dtype == numpy.uint16:
-                    d = d.astype(numpy.float32) * (1.0 / 65535.0)
-                new_data.append(d)
-            data = new_data
+    def _load_buffered_cache_file(self, filename, file_names_to_prefetch):
+        reader = self._cache_reader_with_prefetch
+        misses = reader.num_of_misses if reader else 0
+        start = time.time()
+        data = self._get_next_data(filename, file_names_to_prefetch)
+        stats = self._shuffle_buffer_stats
+        stats['reader_wait_time'] += time.time() - start
+        stats['reader_stalls'] += (reader.num_of_misses - misses
+                                   if reader else 1)
         return data
 
+    def _read_dtypes(self):
+        if self._cache_type == '.mmap':
+            return {v: d.dtype for v, d in self._mmap_data.items()}
+        filename = self._cache_files[0][0]
+        if self._cache_type == '.npy':
+            data = _read_cache_file(filename, self._variables)
+            return {v: d.dtype for v, d in data.items()}
+        with self._filereader.open_cache(filename) as cache:
+            return {k: v.dtype for k, v in cache.items()}
+
+    @property
+    def normalization_scales(self):
+        return dict(self._normalization_scales)
+
+    @property
+    def shuffle_buffer_stats(self):
+        '''
+        Statistics of the shuffle buffer in current epoch, or None if the
+        shuffle buffer is not used.
+
+        * ``mean_buffer_fill``: Mean number of samples in the buffer measured when a sample is drawn.
+        * ``file_loads``: Number of cache files loaded.
+        * ``reader_stalls``: Number of cache files which were not prefetched.
+        * ``reader_wait_time``: Time in seconds spent waiting for cache files.
+        '''
+        if self._shuffle_buffer is None:
+            return None
+        stats = dict(self._shuffle_buffer_stats)
+        stats['mean_buffer_fill'] = self._shuffle_buffer.mean_buffer_fill
+        stats['file_loads'] = self._shuffle_buffer.file_loads
+        return stats
+
+    def _normalize_data(self, d, out=None):
+        if self._normalize and not self._deferred_normalization:
+            scale = _normalization_scale(d.dtype)
+            if scale is not None:
+                return numpy.multiply(d, numpy.float32(scale), out=out, dtype=numpy.float32)
+        if out is not None:
+            out[...] = d
+            return out
+        return d
+
+    def _get_data(self, position):
+
+        self._position = position
+        if self._shuffle_buffer is not None:
+            d = self._shuffle_buffer.get(position)
+            return [self._normalize_data(d[v]) for v in self.variables]
+
+        filename, index = self._order[position]
+
+        self._open_cache_file(position, filename)
+
+        return [self._normalize_data(self._current_data[v][index])
+                for v in self.variables]
+
+    def _get_batch(self, positions, out=None):
+        if self._shuffle_buffer is not None:
+            samples = [self._shuffle_buffer.get(p) for p in positions]
+            data = []
+            for i, v in enumerate(self.variables):
+                d = numpy.stack([sample[v] for sample in samples])
+                data.append(self._normalize_data(
+                    d, out=None if out is None else out[i]))
+            return out if out is not None else data
+
+        orders = [self._order[p] for p in positions]
+        filenames = [o[0] for o in orders]
+        chunks = [[] for _ in self.variables]
+        for start, end in _runs(filenames):
+            self._open_cache_file(positions[start], filenames[start])
+            indexes = [o[1] for o in orders[start:end]]
+            for i, v in enumerate(self.variables):
+                d = numpy.take(self._current_data[v], indexes, axis=0)
+                if out is None:
+                    chunks[i].append(self._normalize_data(d))
+                else:
+                    self._normalize_data(d, out=out[i][start:end])
+        return out if out is not None else _concatenate_chunks(chunks)
+
     def initialize_cache_files(self, filename):
         length = -1
         with self._filereader.open_cache(filename) as cache:
@@ -300,7 +429,7 @@ class CacheDataSource(DataSource):
         except:
             self._cache_type = '.h5'
 
-    def __init__(self, cachedir, shuffle=False, rng=None, normalize=False):
+    def __init__(self, cachedir, shuffle=False, rng=None, normalize=False, deferred_normalization=False):
         super(CacheDataSource, self).__init__(shuffle=shuffle, rng=rng)
 
         self._current_data = {}
@@ -308,27 +437,58 @@ class CacheDataSource(DataSource):
 
         self._cachedir = cachedir
         self._normalize = normalize
+        self._deferred_normalization = deferred_normalization
+        self._normalization_scales = {}
         self._filereader = FileReader(self._cachedir)
         self._num_of_threads = int(nnabla_config.get(
             'DATA_ITERATOR', 'cache_file_cache_num_of_threads'))
+        self._prefetch_num_of_files = 0
+        if self._num_of_threads > 0:
+            self._prefetch_num_of_files = int(nnabla_config.get(
+                'DATA_ITERATOR', 'cache_file_prefetch_num_of_files'))
+        self._shuffle_buffer_size = int(nnabla_config.get(
+            'DATA_ITERATOR', 'cache_file_shuffle_buffer_size'))
+        self._shuffle_buffer_num_of_files = max(1, int(nnabla_config.get(
+            'DATA_ITERATOR', 'cache_file_shuffle_buffer_num_of_files')))
+        self._shuffle_buffer = None
         self._variables = None
 
         self._generation = -1
         self._cache_files = []
         self._max_length = 1
 
-        info_filename = os.path.join(self._cachedir, "cache_info.csv")
-        self.initialize_cache_info(info_filename)
+        self._mmap_data = None
+        if is_mmap_cache(self._cachedir):
+            # All data are treated as one file, so that shuffle is applied
+            # to entire dataset.
+            self._cache_type = '.mmap'
+            self._mmap_data, _ = load_mmap_cache(self._cachedir)
+            self._variables = list(self._mmap_data.keys())
+            length = len(self._mmap_data[self._variables[0]])
+            self._filenames = [self._cachedir]
+            self._cache_files = [(self._cachedir, length)]
+            self._max_length = length
+        else:
+            info_filename = os.path.join(self._cachedir, "cache_info.csv")
+            self.initialize_cache_info(info_filename)
 
-        index_filename = os.path.join(self._cachedir, "cache_index.csv")
-        self.initialize_cache_files_with_index(index_filename)
+            index_filename = os.path.join(self._cachedir, "cache_index.csv")
+            self.initialize_cache_files_with_index(index_filename)
 
         logger.info('{}'.format(len(self._cache_files)))
 
-        self._cache_reader_with_prefetch = CacheReaderWithPrefetch(
-            self._cachedir, self._num_of_threads, self._variables)
+        self._cache_reader_with_prefetch = None
+        if self._cache_type == '.npy':
+            self._cache_reader_with_prefetch = CacheReaderWithPrefetch(
+                self._cachedir, self._num_of_threads, self._variables)
         self._thread_lock = threading.Lock()
 
+        if normalize and deferred_normalization and self._cache_files:
+            for v, dtype in self._read_dtypes().items():
+                scale = _normalization_scale(dtype)
+                if scale is not None:
+                    self._normalization_scales[v] = scale
+
         self._original_order = []
         for i in range(len(self._cache_files)):
             filename, length = self._cache_files[i]
@@ -341,31 +501,68 @@ class CacheDataSource(DataSource):
         if hasattr(self, '_cache_reader_with_prefetch') and self._cache_reader_with_prefetch:
             self._cache_reader_with_prefetch.close()
             self._cache_reader_with_prefetch = None
+        self._mmap_data = None
+        self._current_data = {}
+        if self._shuffle_buffer is not None:
+            self._shuffle_buffer.close()
+
+    def _copy_in_original_order(self):
+        # The copy has its own state of reading cache files.
+        data_source = copy.copy(self)
+        data_source._shuffle = False
+        data_source._shuffle_buffer = None
+        data_source._thread_lock = threading.Lock()
+        data_source.reset()
+        return data_source
 
     def reset(self):
         with self._thread_lock:
             super(CacheDataSource, self).reset()
 
-            self._order = []
-
-            if self._shuffle:
+            if self._shuffle_buffer is not None:
+                stats = self.shuffle_buffer_stats
+                logger.info('Shuffle buffer: mean fill {:.1f}/{}, {} file loads, {} reader stalls, {:.3f} sec waiting.'.format(
+                    stats['mean_buffer_fill'], stats['buffer_size'], stats['file_loads'],
+                    stats['reader_stalls'], stats['reader_wait_time']))
+                self._shuffle_buffer.close()
+                self._shuffle_buffer = None
+
+            # New order is replaced at once, so that it is never seen
+            # partially filled.
+            # Memory-mapped cache is shuffled globally without the buffer.
+            if self._shuffle and self._shuffle_buffer_size > 0 and \
+                    self._cache_type != '.mmap':
+                self._shuffle_buffer_stats = {
+                    'buffer_size': self._shuffle_buffer_size,
+                    'num_of_files': self._shuffle_buffer_num_of_files,
+                    'reader_stalls': 0,
+                    'reader_wait_time': 0.0}
+                self._shuffle_buffer = ShuffleBuffer(
+                    self._cache_files, self._shuffle_buffer_size,
+                    self._shuffle_buffer_num_of_files, self._rng,
+                    self._load_buffered_cache_file,
+                    self._prefetch_num_of_files)
+                order = self._shuffle_buffer.order
+            elif self._shuffle:
+                order = []
                 for i in list(self._rng.permutation(list(range(len(self._cache_files))))):
                     filename, length = self._cache_files[i]
                     for j in list(self._rng.permutation(list(range(length)))):
-                        self._order.append((filename, j))
+                        order.append((filename, j))
             else:
-                for i in range(len(self._cache_files)):
-                    filename, length = self._cache_files[i]
-                    for j in range(length):
-                        self._order.append((filename, j))
+                order = self._original_order
 
             self._current_data = {}
             self._current_filename = None
 
+            self._order = order
             self._size = len(self._order)
             self._generation += 1
 
 
+_CSV_CHUNK_SIZE = 65536
+
+
 class CsvDataSource(DataSource):
     '''
     '''
@@ -433,40 +630,133 @@ class CsvDataSource(DataSource):
             value = load(ext)(f, normalize=self._normalize)
         return value
 
+    def _read_columns(self, csvreader, num_of_header_columns, column_indexes):
+        # Read rows chunk by chunk, numeric columns are converted into arrays
+        # at once. Cells of other columns are kept as they are.
+        chunks = [[] for _ in column_indexes]
+        numeric = [True for _ in column_indexes]
+        self._irregular_rows = set()
+        size = 0
+        while True:
+            rows = list(itertools.islice(csvreader, _CSV_CHUNK_SIZE))
+            if not rows:
+                break
+            for i, row in enumerate(rows):
+                if len(row) != num_of_header_columns:
+                    self._irregular_rows.add(size + i)
+                    rows[i] = ['nan'] * num_of_header_columns
+            cells = list(zip(*rows))
+            for j, c in enumerate(column_indexes):
+                try:
+                    chunks[j].append(numpy.array(cells[c],
+                                                 dtype=numpy.float64))
+                except ValueError:
+                    numeric[j] = False
+                    chunks[j].append(list(cells[c]))
+            size += len(rows)
+
+        columns = []
+        for j in range(len(column_indexes)):
+            if numeric[j]:
+                columns.append(numpy.concatenate(chunks[j]) if chunks[j]
+                               else numpy.zeros(0))
+            else:
+                column = []
+                for chunk in chunks[j]:
+                    column.extend(chunk.tolist() if isinstance(
+                        chunk, numpy.ndarray) else chunk)
+                columns.append(column)
+            chunks[j] = None
+        return size, columns, numeric
+
+    def _get_cell(self, value, is_vector=False):
+        if isinstance(value, float):
+            return [value] if is_vector else value
+        return self._get_value(value, is_vector)
+
+    def _get_row(self, row):
+        if row in self._irregular_rows:
+            return ()
+        values = []
+        for variable in self._variables:
+            if variable in self._arrays:
+                values.append(self._arrays[variable][row])
+            else:
+                cells = [c[row] for c in self._cells[variable]]
+                if isinstance(self._variables_dict[variable], list):
+                    values.append([self._get_cell(c) for c in cells])
+                else:
+                    values.append(self._get_cell(cells[0], is_vector=True))
+        return tuple(values)
+
     def _get_data(self, position):
-        return tuple(self._process_row(self._rows[self._order[position]]))
+        return self._get_row(self._order[position])
+
+    def _get_batch(self, positions, out=None):
+        if len(self._arrays) < len(self._variables) or self._irregular_rows:
+            return None
+        rows = self._order[positions]
+        if out is None:
+            return [numpy.take(self._arrays[v], rows, axis=0) for v in self._variables]
+        for v, o in zip(self._variables, out):
+            numpy.take(self._arrays[v], rows, axis=0, out=o, mode='clip')
+        return out
+
+    def _sample_keys(self, positions):
+        return [self._order[p] for p in positions]
+
+    def _load_sample(self, key):
+        return self._get_row(key)
 
     def __init__(self, filename, shuffle=False, rng=None, normalize=False):
         super(CsvDataSource, self).__init__(shuffle=shuffle, rng=rng)
         self._filename = filename
         self._normalize = normalize
 
-        # Store contents of CSV file into the self._rows list.
+        # Store contents of CSV file column by column. Variables whose
+        # columns are all numeric are stored as arrays, and others (e.g.
+        # file names of images) are stored as cells and loaded on access.
         self._generation = -1
-        self._rows = []
         self._filereader = FileReader(self._filename)
         with self._filereader.open(textmode=True, encoding='utf-8-sig') as f:
             csvreader = csv.reader(f)
             header = next(csvreader)
-            self._rows = list(csvreader)
-            self._size = len(self._rows)
-            self._remove_comment_cols(header, self._rows)
-            self._process_header(header)
+            column_indexes = [i for i, h in enumerate(header) if h[0] != '#']
+            self._size, columns, numeric = self._read_columns(
+                csvreader, len(header), column_indexes)
+            self._process_header([header[i] for i in column_indexes])
+
+        self._arrays = OrderedDict()
+        self._cells = OrderedDict()
+        for variable in self._variables_dict:
+            variable_columns = [j for j, (v, _, _) in enumerate(self._columns)
+                                if v == variable]
+            if all(numeric[j] for j in variable_columns):
+                self._arrays[variable] = numpy.stack(
+                    [columns[j] for j in variable_columns], axis=1)
+            else:
+                self._cells[variable] = [columns[j] for j in variable_columns]
+        del columns
+
         self._original_source_uri = self._filename
         self._original_order = list(range(self._size))
-        self._order = list(range(self._size))
+        self._order = numpy.arange(self._size)
         self._variables = tuple(self._variables_dict.keys())
         self.reset()
 
     def reset(self):
         if self._shuffle:
             logger.debug('Shuffle start.')
-            self._order = list(
-                self._rng.permutation(list(range(self._size))))
+            self._order = self._rng.permutation(self._size)
             logger.debug('Shuffle end.')
         self._generation += 1
         super(CsvDataSource, self).reset()
 
+    def _copy_in_original_order(self):
+        data_source = super(CsvDataSource, self)._copy_in_original_order()
+        data_source._order = numpy.arange(self._size)
+        return data_source
+
 
 class ConcatDataSource(DataSource):
     '''ConcatDataSource
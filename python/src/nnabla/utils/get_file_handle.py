@@ -13,15 +13,20 @@
 # limitations under the License.
 
 import contextlib
+import hashlib
+import tempfile
 import zipfile
 import h5py
 import io
 import os
 import re
+import struct
+import sys
 import numpy
 import google.protobuf.text_format as text_format
 from collections import OrderedDict
 
+from nnabla.config import nnabla_config
 from nnabla.logger import logger
 from nnabla.utils import nnabla_pb2
 from nnabla.utils.nnp_format import nnp_version
@@ -51,7 +56,7 @@ def get_file_handle_load(nnp, path, ext):
             else:
                 need_close = True
                 f = open(path, 'r')
-        elif ext == '.protobuf':
+        elif ext in ['.protobuf', '.params']:
             if hasattr(path, 'read'):
                 need_close = False
                 f = path
@@ -92,7 +97,7 @@ def get_file_handle_save(path, ext):
         else:
             need_close = True
             f = open(path, 'w')
-    elif ext == '.protobuf':
+    elif ext in ['.protobuf', '.params']:
         if hasattr(path, 'read'):
             need_close = False
             f = path
@@ -109,10 +114,209 @@ def get_file_handle_save(path, ext):
         path.seek(0)
 
 
+# Raw tensor parameter format (.params)
+#
+# All values are little-endian.
+#
+#   header:  magic b'NNBP', uint32 version, uint32 number of parameters
+#   entry:   uint32 length and utf-8 bytes of name,
+#            uint8 length and ascii bytes of numpy dtype string (e.g. '<f4'),
+#            uint8 need_grad, uint32 ndim, int64 dims[ndim],
+#            uint64 offset of data from the beginning of file, uint64 nbytes
+#   data:    contiguous C-order bytes of each parameter, aligned to
+#            _RAW_PARAMETER_ALIGNMENT bytes.
+#
+# Since data is not encoded, it is written and read by memory copy, and
+# can be memory-mapped when the file is stored uncompressed.
+_RAW_PARAMETER_MAGIC = b'NNBP'
+_RAW_PARAMETER_VERSION = 1
+_RAW_PARAMETER_ALIGNMENT = 64
+
+
+class RawParameterEntry(object):
+    '''Header entry of a parameter in .params file.
+    '''
+
+    def __init__(self, name, dtype, shape, need_grad, offset, nbytes):
+        self.name = name
+        self.dtype = dtype
+        self.shape = shape
+        self.need_grad = need_grad
+        self.offset = offset
+        self.nbytes = nbytes
+
+
+def _raw_parameter_align(n):
+    return (n + _RAW_PARAMETER_ALIGNMENT - 1) // _RAW_PARAMETER_ALIGNMENT * _RAW_PARAMETER_ALIGNMENT
+
+
+def _raw_parameter_entry_size(name, dtype, shape):
+    return 4 + len(name) + 1 + len(dtype) + 1 + 4 + 8 * len(shape) + 8 + 8
+
+
+def write_raw_parameters(f, parameters):
+    '''Write parameters to a binary file object in .params format.
+
+    Args:
+        f (file object): Writable binary file object. Seek is not required.
+        parameters (dict): Dictionary of parameter name to
+            :obj:`~nnabla.Variable`.
+
+    Returns:
+        list of :obj:`RawParameterEntry`
+    '''
+    arrays = []
+    header_size = 12
+    for name, variable in parameters.items():
+        d = numpy.asarray(variable.d)
+        d = numpy.ascontiguousarray(d, dtype=d.dtype.newbyteorder('<'))
+        name = name.encode('utf-8')
+        arrays.append((name, d, variable.need_grad))
+        header_size += _raw_parameter_entry_size(
+            name, d.dtype.str, d.shape)
+
+    f.write(struct.pack('<4sII', _RAW_PARAMETER_MAGIC,
+                        _RAW_PARAMETER_VERSION, len(arrays)))
+    offset = _raw_parameter_align(header_size)
+    entries = []
+    for name, d, need_grad in arrays:
+        entries.append(RawParameterEntry(name.decode('utf-8'), d.dtype, d.shape,
+                                         bool(need_grad), offset, d.nbytes))
+        dtype = d.dtype.str.encode('ascii')
+        f.write(struct.pack('<I', len(name)) + name)
+        f.write(struct.pack('<B', len(dtype)) + dtype)
+        f.write(struct.pack('<BI', bool(need_grad), d.ndim))
+        f.write(struct.pack('<{}q'.format(d.ndim), *d.shape))
+        f.write(struct.pack('<QQ', offset, d.nbytes))
+        offset = _raw_parameter_align(offset + d.nbytes)
+
+    position = header_size
+    for _, d, _ in arrays:
+        f.write(b'\0' * (_raw_parameter_align(position) - position))
+        f.write(memoryview(d.reshape(-1)).cast('B'))
+        position = _raw_parameter_align(position) + d.nbytes
+    return entries
+
+
+def read_raw_parameter_header(f):
+    '''Read header of .params file.
+
+    Args:
+        f (file object): Readable binary file object positioned at the
+            beginning of .params file.
+
+    Returns:
+        list of :obj:`RawParameterEntry`
+    '''
+    def _read(fmt):
+        size = struct.calcsize(fmt)
+        buf = f.read(size)
+        if len(buf) != size:
+            raise ValueError('Unexpected end of parameter file.')
+        return struct.unpack(fmt, buf)
+
+    magic, version, num = _read('<4sII')
+    if magic != _RAW_PARAMETER_MAGIC:
+        raise ValueError('Not a raw parameter file.')
+    if version > _RAW_PARAMETER_VERSION:
+        raise ValueError(
+            'Unsupported raw parameter file version {}.'.format(version))
+    entries = []
+    for _ in range(num):
+        name = f.read(_read('<I')[0]).decode('utf-8')
+        dtype = numpy.dtype(f.read(_read('<B')[0]).decode('ascii'))
+        need_grad, ndim = _read('<BI')
+        shape = _read('<{}q'.format(ndim))
+        offset, nbytes = _read('<QQ')
+        entries.append(RawParameterEntry(
+            name, dtype, shape, bool(need_grad), offset, nbytes))
+    return entries
+
+
+def read_raw_parameters(f):
+    '''Read parameters from .params file.
+
+    Data is read sequentially, so that ``f`` does not need to be seekable.
+
+    Args:
+        f (file object): Readable binary file object positioned at the
+            beginning of .params file.
+
+    Yields:
+        Tuple of :obj:`RawParameterEntry` and :obj:`numpy.ndarray`.
+    '''
+    entries = read_raw_parameter_header(f)
+    position = 12 + sum(_raw_parameter_entry_size(e.name.encode('utf-8'), e.dtype.str, e.shape)
+                        for e in entries)
+    for e in entries:
+        f.read(e.offset - position)
+        buf = f.read(e.nbytes)
+        if len(buf) != e.nbytes:
+            raise ValueError('Unexpected end of parameter file.')
+        position = e.offset + e.nbytes
+        yield e, numpy.frombuffer(buf, dtype=e.dtype).reshape(e.shape)
+
+
 def get_buf_type(filename):
     return filename.split('_')[-1].split('.')[1].lower()
 
 
+def _nntxt_cache_path(text):
+    cache_dir = nnabla_config.get('MISC', 'nnp_cache_dir')
+    if not cache_dir:
+        return None
+    h = hashlib.sha256(nn.__version__.encode('utf-8') + b'\0')
+    h.update(text)
+    return os.path.join(os.path.expanduser(cache_dir),
+                        h.hexdigest() + '.protobuf')
+
+
+def _parse_nntxt(nnp, filename, ext):
+    '''Parse .nntxt or .prototxt into NNablaProtoBuf.
+    If nnp_cache_dir is configured, the parsed result is cached in binary
+    protobuf keyed by the content, so that the text is parsed only once.
+    '''
+    proto = nnabla_pb2.NNablaProtoBuf()
+    with get_file_handle_load(nnp, filename, ext) as f:
+        text = f.read()
+    if not isinstance(text, bytes):
+        text = text.encode('utf-8')
+    cache_path = _nntxt_cache_path(text)
+    if cache_path is not None and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                proto.ParseFromString(f.read())
+            return proto
+        except Exception:
+            logger.warning('Ignored broken cache {}.'.format(cache_path))
+            proto.Clear()
+    try:
+        text_format.Merge(text.decode('utf-8'), proto)
+    except:
+        logger.critical('Failed to read {}.'.format(filename))
+        logger.critical(
+            '2 byte characters may be used for file name or folder name.')
+        raise
+    if cache_path is not None:
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Write with a temporary name, since other processes may read it.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_path))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(proto.SerializeToString())
+            os.replace(tmp, cache_path)
+            tmp = None
+        except OSError as e:
+            logger.warning(
+                'Failed to write cache {}: {}'.format(cache_path, e))
+        finally:
+            # Temporary file is left if it was not renamed.
+            if tmp is not None:
+                os.remove(tmp)
+    return proto
+
+
 # TODO: Here is some known problems.
 #   - Even when protobuf file includes network structure,
 #     it will not loaded.
@@ -124,28 +328,27 @@ def _nntxt_file_loader(ctx, file_loaders, nnp, filename, ext):
     This loader only loads .nntxt or .prototxt files
     '''
     if not ctx.parameter_only:
-        with get_file_handle_load(nnp, filename, ext) as f:
-            try:
-                text_format.Merge(f.read(), ctx.proto)
-            except:
-                logger.critical('Failed to read {}.'.format(filename))
-                logger.critical(
-                    '2 byte characters may be used for file name or folder name.')
-                raise
+        ctx.proto.MergeFrom(_parse_nntxt(nnp, filename, ext))
     if len(ctx.proto.parameter) > 0:
         if not ctx.exclude_parameter:
             _nntxt_parameter_file_loader(ctx, file_loaders, nnp, filename, ext)
 
 
 def _parameter_file_loader(ctx, file_loaders, nnp, filename, ext):
-    '''.protobuf, .h5
+    '''.protobuf, .h5, .params, .ckpt
     protobuf file loader
-    This handler only handles .protobuf or .h5 files
-    Currently, .h5 files are always treated as parameter file
+    This handler only handles .protobuf, .h5, .params or .ckpt files
+    Currently, .h5, .params and .ckpt files are always treated as parameter file
     '''
     if not ctx.exclude_parameter:
         if ext == ".h5":
             _h5_parameter_file_loader(ctx, file_loaders, nnp, filename, ext)
+        elif ext == ".params":
+            _raw_parameter_file_loader(
+                ctx, file_loaders, nnp, filename, ext)
+        elif ext == ".ckpt":
+            _sharded_parameter_file_loader(
+                ctx, file_loaders, nnp, filename, ext)
         elif ext == ".protobuf":
             _pb_parameter_file_loader(ctx, file_loaders, nnp, filename, ext)
         else:
@@ -249,35 +452,225 @@ def _opti_file_loader(ctx, fileloaders, nnp, filename, ext):
                 "No matched optimizer is found for {}.".format(filename))
 
 
-def _h5_parameter_file_loader(ctx, file_loader, nnp, filename, ext):
-    with get_file_handle_load(nnp, filename, ext) as hd:
-        keys = []
+class _FileRegion(io.RawIOBase):
+    '''Read-only file object of a region of a file.
 
-        def _get_keys(name):
-            ds = hd[name]
-            if not isinstance(ds, h5py.Dataset):
-                # Group
-                return
-            # To preserve order of parameters
-            keys.append((ds.attrs.get('index', None), name))
+    It is used to read a member stored uncompressed in .nnp without reading
+    the whole member.
+    '''
+
+    def __init__(self, path, offset, size):
+        super(_FileRegion, self).__init__()
+        self._f = open(path, 'rb')
+        self._offset = offset
+        self._size = size
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            pos += self._pos
+        elif whence == io.SEEK_END:
+            pos += self._size
+        self._pos = max(pos, 0)
+        return self._pos
+
+    def readinto(self, b):
+        n = max(min(len(b), self._size - self._pos), 0)
+        self._f.seek(self._offset + self._pos)
+        n = self._f.readinto(memoryview(b)[:n])
+        self._pos += n
+        return n
+
+    def close(self):
+        self._f.close()
+        super(_FileRegion, self).close()
+
+
+def _lazy_source(nnp, filename):
+    '''Returns path, offset and size of ``filename`` which can be memory-mapped.
+
+    Returns None if the file is a file object or a compressed member of .nnp.
+    '''
+    if nnp is None:
+        if not isinstance(filename, str):
+            return None
+        return filename, 0, os.path.getsize(filename)
+    if not isinstance(nnp.filename, str):
+        return None
+    info = nnp.getinfo(filename)
+    if info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+        return None
+    # Data follows the local file header, whose extra field may differ from
+    # the one in the central directory.
+    with open(nnp.filename, 'rb') as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    return nnp.filename, info.header_offset + 30 + name_length + extra_length, info.file_size
+
+
+# Whether memory maps can be borrowed by parameters, checked only once.
+_lazy_array_supported = None
+
+
+def _lazy_array_available():
+    global _lazy_array_supported
+    if _lazy_array_supported is None:
+        _lazy_array_supported = hasattr(numpy.ndarray, '__dlpack__')
+        if _lazy_array_supported:
+            try:
+                from nnabla.utils import dlpack
+            except ImportError:
+                _lazy_array_supported = False
+    return _lazy_array_supported
+
+
+def _set_lazy_parameter(ctx, name, path, offset, dtype, shape, need_grad):
+    '''Create a parameter backed by a copy-on-write memory map of ``path``.
+
+    Pages are read when they are touched, and are shared with other
+    processes mapping the same file until they are written. If the data
+    cannot be borrowed, it is copied to the parameter.
+    '''
+    dtype = numpy.dtype(dtype)
+    shape = tuple(shape)
+    var = nn.parameter.get_parameter_or_create(
+        name, shape, need_grad=need_grad)
+    if int(numpy.prod(shape)) > 0:
+        d = numpy.memmap(path, dtype=dtype, mode='c',
+                         offset=offset, shape=shape)
+        if dtype.isnative and ctx.lazy_available:
+            from nnabla.utils.dlpack import from_dlpack
+            from_dlpack(d.__dlpack__(), arr=var.data)
+        else:
+            var.data.cast(dtype.newbyteorder('='))[...] = d
 
-        hd.visit(_get_keys)
-        for _, key in sorted(keys):
-            ds = hd[key]
+    if hasattr(ctx, "needs_proto") and ctx.needs_proto:
+        parameter = ctx.proto.parameter.add()
+        parameter.variable_name = name
+        parameter.shape.dim.extend(shape)
+        parameter.data.extend(numpy.asarray(var.d).flatten().tolist())
+        parameter.need_grad = need_grad
 
+
+def _get_lazy_source(ctx, nnp, filename):
+    if not (hasattr(ctx, "lazy") and ctx.lazy):
+        return None
+    if not hasattr(ctx, "lazy_available"):
+        ctx.lazy_available = _lazy_array_available()
+        if not ctx.lazy_available:
+            logger.warning(
+                'Parameters are copied since DLPack is not available.')
+    return _lazy_source(nnp, filename)
+
+
+def _h5_parameter_file_loader(ctx, file_loader, nnp, filename, ext):
+    source = _get_lazy_source(ctx, nnp, filename)
+    if source is not None:
+        path, base, _ = source
+        with h5py.File(_FileRegion(*source), 'r') as hd:
+            for _, key in _h5_parameter_keys(hd):
+                ds = hd[key]
+                offset = ds.id.get_offset()
+                if offset is None or ds.chunks is not None:
+                    _set_h5_parameter(ctx, key, ds)
+                else:
+                    _set_lazy_parameter(ctx, key, path, base + offset, ds.dtype,
+                                        ds.shape, bool(ds.attrs['need_grad']))
+        return
+
+    with get_file_handle_load(nnp, filename, ext) as hd:
+        for _, key in _h5_parameter_keys(hd):
+            _set_h5_parameter(ctx, key, hd[key])
+
+
+def _h5_parameter_keys(hd):
+    keys = []
+
+    def _get_keys(name):
+        ds = hd[name]
+        if not isinstance(ds, h5py.Dataset):
+            # Group
+            return
+        # To preserve order of parameters
+        keys.append((ds.attrs.get('index', None), name))
+
+    hd.visit(_get_keys)
+    return sorted(keys)
+
+
+def _set_h5_parameter(ctx, key, ds):
+    var = nn.parameter.get_parameter_or_create(
+        key, ds.shape, need_grad=ds.attrs['need_grad'])
+    var.data.cast(ds.dtype)[...] = ds[...]
+
+    if hasattr(ctx, "needs_proto") and ctx.needs_proto:
+        parameter = ctx.proto.parameter.add()
+        parameter.variable_name = key
+        parameter.shape.dim.extend(ds.shape)
+        parameter.data.extend(
+            numpy.array(ds[...]).flatten().tolist())
+        parameter.need_grad = False
+        if ds.attrs['need_grad']:
+            parameter.need_grad = True
+
+
+def _raw_parameter_file_loader(ctx, file_loaders, nnp, filename, ext):
+    source = _get_lazy_source(ctx, nnp, filename)
+    if source is not None:
+        path, base, _ = source
+        with _FileRegion(*source) as f:
+            entries = read_raw_parameter_header(f)
+        for e in entries:
+            _set_lazy_parameter(ctx, e.name, path, base + e.offset, e.dtype,
+                                e.shape, e.need_grad)
+        return
+
+    with get_file_handle_load(nnp, filename, ext) as f:
+        for e, d in read_raw_parameters(f):
             var = nn.parameter.get_parameter_or_create(
-                key, ds.shape, need_grad=ds.attrs['need_grad'])
-            var.data.cast(ds.dtype)[...] = ds[...]
+                e.name, e.shape, need_grad=e.need_grad)
+            var.data.cast(d.dtype)[...] = d
 
             if hasattr(ctx, "needs_proto") and ctx.needs_proto:
                 parameter = ctx.proto.parameter.add()
-                parameter.variable_name = key
-                parameter.shape.dim.extend(ds.shape)
-                parameter.data.extend(
-                    numpy.array(ds[...]).flatten().tolist())
-                parameter.need_grad = False
-                if ds.attrs['need_grad']:
-                    parameter.need_grad = True
+                parameter.variable_name = e.name
+                parameter.shape.dim.extend(e.shape)
+                parameter.data.extend(d.flatten().tolist())
+                parameter.need_grad = e.need_grad
+
+
+def _sharded_parameter_file_loader(ctx, file_loaders, nnp, filename, ext):
+    from nnabla.utils.sharded_parameters import read_manifest, read_sharded, select_entries
+    assert nnp is None and isinstance(
+        filename, str), ".ckpt must be loaded by its path."
+    names = ctx.names if hasattr(ctx, "names") else None
+    if _get_lazy_source(ctx, nnp, filename) is not None:
+        for e in select_entries(read_manifest(filename), names):
+            _set_lazy_parameter(ctx, e['name'], e['path'], e['offset'], e['dtype'],
+                                e['shape'], e['need_grad'])
+        return
+
+    for e, d in read_sharded(filename, names):
+        var = nn.parameter.get_parameter_or_create(
+            e['name'], e['shape'], need_grad=e['need_grad'])
+        var.data.cast(d.dtype)[...] = d
+
+        if hasattr(ctx, "needs_proto") and ctx.needs_proto:
+            parameter = ctx.proto.parameter.add()
+            parameter.variable_name = e['name']
+            parameter.shape.dim.extend(e['shape'])
+            parameter.data.extend(d.flatten().tolist())
+            parameter.need_grad = e['need_grad']
 
 
 def _pb_parameter_file_loader(ctx, file_loaders, nnp, filename, ext):
@@ -291,9 +684,8 @@ def _pb_parameter_file_loader(ctx, file_loaders, nnp, filename, ext):
 
 
 def _nntxt_parameter_file_loader(ctx, file_loaders, nnp, filename, ext):
-    with get_file_handle_load(nnp, filename, ext) as f:
-        text_format.Merge(f.read(), ctx.proto)
-        nn.parameter.set_parameter_from_proto(ctx.proto)
+    ctx.proto.MergeFrom(_parse_nntxt(nnp, filename, ext))
+    nn.parameter.set_parameter_from_proto(ctx.proto)
 
 
 def _nnp_parameter_file_loader(ctx, file_loaders, nnp, filename, ext):
@@ -303,6 +695,8 @@ def _nnp_parameter_file_loader(ctx, file_loaders, nnp, filename, ext):
 def get_parameter_file_loader():
     file_loaders = OrderedDict([
         ('.h5', _h5_parameter_file_loader),
+        ('.params', _raw_parameter_file_loader),
+        ('.ckpt', _sharded_parameter_file_loader),
         ('.protobuf', _pb_parameter_file_loader),
         ('.nntxt,.prototxt', _nntxt_parameter_file_loader),
         ('.nnp', _nnp_parameter_file_loader)
@@ -317,7 +711,7 @@ def get_initial_file_loader():
     '''
     file_loaders = OrderedDict([
         ('.nntxt,.prototxt', _nntxt_file_loader),
-        ('.protobuf,.h5', _parameter_file_loader),
+        ('.protobuf,.h5,.params,.ckpt', _parameter_file_loader),
         ('.nnp', _nnp_file_loader)
     ])
     return file_loaders
@@ -331,7 +725,7 @@ def get_decorated_file_loader():
     '''
     file_loaders = OrderedDict([
         ('.optimizer', _opti_file_loader),
-        ('.protobuf,.h5', _parameter_file_loader),
+        ('.protobuf,.h5,.params,.ckpt', _parameter_file_loader),
         ('.nnp', _nnp_parameter_file_loader)
     ])
     return file_loaders
@@ -395,17 +789,45 @@ def _nnp_file_saver(ctx, filename, ext):
     version.write('{}\n'.format(nnp_version()))
     version.seek(0)
 
-    param = io.BytesIO()
     if ctx.parameters is None:
-        nn.parameter.save_parameters(param, extension='.protobuf')
+        parameters = nn.parameter.get_parameters(grad_only=False)
     else:
-        nn.parameter.save_parameters(
-            param, ctx.parameters, extension='.protobuf')
+        parameters = ctx.parameters
 
     with get_file_handle_save(filename, ext) as nnp:
         nnp.writestr('nnp_version.txt', version.read())
         nnp.writestr('network.nntxt', nntxt.read())
-        nnp.writestr('parameter.protobuf', param.read())
+        # Parameters are streamed into the archive without compression,
+        # so that they can be read by memory copy or memory-mapped.
+        info = zipfile.ZipInfo('parameter.params')
+        info.compress_type = zipfile.ZIP_STORED
+        if sys.version_info >= (3, 6):
+            _align_zip_member(nnp, info, True)
+            with nnp.open(info, 'w', force_zip64=True) as f:
+                write_raw_parameters(f, parameters)
+        else:
+            # ZipFile.open() cannot write a member before Python 3.6.
+            buf = io.BytesIO()
+            write_raw_parameters(buf, parameters)
+            data = buf.getvalue()
+            _align_zip_member(nnp, info, len(data) > zipfile.ZIP64_LIMIT)
+            nnp.writestr(info, data)
+
+
+def _align_zip_member(nnp, info, zip64):
+    '''Pad the extra field of ``info`` so that data of the member starts at
+    an aligned offset, which allows memory-mapped parameters to be aligned.
+    '''
+    try:
+        position = nnp.fp.tell()
+    except (AttributeError, OSError):
+        return
+    # Local file header, file name and zip64 extra field written by zipfile.
+    header_size = 30 + len(info.filename.encode('utf-8')) + 4
+    if zip64:
+        header_size += 20
+    padding = -(position + header_size) % _RAW_PARAMETER_ALIGNMENT
+    info.extra = struct.pack('<HH', 0xD935, padding) + b'\0' * padding
 
 
 def _h5_parameter_file_saver(ctx, filename, ext):
@@ -417,6 +839,22 @@ def _h5_parameter_file_saver(ctx, filename, ext):
             hd[k].attrs['index'] = i
 
 
+def _raw_parameter_file_saver(ctx, filename, ext):
+    with get_file_handle_save(filename, ext) as f:
+        write_raw_parameters(f, ctx.parameters)
+
+
+def _sharded_parameter_file_saver(ctx, filename, ext):
+    from nnabla.utils.sharded_parameters import save_sharded
+    assert isinstance(filename, str), ".ckpt must be saved by its path."
+    rank = ctx.rank if hasattr(ctx, "rank") else 0
+    num_ranks = ctx.num_ranks if hasattr(ctx, "num_ranks") else 1
+    barrier = ctx.barrier if hasattr(ctx, "barrier") else None
+    written = save_sharded(filename, ctx.parameters, rank, num_ranks, barrier)
+    logger.info("Saving {} (rank {} of {}), {} bytes written".format(
+        filename, rank, num_ranks, written))
+
+
 def _protobuf_parameter_file_saver(ctx, filename, ext):
     proto = nnabla_pb2.NNablaProtoBuf()
     for variable_name, variable in ctx.parameters.items():
@@ -445,6 +883,8 @@ def get_parameter_file_savers():
     '''
     file_savers = OrderedDict([
         ('.h5', _h5_parameter_file_saver),
+        ('.params', _raw_parameter_file_saver),
+        ('.ckpt', _sharded_parameter_file_saver),
         ('.protobuf', _protobuf_parameter_file_saver)
     ])
     return file_savers
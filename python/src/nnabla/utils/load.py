@@ -25,6 +25,7 @@ import itertools
 
 from nnabla.initializer import (
     NormalInitializer, UniformInitializer, ConstantInitializer, RangeInitializer)
+from nnabla.config import nnabla_config
 from nnabla.logger import logger
 
 from nnabla.utils import nnabla_pb2
@@ -382,6 +383,8 @@ def _create_dataset(
     dataset.uri = uri
     dataset.cache_dir = cache_dir
     dataset.normalize = not no_image_normalization
+    deferred_normalization = nnabla_config.get(
+        'DATA_ITERATOR', 'cache_file_deferred_normalization') == 'True'
 
     comm = current_communicator()
 
@@ -416,7 +419,8 @@ def _create_dataset(
                     comm.barrier()
             rng = numpy.random.RandomState(dataset_index)
             dataset.data_iterator = (lambda: data_iterator_cache(
-                cache_dir, batch_size, shuffle, rng=rng, normalize=dataset.normalize, with_memory_cache=use_memory_cache))
+                cache_dir, batch_size, shuffle, rng=rng, normalize=dataset.normalize, with_memory_cache=use_memory_cache,
+                deferred_normalization=deferred_normalization))
         elif not cache_dir or overwrite_cache or not os.path.exists(cache_dir) or len(os.listdir(cache_dir)) == 0:
             if comm:
                 logger.critical(
@@ -433,7 +437,8 @@ def _create_dataset(
                     uri, batch_size, shuffle, rng=rng, normalize=dataset.normalize, cache_dir=cache_dir))
         else:
             dataset.data_iterator = (lambda: data_iterator_cache(
-                cache_dir, batch_size, shuffle, rng=rng, normalize=dataset.normalize, with_memory_cache=use_memory_cache))
+                cache_dir, batch_size, shuffle, rng=rng, normalize=dataset.normalize, with_memory_cache=use_memory_cache,
+                deferred_normalization=deferred_normalization))
     else:
         dataset.data_iterator = None
     return dataset
@@ -600,7 +605,7 @@ def load(filenames, prepare_data_iterator=True, batch_size=None, exclude_paramet
 
     Args:
         filenames (list): file-like object or List of filenames.
-        extension: if filenames is file-like object, extension is one of ".nntxt", ".prototxt", ".protobuf", ".h5", ".nnp".
+        extension: if filenames is file-like object, extension is one of ".nntxt", ".prototxt", ".protobuf", ".h5", ".params", ".nnp".
     Returns:
         dict: Network information.
     '''
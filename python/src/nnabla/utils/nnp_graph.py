@@ -78,6 +78,19 @@ class NnpNetwork(object):
     def variables(self):
         return self._variables
 
+    def plan_memory(self, ctx=None):
+        '''Create a static memory plan of the network for inference.
+
+        Args:
+            ctx (:obj:`~nnabla.Context`): Context where the arena is
+                allocated. If None, the current context is used.
+
+        Returns:
+            :obj:`~nnabla.MemoryPlan`: Call ``forward()`` of it to execute
+            the network with the planned memory.
+        '''
+        return nn.MemoryPlan(list(self._outputs.values()), ctx)
+
 
 class NnpLoader(object):
     '''An NNP file loader.
@@ -85,6 +98,8 @@ class NnpLoader(object):
     Args:
         filepath : file-like object or filepath.
         extension: if filepath is file-like object, extension is one of ".nnp", ".nntxt", ".prototxt".
+        lazy (bool): If True, parameters are memory-mapped from the file
+            instead of being copied. See :func:`nnabla.core.graph_def.load`.
 
     Example:
 
@@ -107,13 +122,14 @@ class NnpLoader(object):
 
     '''
 
-    def __init__(self, filepath, scope=None, extension=".nntxt"):
+    def __init__(self, filepath, scope=None, extension=".nntxt", lazy=False):
         # OrderedDict maintains loaded parameters from nnp files.
         # The loaded parameters will be copied to the current
         # scope when get_network is called.
         self._params = scope if scope else OrderedDict()
         self.g = nn.graph_def.load(
-            filepath, parameter_scope=self._params, rng=np.random.RandomState(1223), extension=extension)
+            filepath, parameter_scope=self._params, rng=np.random.RandomState(1223), extension=extension,
+            lazy=lazy)
         self.network_dict = {
             name: pn for name, pn in self.g.networks.items()
         }
@@ -340,7 +340,8 @@ def save(filename, contents, include_params=False, variable_batch_size=True, ext
         filename (str or file object): Filename to store information. The file
             extension is used to determine the saving file format.
             ``.nnp``: (Recommended) Creating a zip archive with nntxt (network
-            definition etc.) and h5 (parameters).
+            definition etc.) and params (parameters in raw binary format,
+            stored uncompressed).
             ``.nntxt``: Protobuf in text format.
             ``.protobuf``: Protobuf in binary format (unsafe in terms of
              backward compatibility).
@@ -352,7 +353,7 @@ def save(filename, contents, include_params=False, variable_batch_size=True, ext
             as batch size, and left as a placeholder
             (more specifically ``-1``). The placeholder dimension will be
             filled during/after loading.
-        extension: if files is file-like object, extension is one of ".nntxt", ".prototxt", ".protobuf", ".h5", ".nnp".
+        extension: if files is file-like object, extension is one of ".nntxt", ".prototxt", ".protobuf", ".h5", ".params", ".nnp".
 
     Example:
         The following example creates a two inputs and two
@@ -0,0 +1,297 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+'''
+Sharded and incremental checkpoint format (.ckpt).
+
+A checkpoint consists of the following files in the same directory.
+
+* ``<name>.ckpt``: Manifest which lists part manifests.
+* ``<name>.ckpt.part<rank>-of<num_ranks>``: Part manifest written by each
+  rank, which maps parameter names to shards, offsets and content hashes.
+* ``<name>.ckpt.part<rank>-of<num_ranks>.g<generation>.params``: Shards in
+  .params format.
+
+Each rank writes only the tensors assigned to it, so that ranks of a
+data-parallel job write their shards in parallel without communication.
+When a checkpoint is saved again, only the tensors whose content hash
+changed are written into a new shard, and shards which are no longer
+referenced are removed. Manifests are replaced atomically.
+'''
+
+from collections import OrderedDict
+import hashlib
+import json
+import numpy
+import os
+import re
+import tempfile
+
+from nnabla.utils.get_file_handle import write_raw_parameters
+
+_FORMAT = 'nnabla-sharded-parameters'
+_VERSION = 1
+
+
+class _HostTensor(object):
+
+    def __init__(self, d, need_grad):
+        self.d = d
+        self.need_grad = need_grad
+
+
+def _tensor_hash(d):
+    h = hashlib.blake2b(digest_size=16)
+    h.update('{}{}'.format(d.dtype.str, d.shape).encode('ascii'))
+    h.update(memoryview(d.reshape(-1)).cast('B'))
+    return h.hexdigest()
+
+
+def _write_json(path, obj):
+    # A unique temporary file per writer, so that concurrent writers do not
+    # replace each other's temporary files.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                               prefix=os.path.basename(path) + '.',
+                               suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(obj, f, indent=1)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _read_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _part_name(manifest, rank, num_ranks):
+    return '{}.part{}-of{}'.format(os.path.basename(manifest), rank, num_ranks)
+
+
+def assign_ranks(sizes, num_ranks):
+    '''Assign tensors to ranks so that each rank writes similar bytes.
+
+    Args:
+        sizes (dict): Dictionary of a name to the number of bytes.
+        num_ranks (int): Number of ranks.
+
+    Returns:
+        dict: Dictionary of a name to the rank.
+    '''
+    loads = [0] * num_ranks
+    ranks = {}
+    for name in sorted(sizes, key=lambda n: (-sizes[n], n)):
+        rank = loads.index(min(loads))
+        ranks[name] = rank
+        loads[rank] += sizes[name]
+    return ranks
+
+
+def save_sharded(manifest, tensors, rank=0, num_ranks=1, barrier=None):
+    '''Save tensors into a sharded checkpoint.
+
+    Each rank writes its shards and part manifest, and removes its own shards
+    which are no longer referenced. Only rank 0 writes the manifest. Parts
+    written with another number of ranks are removed by rank 0 when it is the
+    only writer, or after ``barrier`` when it is given, since other ranks may
+    still be writing before that.
+
+    Args:
+        manifest (str): Path of the manifest (.ckpt).
+        tensors (dict): Dictionary of a name to an object which has ``d``
+            and ``need_grad``, e.g. :obj:`~nnabla.Variable`. All ranks must
+            pass the same names and shapes.
+        rank (int): Rank of the caller. It writes only tensors assigned to it.
+        num_ranks (int): Number of ranks writing the checkpoint.
+        barrier (callable): Function to synchronize all ranks, e.g.
+            ``comm.barrier`` of a communicator. If given, it is called by all
+            ranks after writing their parts, and then rank 0 writes the
+            manifest.
+
+    Returns:
+        int: Number of bytes written into shards.
+    '''
+    directory = os.path.dirname(os.path.abspath(manifest))
+    part = _part_name(manifest, rank, num_ranks)
+    part_path = os.path.join(directory, part)
+
+    arrays = OrderedDict()
+    for name, v in tensors.items():
+        d = numpy.asarray(v.d)
+        arrays[name] = numpy.ascontiguousarray(
+            d, dtype=d.dtype.newbyteorder('<'))
+    ranks = assign_ranks(
+        OrderedDict((k, d.nbytes) for k, d in arrays.items()), num_ranks)
+
+    old = {}
+    generation = 0
+    if os.path.exists(part_path):
+        info = _read_json(part_path)
+        generation = info['generation'] + 1
+        old = {e['name']: e for e in info['parameters']}
+
+    entries = OrderedDict()
+    changed = OrderedDict()
+    for name, d in arrays.items():
+        if ranks[name] != rank:
+            continue
+        h = _tensor_hash(d)
+        e = old.get(name)
+        if e is not None and e['hash'] == h and \
+                os.path.exists(os.path.join(directory, e['shard'])):
+            entries[name] = dict(
+                e, need_grad=bool(tensors[name].need_grad)), h
+        else:
+            entries[name] = None, h
+            changed[name] = _HostTensor(d, tensors[name].need_grad)
+
+    # Rewrite tensors kept in shards which are mostly not referenced any more,
+    # so that the checkpoint does not grow by incremental saves.
+    live = {}
+    for e, _ in entries.values():
+        if e is not None:
+            live[e['shard']] = live.get(e['shard'], 0) + e['nbytes']
+    for shard, nbytes in live.items():
+        if nbytes * 2 < os.path.getsize(os.path.join(directory, shard)):
+            for name, (e, h) in entries.items():
+                if e is not None and e['shard'] == shard:
+                    entries[name] = None, h
+                    changed[name] = _HostTensor(
+                        arrays[name], tensors[name].need_grad)
+
+    written = 0
+    if changed:
+        shard = '{}.g{}.params'.format(part, generation)
+        shard_path = os.path.join(directory, shard)
+        with open(shard_path + '.tmp', 'wb') as f:
+            raw_entries = write_raw_parameters(f, changed)
+        os.replace(shard_path + '.tmp', shard_path)
+        for r in raw_entries:
+            entries[r.name] = {'name': r.name, 'shard': shard,
+                               'offset': r.offset, 'nbytes': r.nbytes,
+                               'dtype': r.dtype.str, 'shape': list(r.shape),
+                               'need_grad': r.need_grad}, entries[r.name][1]
+            written += r.nbytes
+
+    # To preserve order of parameters
+    indexes = {name: i for i, name in enumerate(arrays)}
+    parameters = []
+    for name, (e, h) in entries.items():
+        e['hash'] = h
+        e['index'] = indexes[name]
+        parameters.append(e)
+    _write_json(part_path, {'generation': generation,
+                            'parameters': parameters})
+
+    # Remove own shards which are not referenced.
+    referenced = set(e['shard'] for e in parameters)
+    pattern = re.compile(re.escape(os.path.basename(manifest)) +
+                         r'\.part(\d+)-of(\d+)(\.g\d+\.params)?$')
+    matches = [m for m in map(pattern.match, os.listdir(directory)) if m]
+    for m in matches:
+        if int(m.group(2)) == num_ranks and int(m.group(1)) == rank and \
+                m.group(3) is not None and m.group(0) not in referenced:
+            os.unlink(os.path.join(directory, m.group(0)))
+
+    if barrier is not None:
+        barrier()
+    if rank != 0:
+        return written
+    _write_json(manifest, {'format': _FORMAT, 'version': _VERSION,
+                           'num_ranks': num_ranks,
+                           'parts': [_part_name(manifest, r, num_ranks)
+                                     for r in range(num_ranks)]})
+    # Remove parts written with another number of ranks.
+    if num_ranks == 1 or barrier is not None:
+        for m in matches:
+            if int(m.group(2)) != num_ranks:
+                os.unlink(os.path.join(directory, m.group(0)))
+    return written
+
+
+def read_manifest(manifest):
+    '''Read manifest of a sharded checkpoint.
+
+    Args:
+        manifest (str): Path of the manifest (.ckpt).
+
+    Returns:
+        OrderedDict: Dictionary of a name to an entry, which is a dictionary
+        of ``path`` of the shard, ``offset``, ``nbytes``, ``dtype``,
+        ``shape``, ``need_grad``, ``hash`` and ``index``.
+    '''
+    directory = os.path.dirname(os.path.abspath(manifest))
+    info = _read_json(manifest)
+    if info.get('format') != _FORMAT or info.get('version', 0) > _VERSION:
+        raise ValueError('{} is not a supported checkpoint.'.format(manifest))
+    entries = []
+    for part in info['parts']:
+        part_path = os.path.join(directory, part)
+        if not os.path.exists(part_path):
+            raise ValueError(
+                'Part {} of checkpoint {} is not found.'.format(part, manifest))
+        for e in _read_json(part_path)['parameters']:
+            e = dict(e)
+            e['path'] = os.path.join(directory, e.pop('shard'))
+            e['dtype'] = numpy.dtype(e['dtype'])
+            e['shape'] = tuple(e['shape'])
+            entries.append(e)
+    entries.sort(key=lambda e: e['index'])
+    return OrderedDict((e['name'], e) for e in entries)
+
+
+def read_sharded(manifest, names=None):
+    '''Read tensors from a sharded checkpoint.
+
+    Only shards which contain the specified names are opened, and only the
+    bytes of the specified tensors are read.
+
+    Args:
+        manifest (str): Path of the manifest (.ckpt).
+        names (list of str): Names to read. If None, all tensors are read.
+
+    Yields:
+        Tuple of an entry (see :func:`read_manifest`) and
+        :obj:`numpy.ndarray`.
+    '''
+    files = {}
+    try:
+        for e in select_entries(read_manifest(manifest), names):
+            if e['path'] not in files:
+                files[e['path']] = open(e['path'], 'rb')
+            f = files[e['path']]
+            f.seek(e['offset'])
+            buf = f.read(e['nbytes'])
+            if len(buf) != e['nbytes']:
+                raise ValueError('Shard {} is truncated.'.format(e['path']))
+            yield e, numpy.frombuffer(buf, dtype=e['dtype']).reshape(e['shape'])
+    finally:
+        for f in files.values():
+            f.close()
+
+
+def select_entries(entries, names=None):
+    '''Select entries by names keeping the order of the manifest.
+    '''
+    if names is None:
+        return list(entries.values())
+    missing = [n for n in names if n not in entries]
+    if missing:
+        raise ValueError(
+            'Parameters not found in checkpoint: {}'.format(', '.join(missing)))
+    names = set(names)
+    return [e for n, e in entries.items() if n in names]
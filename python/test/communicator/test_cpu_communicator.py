@@ -0,0 +1,119 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import platform
+import sys
+
+import pytest
+import numpy as np
+
+import nnabla as nn
+import nnabla.communicators as C
+from nnabla.ext_utils import get_extension_context
+from nnabla.testing import assert_allclose
+
+# Executed in each process launched by the test.
+script = '''
+import numpy as np
+import nnabla as nn
+import nnabla.functions as F
+import nnabla.communicators as C
+from nnabla.ext_utils import get_extension_context
+from nnabla.testing import assert_allclose
+
+comm = C.MultiProcessCommunicator(get_extension_context("cpu"))
+comm.init()
+rank, size = comm.rank, comm.size
+assert size == {size}
+rng = np.random.RandomState(313)
+data = [rng.randn(s).astype(np.float32) for s in [1, 100, 257, 1000]]
+
+# all_reduce
+xs = [nn.NdArray.from_numpy_array(d * (rank + 1)) for d in data]
+comm.all_reduce(xs, division=True)
+for x, d in zip(xs, data):
+    assert_allclose(x.data, d * (size + 1) / 2., rtol=1e-5)
+
+# reduce and bcast
+xs = [nn.NdArray.from_numpy_array(d * (rank + 1)) for d in data]
+comm.reduce(xs, 1)
+if rank == 1:
+    for x, d in zip(xs, data):
+        assert_allclose(x.data, d * size * (size + 1) / 2., rtol=1e-5)
+comm.bcast(xs, 1)
+for x, d in zip(xs, data):
+    assert_allclose(x.data, d * size * (size + 1) / 2., rtol=1e-5)
+
+# all_gather and reduce_scatter
+x = nn.NdArray.from_numpy_array(data[2] * rank)
+ys = [nn.NdArray(x.shape) for _ in range(size)]
+comm.all_gather(x, ys)
+for r, y in enumerate(ys):
+    assert_allclose(y.data, data[2] * r)
+y = nn.NdArray(x.shape)
+comm.reduce_scatter(ys, y)
+assert_allclose(y.data, data[2] * rank * size, rtol=1e-5)
+
+# all_reduce_callback during backward
+ws = [nn.Variable.from_numpy_array(d, need_grad=True) for d in data]
+loss = sum([F.sum(w * (rank + 1)) for w in ws])
+loss.forward()
+for w in ws:
+    w.grad.zero()
+loss.backward(communicator_callbacks=comm.all_reduce_callback(
+    [w.grad for w in ws], 64))
+for w in ws:
+    assert_allclose(w.g, np.full(w.shape, size * (size + 1) / 2.))
+
+# bucketed_all_reduce_callback during backward
+for fp16_compression in [False, True]:
+    for overlap in [False, True]:
+        for w in ws:
+            w.grad.zero()
+        loss.backward(communicator_callbacks=comm.bucketed_all_reduce_callback(
+            [w.grad for w in ws], 300, division=True,
+            fp16_compression=fp16_compression, overlap=overlap))
+        for w in ws:
+            assert_allclose(w.g, np.full(w.shape, (size + 1) / 2.))
+
+# group
+comm.new_group(("half", list(range(size // 2))))
+x = nn.NdArray.from_numpy_array(data[0])
+comm.all_reduce(x, group="half")
+if rank < size // 2:
+    assert_allclose(x.data, data[0] * (size // 2), rtol=1e-5)
+comm.barrier()
+'''
+
+
+@pytest.mark.skipif(platform.system() != 'Linux', reason='Linux only')
+@pytest.mark.parametrize("num_processes", [2, 3])
+def test_cpu_communicator_launch(num_processes, tmpdir, monkeypatch):
+    from nnabla.utils.cli.launch import launch
+    path = str(tmpdir.join('comm.py'))
+    with open(path, 'w') as f:
+        f.write(script.format(size=num_processes))
+    # Small buffers to transfer data in many chunks.
+    monkeypatch.setenv('NNABLA_COMM_BUFFER_SIZE', '1024')
+    assert launch([sys.executable, path], num_processes, 1) == 0
+
+
+def test_cpu_communicator_single_process():
+    comm = C.MultiProcessCommunicator(get_extension_context('cpu'))
+    comm.init()
+    assert comm.size == 1
+    assert comm.rank == 0
+    x = nn.NdArray.from_numpy_array(np.arange(6, dtype=np.float32))
+    comm.all_reduce(x, division=True)
+    assert_allclose(x.data, np.arange(6))
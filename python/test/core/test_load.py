@@ -539,6 +539,30 @@ def test_load_and_infer_improvement(nntxt_idx, parameter_format, dataset_sample_
     # assert_tensor_equal(result, ref_result)
 
 
+@pytest.mark.parametrize("nntxt_idx", [0])
+@pytest.mark.parametrize("parameter_format", ['.protobuf'])
+@pytest.mark.parametrize("dataset_sample_num", [32])
+def test_load_with_nnp_cache(tmpdir, nntxt_idx, parameter_format, dataset_sample_num):
+    '''Loading through the parsed network cache gives the same result.
+    '''
+    from nnabla.config import nnabla_config
+    cache_dir = tmpdir.join('cache').strpath
+    nnabla_config.set('MISC', 'nnp_cache_dir', cache_dir)
+    try:
+        with generate_case_from_nntxt_str(NNTXT_EQUIVALENCE_CASES[nntxt_idx], parameter_format, dataset_sample_num) as nnp_file:
+            results = []
+            for _ in range(2):
+                nn.clear_parameters()
+                info = load.load(nnp_file)
+                results.append(
+                    partial(common_forward, forward_func=_forward)(info))
+                assert len(os.listdir(cache_dir)) == 1
+    finally:
+        nnabla_config.set('MISC', 'nnp_cache_dir', '')
+
+    assert_tensor_equal(results[1], results[0])
+
+
 @pytest.mark.parametrize("nntxt_idx", CASE_INDEX)
 @pytest.mark.parametrize("parameter_format", ['.protobuf'])
 @pytest.mark.parametrize("dataset_sample_num", [64])
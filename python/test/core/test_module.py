@@ -759,6 +759,34 @@ def test_context_priority_hierarchy_testing(module_func, backend):
             assert ('Cuda' in f.function_instance.name)
 
 
+def test_eliminate_common_subexpressions_and_fold_constants():
+    nn.clear_parameters()
+    rng = np.random.RandomState(313)
+    x = nn.Variable.from_numpy_array(rng.randn(4, 8))
+    w = nn.parameter.get_parameter_or_create('w', (8, 16), rng.randn(8, 16))
+    ws = F.weight_standardization(w, channel_axis=1)
+    y = F.tanh(F.affine(x, ws)) + F.tanh(F.affine(x, ws))
+
+    def function_types(n):
+        return sorted(pf.type for pf in n.forward_sequence())
+
+    g = nn.graph_def.create_graph_from_variable('net', y)
+    n = g.default_graph()
+    assert function_types(n) == ['Add2', 'Affine', 'Affine',
+                                 'Tanh', 'Tanh', 'WeightStandardization']
+
+    n = n.eliminate_common_subexpressions()
+    assert function_types(n) == ['Add2', 'Affine', 'Tanh',
+                                 'WeightStandardization']
+
+    n = n.fold_constants()
+    assert function_types(n) == ['Add2', 'Affine', 'Tanh']
+    assert not any(pv.need_grad for pv in n.parameters.values())
+
+    forward_variable_and_check_equal(n(x), y)
+    nn.clear_parameters()
+
+
 def test_training_property():
     import nnabla.parametric_functions as PF
 
@@ -0,0 +1,82 @@
+# Copyright (c) 2017 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import numpy as np
+import nnabla as nn
+import nnabla.functions as F
+from nbla_test_utils import list_context
+
+ctxs = list_context('FusedElementwise')
+
+
+def ref_fused_elementwise(*inputs, **params):
+    ops = params['ops']
+    operands = params['operands']
+    values = params['values']
+    v = inputs[0].copy()
+    for op, k, s in zip(ops, operands, values):
+        a = inputs[k] if k >= 0 else None
+        v = [lambda: v + a, lambda: v - a, lambda: a - v,
+             lambda: v * a, lambda: v / a, lambda: a / v,
+             lambda: v + s, lambda: v * s, lambda: s - v,
+             lambda: s / v, lambda: v ** s,
+             lambda: np.maximum(v, s), lambda: np.minimum(v, s),
+             lambda: np.maximum(v, 0), lambda: np.where(v > 0, v, s * v),
+             lambda: 1 / (1 + np.exp(-v)), lambda: np.tanh(v),
+             lambda: np.exp(v), lambda: np.log(v), lambda: np.abs(v)][op]()
+    return v
+
+
+@pytest.mark.parametrize("ctx, func_name", ctxs)
+@pytest.mark.parametrize("seed", [313])
+@pytest.mark.parametrize("shape", [(2, 3, 4), (3, 5000)])
+@pytest.mark.parametrize("ops, operands, values", [
+    ([0, 13], [1, -1], [0, 0]),
+    ([7, 6, 16], [-1, -1, -1], [0.5, 1.5, 0]),
+    ([15, 3], [-1, 0], [0, 0]),
+    ([1, 2, 4, 14, 11, 12], [1, 2, 1, -1, -1, -1],
+     [0, 0, 0, 0.1, -0.5, 0.5]),
+    ([19, 6, 5], [-1, -1, 1], [0, 1, 0]),
+    ([19, 6, 18, 17, 10, 8, 9], [-1] * 7, [0, 1, 0, 0, 2, -1, 2]),
+])
+def test_fused_elementwise_forward(seed, shape, ops, operands, values, ctx,
+                                   func_name):
+    from nbla_test_utils import function_tester
+    rng = np.random.RandomState(seed)
+    num_inputs = max(operands + [0]) + 1
+    inputs = [rng.randn(*shape).astype(np.float32)
+              for _ in range(num_inputs)]
+    # Avoid division by values close to zero
+    for i in inputs[1:]:
+        i += np.sign(i)
+    func_kwargs = dict(ops=ops, operands=operands, values=values)
+    function_tester(rng, F.fused_elementwise, ref_fused_elementwise, inputs,
+                    func_kwargs=func_kwargs, atol_f=1e-5,
+                    backward=[False] * num_inputs, ctx=ctx,
+                    func_name=func_name, disable_half_test=True)
+
+
+@pytest.mark.parametrize("ctx, func_name", ctxs)
+def test_fused_elementwise_inplace(ctx, func_name):
+    rng = np.random.RandomState(313)
+    with nn.context_scope(ctx):
+        x0 = nn.Variable.from_numpy_array(rng.randn(2, 3).astype(np.float32))
+        x1 = nn.Variable.from_numpy_array(rng.randn(2, 3).astype(np.float32))
+        h = F.identity(x0)
+        y = F.fused_elementwise(h, x1, ops=[0, 13], operands=[1, -1],
+                                values=[0, 0], inplace=True)
+    y.forward()
+    assert np.allclose(y.d, np.maximum(x0.d + x1.d, 0))
+    assert h.data.data_ptr(np.float32, ctx) == y.data.data_ptr(np.float32, ctx)
@@ -46,3 +46,59 @@ def test_solver_zeroing():
 
     for x in xs:
         assert_allclose(x.d, 1 - (1 + 0.1))
+
+
+def _train_solver(solver, fused, num_threads):
+    import nnabla.functions as F
+    import nnabla.parametric_functions as PF
+    rng = np.random.RandomState(313)
+    nn.clear_parameters()
+    nn.set_num_threads(num_threads)
+    x = nn.Variable.from_numpy_array(rng.randn(8, 1000).astype(np.float32))
+    h = F.tanh(PF.affine(x, 100, name='fc1'))
+    y = F.mean(PF.affine(h, 1, name='fc2') ** 2)
+    # A parameter not used in the graph is skipped by the solver.
+    nn.parameter.get_parameter_or_create(
+        'unused', (5, 7), rng.randn(5, 7).astype(np.float32))
+    s = solver(fused=fused)
+    assert s.fused == fused
+    s.set_parameters(nn.get_parameters())
+    for i in range(4):
+        s.zero_grad()
+        y.forward()
+        y.backward()
+        s.scale_grad(0.5)
+        s.weight_decay(1e-3)
+        s.clip_grad_by_norm(1.0)
+        assert not s.check_inf_or_nan_grad()
+        s.update()
+    params = {k: v.d.copy() for k, v in nn.get_parameters().items()}
+    states = {k: ({n: v.d.copy() for n, v in state.pstate.items()}, state.t)
+              for k, state in s.get_states().items()}
+    return params, states
+
+
+@pytest.mark.parametrize("solver", [
+    lambda **kw: S.Sgd(0.1, **kw),
+    lambda **kw: S.Momentum(0.1, 0.9, **kw),
+    lambda **kw: S.Adam(0.01, **kw),
+    lambda **kw: S.AdamW(0.01, wd=1e-3, **kw),
+    lambda **kw: S.RMSpropGraves(0.01, **kw),
+    lambda **kw: S.Lars(0.1, **kw),
+])
+@pytest.mark.parametrize("num_threads", [1, 4])
+def test_solver_fused(solver, num_threads):
+    num_threads_orig = nn.get_num_threads()
+    try:
+        ref_params, ref_states = _train_solver(solver, False, 1)
+        params, states = _train_solver(solver, True, num_threads)
+    finally:
+        nn.set_num_threads(num_threads_orig)
+    assert_allclose(params['unused'], ref_params['unused'])
+    for k, v in ref_params.items():
+        assert_allclose(params[k], v, atol=1e-6)
+    assert set(states.keys()) == set(ref_states.keys())
+    for k, (pstate, t) in ref_states.items():
+        assert states[k][1] == t
+        for n, v in pstate.items():
+            assert_allclose(states[k][0][n], v, atol=1e-6)
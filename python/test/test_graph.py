@@ -243,6 +243,114 @@ def test_graph_rewire(seed, clear_buffer):
         assert_allclose(b, c)
 
 
+@pytest.mark.parametrize("seed", [311])
+@pytest.mark.parametrize("clear_buffer", [True, False])
+def test_graph_compile(seed, clear_buffer):
+    nn.clear_parameters()
+    rng = np.random.RandomState(seed)
+
+    def mlp(x):
+        h = F.relu(PF.affine(x, 8, name='a1'), inplace=True)
+        h = F.relu(PF.affine(h, 8, name='a2'), inplace=True)
+        return F.mean(PF.affine(h, 1, name='a3'))
+
+    x = nn.Variable((4, 5))
+    y = nn.compile(mlp(x))
+    yr = mlp(x)
+    assert y.compiled and not yr.compiled
+    params = nn.get_parameters()
+
+    def run(y):
+        for p in params.values():
+            p.grad.zero()
+        y.forward(clear_no_need_grad=clear_buffer)
+        y.backward(clear_buffer=clear_buffer)
+        return y.d.copy(), [p.g.copy() for p in params.values()]
+
+    for i in range(4):
+        if i == 2:
+            # Captured again after the graph is modified.
+            params['a1/affine/b'].need_grad = False
+        x.d = rng.randn(*x.shape)
+        d, g = run(y)
+        dr, gr = run(yr)
+        assert_allclose(d, dr)
+        for a, b in zip(g, gr):
+            assert_allclose(a, b)
+    params['a1/affine/b'].need_grad = True
+
+    y.compile_forward(False)
+    assert not y.compiled
+
+
+@pytest.mark.parametrize("seed", [311])
+def test_memory_plan(seed):
+    nn.clear_parameters()
+    rng = np.random.RandomState(seed)
+
+    def mlp(x):
+        h = F.relu(PF.affine(x, 16, name='a1'), inplace=True)
+        h = F.tanh(PF.affine(h, 16, name='a2'))
+        h = F.relu(PF.affine(h, 16, name='a3'), inplace=True)
+        return PF.affine(h, 3, name='a4')
+
+    def chain(x):
+        # Each intermediate buffer is used only by the next function.
+        h = x
+        for i in range(6):
+            h = F.tanh(PF.affine(h, 32, name='c{}'.format(i)))
+        return h
+
+    def gradients(y):
+        params = nn.get_parameters(grad_only=False)
+        for p in params.values():
+            p.grad.zero()
+        y.forward()
+        y.backward(clear_buffer=True)
+        return [p.g.copy() for p in params.values()]
+
+    x = nn.Variable((4, 5))
+    x.d = rng.randn(*x.shape)
+    y = mlp(x)
+    yr = mlp(x)
+    plan = nn.MemoryPlan([y])
+    assert plan.num_planned_buffers > 0
+    assert 0 < plan.arena_size <= \
+        plan.total_size + 256 * plan.num_planned_buffers
+
+    for i in range(3):
+        x.d = rng.randn(*x.shape)
+        plan.forward()
+        yr.forward()
+        assert_allclose(y.d, yr.d, rtol=1e-5)
+
+    # Parameters shared with the planned graph are not overwritten, so
+    # forward and backward of the unplanned graph give the same results.
+    x.d = rng.randn(*x.shape)
+    yr.forward()
+    d = yr.d.copy()
+    plan.forward()
+    assert_allclose(y.d, d, rtol=1e-5)
+    x.d = rng.randn(*x.shape)
+    grads = gradients(yr)
+    plan.forward()
+    for g, gr in zip(gradients(yr), grads):
+        assert_allclose(g, gr, rtol=1e-5)
+
+    # Buffers whose lifetimes do not overlap share memory of the arena.
+    z = chain(x)
+    zr = chain(x)
+    plan = nn.MemoryPlan([z])
+    assert plan.num_planned_buffers > 2
+    assert plan.arena_size < plan.total_size
+    for i in range(3):
+        x.d = rng.randn(*x.shape)
+        plan.forward()
+        zr.forward()
+        assert_allclose(z.d, zr.d, rtol=1e-5)
+    nn.clear_parameters()
+
+
 def test_deleted_outputs():
     rng = np.random.RandomState(313)
 
@@ -0,0 +1,75 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import platform
+
+import pytest
+import numpy as np
+
+import nnabla as nn
+import nnabla.functions as F
+import nnabla.parametric_functions as PF
+import nnabla.solvers as S
+from nnabla.ext_utils import get_extension_context
+from nnabla.lms import SwapInOutScheduler, set_disk_array_directory
+from nnabla.testing import assert_allclose
+
+
+def train(x, t, scheduler, iterations):
+    rng = np.random.RandomState(313)
+    nn.clear_parameters()
+    with nn.parameter_scope('mlp'):
+        h = F.relu(PF.affine(x, 32))
+        h = F.relu(PF.affine(h, 32))
+        loss = F.mean(F.squared_error(PF.affine(h, 1), t))
+    solver = S.Sgd(0.1)
+    solver.set_parameters(nn.get_parameters())
+    for i in range(iterations):
+        x.d = rng.randn(*x.shape)
+        t.d = rng.randn(*t.shape)
+        if scheduler is None:
+            loss.forward(clear_no_need_grad=True)
+            solver.zero_grad()
+            loss.backward(clear_buffer=True)
+            solver.update()
+            continue
+        with scheduler:
+            loss.forward(clear_no_need_grad=True)
+            solver.zero_grad()
+            loss.backward(clear_buffer=True)
+            solver.update()
+    params = [p.d.copy() for p in nn.get_parameters().values()]
+    nn.clear_parameters()
+    return params
+
+
+@pytest.mark.skipif(platform.system() == 'Windows', reason='POSIX only')
+def test_swap_in_out_scheduler_disk(tmpdir):
+    set_disk_array_directory(str(tmpdir))
+    host_ctx = nn.Context(['cpu:float'], 'CpuDiskArray', '0')
+    device_ctx = get_extension_context('cpu', type_config='float')
+    with nn.context_scope(device_ctx):
+        x = nn.Variable((8, 16))
+        t = nn.Variable((8, 1))
+        ref = train(x, t, None, 4)
+        scheduler = SwapInOutScheduler(host_ctx, device_ctx, size=32 << 10)
+        params = train(x, t, scheduler, 4)
+    for p0, p1 in zip(ref, params):
+        assert_allclose(p0, p1, atol=1e-6)
+    stats = scheduler.stats()
+    assert stats['swap_in_bytes'] > 0
+    assert stats['swap_out_bytes'] > 0
+    assert stats['stall_time'] >= 0
+    scheduler.reset_stats()
+    assert scheduler.stats()['swap_in_bytes'] == 0
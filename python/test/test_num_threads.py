@@ -0,0 +1,63 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import numpy as np
+
+import nnabla as nn
+import nnabla.functions as F
+
+
+@pytest.fixture
+def num_threads_scope():
+    num_threads = nn.get_num_threads()
+    yield
+    nn.set_num_threads(num_threads)
+
+
+def test_set_num_threads(num_threads_scope):
+    nn.set_num_threads(3)
+    assert nn.get_num_threads() == 3
+    nn.set_num_threads(0)
+    assert nn.get_num_threads() >= 1
+
+
+def forward_backward(func, inputs, num_threads):
+    nn.set_num_threads(num_threads)
+    xs = [nn.Variable.from_numpy_array(x, need_grad=True) for x in inputs]
+    y = func(*xs)
+    y.forward()
+    y.backward(np.linspace(-1, 1, y.size).reshape(y.shape).astype(np.float32),
+               clear_buffer=True)
+    return [y.d.copy()] + [x.g.copy() for x in xs]
+
+
+@pytest.mark.parametrize("func, shapes", [
+    (lambda x, w, b: F.convolution(x, w, b, pad=(1, 1)),
+     [(7, 3, 8, 8), (4, 3, 3, 3), (4,)]),
+    (lambda x, w, b: F.deconvolution(x, w, b, stride=(2, 2)),
+     [(7, 4, 5, 5), (4, 3, 3, 3), (3,)]),
+    (lambda x, w, b: F.affine(x, w, b), [(65, 20), (20, 30), (30,)]),
+    (lambda x: F.sum(x, axis=1), [(9, 50000)]),
+    (lambda x: F.mean(x), [(300000,)]),
+    (lambda x: F.tanh(x), [(3, 100000)]),
+    (lambda x0, x1: F.mul2(x0, x1), [(3, 100000), (3, 100000)]),
+])
+def test_num_threads_results(func, shapes, num_threads_scope):
+    rng = np.random.RandomState(313)
+    inputs = [rng.randn(*s).astype(np.float32) for s in shapes]
+    refs = forward_backward(func, inputs, 1)
+    outs = forward_backward(func, inputs, 4)
+    for ref, out in zip(refs, outs):
+        assert np.allclose(ref, out, atol=1e-4, rtol=1e-4)
@@ -0,0 +1,140 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import numpy as np
+
+import nnabla as nn
+import nnabla.functions as F
+import nnabla.parametric_functions as PF
+from nnabla.testing import assert_allclose
+
+
+def mlp(x, num_blocks, recompute):
+    hs = []
+    h = x
+    for i in range(num_blocks):
+        with nn.parameter_scope('block{}'.format(i)), nn.recompute(recompute):
+            h = F.tanh(PF.affine(h, 8))
+            h = F.sigmoid(PF.affine(h, 8)) * h
+            hs.append(h)
+    return F.mean(PF.affine(h, 1)), hs
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+@pytest.mark.parametrize("clear_buffer", [False, True])
+def test_recompute_grads(compiled, clear_buffer):
+    rng = np.random.RandomState(313)
+    x = nn.Variable.from_numpy_array(rng.randn(4, 5).astype(np.float32))
+    grads = []
+    nn.clear_parameters()
+    for recompute in [False, True]:
+        # Parameters are shared by both graphs.
+        loss, hs = mlp(x, 3, recompute)
+        loss.compile_forward(compiled)
+        for _ in range(2):
+            loss.forward(clear_no_need_grad=True)
+            if recompute:
+                # Intermediate data in blocks are cleared after forward, and
+                # outputs of blocks are kept as checkpoints.
+                for h in hs:
+                    assert h.recompute
+                    assert not h.data.clear_called
+                    for i in h.parent.inputs:
+                        assert i.data.clear_called
+            for p in nn.get_parameters().values():
+                p.grad.zero()
+            loss.backward(clear_buffer=clear_buffer)
+        grads.append([p.g.copy() for p in nn.get_parameters().values()])
+    for g0, g1 in zip(*grads):
+        assert_allclose(g0, g1, atol=1e-6)
+    nn.clear_parameters()
+
+
+def test_recompute_scope():
+    x = nn.Variable((2, 3), need_grad=True)
+    assert not nn.get_recompute()
+    with nn.recompute():
+        assert nn.get_recompute()
+        h = F.relu(x)
+        # Outputs of stochastic functions are not recomputed.
+        d = F.dropout(h, 0.5)
+        with nn.recompute(False):
+            y = F.tanh(d)
+    assert not nn.get_recompute()
+    assert h.recompute
+    assert not d.recompute
+    assert not y.recompute
+    assert not x.recompute
+    y.recompute = True
+    assert y.recompute
+
+
+def test_recompute_summary():
+    x = nn.Variable((2, 3), need_grad=True)
+    with nn.recompute():
+        h = F.tanh(F.relu(x))
+    y = F.sum(h * 2)
+    summary = nn.recompute_summary(y)
+    assert summary['num_variables'] == 2
+    assert summary['recomputed_values'] == 12
+    assert summary['recomputed_functions'] == 2
+    assert summary['total_functions'] == 4
+    assert summary['total_values'] == 19
+
+
+def live_values(y):
+    # Values of intermediate variables alive.
+    values = [0]
+
+    def visit(f):
+        for o in f.outputs:
+            if not o.data.clear_called:
+                values[0] += o.size
+    y.visit(visit)
+    return values[0]
+
+
+def test_recompute_memory():
+    rng = np.random.RandomState(313)
+    x = nn.Variable.from_numpy_array(rng.randn(16, 5).astype(np.float32))
+    live = {}
+    nn.clear_parameters()
+    for recompute in [False, True]:
+        loss, _ = mlp(x, 8, recompute)
+        loss.forward(clear_no_need_grad=True)
+        live[recompute] = live_values(loss)
+    summary = nn.recompute_summary(loss)
+    assert summary['recomputed_values'] > 0
+    assert live[True] < live[False]
+    assert live[False] - live[True] <= summary['recomputed_values']
+    nn.clear_parameters()
+
+
+def test_recompute_backward_memory():
+    rng = np.random.RandomState(313)
+    x = nn.Variable.from_numpy_array(rng.randn(16, 5).astype(np.float32))
+    peak = {}
+    nn.clear_parameters()
+    for recompute in [False, True]:
+        loss, _ = mlp(x, 8, recompute)
+        loss.forward(clear_no_need_grad=True)
+        peak[recompute] = live_values(loss)
+
+        def post_hook(f):
+            peak[recompute] = max(peak[recompute], live_values(loss))
+        loss.backward(clear_buffer=True, function_post_hook=post_hook)
+    # Backward recomputes one block at a time from the checkpoints.
+    assert peak[True] < peak[False]
+    nn.clear_parameters()
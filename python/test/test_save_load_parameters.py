@@ -14,6 +14,8 @@
 
 from six import iteritems
 
+import pytest
+
 import numpy as np
 import nnabla as nn
 import nnabla.parametric_functions as PF
@@ -36,6 +38,7 @@ def test_save_load_parameters():
         param1 = nn.get_parameters(grad_only=False)
         nn.save_parameters("tmp.h5")
         nn.save_parameters("tmp.protobuf")
+        nn.save_parameters("tmp.params")
 
     with nn.parameter_scope("param2"):
         nn.load_parameters('tmp.h5')
@@ -45,7 +48,11 @@ def test_save_load_parameters():
         nn.load_parameters('tmp.protobuf')
         param3 = nn.get_parameters(grad_only=False)
 
-    for par2 in [param2, param3]:
+    with nn.parameter_scope("param4"):
+        nn.load_parameters('tmp.params')
+        param4 = nn.get_parameters(grad_only=False)
+
+    for par2 in [param2, param3, param4]:
         assert param1.keys() == par2.keys()  # Check order
         for (n1, p1), (n2, p2) in zip(sorted(param1.items()), sorted(par2.items())):
             assert n1 == n2
@@ -54,3 +61,166 @@ def test_save_load_parameters():
                 # NOTE: data is automatically casted to fp32 in Protobuf
                 assert p1.data.dtype == p2.data.dtype
             assert p1.need_grad == p2.need_grad
+
+
+@pytest.mark.parametrize("ext", [".h5", ".params", ".nnp"])
+def test_load_parameters_lazy(tmpdir, monkeypatch, ext):
+    import os
+    from nnabla.utils import get_file_handle
+    from nnabla.utils.save import save
+
+    # Record parameters created from memory maps of the file.
+    lazy_names = []
+    set_lazy_parameter = get_file_handle._set_lazy_parameter
+
+    def recording_set_lazy_parameter(ctx, name, *args):
+        lazy_names.append(name)
+        return set_lazy_parameter(ctx, name, *args)
+    monkeypatch.setattr(get_file_handle, '_set_lazy_parameter',
+                        recording_set_lazy_parameter)
+
+    nn.clear_parameters()
+    x = nn.Variable([4, 3, 8, 8])
+    with nn.parameter_scope("lazy"):
+        y = PF.affine(PF.convolution(x, 4, (3, 3)), 5)
+        params = nn.get_parameters(grad_only=False)
+        for v in params.values():
+            v.d = np.random.randn(*v.shape)
+    filename = tmpdir.join('param' + ext).strpath
+    if ext == ".nnp":
+        save(filename, {'networks': [{'name': 'net', 'batch_size': 4,
+                                      'outputs': {'y': y}, 'names': {'x': x}}]},
+             parameters=params)
+    else:
+        with nn.parameter_scope("lazy"):
+            nn.save_parameters(filename)
+
+    for _ in range(2):
+        del lazy_names[:]
+        with nn.parameter_scope("loaded"):
+            nn.load_parameters(filename, lazy=True)
+            loaded = nn.get_parameters(grad_only=False)
+        assert list(loaded.keys()) == list(params.keys())
+        assert sorted(lazy_names) == sorted(params.keys())
+        if get_file_handle._lazy_array_available() and \
+                os.path.exists('/proc/self/maps'):
+            # Parameters borrow the memory map of the file.
+            with open('/proc/self/maps') as f:
+                assert os.path.realpath(filename) in f.read()
+        for k, v in params.items():
+            assert np.all(loaded[k].d == v.d)
+            assert loaded[k].need_grad == v.need_grad
+            # Writing to a loaded parameter does not change the file.
+            loaded[k].d += 1
+        nn.clear_parameters()
+
+
+@pytest.mark.parametrize("dtype", [np.float16, np.float64, np.int32])
+def test_save_load_parameters_raw_dtype(tmpdir, dtype):
+    nn.clear_parameters()
+    filename = tmpdir.join('param.params').strpath
+    with nn.parameter_scope("raw"):
+        v = nn.parameter.get_parameter_or_create('w', (2, 3), need_grad=False)
+        v.data.cast(dtype)[...] = np.arange(6).reshape(2, 3) - 2
+        nn.save_parameters(filename)
+    with nn.parameter_scope("loaded"):
+        nn.load_parameters(filename)
+        loaded = nn.get_parameters(grad_only=False)['w']
+    # Parameters keep the dtype in .params.
+    assert loaded.data.dtype == dtype
+    assert np.all(loaded.d == v.d)
+    assert not loaded.need_grad
+    nn.clear_parameters()
+
+
+def test_save_load_parameters_sharded(tmpdir):
+    import os
+    nn.clear_parameters()
+    x = nn.Variable([4, 3, 8, 8])
+    with nn.parameter_scope("sharded"):
+        PF.affine(PF.convolution(x, 4, (3, 3)), 5)
+        params = nn.get_parameters(grad_only=False)
+        for v in params.values():
+            v.d = np.random.randn(*v.shape)
+    filename = tmpdir.join('param.ckpt').strpath
+
+    def save(num_ranks):
+        with nn.parameter_scope("sharded"):
+            for rank in range(num_ranks):
+                nn.save_parameters(filename, rank=rank, num_ranks=num_ranks)
+        return sorted(os.listdir(tmpdir.strpath))
+
+    files = save(2)
+    assert len([f for f in files if f.endswith('.params')]) == 2
+    # Saving unchanged parameters writes no shard.
+    assert save(2) == files
+    # Only a shard holding a changed parameter is added.
+    params['affine/W'].d += 1
+    assert len([f for f in save(2) if f not in files]) == 1
+    # Parts written with another number of ranks are removed.
+    files = save(1)
+    assert [f for f in files if 'of2' in f] == []
+
+    for lazy in [False, True]:
+        with nn.parameter_scope("loaded"):
+            nn.load_parameters(filename, lazy=lazy)
+            loaded = nn.get_parameters(grad_only=False)
+        assert list(loaded.keys()) == list(params.keys())
+        for k, v in params.items():
+            assert np.all(loaded[k].d == v.d)
+            assert loaded[k].need_grad == v.need_grad
+        with nn.parameter_scope("loaded"):
+            nn.clear_parameters()
+
+    with nn.parameter_scope("subset"):
+        nn.load_parameters(filename, names=['affine/W'])
+        assert list(nn.get_parameters(grad_only=False).keys()) == ['affine/W']
+    with pytest.raises(ValueError):
+        nn.load_parameters(filename, names=['missing'])
+    nn.clear_parameters()
+
+
+def test_save_sharded_concurrent(tmpdir):
+    import os
+    import threading
+    from collections import namedtuple
+    from nnabla.utils.sharded_parameters import (
+        assign_ranks, read_sharded, save_sharded)
+    Tensor = namedtuple('Tensor', ['d', 'need_grad'])
+    num_ranks = 4
+    rng = np.random.RandomState(313)
+    tensors = {'p{}'.format(i): Tensor(rng.randn(3, i + 1), True)
+               for i in range(8)}
+    owners = assign_ranks({k: v.d.nbytes for k, v in tensors.items()},
+                          num_ranks)
+    filename = tmpdir.join('param.ckpt').strpath
+    # Parts written with another number of ranks.
+    for rank in range(2):
+        save_sharded(filename, tensors, rank, 2)
+    barrier = threading.Barrier(num_ranks)
+    errors = []
+
+    def save(rank):
+        try:
+            for i in range(20):
+                # Each rank changes only tensors it writes.
+                for k, v in tensors.items():
+                    if owners[k] == rank:
+                        v.d[...] = i
+                save_sharded(filename, tensors, rank, num_ranks,
+                             barrier.wait)
+        except Exception as e:
+            errors.append(e)
+            barrier.abort()
+
+    threads = [threading.Thread(target=save, args=(r,))
+               for r in range(num_ranks)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    files = os.listdir(tmpdir.strpath)
+    assert [f for f in files if 'of2' in f or f.endswith('.tmp')] == []
+    for e, d in read_sharded(filename):
+        assert np.all(d == tensors[e['name']].d)
@@ -0,0 +1,89 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import zipfile
+import pytest
+import numpy as np
+
+import nnabla as nn
+import nnabla.solvers as S
+
+from nnabla.utils.cli.checkpoint import CheckpointWriter
+
+
+@pytest.mark.parametrize("async_write", [False, True])
+@pytest.mark.parametrize("keep_last", [0, 1, 2])
+@pytest.mark.parametrize("param_ext", [".h5", ".params"])
+def test_checkpoint_writer(tmpdir, async_write, keep_last, param_ext):
+    params = {'w': nn.Variable.from_numpy_array(np.arange(6, dtype=np.float32).reshape(2, 3),
+                                                need_grad=True)}
+    solver = S.Momentum()
+    solver.set_parameters(params)
+
+    saved = []
+    writer = CheckpointWriter(async_write, keep_last)
+    pattern = os.path.join(tmpdir.strpath, 'results_current_*.nnp')
+    for epoch in range(3):
+        filename = os.path.join(
+            tmpdir.strpath, 'results_current_{}.nnp'.format(epoch))
+        writer.save(filename, {'nnp_version.txt': '0.1\n'}, params, param_ext,
+                    optimizers={
+                        'opti_Momentum_optimizer.h5.optimizer': solver},
+                    keep_pattern=pattern,
+                    on_saved=lambda e=epoch: saved.append(e))
+        # Values written are ones when the checkpoint is requested.
+        params['w'].d += 1
+    writer.wait()
+    assert saved == [0, 1, 2]
+    assert not [f for f in os.listdir(tmpdir.strpath)
+                if not f.endswith('.nnp')]
+
+    exists = sorted(os.listdir(tmpdir.strpath))
+    if keep_last:
+        assert exists == ['results_current_{}.nnp'.format(e)
+                          for e in range(3)][-keep_last:]
+    else:
+        assert len(exists) == 3
+
+    nn.clear_parameters()
+    with zipfile.ZipFile(os.path.join(tmpdir.strpath, exists[-1])) as nnp:
+        assert sorted(nnp.namelist()) == sorted([
+            'nnp_version.txt', 'parameter' + param_ext,
+            'opti_Momentum_optimizer.h5.optimizer'])
+    nn.load_parameters(os.path.join(tmpdir.strpath, exists[-1]))
+    assert np.all(nn.get_parameters()['w'].d ==
+                  np.arange(6).reshape(2, 3) + 2)
+    nn.clear_parameters()
+
+
+def test_checkpoint_writer_keep_order(tmpdir):
+    params = {'w': nn.Variable.from_numpy_array(
+        np.zeros((2, 3), dtype=np.float32))}
+    pattern = os.path.join(tmpdir.strpath, 'results_current_*.nnp')
+    # Old checkpoints with the same modification time.
+    for epoch in range(8, 11):
+        filename = os.path.join(
+            tmpdir.strpath, 'results_current_{}.nnp'.format(epoch))
+        with open(filename, 'w'):
+            pass
+        os.utime(filename, (1000000000, 1000000000))
+    writer = CheckpointWriter(False, 2)
+    writer.save(os.path.join(tmpdir.strpath, 'results_current_11.nnp'),
+                {'nnp_version.txt': '0.1\n'}, params, '.h5',
+                keep_pattern=pattern)
+    writer.wait()
+    assert sorted(os.listdir(tmpdir.strpath)) == [
+        'results_current_10.nnp', 'results_current_11.nnp']
+    nn.clear_parameters()
@@ -16,15 +16,19 @@ from __future__ import absolute_import
 
 import os
 import csv
+import numpy
 import pytest
 import tempfile
+import time
 from shutil import rmtree
 from contextlib import contextmanager, closing
 
 # from nnabla
 from nnabla.config import nnabla_config
 from nnabla.utils.create_cache import CreateCache
+from nnabla.utils.data_iterator import data_iterator_cache
 from nnabla.utils.data_source_implements import CacheDataSource, CsvDataSource
+from nnabla.utils.data_source_implements import CacheReaderWithPrefetch
 from nnabla.testing import assert_allclose
 
 from .conftest import test_data_csv_csv_20, test_data_csv_png_20
@@ -45,16 +49,28 @@ def associate_variables_and_data(source) -> dict:
 
 
 def check_relative_csv_file_result(cache_file_fmt, csvfilename, cachedir):
-    # check cache_index.csv
-    cache_info_csv_path = os.path.join(cachedir, 'cache_index.csv')
-    assert os.path.exists(cache_info_csv_path)
+    if cache_file_fmt == '.mmap':
+        # check cache_index.npy
+        index = numpy.load(os.path.join(cachedir, 'cache_index.npy'))
+        assert index.shape[1] == 2
+        assert numpy.all(index[1:, 0] == index[:-1, 0] + index[:-1, 1])
 
-    with open(cache_info_csv_path, 'r') as f:
-        for row in csv.reader(f):
-            assert os.path.exists(os.path.join(cachedir, row[0]))
+        # check cache_info.csv
+        with open(os.path.join(cachedir, 'cache_info.csv'), 'r') as f:
+            for row in csv.reader(f):
+                data = numpy.load(os.path.join(cachedir, row[1]))
+                assert len(data) == index[-1, 0] + index[-1, 1]
+    else:
+        # check cache_index.csv
+        cache_info_csv_path = os.path.join(cachedir, 'cache_index.csv')
+        assert os.path.exists(cache_info_csv_path)
+
+        with open(cache_info_csv_path, 'r') as f:
+            for row in csv.reader(f):
+                assert os.path.exists(os.path.join(cachedir, row[0]))
 
     # check cache_info.csv
-    if cache_file_fmt == '.npy':
+    if cache_file_fmt in ['.npy', '.mmap']:
         assert os.path.exists(os.path.join(cachedir, 'cache_info.csv'))
 
     # check order.csv
@@ -70,7 +86,7 @@ def check_relative_csv_file_result(cache_file_fmt, csvfilename, cachedir):
 
 
 @pytest.mark.parametrize('input_file_fmt', ['png', 'csv'])
-@pytest.mark.parametrize('cache_file_fmt', ['.npy', '.h5'])
+@pytest.mark.parametrize('cache_file_fmt', ['.npy', '.h5', '.mmap'])
 @pytest.mark.parametrize('shuffle', [False, True])
 @pytest.mark.parametrize('normalize', [False, True])
 @pytest.mark.parametrize('num_of_threads', [i for i in range(10)])
@@ -112,3 +128,229 @@ def test_create_cache(test_data_csv_csv_20,
 
                 for v in cache_source.variables:
                     assert_allclose(cache_data[v], csv_data[v])
+
+
+@pytest.mark.parametrize('cache_file_fmt', ['.npy', '.h5', '.mmap'])
+@pytest.mark.parametrize('shuffle', [False, True])
+@pytest.mark.parametrize('normalize', [False, True])
+@pytest.mark.parametrize('batch_size', [1, 7, 20])
+def test_cache_data_source_next_batch(test_data_csv_png_20,
+                                      cache_file_fmt,
+                                      shuffle,
+                                      normalize,
+                                      batch_size):
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', cache_file_fmt)
+
+    with create_temp_with_dir() as tmpdir:
+        cc = CreateCache(test_data_csv_png_20, shuffle=False)
+        cc.create(tmpdir, normalize=False)
+
+        with closing(CacheDataSource(tmpdir, shuffle=shuffle, normalize=normalize)) as batch_source, \
+                closing(CacheDataSource(tmpdir, shuffle=shuffle, normalize=normalize)) as sample_source:
+            while batch_source.position + batch_size <= batch_source.size:
+                out = None
+                if batch_source.position > 0:
+                    out = [numpy.empty_like(d) for d in batch]
+                batch = batch_source.next_batch(batch_size, out)
+                if out is not None:
+                    assert all(b is o for b, o in zip(batch, out))
+                samples = [sample_source.next() for _ in range(batch_size)]
+                for i, d in enumerate(batch):
+                    assert d.shape[0] == batch_size
+                    for j, s in enumerate(samples):
+                        assert d[j].dtype == s[i].dtype
+                        assert_allclose(d[j], s[i])
+            assert batch_source.position == sample_source.position
+
+
+@pytest.mark.parametrize('cache_file_fmt', ['.npy', '.h5', '.mmap'])
+@pytest.mark.parametrize('shuffle', [False, True])
+@pytest.mark.parametrize('num_of_processes', [0, 2])
+def test_create_cache_with_processes_and_resume(test_data_csv_png_20,
+                                                cache_file_fmt,
+                                                shuffle,
+                                                num_of_processes):
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', cache_file_fmt)
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '3')
+
+    with create_temp_with_dir() as tmpdir:
+        cc = CreateCache(test_data_csv_png_20, shuffle=shuffle,
+                         num_of_processes=num_of_processes)
+        cc.create(tmpdir, normalize=False)
+        check_relative_csv_file_result(
+            cache_file_fmt, test_data_csv_png_20, tmpdir)
+
+        if cache_file_fmt != '.mmap':
+            # Remove last half of cache files to emulate interruption.
+            with open(os.path.join(tmpdir, 'cache_index.csv'), 'r') as f:
+                rows = list(csv.reader(f))
+            with open(os.path.join(tmpdir, 'cache_index.csv'), 'w') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                for row in rows[:len(rows) // 2]:
+                    writer.writerow(row)
+            for row in rows[len(rows) // 2:]:
+                os.remove(os.path.join(tmpdir, row[0]))
+
+            cc = CreateCache(test_data_csv_png_20, shuffle=shuffle,
+                             num_of_processes=num_of_processes)
+            cc.create(tmpdir, normalize=False, resume=True)
+            with open(os.path.join(tmpdir, 'cache_index.csv'), 'r') as f:
+                assert list(csv.reader(f)) == rows
+
+        with closing(CacheDataSource(tmpdir)) as cache_source:
+            csv_source = CsvDataSource(test_data_csv_png_20, normalize=False)
+            with open(os.path.join(tmpdir, 'order.csv'), 'r') as f:
+                csv_source._order = [int(row[1]) for row in csv.reader(f)]
+            assert cache_source.size == csv_source.size
+            for _ in range(cache_source.size):
+                cache_data = associate_variables_and_data(cache_source)
+                csv_data = associate_variables_and_data(csv_source)
+                for v in cache_source.variables:
+                    assert_allclose(cache_data[v], csv_data[v])
+
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '100')
+
+
+@pytest.mark.parametrize('cache_file_fmt', ['.npy', '.h5'])
+@pytest.mark.parametrize('buffer_size', [1, 5, 100])
+@pytest.mark.parametrize('num_of_files', [1, 3])
+@pytest.mark.parametrize('batch_size', [1, 4])
+def test_cache_data_source_shuffle_buffer(test_data_csv_png_20,
+                                          cache_file_fmt,
+                                          buffer_size,
+                                          num_of_files,
+                                          batch_size):
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', cache_file_fmt)
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '3')
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_shuffle_buffer_size',
+                      str(buffer_size))
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_shuffle_buffer_num_of_files',
+                      str(num_of_files))
+
+    with create_temp_with_dir() as tmpdir:
+        cc = CreateCache(test_data_csv_png_20, shuffle=False)
+        cc.create(tmpdir, normalize=False)
+
+        with closing(CacheDataSource(tmpdir, shuffle=True, rng=numpy.random.RandomState(313))) as cache_source, \
+                closing(CacheDataSource(tmpdir, shuffle=True, rng=numpy.random.RandomState(313))) as same_source:
+            csv_source = CsvDataSource(test_data_csv_png_20, normalize=False)
+            expected = [associate_variables_and_data(csv_source)
+                        for _ in range(csv_source.size)]
+            x, y = csv_source.variables
+            labels = []
+            for epoch in range(2):
+                while cache_source.position + batch_size <= cache_source.size:
+                    batch = dict(zip(cache_source.variables,
+                                     cache_source.next_batch(batch_size)))
+                    # Only samples in the buffer and files being read
+                    # into it are kept.
+                    shuffle_buffer = cache_source._shuffle_buffer
+                    assert len(shuffle_buffer._samples) <= buffer_size
+                    assert len(shuffle_buffer._opened) <= num_of_files
+                    for i in range(batch_size):
+                        label = int(batch[y][i][0])
+                        labels.append(label)
+                        assert_allclose(batch[x][i], expected[label][x])
+                stats = cache_source.shuffle_buffer_stats
+                assert stats['buffer_size'] == buffer_size
+                assert 0 < stats['mean_buffer_fill'] <= buffer_size
+                if buffer_size == 1:
+                    assert stats['mean_buffer_fill'] == 1.0
+                # Each cache file is loaded only once per epoch.
+                assert stats['file_loads'] == len(
+                    set(o[0] for o in cache_source._order))
+                assert cache_source._order == same_source._order
+                cache_source.reset()
+                same_source.reset()
+            epoch_size = cache_source.size // batch_size * batch_size
+            assert len(set(labels[:epoch_size])) == epoch_size
+
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_shuffle_buffer_size', '0')
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '100')
+
+
+@pytest.mark.parametrize('num_of_threads', [0, 1, 3])
+def test_cache_reader_with_prefetch(test_data_csv_png_20, num_of_threads):
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', '.npy')
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '5')
+
+    def wait_for(reader, file_names):
+        for _ in range(1000):
+            with reader._cond:
+                if all(fn in reader._entries and reader._entries[fn]['data'] is not None
+                       for fn in file_names):
+                    return
+            time.sleep(0.01)
+
+    with create_temp_with_dir() as tmpdir:
+        cc = CreateCache(test_data_csv_png_20, shuffle=False)
+        cc.create(tmpdir, normalize=False)
+        with closing(CacheDataSource(tmpdir)) as cache_source:
+            variables = cache_source.variables
+            file_names = [f for f, _ in cache_source._cache_files]
+        assert len(file_names) == 4
+        expected = {}
+        for fn in file_names:
+            with open(fn, 'rb') as f:
+                expected[fn] = [numpy.load(f) for _ in variables]
+        file_size = sum(d.nbytes for d in expected[file_names[0]])
+
+        def check(fn, data):
+            for v, d in zip(variables, expected[fn]):
+                assert_allclose(data[v], d)
+
+        # Keep up to 3 files.
+        with closing(CacheReaderWithPrefetch(tmpdir, num_of_threads, variables,
+                                             max_bytes=file_size * 3)) as reader:
+            check(file_names[0], reader.open_and_prefetch_cache(
+                file_names[0], file_names[1:3]))
+            assert reader.num_of_misses == 1
+            if num_of_threads > 0:
+                wait_for(reader, file_names[1:3])
+            misses = reader.num_of_misses
+            # Prefetched file which is not requested anymore is reused.
+            check(file_names[2], reader.open_and_prefetch_cache(
+                file_names[2], []))
+            check(file_names[1], reader.open_and_prefetch_cache(
+                file_names[1], []))
+            check(file_names[0], reader.open_and_prefetch_cache(
+                file_names[0], []))
+            if num_of_threads > 0:
+                assert reader.num_of_misses == misses
+            assert reader._total_bytes <= file_size * 3
+
+            # Least recently used file is evicted.
+            check(file_names[3], reader.open_and_prefetch_cache(
+                file_names[3], []))
+            assert file_names[2] not in reader._entries
+            assert reader._total_bytes <= file_size * 3
+
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '100')
+
+
+@pytest.mark.parametrize('cache_file_fmt', ['.npy', '.h5', '.mmap'])
+@pytest.mark.parametrize('with_memory_cache', [False, True])
+def test_data_iterator_cache_deferred_normalization(test_data_csv_png_20,
+                                                    cache_file_fmt,
+                                                    with_memory_cache):
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', cache_file_fmt)
+
+    with create_temp_with_dir() as tmpdir:
+        cc = CreateCache(test_data_csv_png_20, shuffle=False)
+        cc.create(tmpdir, normalize=False)
+
+        with data_iterator_cache(tmpdir, 5, normalize=True, with_memory_cache=with_memory_cache) as di, \
+                data_iterator_cache(tmpdir, 5, normalize=True, with_memory_cache=with_memory_cache,
+                                    deferred_normalization=True) as deferred_di:
+            assert di.normalization_scales == {}
+            scales = deferred_di.normalization_scales
+            assert list(scales.keys()) == ['x']
+            for _ in range(di.size // di.batch_size):
+                for v, d, deferred_d in zip(di.variables, di.next(),
+                                            deferred_di.next()):
+                    if v in scales:
+                        assert deferred_d.dtype == numpy.uint8
+                        assert_allclose(
+                            deferred_d * numpy.float32(scales[v]), d)
+                    else:
+                        assert_allclose(deferred_d, d)
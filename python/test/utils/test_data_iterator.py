@@ -15,6 +15,7 @@
 from __future__ import absolute_import
 
 import os
+import numpy as np
 import pytest
 
 # from NNabla
@@ -25,6 +26,7 @@ from nnabla.utils.data_iterator import data_iterator_csv_dataset
 from nnabla.utils.data_iterator import data_iterator_simple
 from nnabla.utils.data_iterator import data_iterator_concat_datasets
 from nnabla.utils.data_source_implements import CsvDataSource
+from nnabla.utils import data_iterator_worker
 from .conftest import test_data_csv_png_10, test_data_csv_png_20
 
 
@@ -221,3 +223,154 @@ def test_data_iterator_concat_datasets(test_data_csv_png_10,
         check_data_iterator_concat_result(
             di, batch_size, normalize, ds1.size, ds2.size, stop_exhausted)
         di.close()
+
+
+@pytest.mark.parametrize("num_of_batch_buffers", [0, 1, 3])
+@pytest.mark.parametrize("batch_size", [5, 7])
+@pytest.mark.parametrize("shuffle", [True, False])
+@pytest.mark.parametrize("use_thread", [True, False])
+@pytest.mark.parametrize("with_memory_cache", [True, False])
+@pytest.mark.parametrize("with_file_cache", [True, False])
+def test_data_iterator_batch_buffers(test_data_csv_png_20,
+                                     num_of_batch_buffers,
+                                     batch_size,
+                                     shuffle,
+                                     use_thread,
+                                     with_memory_cache,
+                                     with_file_cache):
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '3')
+    nnabla_config.set(
+        'DATA_ITERATOR', 'data_source_buffer_max_size', '10000')
+    nnabla_config.set('DATA_ITERATOR', 'data_iterator_num_of_batch_buffers',
+                      str(num_of_batch_buffers))
+
+    with data_iterator_csv_dataset(uri=test_data_csv_png_20,
+                                   batch_size=batch_size,
+                                   shuffle=shuffle,
+                                   normalize=False,
+                                   with_memory_cache=with_memory_cache,
+                                   with_file_cache=with_file_cache,
+                                   use_thread=use_thread) as di:
+        check_data_iterator_result(di, batch_size, shuffle, False, False)
+
+        if num_of_batch_buffers > 1:
+            ids = set()
+            for _ in range(num_of_batch_buffers * 2):
+                ids.add(id(di.next()[0]))
+            assert len(ids) == num_of_batch_buffers
+
+    nnabla_config.set(
+        'DATA_ITERATOR', 'data_iterator_num_of_batch_buffers', '0')
+
+
+@pytest.mark.parametrize("num_of_batch_buffers", [0, 2])
+@pytest.mark.parametrize("use_thread", [True, False])
+@pytest.mark.parametrize("with_memory_cache", [True, False])
+def test_data_iterator_variable_shape(num_of_batch_buffers,
+                                      use_thread,
+                                      with_memory_cache):
+    nnabla_config.set('DATA_ITERATOR', 'data_iterator_num_of_batch_buffers',
+                      str(num_of_batch_buffers))
+
+    def load_func(position):
+        return np.arange(position % 3 + 1), np.array([position])
+
+    with data_iterator_simple(load_func, 4, 1,
+                              use_thread=use_thread,
+                              with_memory_cache=with_memory_cache) as di:
+        for _ in range(2):
+            shapes = []
+            for position in range(4):
+                x, y = di.next()
+                shapes.append(x.shape)
+                assert np.all(x[0] == np.arange(position % 3 + 1))
+                assert y[0, 0] == position
+            assert shapes == [(1, 1), (1, 2), (1, 3), (1, 1)]
+
+    nnabla_config.set(
+        'DATA_ITERATOR', 'data_iterator_num_of_batch_buffers', '0')
+
+
+@pytest.mark.parametrize("num_workers", [1, 3])
+@pytest.mark.parametrize("prefetch_depth", [None, 2])
+@pytest.mark.parametrize("batch_size", [3, 7])
+@pytest.mark.parametrize("shuffle", [False, True])
+@pytest.mark.parametrize('stop_exhausted', [False, True])
+def test_data_iterator_num_workers(num_workers, prefetch_depth, batch_size, shuffle, stop_exhausted):
+    if not data_iterator_worker.is_available():
+        pytest.skip('Shared memory is not available.')
+
+    def load_func(position):
+        return np.full((2, 3), position, dtype=np.float32), np.array([position])
+
+    def create(num_workers):
+        epochs = []
+        di = data_iterator_simple(load_func, 20, batch_size, shuffle=shuffle,
+                                  rng=np.random.RandomState(123),
+                                  stop_exhausted=stop_exhausted,
+                                  epoch_end_callbacks=[epochs.append],
+                                  num_workers=num_workers,
+                                  prefetch_depth=prefetch_depth)
+        return di, epochs
+
+    ref_di, ref_epochs = create(0)
+    di, epochs = create(num_workers)
+    with ref_di, di:
+        for _ in range(20):
+            try:
+                ref = ref_di.next()
+            except StopIteration:
+                with pytest.raises(StopIteration):
+                    di.next()
+                break
+            data = di.next()
+            assert di.epoch == ref_di.epoch
+            for d, r in zip(data, ref):
+                assert d.dtype == r.dtype
+                assert np.all(d == r)
+            assert np.all(data[0][:, 0, 0] == data[1][:, 0])
+        assert epochs == ref_epochs
+
+
+def test_data_iterator_num_workers_variable_shape():
+    if not data_iterator_worker.is_available():
+        pytest.skip('Shared memory is not available.')
+
+    def load_func(position):
+        return np.zeros(2 if position < 4 else 3, dtype=np.float32),
+
+    di = data_iterator_simple(load_func, 8, 4, shuffle=False, num_workers=2)
+    with di:
+        assert di.next()[0].shape == (4, 2)
+        with pytest.raises(RuntimeError, match='Shape'):
+            di.next()
+
+
+@pytest.mark.parametrize("cache_file_fmt", ['.npy', '.h5', '.mmap'])
+@pytest.mark.parametrize("num_of_processes", [0, 2])
+@pytest.mark.parametrize("batch_size", [5, 7])
+@pytest.mark.parametrize("shuffle", [True, False])
+@pytest.mark.parametrize("normalize", [True, False])
+def test_data_iterator_file_cache_format(test_data_csv_png_20,
+                                         cache_file_fmt,
+                                         num_of_processes,
+                                         batch_size,
+                                         shuffle,
+                                         normalize):
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '3')
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', cache_file_fmt)
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_num_of_processes',
+                      str(num_of_processes))
+
+    with data_iterator_csv_dataset(uri=test_data_csv_png_20,
+                                   batch_size=batch_size,
+                                   shuffle=shuffle,
+                                   normalize=normalize,
+                                   with_memory_cache=False,
+                                   with_file_cache=True) as di:
+        check_data_iterator_result(
+            di, batch_size, shuffle, normalize, False)
+
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', '.npy')
+    nnabla_config.set(
+        'DATA_ITERATOR', 'data_source_file_cache_num_of_processes', '0')
@@ -14,9 +14,12 @@
 
 import os
 import pytest
+import numpy as np
 
 # from NNabla
 from nnabla.utils.data_source_implements import SimpleDataSource, CsvDataSource, ConcatDataSource
+from nnabla.utils.data_source import ColumnarStore, DataSourceWithMemoryCache
+from nnabla.utils.data_source import DataSourceWithFileCache
 from nnabla.utils.data_source_loader import load_image
 
 from .conftest import test_data_csv_csv_10, test_data_csv_csv_20
@@ -95,3 +98,208 @@ def test_concat_data_source(test_data_csv_csv_10, test_data_csv_csv_20, shuffle)
         assert sorted(original_order) == sorted(order)
     else:
         assert original_order == order
+
+
+@pytest.mark.parametrize("capacity", [0, 3, 20])
+@pytest.mark.parametrize("spill", [False, True])
+def test_columnar_store(capacity, spill):
+    import tempfile
+    max_memory = 100 if spill else None
+    store = ColumnarStore(capacity, max_memory,
+                          tempfile.gettempdir() if spill else None)
+    samples = [(np.full((2, 3), i, dtype=np.uint8), i) for i in range(20)]
+    samples[10] = (samples[10][0], 10.5)
+    for s in samples:
+        store.append(s)
+    assert len(store) == 20
+    assert store.nbytes == 20 * (6 + 8)
+    if spill:
+        assert store.resident_size == 0
+    else:
+        assert store.resident_size >= store.nbytes
+
+    x, y = store[10]
+    assert np.all(x == 10)
+    assert y == 10.5
+    indexes = np.array([3, 10, 0])
+    x, y = store.take(indexes)
+    assert x.shape == (3, 2, 3)
+    assert x.dtype == np.uint8
+    assert y.tolist() == [3, 10.5, 0]
+    out = [np.empty_like(x), np.empty_like(y)]
+    assert all(a is b for a, b in zip(store.take(indexes, out), out))
+    assert out[1].tolist() == [3, 10.5, 0]
+    store.close()
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_columnar_store_variable_shape(spill):
+    import os
+    import tempfile
+    spill_dir = tempfile.mkdtemp() if spill else None
+    store = ColumnarStore(8, 60 if spill else None, spill_dir)
+    samples = [(np.arange(i % 3 + 1, dtype=np.float32), i) for i in range(10)]
+    appended = [store.append(s) for s in samples]
+    # Samples of variable shapes are counted against max_memory.
+    size = 4 if spill else 10
+    assert appended == [True] * size + [False] * (10 - size)
+    assert len(store) == size
+    for i, (x, y) in enumerate(samples[:size]):
+        assert store[i][0].tolist() == x.tolist()
+        assert store[i][1] == y
+    assert store.nbytes == sum(x.nbytes + np.asarray(y).nbytes
+                               for x, y in samples[:size])
+    assert store.nbytes <= 60 or not spill
+    # Samples of different shapes can not be gathered.
+    assert store.take(np.array([0, 1])) is None
+    store.close()
+    if spill:
+        assert os.listdir(spill_dir) == []
+        os.rmdir(spill_dir)
+
+
+def test_memory_cache_data_source_variable_shape():
+
+    def test_load_func(position):
+        return np.full((position % 3 + 1,), position, dtype=np.float32),
+
+    size = 10
+    with DataSourceWithMemoryCache(SimpleDataSource(test_load_func, size),
+                                   shuffle=True) as ds:
+        for epoch in range(2):
+            ds.reset()
+            data = [ds.next()[0] for _ in range(size)]
+            for x in data:
+                assert x.shape == (x[0] % 3 + 1,)
+            assert sorted(int(x[0]) for x in data) == list(range(size))
+
+
+def test_memory_cache_data_source_variable_shape_max_size():
+    from nnabla.config import nnabla_config
+    nnabla_config.set('DATA_ITERATOR', 'data_source_buffer_max_size', '100')
+
+    def test_load_func(position):
+        return np.full((position % 3 + 1,), position, dtype=np.float32),
+
+    size = 20
+    with DataSourceWithMemoryCache(SimpleDataSource(test_load_func, size),
+                                   shuffle=True) as ds:
+        for epoch in range(3):
+            ds.reset()
+            data = [ds.next()[0] for _ in range(size)]
+            for x in data:
+                assert x.shape == (x[0] % 3 + 1,)
+            assert sorted(int(x[0]) for x in data) == list(range(size))
+            assert ds._cache.nbytes <= 100
+        assert 0 < len(ds._cache) < size
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_memory_cache_data_source_spill(spill):
+    from nnabla.config import nnabla_config
+    nnabla_config.set('DATA_ITERATOR', 'data_source_buffer_max_size', '100')
+    nnabla_config.set('DATA_ITERATOR',
+                      'data_source_buffer_spill_to_file', str(spill))
+
+    def test_load_func(position):
+        return np.full((4,), position, dtype=np.float32), position
+
+    size = 20
+    with DataSourceWithMemoryCache(SimpleDataSource(test_load_func, size),
+                                   shuffle=True) as ds:
+        for epoch in range(2):
+            ds.reset()
+            if epoch == 0 or not spill:
+                data = [ds.next() for _ in range(size)]
+            else:
+                data = list(zip(*ds.next_batch(size)))
+            for x, y in data:
+                assert np.all(x == y)
+            assert sorted(int(y) for _, y in data) == list(range(size))
+        assert ds.resident_size == 0
+        assert ds._on_memory == spill
+
+    nnabla_config.set('DATA_ITERATOR',
+                      'data_source_buffer_max_size', '1073741824')
+    nnabla_config.set('DATA_ITERATOR',
+                      'data_source_buffer_spill_to_file', 'False')
+
+
+@pytest.mark.parametrize("cache_file_format", [".npy", ".h5"])
+@pytest.mark.parametrize("buffer_size", [1, 5, 100])
+def test_file_cache_data_source_shuffle_buffer(cache_file_format, buffer_size):
+    from nnabla.config import nnabla_config
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', cache_file_format)
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '3')
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_shuffle_buffer_size',
+                      str(buffer_size))
+    nnabla_config.set('DATA_ITERATOR',
+                      'cache_file_shuffle_buffer_num_of_files', '2')
+
+    def test_load_func(position):
+        return np.full((4,), position, dtype=np.float32), position
+
+    size = 20
+    with DataSourceWithFileCache(SimpleDataSource(test_load_func, size),
+                                 shuffle=True,
+                                 rng=np.random.RandomState(313)) as ds:
+        for epoch in range(2):
+            ds.reset()
+            data = [ds.next() for _ in range(size // 2)]
+            data += list(zip(*ds.next_batch(size - size // 2)))
+            for x, y in data:
+                assert np.all(x == y)
+            assert sorted(int(y) for _, y in data) == list(range(size))
+            # Each cache file is loaded only once per epoch.
+            assert ds._shuffle_buffer.file_loads == 7
+            assert 0 < ds._shuffle_buffer.mean_buffer_fill <= buffer_size
+
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_shuffle_buffer_size', '0')
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '100')
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', '.npy')
+
+
+@pytest.mark.parametrize("chunk_size", [3, 65536])
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_csv_data_source_columns(test_data_csv_csv_10, monkeypatch, chunk_size, shuffle):
+    import csv
+    import nnabla.utils.data_source_implements as dsi
+    monkeypatch.setattr(dsi, '_CSV_CHUNK_SIZE', chunk_size)
+
+    # Numeric vector, indexed numeric columns, a comment column and a
+    # column which has both numbers and file names.
+    with open(test_data_csv_csv_10) as f:
+        rows = list(csv.reader(f))[1:]
+    csvfilename = os.path.join(os.path.dirname(test_data_csv_csv_10),
+                               'columns.csv')
+    with open(csvfilename, 'w') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(['a', 'b__0', '#comment', 'b__1', 'c'])
+        for i in range(10):
+            c = rows[i][0] if i >= 5 else str(i)
+            writer.writerow([str(i), str(i * 2), 'x', '{}e-1'.format(i), c])
+
+    cds = CsvDataSource(csvfilename, shuffle)
+    assert cds.variables == ('a', 'b', 'c')
+    order = []
+    for n in range(cds.size):
+        a, b, c = cds.next()
+        i = int(a[0])
+        order.append(i)
+        assert np.asarray(a).shape == (1,)
+        assert list(b) == [i * 2, float('{}e-1'.format(i))]
+        if i < 5:
+            assert c == [i]
+        else:
+            assert np.asarray(c).shape[0] > 1
+    assert sorted(order) == list(range(10))
+
+    # Batched access is available when all variables are numeric.
+    cds.reset()
+    assert cds._get_batch(np.arange(3)) is None
+    del cds._cells['c']
+    cds._arrays['c'] = cds._arrays['a']
+    a, b, c = cds._get_batch(np.arange(10))
+    assert a.shape == (10, 1)
+    assert b.shape == (10, 2)
+    assert sorted(a[:, 0].astype(int).tolist()) == list(range(10))
@@ -0,0 +1,67 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import pytest
+import numpy as np
+
+import nnabla as nn
+import nnabla.functions as F
+import nnabla.parametric_functions as PF
+import nnabla.experimental.graph_converters as GC
+
+
+@pytest.mark.parametrize('seed', [313])
+def test_common_subexpression_elimination(seed):
+    from .graph_converter_test_utils import GraphInfo, value_tester
+
+    rng = np.random.RandomState(seed)
+    x = nn.Variable.from_numpy_array(rng.randn(4, 8))
+    with nn.parameter_scope('cse'):
+        h = PF.affine(x, 16, name='fc1')
+        h0 = F.relu(h)
+        h1 = F.relu(h)
+        # Stochastic functions are not merged.
+        d0 = F.dropout(h, 0.5)
+        d1 = F.dropout(h, 0.5)
+        y_tgt = F.mul_scalar(h0 + h1, 2.0) * F.mul_scalar(h1, 2.0) + d0 + d1
+
+    modifiers = [GC.CommonSubexpressionEliminationModifier()]
+    y_act = GC.GraphConverter(modifiers).convert(y_tgt)
+
+    funcs = [f.info.type_name for f in GraphInfo(y_act).funcs]
+    assert funcs.count('ReLU') == 1
+    assert funcs.count('Dropout') == 2
+    assert funcs.count('MulScalar') == 2
+
+    # Remove dropout from the comparison
+    y_tgt = F.mul_scalar(h0 + h1, 2.0) * F.mul_scalar(h1, 2.0)
+    y_act = GC.GraphConverter(modifiers).convert(y_tgt)
+    funcs = [f.info.type_name for f in GraphInfo(y_act).funcs]
+    assert sorted(funcs) == ['Add2', 'Affine', 'MulScalar', 'MulScalar',
+                             'Mul2', 'ReLU']
+    value_tester(y_tgt, y_act)
+
+
+def test_is_deterministic_function():
+    from nnabla.core.graph_def import is_deterministic_function
+
+    assert is_deterministic_function('ReLU', {})
+    assert not is_deterministic_function('Dropout', {'p': 0.5})
+    assert not is_deterministic_function('MeanSubtraction', {})
+    assert not is_deterministic_function(
+        'MeanSubtraction', {'update_running_mean': True})
+    assert is_deterministic_function(
+        'MeanSubtraction', {'update_running_mean': False})
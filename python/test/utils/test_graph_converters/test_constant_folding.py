@@ -0,0 +1,50 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import pytest
+import numpy as np
+
+import nnabla as nn
+import nnabla.functions as F
+import nnabla.parametric_functions as PF
+import nnabla.experimental.graph_converters as GC
+
+
+@pytest.mark.parametrize('seed', [313])
+def test_constant_folding(seed):
+    from .graph_converter_test_utils import GraphInfo, value_tester
+
+    nn.clear_parameters()
+    rng = np.random.RandomState(seed)
+    x = nn.Variable.from_numpy_array(rng.randn(4, 3, 8, 8))
+    with nn.parameter_scope('cf'):
+        h = PF.convolution(x, 4, (3, 3), apply_w=lambda w: F.weight_standardization(
+            w, channel_axis=0), name='conv1')
+        h = F.relu(h)
+        y_tgt = PF.affine(h, 10, apply_w=lambda w: F.mul_scalar(
+            F.tanh(w), 0.5), name='fc1')
+
+    modifiers = [GC.ConstantFoldingModifier()]
+    y_act = GC.GraphConverter(modifiers).convert(y_tgt)
+
+    funcs = [f.info.type_name for f in GraphInfo(y_act).funcs]
+    assert funcs == ['Convolution', 'ReLU', 'Affine']
+    params = nn.get_parameters(grad_only=False)
+    assert 'cf/conv1/conv/WeightStandardization_folded' in params
+    assert 'cf/fc1/affine/MulScalar_folded' in params
+    assert not params['cf/conv1/conv/WeightStandardization_folded'].need_grad
+    value_tester(y_tgt, y_act)
+    nn.clear_parameters()
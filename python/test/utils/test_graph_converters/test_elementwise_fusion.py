@@ -0,0 +1,57 @@
+# Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import absolute_import
+
+import pytest
+import numpy as np
+
+import nnabla as nn
+import nnabla.functions as F
+import nnabla.parametric_functions as PF
+import nnabla.experimental.graph_converters as GC
+
+
+def elementwise_graph(x, z):
+    h = F.relu(PF.affine(x, 16, name='fc1'))
+    h = F.relu(F.add2(h, z))
+    h = F.tanh(F.add_scalar(F.mul_scalar(h, 0.5), 0.1))
+    h = PF.affine(h, 16, name='fc2')
+    return h * F.sigmoid(h)
+
+
+@pytest.mark.parametrize('seed', [313])
+@pytest.mark.parametrize('epilogue', [True, False])
+def test_elementwise_fusion(seed, epilogue):
+    from .graph_converter_test_utils import GraphInfo, value_tester
+
+    rng = np.random.RandomState(seed)
+    x = nn.Variable.from_numpy_array(rng.randn(4, 8))
+    z = nn.Variable.from_numpy_array(rng.randn(4, 16))
+    with nn.parameter_scope('elementwise-fusion'):
+        y_tgt = elementwise_graph(x, z)
+
+    modifiers = [GC.ElementwiseFusionModifier(epilogue=epilogue)]
+    y_act = GC.GraphConverter(modifiers).convert(y_tgt)
+
+    # Chains after fc1 and fc2 are fused respectively.
+    funcs = GraphInfo(y_act).funcs
+    assert [f.info.type_name for f in funcs] == [
+        'Affine', 'FusedElementwise', 'Affine', 'FusedElementwise']
+    assert len(funcs[1].info.args['ops']) == 6
+    assert funcs[1].info.args['inplace'] == epilogue
+    # Output of fc2 is also an operand of the chain.
+    assert len(funcs[3].inputs) == 1
+    assert not funcs[3].info.args['inplace']
+    value_tester(y_tgt, y_act, rtol=1e-5, atol=1e-6)
@@ -18,6 +18,11 @@ import numpy as np
 
 from nnabla.utils.data_source_loader import load_image
 from nnabla.utils.data_iterator import data_iterator_simple
+from nnabla.config import nnabla_config
+from nnabla.utils.data_source import DataSourceWithFileCache
+from nnabla.utils.data_source import DataSourceWithMemoryCache
+from nnabla.utils.data_source import ShardedDataSource
+from nnabla.utils.data_source_implements import SimpleDataSource
 
 from .test_data_iterator import check_data_iterator_result
 
@@ -77,3 +82,106 @@ def test_sliced_data_iterator(test_data_csv_png_10, num_of_slices, size, batch_s
             acceptable_size = amount
         for dup in [x0 & x for x in epochs[epoch][1:]]:
             assert len(dup) < amount
+
+
+@pytest.mark.parametrize("num_of_shards", [1, 3, 4])
+@pytest.mark.parametrize("size", [1, 50, 97])
+@pytest.mark.parametrize("batch_size", [1, 5])
+@pytest.mark.parametrize("shuffle", [False, True])
+@pytest.mark.parametrize("drop_last", [False, True])
+def test_sharded_data_iterator(num_of_shards, size, batch_size, shuffle, drop_last):
+
+    def test_load_func(position):
+        return np.full((1), position, dtype=np.float32)
+
+    if drop_last and size < num_of_shards:
+        return
+
+    shards = [ShardedDataSource(SimpleDataSource(test_load_func, size, shuffle=shuffle),
+                                num_of_shards, pos, shuffle=shuffle, seed=123,
+                                drop_last=drop_last)
+              for pos in range(num_of_shards)]
+    shard_size = size // num_of_shards if drop_last else - \
+        (-size // num_of_shards)
+
+    orders = []
+    for epoch in range(2):
+        epoch_data = []
+        for ds in shards:
+            assert ds.size == shard_size
+            data = []
+            while ds.position < ds.size:
+                data.append(int(ds.next()[0]))
+            ds.reset()
+            assert len(data) == shard_size
+            epoch_data += data
+        if drop_last:
+            assert len(set(epoch_data)) == len(epoch_data)
+        else:
+            assert set(epoch_data) == set(range(size))
+        if not shuffle:
+            assert epoch_data[:size] == list(range(min(size, len(epoch_data))))
+        orders.append(epoch_data)
+    if shuffle and size > 10:
+        assert orders[0] != orders[1]
+
+    # Same seed gives same shards.
+    di = data_iterator_simple(test_load_func, size,
+                              batch_size, shuffle=shuffle)
+    ds = di._data_source
+    while hasattr(ds, '_data_source'):
+        ds = ds._data_source
+    order = list(ds._order)
+    sharded_di = di.shard(num_of_shards, 0, seed=123, drop_last=drop_last)
+    assert sharded_di._data_source._shard_indexes(1).tolist() == \
+        shards[0]._shard_indexes(1).tolist()
+    # Data source of the original data iterator is left unchanged.
+    assert ds.shuffle == shuffle
+    assert list(ds._order) == order
+    for _ in range(3):
+        batch = sharded_di.next()
+        assert batch[0].shape == (batch_size,)
+
+
+@pytest.mark.parametrize("cache_file_format", ['.npy', '.h5'])
+def test_sharded_data_iterator_cache_files(cache_file_format):
+
+    def test_load_func(position):
+        return np.full((1), position, dtype=np.float32)
+
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '20')
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', cache_file_format)
+    with data_iterator_simple(test_load_func, 200, 10, shuffle=True,
+                              use_thread=False, with_memory_cache=True,
+                              with_file_cache=True) as di:
+        assert isinstance(di._data_source._data_source,
+                          DataSourceWithFileCache)
+        sharded_di = di.shard(2, 0, seed=123)
+        # Memory cache is kept.
+        assert isinstance(sharded_di._data_source, DataSourceWithMemoryCache)
+        sharded = sharded_di._data_source._data_source
+        assert sharded._block_size == 20
+        # A copy of the shuffled file cache is read in the original order.
+        file_cache = sharded._data_source
+        assert file_cache is not di._data_source._data_source
+        assert di._data_source._data_source.shuffle
+        assert not file_cache.shuffle
+
+        # Count loads of cache files.
+        loads = []
+        load_cache_file = file_cache._load_cache_file
+
+        def counting_load_cache_file(index):
+            if index != file_cache._current_cache_file_index:
+                loads.append(index)
+            return load_cache_file(index)
+        file_cache._load_cache_file = counting_load_cache_file
+        file_cache._current_cache_file_index = -1
+
+        data = [sharded_di.next()[0] for _ in range(10)]
+        assert len(set(np.concatenate(data).ravel().tolist())) == 100
+        # Each cache file in the shard is loaded once.
+        assert len(loads) == len(set(loads)) == 5
+        sharded_di.close()
+    nnabla_config.set('DATA_ITERATOR', 'data_source_file_cache_size', '100')
+    nnabla_config.set('DATA_ITERATOR', 'cache_file_format', '.npy')
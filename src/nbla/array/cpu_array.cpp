@@ -18,9 +18,20 @@
 #include <nbla/common.hpp>
 #include <nbla/cpu.hpp>
 
+#include <algorithm>
+#include <chrono>
+#include <condition_variable>
 #include <cstring> // memset
+#include <deque>
+#include <future>
+#include <mutex>
+#include <thread>
 #include <vector>
 
+#ifndef _WIN32
+#include <sys/mman.h>
+#endif
+
 namespace nbla {
 
 using std::vector;
@@ -64,4 +75,166 @@ CpuCachedArray::~CpuCachedArray() {}
 Context CpuCachedArray::filter_context(const Context &ctx) {
   return Context({}, "CpuCachedArray", "");
 }
+
+/////////////////////////////////
+// CpuDiskArray implementation
+/////////////////////////////////
+CpuDiskArray::CpuDiskArray(const Size_t size, dtypes dtype, const Context &ctx)
+    : CpuArray(size, dtype, ctx,
+               SingletonManager::get<Cpu>()->disk_allocator()->alloc(
+                   Array::size_as_bytes(size, dtype), "")) {}
+
+CpuDiskArray::~CpuDiskArray() {}
+
+Context CpuDiskArray::filter_context(const Context &ctx) {
+  return Context({}, "CpuDiskArray", "");
+}
+
+namespace {
+// Thread copying arrays from disk in order.
+class DiskCopyQueue {
+  struct Copy {
+    ArrayPtr src;
+    ArrayPtr dst;
+    std::promise<void> done;
+  };
+
+  std::thread thread_;
+  std::mutex mtx_;
+  std::condition_variable cv_queue_;
+  std::condition_variable cv_done_;
+  std::deque<shared_ptr<Copy>> queue_;
+  // Arrays of finished copies are released by the calling thread, since
+  // allocators are not thread safe.
+  vector<shared_ptr<Copy>> finished_;
+  size_t pending_{0};
+  bool stop_{false};
+  double wait_time_{0};
+
+  void run() {
+    std::unique_lock<std::mutex> lock(mtx_);
+    while (true) {
+      cv_queue_.wait(lock, [this] { return stop_ || !queue_.empty(); });
+      if (queue_.empty()) {
+        return;
+      }
+      auto copy = queue_.front();
+      queue_.pop_front();
+      lock.unlock();
+      try {
+        copy->dst->copy_from(copy->src.get());
+        copy->done.set_value();
+      } catch (...) {
+        copy->done.set_exception(std::current_exception());
+      }
+      lock.lock();
+      finished_.push_back(copy);
+      if (--pending_ == 0) {
+        cv_done_.notify_all();
+      }
+    }
+  }
+
+public:
+  DiskCopyQueue() : thread_([this] { run(); }) {}
+
+  ~DiskCopyQueue() {
+    {
+      std::lock_guard<std::mutex> lock(mtx_);
+      stop_ = true;
+    }
+    cv_queue_.notify_one();
+    thread_.join();
+  }
+
+  std::shared_future<void> submit(ArrayPtr src, ArrayPtr dst) {
+    release_finished();
+    auto copy = std::make_shared<Copy>();
+    copy->src = src;
+    copy->dst = dst;
+    std::shared_future<void> future = copy->done.get_future().share();
+    {
+      std::lock_guard<std::mutex> lock(mtx_);
+      queue_.push_back(copy);
+      pending_++;
+    }
+    cv_queue_.notify_one();
+    return future;
+  }
+
+  void wait(const std::shared_future<void> &future) {
+    using clock = std::chrono::steady_clock;
+    if (future.wait_for(std::chrono::seconds(0)) !=
+        std::future_status::ready) {
+      auto start = clock::now();
+      future.wait();
+      std::chrono::duration<double> elapsed = clock::now() - start;
+      std::lock_guard<std::mutex> lock(mtx_);
+      wait_time_ += elapsed.count();
+    }
+    release_finished();
+    future.get();
+  }
+
+  void synchronize() {
+    {
+      std::unique_lock<std::mutex> lock(mtx_);
+      cv_done_.wait(lock, [this] { return pending_ == 0; });
+    }
+    release_finished();
+  }
+
+  void release_finished() {
+    vector<shared_ptr<Copy>> finished;
+    {
+      std::lock_guard<std::mutex> lock(mtx_);
+      finished.swap(finished_);
+    }
+  }
+
+  double wait_time() {
+    std::lock_guard<std::mutex> lock(mtx_);
+    return wait_time_;
+  }
+};
+
+DiskCopyQueue &disk_copy_queue() {
+  static DiskCopyQueue queue;
+  return queue;
+}
+
+// Event of an asynchronous copy from disk.
+class DiskCopyEvent : public Event {
+  std::shared_future<void> future_;
+
+public:
+  explicit DiskCopyEvent(std::shared_future<void> future) : future_(future) {}
+  virtual ~DiskCopyEvent() {}
+  virtual void wait_event(const Context ctx, const int async_flags) {
+    disk_copy_queue().wait(future_);
+  }
+};
+}
+
+void synchronizer_cpu_disk(Array *src, Array *dst, const int async_flags) {
+  // The source may be being copied from disk.
+  src->wait_event(src->context());
+  if ((async_flags & AsyncFlag::ASYNC) &&
+      dynamic_cast<CpuDiskArray *>(src)) {
+#ifndef _WIN32
+    // Start reading pages ahead of the copy.
+    const size_t bytes = src->size() * sizeof_dtype(src->dtype());
+    ::madvise(src->pointer<void>(), std::max<size_t>(bytes, 1),
+              MADV_WILLNEED);
+#endif
+    dst->set_event(std::make_shared<DiskCopyEvent>(
+        disk_copy_queue().submit(src->getptr(), dst->getptr())));
+    return;
+  }
+  dst->copy_from(src);
+}
+
+void cpu_disk_array_synchronize() { disk_copy_queue().synchronize(); }
+
+double cpu_disk_array_wait_time() { return disk_copy_queue().wait_time(); }
 }
@@ -13,6 +13,7 @@
 // limitations under the License.
 
 #include <nbla/communicator.hpp>
+#include <nbla/communicator/bucketed_all_reduce_callback.hpp>
 #include <nbla/logger.hpp>
 
 #include <algorithm>
@@ -148,6 +149,15 @@ Communicator::all_reduce_callback(NdArrayPtr ndarray, size_t pack_size,
                                    division, group);
 }
 
+CommunicatorBackwardCallbackPtr Communicator::bucketed_all_reduce_callback(
+    const vector<NdArrayPtr> &ndarray_list, size_t bucket_size, bool division,
+    bool fp16_compression, bool overlap, const string &group) {
+  return make_shared<BucketedAllReduceCallback>(this, ctx_, ndarray_list,
+                                                bucket_size, division,
+                                                fp16_compression, overlap,
+                                                group);
+}
+
 void Communicator::reduce_scatter(const vector<NdArrayPtr> &ndarray_list,
                                   NdArrayPtr ndarray, bool division,
                                   const string &group) {
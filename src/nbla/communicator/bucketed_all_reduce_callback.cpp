@@ -0,0 +1,207 @@
+// Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <nbla/communicator/bucketed_all_reduce_callback.hpp>
+#include <nbla/computation_graph/function.hpp>
+#include <nbla/singleton_manager.hpp>
+#include <nbla/synced_array.hpp>
+
+#include <algorithm>
+#include <condition_variable>
+#include <deque>
+#include <exception>
+#include <mutex>
+#include <thread>
+
+namespace nbla {
+
+// Thread all-reducing queued buckets in order.
+struct BucketedAllReduceCallback::Worker {
+  std::thread thread;
+  std::mutex mtx;
+  std::condition_variable cv_queue;
+  std::condition_variable cv_done;
+  std::deque<vector<size_t>> queue;
+  size_t pending{0};
+  bool stop{false};
+  std::exception_ptr error;
+
+  explicit Worker(BucketedAllReduceCallback *owner) {
+    thread = std::thread([this, owner] {
+      std::unique_lock<std::mutex> lock(mtx);
+      while (true) {
+        cv_queue.wait(lock, [this] { return stop || !queue.empty(); });
+        if (queue.empty()) {
+          return;
+        }
+        auto bucket = std::move(queue.front());
+        queue.pop_front();
+        lock.unlock();
+        try {
+          owner->all_reduce(bucket);
+        } catch (...) {
+          lock.lock();
+          if (!error) {
+            error = std::current_exception();
+          }
+          lock.unlock();
+        }
+        lock.lock();
+        if (--pending == 0) {
+          cv_done.notify_all();
+        }
+      }
+    });
+  }
+
+  ~Worker() {
+    {
+      std::lock_guard<std::mutex> lock(mtx);
+      stop = true;
+    }
+    cv_queue.notify_one();
+    thread.join();
+  }
+
+  void submit(vector<size_t> &&bucket) {
+    {
+      std::lock_guard<std::mutex> lock(mtx);
+      queue.push_back(std::move(bucket));
+      pending++;
+    }
+    cv_queue.notify_one();
+  }
+
+  void wait() {
+    std::unique_lock<std::mutex> lock(mtx);
+    cv_done.wait(lock, [this] { return pending == 0; });
+    if (error) {
+      auto e = error;
+      error = nullptr;
+      std::rethrow_exception(e);
+    }
+  }
+};
+
+BucketedAllReduceCallback::BucketedAllReduceCallback(
+    Communicator *comm, const Context &ctx,
+    const vector<NdArrayPtr> &ndarray_list, size_t bucket_size, bool division,
+    bool fp16_compression, bool overlap, const string &group)
+    : comm_(comm), ctx_(ctx), arrays_(ndarray_list), bucket_size_(bucket_size),
+      division_(division), fp16_compression_(fp16_compression),
+      overlap_(overlap), group_(group), uses_(ndarray_list.size(), 0),
+      done_(ndarray_list.size(), false), halves_(ndarray_list.size()) {
+  for (size_t i = 0; i < arrays_.size(); i++) {
+    indices_[arrays_[i].get()] = i;
+  }
+}
+
+BucketedAllReduceCallback::~BucketedAllReduceCallback() {}
+
+void BucketedAllReduceCallback::on_finish_function_backward(
+    const CgFunctionPtr &ptr) {
+  for (auto &v : ptr->inputs()) {
+    auto it = indices_.find(v->variable()->grad().get());
+    if (it == indices_.end()) {
+      continue;
+    }
+    // The gradient is complete when all the functions using it finish.
+    const size_t i = it->second;
+    if (!done_[i] && ++uses_[i] >= v->function_reference_count()) {
+      add(i);
+    }
+  }
+}
+
+void BucketedAllReduceCallback::on_finish_backward() {
+  // Gradients not seen during backward are reduced at last, so that all
+  // processes call the same collectives.
+  for (size_t i = 0; i < arrays_.size(); i++) {
+    if (!done_[i]) {
+      add(i);
+    }
+  }
+  flush();
+  std::fill(uses_.begin(), uses_.end(), 0);
+  std::fill(done_.begin(), done_.end(), false);
+  if (worker_) {
+    worker_->wait();
+  }
+}
+
+void BucketedAllReduceCallback::add(size_t i) {
+  done_[i] = true;
+  bucket_.push_back(i);
+  bucket_elements_ += arrays_[i]->size();
+  if (bucket_elements_ >= bucket_size_) {
+    flush();
+  }
+}
+
+void BucketedAllReduceCallback::flush() {
+  if (bucket_.empty()) {
+    return;
+  }
+  vector<size_t> bucket;
+  bucket.swap(bucket_);
+  bucket_elements_ = 0;
+  // Callbacks of SyncedArray (e.g. swapping) are not called concurrently.
+  if (!overlap_ || !SingletonManager::get<SyncedArrayCallback>()->empty()) {
+    all_reduce(bucket);
+    return;
+  }
+  if (!worker_) {
+    worker_.reset(new Worker(this));
+  }
+  worker_->submit(std::move(bucket));
+}
+
+void BucketedAllReduceCallback::all_reduce(const vector<size_t> &bucket) {
+  vector<NdArrayPtr> ndarray_list;
+  if (!fp16_compression_) {
+    for (auto i : bucket) {
+      ndarray_list.push_back(arrays_[i]);
+    }
+    comm_->all_reduce(ndarray_list, division_, false, group_);
+    return;
+  }
+
+  // Zeroing gradients are kept zeroing in the half arrays, so that they are
+  // skipped if zeroing in all processes.
+  vector<dtypes> types;
+  for (auto i : bucket) {
+    auto g = arrays_[i]->array();
+    auto &h = halves_[i];
+    if (!h) {
+      h = std::make_shared<NdArray>(arrays_[i]->shape());
+    }
+    types.push_back(g->get_num_arrays() > 0 ? g->dtype() : dtypes::FLOAT);
+    if (g->zeroing()) {
+      h->zero();
+    } else {
+      h->cast(dtypes::HALF, ctx_, true)->copy_from(g->get(types.back(), ctx_));
+    }
+    ndarray_list.push_back(h);
+  }
+  comm_->all_reduce(ndarray_list, division_, false, group_);
+  for (size_t j = 0; j < bucket.size(); j++) {
+    auto &h = halves_[bucket[j]];
+    if (!h->array()->zeroing()) {
+      arrays_[bucket[j]]
+          ->cast(types[j], ctx_, true)
+          ->copy_from(h->get(dtypes::HALF, ctx_));
+    }
+  }
+}
+}
@@ -12,10 +12,28 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <nbla/communicator/bucketed_all_reduce_callback.hpp>
 #include <nbla/communicator/multi_process_data_parallel_communicator.hpp>
+#include <nbla/cpu.hpp>
+#include <nbla/half.hpp>
+#include <nbla/singleton_manager.hpp>
 
 #include <algorithm>
+#include <atomic>
+#include <cerrno>
+#include <chrono>
+#include <cstdlib>
+#include <cstring>
 #include <memory>
+#include <numeric>
+#include <thread>
+
+#ifndef _WIN32
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
 
 namespace nbla {
 
@@ -25,6 +43,246 @@ NBLA_REGISTER_COMMUNICATOR_SOURCE(MultiProcessDataParallelCommunicator);
 
 using std::make_shared;
 
+namespace {
+// Maximum number of groups including "world".
+const int max_groups = 64;
+// Default size of the buffer of each process in bytes.
+const long default_buffer_size = 4 << 20;
+// Alignment of the regions in the shared memory.
+const size_t shm_alignment = 64;
+// Time to wait for other processes at initialization.
+const std::chrono::seconds init_timeout(60);
+
+long env_long(const char *name, long default_value) {
+  const char *env = std::getenv(name);
+  return env ? std::atol(env) : default_value;
+}
+
+size_t align(size_t bytes) {
+  return (bytes + shm_alignment - 1) / shm_alignment * shm_alignment;
+}
+
+int index_of(const vector<int> &ranks, int rank) {
+  auto it = std::find(ranks.begin(), ranks.end(), rank);
+  return it == ranks.end() ? -1 : static_cast<int>(it - ranks.begin());
+}
+
+// Concatenation of arrays seen as a flat array.
+template <typename T> class Flat {
+  vector<T *> ptrs_;
+  vector<Size_t> offsets_{0};
+
+public:
+  void push_back(T *ptr, Size_t size) {
+    ptrs_.push_back(ptr);
+    offsets_.push_back(offsets_.back() + size);
+  }
+  Size_t size() const { return offsets_.back(); }
+
+  // Call f(ptr, n, pos) for each contiguous piece of [begin, end), where pos
+  // is the position of the piece from begin.
+  template <typename F> void each(Size_t begin, Size_t end, F f) const {
+    auto i = std::upper_bound(offsets_.begin(), offsets_.end(), begin) -
+             offsets_.begin() - 1;
+    for (Size_t pos = 0; begin < end; i++) {
+      const Size_t n = std::min(end, offsets_[i + 1]) - begin;
+      f(ptrs_[i] + (begin - offsets_[i]), n, pos);
+      begin += n;
+      pos += n;
+    }
+  }
+};
+
+template <typename T, typename U>
+void copy_in(const Flat<U> &flat, Size_t begin, Size_t end, T *dst) {
+  flat.each(begin, end, [dst](const T *p, Size_t n, Size_t pos) {
+    std::memcpy(dst + pos, p, sizeof(T) * n);
+  });
+}
+
+template <typename T>
+void copy_out(const T *src, const Flat<T> &flat, Size_t begin, Size_t end) {
+  flat.each(begin, end, [src](T *p, Size_t n, Size_t pos) {
+    std::memcpy(p, src + pos, sizeof(T) * n);
+  });
+}
+
+template <typename T> const T *read_ptr(NdArrayPtr a, const Context &ctx) {
+  return a->get(get_dtype<T>(), ctx)->template const_pointer<T>();
+}
+
+template <typename T>
+T *write_ptr(NdArrayPtr a, const Context &ctx, bool write_only = false) {
+  return a->cast(get_dtype<T>(), ctx, write_only)->template pointer<T>();
+}
+}
+
+/* Shared memory segment of the processes.
+
+   The segment consists of a header, barrier counters of each group and each
+   process, flags of each process and a buffer of each process. A process
+   writes only its own counters, flag and buffer.
+ */
+template <typename T>
+struct MultiProcessDataParallelCommunicator<T>::SharedMemory {
+  int rank;
+  int size;
+  size_t buffer_bytes;
+  size_t bytes{0};
+  char *base{nullptr};
+  std::atomic<int> *aborted;
+  std::atomic<int> *attached;
+  std::atomic<uint64_t> *counters;
+  std::atomic<int> *flags;
+  char *buffers;
+  vector<uint64_t> counts;
+  unordered_map<string, int> group_ids;
+
+  SharedMemory(int rank, int size, const string &id, size_t buffer_bytes)
+      : rank(rank), size(size), buffer_bytes(align(buffer_bytes)),
+        counts(max_groups, 0) {
+#ifdef _WIN32
+    NBLA_ERROR(error_code::not_implemented,
+               "Shared memory communication is not supported on Windows.");
+#else
+    const size_t header_bytes = align(2 * sizeof(std::atomic<int>));
+    const size_t counter_bytes =
+        align(max_groups * size * sizeof(std::atomic<uint64_t>));
+    const size_t flag_bytes = align(size * sizeof(std::atomic<int>));
+    bytes = header_bytes + counter_bytes + flag_bytes +
+            size * this->buffer_bytes;
+
+    // Rank 0 creates the segment and the others open it.
+    const string name = "/nnabla_comm_" + id;
+    const auto deadline = std::chrono::steady_clock::now() + init_timeout;
+    int fd = -1;
+    if (rank == 0) {
+      fd = shm_open(name.c_str(), O_CREAT | O_EXCL | O_RDWR, 0600);
+      NBLA_CHECK(fd >= 0, error_code::os,
+                 "Failed to create shared memory %s: %s", name.c_str(),
+                 std::strerror(errno));
+      if (ftruncate(fd, bytes) != 0) {
+        close(fd);
+        shm_unlink(name.c_str());
+        NBLA_ERROR(error_code::memory,
+                   "Failed to allocate %zu bytes of shared memory.", bytes);
+      }
+    } else {
+      while (true) {
+        fd = shm_open(name.c_str(), O_RDWR, 0600);
+        struct stat st;
+        if (fd >= 0 && fstat(fd, &st) == 0 &&
+            static_cast<size_t>(st.st_size) == bytes) {
+          break;
+        }
+        if (fd >= 0) {
+          close(fd);
+        }
+        NBLA_CHECK(std::chrono::steady_clock::now() < deadline,
+                   error_code::runtime,
+                   "Timed out waiting for shared memory %s of rank 0.",
+                   name.c_str());
+        std::this_thread::sleep_for(std::chrono::milliseconds(1));
+      }
+    }
+    void *ptr =
+        mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+    close(fd);
+    if (ptr == MAP_FAILED) {
+      if (rank == 0) {
+        shm_unlink(name.c_str());
+      }
+      NBLA_ERROR(error_code::os, "Failed to map shared memory %s: %s",
+                 name.c_str(), std::strerror(errno));
+    }
+
+    // The segment is zero-filled, which is the initial state of the atomics.
+    base = static_cast<char *>(ptr);
+    aborted = reinterpret_cast<std::atomic<int> *>(base);
+    attached = aborted + 1;
+    counters = reinterpret_cast<std::atomic<uint64_t> *>(base + header_bytes);
+    flags = reinterpret_cast<std::atomic<int> *>(base + header_bytes +
+                                                 counter_bytes);
+    buffers = base + header_bytes + counter_bytes + flag_bytes;
+    NBLA_CHECK(counters->is_lock_free() && flags->is_lock_free(),
+               error_code::not_implemented,
+               "Atomics are not lock-free on this platform.");
+
+    // Wait for all processes, then the name is no longer necessary.
+    attached->fetch_add(1);
+    while (attached->load() < size) {
+      NBLA_CHECK(std::chrono::steady_clock::now() < deadline,
+                 error_code::runtime,
+                 "Timed out waiting for %d processes attaching to %s.", size,
+                 name.c_str());
+      std::this_thread::sleep_for(std::chrono::milliseconds(1));
+    }
+    if (rank == 0) {
+      shm_unlink(name.c_str());
+    }
+#endif
+  }
+
+  ~SharedMemory() {
+#ifndef _WIN32
+    if (base) {
+      munmap(base, bytes);
+    }
+#endif
+  }
+
+  template <typename U = T> U *buffer(int r) {
+    return reinterpret_cast<U *>(buffers + r * buffer_bytes);
+  }
+
+  template <typename U = T> Size_t capacity() const {
+    return buffer_bytes / sizeof(U);
+  }
+
+  template <typename F> void wait(F ready) {
+    for (int i = 0; !ready(); i++) {
+      NBLA_CHECK(!aborted->load(), error_code::runtime,
+                 "A process of the communicator aborted.");
+      if (i < 1024) {
+        std::this_thread::yield();
+      } else {
+        std::this_thread::sleep_for(std::chrono::microseconds(20));
+      }
+    }
+  }
+
+  void barrier(int group, const vector<int> &ranks) {
+    const uint64_t count = ++counts[group];
+    counters[group * size + rank].store(count, std::memory_order_release);
+    for (auto r : ranks) {
+      auto &c = counters[group * size + r];
+      wait([&c, count] {
+        return c.load(std::memory_order_acquire) >= count;
+      });
+    }
+  }
+
+  // Sum n elements from offset of the buffers of ranks into dst in the order
+  // of ranks, so that the result does not depend on the process computing it.
+  template <typename U>
+  void reduce(const vector<int> &ranks, Size_t offset, Size_t n,
+              bool division, U *dst) {
+    typedef typename force_float<U>::type Tf;
+    vector<const U *> srcs;
+    for (auto r : ranks) {
+      srcs.push_back(buffer<U>(r) + offset);
+    }
+    const Tf k = static_cast<Tf>(ranks.size());
+    for (Size_t i = 0; i < n; i++) {
+      Tf sum = 0;
+      for (auto src : srcs) {
+        sum += static_cast<Tf>(src[i]);
+      }
+      dst[i] = division ? sum / k : sum;
+    }
+  }
+};
+
 template <typename T>
 MultiProcessDataParallelCommunicator<T>::MultiProcessDataParallelCommunicator(
     const Context &ctx)
@@ -35,13 +293,86 @@ MultiProcessDataParallelCommunicator<
     T>::~MultiProcessDataParallelCommunicator() {}
 
 template <typename T> void MultiProcessDataParallelCommunicator<T>::init() {
-  NBLA_ERROR(error_code::not_implemented, "CPU init is not implemented.")
+  Communicator::init();
+  const int size = env_long("NNABLA_COMM_SIZE", 1);
+  const int rank = env_long("NNABLA_COMM_RANK", 0);
+  NBLA_CHECK(size > 0 && rank >= 0 && rank < size, error_code::value,
+             "Invalid NNABLA_COMM_RANK %d and NNABLA_COMM_SIZE %d.", rank,
+             size);
+  this->rank_ = rank;
+  this->local_rank_ = rank;
+  this->size_ = size;
+  vector<int> world(size);
+  std::iota(world.begin(), world.end(), 0);
+  if (size > 1) {
+    const char *id = std::getenv("NNABLA_COMM_ID");
+    NBLA_CHECK(id, error_code::value,
+               "NNABLA_COMM_ID is not set. Launch processes by "
+               "`nnabla_cli launch`.");
+    const long buffer_size =
+        env_long("NNABLA_COMM_BUFFER_SIZE", default_buffer_size);
+    NBLA_CHECK(buffer_size >= static_cast<long>(size * sizeof(T)),
+               error_code::value,
+               "NNABLA_COMM_BUFFER_SIZE %ld is too small for %d processes.",
+               buffer_size, size);
+    shm_ = make_shared<SharedMemory>(rank, size, id, buffer_size);
+    shm_->group_ids["world"] = 0;
+  }
+  this->groups_["world"] = world;
+  this->initialized_ = true;
+}
+
+template <typename T> void MultiProcessDataParallelCommunicator<T>::barrier() {
+  auto ranks = this->group_ranks("world");
+  if (shm_) {
+    shm_->barrier(0, ranks);
+  }
+}
+
+template <typename T> void MultiProcessDataParallelCommunicator<T>::abort() {
+  if (shm_) {
+    shm_->aborted->store(1);
+  }
+  std::abort();
+}
+
+template <typename T>
+vector<int>
+MultiProcessDataParallelCommunicator<T>::group_ranks(const string &group) {
+  NBLA_CHECK(this->initialized_, error_code::value,
+             "Communicator is not initialized.");
+  auto it = this->groups_.find(group);
+  NBLA_CHECK(it != this->groups_.end(), error_code::value,
+             "Group %s does not exist.", group.c_str());
+  return it->second;
 }
 
 template <typename T>
 string MultiProcessDataParallelCommunicator<T>::new_group(
     pair<string, vector<int>> name_ranks_pair) {
-  NBLA_ERROR(error_code::not_implemented, "CPU new_group is not implemented.")
+  const string &name = name_ranks_pair.first;
+  const vector<int> &ranks = name_ranks_pair.second;
+  NBLA_CHECK(this->initialized_, error_code::value,
+             "Communicator is not initialized.");
+  NBLA_CHECK(this->groups_.find(name) == this->groups_.end(),
+             error_code::value, "Group %s already exists.", name.c_str());
+  auto sorted = ranks;
+  std::sort(sorted.begin(), sorted.end());
+  NBLA_CHECK(!sorted.empty() && sorted.front() >= 0 &&
+                 sorted.back() < this->size_ &&
+                 std::adjacent_find(sorted.begin(), sorted.end()) ==
+                     sorted.end(),
+             error_code::value, "Invalid ranks of group %s.", name.c_str());
+  if (shm_) {
+    // All processes create groups in the same order.
+    const int id = this->groups_.size();
+    NBLA_CHECK(id < max_groups, error_code::value,
+               "The number of groups exceeds %d.", max_groups);
+    shm_->group_ids[name] = id;
+    shm_->barrier(0, this->groups_["world"]);
+  }
+  this->groups_[name] = ranks;
+  return name;
 }
 
 template <typename T>
@@ -76,7 +407,48 @@ template <typename T>
 void MultiProcessDataParallelCommunicator<T>::reduce(
     const vector<NdArrayPtr> &ndarray_list, int dst, bool division,
     bool inplace, const string &group) {
-  NBLA_ERROR(error_code::not_implemented, "CPU reduce is not implemented.")
+  auto ranks = this->group_ranks(group);
+  const int k = ranks.size();
+  const int self = index_of(ranks, this->rank_);
+  // dst is a rank in the world, so its index in the group is compared.
+  const int root = index_of(ranks, dst);
+  NBLA_CHECK(root >= 0, error_code::value, "dst %d is not in group %s.", dst,
+             group.c_str());
+  if (self < 0 || k == 1) {
+    return;
+  }
+  auto &shm = *shm_;
+  const int g = shm.group_ids[group];
+  Flat<const T> src;
+  Flat<T> out;
+  for (auto &a : ndarray_list) {
+    if (self == root) {
+      auto p = write_ptr<T>(a, this->ctx_);
+      src.push_back(p, a->size());
+      out.push_back(p, a->size());
+    } else {
+      src.push_back(read_ptr<T>(a, this->ctx_), a->size());
+    }
+  }
+  const Size_t n = src.size();
+  const Size_t cap = shm.capacity();
+  T *own = shm.buffer(this->rank_);
+  for (Size_t off = 0; off < n; off += cap) {
+    const Size_t m = std::min(cap, n - off);
+    const Size_t begin = m * self / k;
+    const Size_t end = m * (self + 1) / k;
+    copy_in(src, off, off + m, own);
+    shm.barrier(g, ranks);
+    shm.reduce(ranks, begin, end - begin, division, own + begin);
+    shm.barrier(g, ranks);
+    if (self == root) {
+      for (int j = 0; j < k; j++) {
+        const Size_t b = m * j / k;
+        copy_out(shm.buffer(ranks[j]) + b, out, off + b, off + m * (j + 1) / k);
+      }
+    }
+    shm.barrier(g, ranks);
+  }
 }
 
 template <typename T>
@@ -84,20 +456,96 @@ void MultiProcessDataParallelCommunicator<T>::reduce(NdArrayPtr ndarray,
                                                      int dst, bool division,
                                                      bool inplace,
                                                      const string &group) {
-  NBLA_ERROR(error_code::not_implemented, "CPU reduce is not implemented.")
+  this->reduce(vector<NdArrayPtr>{ndarray}, dst, division, inplace, group);
 }
 
 template <typename T>
 void MultiProcessDataParallelCommunicator<T>::allreduce(bool division,
                                                         bool inplace) {
-  NBLA_ERROR(error_code::not_implemented, "CPU allreduce is not implemented.")
+  vector<NdArrayPtr> ndarray_list;
+  for (auto &params : this->device_func_named_param_) {
+    for (auto &kv : params) {
+      ndarray_list.push_back(kv.second->grad());
+    }
+  }
+  this->all_reduce(ndarray_list, division, inplace, "world");
 }
 
 template <typename T>
 void MultiProcessDataParallelCommunicator<T>::all_reduce(
     const vector<NdArrayPtr> &ndarray_list, bool division, bool inplace,
     const string &group) {
-  NBLA_ERROR(error_code::not_implemented, "CPU all_reduce is not implemented.")
+  auto ranks = this->group_ranks(group);
+  const int k = ranks.size();
+  const int self = index_of(ranks, this->rank_);
+  if (self < 0 || k == 1) {
+    return;
+  }
+  auto &shm = *shm_;
+  const int g = shm.group_ids[group];
+
+  // Arrays are skipped if they are zeroing in all processes, and transferred
+  // in half precision if they are half in all processes.
+  bool zeroing = true;
+  bool half = true;
+  Size_t n = 0;
+  for (auto &a : ndarray_list) {
+    auto sa = a->array();
+    zeroing &= sa->zeroing();
+    half &= sa->zeroing() ||
+            (sa->get_num_arrays() > 0 && sa->dtype() == dtypes::HALF);
+    n += a->size();
+  }
+  shm.flags[this->rank_].store(zeroing | (half << 1));
+  shm.barrier(g, ranks);
+  int flags = 3;
+  for (auto r : ranks) {
+    flags &= shm.flags[r].load();
+  }
+  if ((flags & 1) || n == 0) {
+    // Flags must be read before the next collective writes them.
+    shm.barrier(g, ranks);
+    return;
+  }
+  if (flags & 2) {
+    this->all_reduce_chunks<Half>(ndarray_list, division, ranks, g);
+  } else {
+    this->all_reduce_chunks<T>(ndarray_list, division, ranks, g);
+  }
+}
+
+template <typename T>
+template <typename U>
+void MultiProcessDataParallelCommunicator<T>::all_reduce_chunks(
+    const vector<NdArrayPtr> &ndarray_list, bool division,
+    const vector<int> &ranks, int g) {
+  auto &shm = *shm_;
+  const int k = ranks.size();
+  const int self = index_of(ranks, this->rank_);
+  Flat<U> flat;
+  for (auto &a : ndarray_list) {
+    flat.push_back(write_ptr<U>(a, this->ctx_), a->size());
+  }
+
+  // Each process reduces a part of a chunk and gathers the other parts.
+  const Size_t n = flat.size();
+  const Size_t cap = shm.template capacity<U>();
+  U *own = shm.template buffer<U>(this->rank_);
+  for (Size_t off = 0; off < n; off += cap) {
+    const Size_t m = std::min(cap, n - off);
+    const Size_t begin = m * self / k;
+    const Size_t end = m * (self + 1) / k;
+    copy_in(flat, off, off + m, own);
+    shm.barrier(g, ranks);
+    shm.reduce(ranks, begin, end - begin, division, own + begin);
+    shm.barrier(g, ranks);
+    for (int j = 0; j < k; j++) {
+      const Size_t b = m * j / k;
+      copy_out(shm.template buffer<U>(ranks[j]) + b, flat, off + b,
+               off + m * (j + 1) / k);
+    }
+    shm.barrier(g, ranks);
+  }
 }
 
 template <typename T>
@@ -105,36 +553,150 @@ void MultiProcessDataParallelCommunicator<T>::all_reduce(NdArrayPtr ndarray,
                                                          bool division,
                                                          bool inplace,
                                                          const string &group) {
-  NBLA_ERROR(error_code::not_implemented, "CPU all_reduce is not implemented.")
+  this->all_reduce(vector<NdArrayPtr>{ndarray}, division, inplace, group);
+}
+
+template <typename T>
+CommunicatorBackwardCallbackPtr
+MultiProcessDataParallelCommunicator<T>::all_reduce_callback(
+    const vector<NdArrayPtr> &ndarray_list, size_t pack_size, bool division,
+    const string &group) {
+  this->group_ranks(group);
+  return make_shared<BucketedAllReduceCallback>(this, this->ctx_, ndarray_list,
+                                                pack_size, division, false,
+                                                false, group);
 }
 
 template <typename T>
 void MultiProcessDataParallelCommunicator<T>::reduce_scatter(
     const vector<NdArrayPtr> &ndarray_list, NdArrayPtr ndarray, bool division,
     const string &group) {
-  NBLA_ERROR(error_code::not_implemented,
-             "CPU reduce_scatter is not implemented.")
+  auto ranks = this->group_ranks(group);
+  const int k = ranks.size();
+  const int self = index_of(ranks, this->rank_);
+  if (self < 0) {
+    return;
+  }
+  const Size_t n = ndarray->size();
+  NBLA_CHECK(ndarray_list.size() == static_cast<size_t>(k), error_code::value,
+             "The number of arrays (%zu) differs from the size of group %s "
+             "(%d).",
+             ndarray_list.size(), group.c_str(), k);
+  vector<const T *> srcs;
+  for (auto &a : ndarray_list) {
+    NBLA_CHECK(a->size() == n, error_code::value,
+               "Sizes of arrays differ from the output size %ld.", n);
+    srcs.push_back(read_ptr<T>(a, this->ctx_));
+  }
+  T *out = write_ptr<T>(ndarray, this->ctx_, true);
+  if (k == 1) {
+    std::memcpy(out, srcs[0], sizeof(T) * n);
+    return;
+  }
+
+  // The j-th part of a buffer is a chunk of the j-th array.
+  auto &shm = *shm_;
+  const int g = shm.group_ids[group];
+  const Size_t cap = shm.capacity() / k;
+  T *own = shm.buffer(this->rank_);
+  for (Size_t off = 0; off < n; off += cap) {
+    const Size_t m = std::min(cap, n - off);
+    for (int j = 0; j < k; j++) {
+      std::memcpy(own + m * j, srcs[j] + off, sizeof(T) * m);
+    }
+    shm.barrier(g, ranks);
+    shm.reduce(ranks, m * self, m, division, out + off);
+    shm.barrier(g, ranks);
+  }
 }
 
 template <typename T>
 void MultiProcessDataParallelCommunicator<T>::bcast(
     const vector<NdArrayPtr> &ndarray_list, int src, bool inplace,
     const string &group) {
-  NBLA_ERROR(error_code::not_implemented, "CPU bcast is not implemented.")
+  auto ranks = this->group_ranks(group);
+  const int k = ranks.size();
+  const int self = index_of(ranks, this->rank_);
+  // src is a rank in the world, so its index in the group is compared.
+  const int root = index_of(ranks, src);
+  NBLA_CHECK(root >= 0, error_code::value, "src %d is not in group %s.", src,
+             group.c_str());
+  if (self < 0 || k == 1) {
+    return;
+  }
+  auto &shm = *shm_;
+  const int g = shm.group_ids[group];
+  Flat<const T> in;
+  Flat<T> out;
+  for (auto &a : ndarray_list) {
+    if (self == root) {
+      in.push_back(read_ptr<T>(a, this->ctx_), a->size());
+    } else {
+      out.push_back(write_ptr<T>(a, this->ctx_, true), a->size());
+    }
+  }
+  const Size_t n = std::max(in.size(), out.size());
+  const Size_t cap = shm.capacity();
+  for (Size_t off = 0; off < n; off += cap) {
+    const Size_t m = std::min(cap, n - off);
+    if (self == root) {
+      copy_in(in, off, off + m, shm.buffer(this->rank_));
+    }
+    shm.barrier(g, ranks);
+    if (self != root) {
+      copy_out(shm.buffer(ranks[root]), out, off, off + m);
+    }
+    shm.barrier(g, ranks);
+  }
 }
 
 template <typename T>
 void MultiProcessDataParallelCommunicator<T>::bcast(NdArrayPtr ndarray, int src,
                                                     bool inplace,
                                                     const string &group) {
-  NBLA_ERROR(error_code::not_implemented, "CPU bcast is not implemented.")
+  this->bcast(vector<NdArrayPtr>{ndarray}, src, inplace, group);
 }
 
 template <typename T>
 void MultiProcessDataParallelCommunicator<T>::all_gather(
     NdArrayPtr ndarray, const vector<NdArrayPtr> &ndarray_list,
     const string &group) {
-  NBLA_ERROR(error_code::not_implemented, "CPU all_gather is not implemented.")
+  auto ranks = this->group_ranks(group);
+  const int k = ranks.size();
+  const int self = index_of(ranks, this->rank_);
+  if (self < 0) {
+    return;
+  }
+  const Size_t n = ndarray->size();
+  NBLA_CHECK(ndarray_list.size() == static_cast<size_t>(k), error_code::value,
+             "The number of arrays (%zu) differs from the size of group %s "
+             "(%d).",
+             ndarray_list.size(), group.c_str(), k);
+  const T *src = read_ptr<T>(ndarray, this->ctx_);
+  vector<T *> dsts;
+  for (auto &a : ndarray_list) {
+    NBLA_CHECK(a->size() == n, error_code::value,
+               "Sizes of arrays differ from the input size %ld.", n);
+    dsts.push_back(a.get() == ndarray.get()
+                       ? write_ptr<T>(a, this->ctx_)
+                       : write_ptr<T>(a, this->ctx_, true));
+  }
+  if (k == 1) {
+    std::memmove(dsts[0], src, sizeof(T) * n);
+    return;
+  }
+  auto &shm = *shm_;
+  const int g = shm.group_ids[group];
+  const Size_t cap = shm.capacity();
+  for (Size_t off = 0; off < n; off += cap) {
+    const Size_t m = std::min(cap, n - off);
+    std::memcpy(shm.buffer(this->rank_), src + off, sizeof(T) * m);
+    shm.barrier(g, ranks);
+    for (int j = 0; j < k; j++) {
+      std::memcpy(dsts[j] + off, shm.buffer(ranks[j]), sizeof(T) * m);
+    }
+    shm.barrier(g, ranks);
+  }
 }
 
 template <typename T>
@@ -171,9 +733,7 @@ void MultiProcessDataParallelCommunicator<T>::allgather_async() {
 template <typename T>
 vector<string>
 MultiProcessDataParallelCommunicator<T>::allowed_array_classes() {
-  NBLA_ERROR(error_code::not_implemented,
-             "Derived class of MultiProcessDataParallelCommunicator must "
-             "implement allowed_array_classes().")
+  return SingletonManager::get<Cpu>()->array_classes();
 }
 
 template class MultiProcessDataParallelCommunicator<float>;
@@ -0,0 +1,225 @@
+// Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <nbla/array_registry.hpp>
+#include <nbla/computation_graph/computation_graph.hpp>
+#include <nbla/computation_graph/memory_planner.hpp>
+#include <nbla/utils/dlpack_utils.hpp>
+
+#include <algorithm>
+#include <unordered_map>
+#include <unordered_set>
+
+namespace nbla {
+
+using std::unordered_map;
+using std::unordered_set;
+
+// Alignment of buffers in the arena.
+static const Size_t arena_alignment = 256;
+
+static inline Size_t align_size(Size_t n) {
+  return (n + arena_alignment - 1) / arena_alignment * arena_alignment;
+}
+
+MemoryPlan::MemoryPlan(const vector<CgVariablePtr> &outputs,
+                       const Context &ctx)
+    : outputs_(outputs), ctx_(ctx) {
+  NBLA_CHECK(!outputs_.empty(), error_code::value, "No outputs are given.");
+  plan(nullptr, nullptr);
+}
+
+MemoryPlan::~MemoryPlan() { unbind(); }
+
+void MemoryPlan::plan(function_hook_type function_pre_hook,
+                      function_hook_type function_post_hook) {
+  unbind();
+  buffers_.clear();
+  versions_.clear();
+  arena_ = nullptr;
+  arena_size_ = 0;
+  total_size_ = 0;
+
+  // 1. Execute forward once to get the order of functions and data types.
+  vector<CgFunctionPtr> functions;
+  forward_all(outputs_, false, false, function_pre_hook,
+              [&functions, &function_post_hook](const CgFunctionPtr &f) {
+                functions.push_back(f);
+                if (function_post_hook) {
+                  function_post_hook(f);
+                }
+              });
+
+  // 2. Liveness of buffers. In-placed variables share a buffer.
+  unordered_set<CgFunction *> in_graph;
+  for (auto &f : functions) {
+    in_graph.insert(f.get());
+  }
+  unordered_map<SyncedArray *, size_t> index;
+  auto use = [&](const CgVariablePtr &v, int i) {
+    auto array = v->variable()->data()->array();
+    auto it = index.find(array.get());
+    if (it == index.end()) {
+      it = index.insert({array.get(), buffers_.size()}).first;
+      buffers_.emplace_back();
+      buffers_.back().array = array;
+      buffers_.back().ndarray = v->variable()->data();
+      buffers_.back().begin = i;
+    }
+    auto &b = buffers_[it->second];
+    b.end = std::max(b.end, i);
+    if (!v->parent() || v->persistent()) {
+      b.planned = false;
+    }
+    for (auto &f : v->function_references()) {
+      if (in_graph.find(f.get()) == in_graph.end()) {
+        b.planned = false;
+      }
+    }
+  };
+  for (int i = 0; i < static_cast<int>(functions.size()); i++) {
+    for (auto &v : functions[i]->inputs()) {
+      use(v, i);
+      versions_.emplace_back(v, v->version());
+    }
+    for (auto &v : functions[i]->outputs()) {
+      use(v, i);
+    }
+  }
+  for (auto &v : outputs_) {
+    versions_.emplace_back(v, v->version());
+    auto it = index.find(v->variable()->data()->array().get());
+    if (it != index.end()) {
+      buffers_[it->second].planned = false;
+    }
+  }
+
+  // 3. Sizes. Buffers of other devices or held in multiple data types are not
+  // planned.
+  const auto group =
+      ArrayGroup::get_group(ArrayCreator::filter_context(ctx_).array_class);
+  for (auto &b : buffers_) {
+    if (!b.planned) {
+      continue;
+    }
+    if (b.array->get_num_arrays() != 1 ||
+        ArrayGroup::get_group(b.array->head_array_class()) != group) {
+      b.planned = false;
+      continue;
+    }
+    b.dtype = b.array->dtype();
+    b.nbytes = b.array->size() * sizeof_dtype(b.dtype);
+    total_size_ += b.nbytes;
+  }
+
+  // 4. Assign offsets from larger buffers. Each buffer is placed at the
+  // lowest offset where it does not overlap with placed buffers alive at the
+  // same time.
+  vector<size_t> order;
+  for (size_t i = 0; i < buffers_.size(); i++) {
+    if (buffers_[i].planned) {
+      order.push_back(i);
+    }
+  }
+  std::stable_sort(order.begin(), order.end(), [this](size_t a, size_t b) {
+    return buffers_[a].nbytes > buffers_[b].nbytes;
+  });
+  vector<size_t> placed;
+  for (auto i : order) {
+    auto &b = buffers_[i];
+    vector<pair<Size_t, Size_t>> ranges;
+    for (auto j : placed) {
+      const auto &p = buffers_[j];
+      if (p.end < b.begin || b.end < p.begin) {
+        continue;
+      }
+      ranges.push_back({p.offset, p.offset + align_size(p.nbytes)});
+    }
+    std::sort(ranges.begin(), ranges.end());
+    Size_t offset = 0;
+    for (auto &r : ranges) {
+      if (offset + align_size(b.nbytes) <= r.first) {
+        break;
+      }
+      offset = std::max(offset, r.second);
+    }
+    b.offset = offset;
+    arena_size_ = std::max(arena_size_, offset + align_size(b.nbytes));
+    placed.push_back(i);
+  }
+
+  // 5. Allocate the arena and bind buffers to it.
+  if (arena_size_ == 0) {
+    return;
+  }
+  arena_ = make_shared<NdArray>(Shape_t{arena_size_});
+  arena_->cast(dtypes::BYTE, ctx_, true);
+  for (auto i : placed) {
+    bind(buffers_[i]);
+  }
+}
+
+void MemoryPlan::bind(Buffer &buffer) {
+  // Borrow the arena via DLPack, which keeps the arena alive.
+  borrow_array(arena_.get(), buffer.offset, buffer.dtype, ctx_,
+               buffer.ndarray.get());
+  buffer.bound = buffer.array->head_array();
+}
+
+void MemoryPlan::unbind() {
+  for (auto &b : buffers_) {
+    if (b.bound && b.array->get_num_arrays() == 1 &&
+        b.array->head_array() == b.bound) {
+      b.array->clear();
+    }
+    b.bound = nullptr;
+  }
+}
+
+bool MemoryPlan::valid() const {
+  for (auto &v : versions_) {
+    if (v.first->version() != v.second) {
+      return false;
+    }
+  }
+  for (auto &b : buffers_) {
+    if (b.ndarray->array() != b.array) {
+      return false;
+    }
+  }
+  return true;
+}
+
+void MemoryPlan::forward(function_hook_type function_pre_hook,
+                         function_hook_type function_post_hook) {
+  if (!valid()) {
+    // Planning executes forward.
+    plan(function_pre_hook, function_post_hook);
+    return;
+  }
+  // Bind again buffers released by clear or zero.
+  for (auto &b : buffers_) {
+    if (b.bound && (b.array->get_num_arrays() != 1 ||
+                    b.array->head_array() != b.bound)) {
+      bind(b);
+    }
+  }
+  forward_all(outputs_, false, false, function_pre_hook, function_post_hook);
+}
+
+size_t MemoryPlan::num_planned_buffers() const {
+  return std::count_if(buffers_.begin(), buffers_.end(),
+                       [](const Buffer &b) { return b.planned; });
+}
+}
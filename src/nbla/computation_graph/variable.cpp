@@ -144,6 +144,25 @@ public:
     return false;
   }
 
+  // Check if the data of v is dropped during forward to be recomputed in
+  // backward. A variable used by a function whose outputs are not recomputed
+  // in the same segment is a boundary of the segment, and is kept as a
+  // checkpoint so that backward recomputes one segment at a time.
+  bool drop_for_recompute(CgVariablePtr v) {
+    if (!v->recompute()) {
+      return false;
+    }
+    for (auto &f : v->function_references()) {
+      for (auto &o : f->outputs()) {
+        if (!o->recompute() ||
+            o->recompute_segment() != v->recompute_segment()) {
+          return false;
+        }
+      }
+    }
+    return true;
+  }
+
   // Check if input/output[target_idx] are needed for backward calculation.
   // Return true if needed and false otherwise.
   template <bool INPUT>
@@ -176,6 +195,12 @@ public:
       }
     }
 
+    // Inputs are required to recompute the outputs in backward.
+    bool recompute_outputs = false;
+    for (auto &o : outputs) {
+      recompute_outputs |= o->recompute();
+    }
+
     vector<bool> ret(inputs.size(), false);
     for (vector<CgVariablePtr>::size_type i = 0; i < inputs.size(); ++i) {
       auto vi = inputs[i];
@@ -183,6 +208,9 @@ public:
       if (func->need_grad() && check_grad_depends_data<true>(func, i)) {
         need_grad_variable_set_.insert(vi);
       }
+      if (recompute_outputs && !drop_for_recompute(vi)) {
+        need_grad_variable_set_.insert(vi);
+      }
       if (func->need_grad() &&
           func->function()->overwrite_input_data_in_forward(i)) {
         overwrite_variable_set_.insert(vi);
@@ -215,7 +243,9 @@ public:
       }
 
       if (clear_no_need_grad_) {
-        if (need_grad_variable_set_.find(vi) != need_grad_variable_set_.end()) {
+        // Variables to be recomputed are cleared even if backward needs them.
+        if (!drop_for_recompute(vi) && need_grad_variable_set_.find(vi) !=
+                                           need_grad_variable_set_.end()) {
           continue;
         }
         if (overwrite_variable_set_.find(vi) != overwrite_variable_set_.end()) {
@@ -281,6 +311,14 @@ public:
   }
 
   void operator()(CgFunctionPtr func) {
+    execute(func);
+
+    // Clear input buffers where possible.
+    finish(func, get_clear_flags(func));
+  }
+
+  // Execute forward of a function with hooks.
+  void execute(CgFunctionPtr func) {
     // Execute forward.
     // std::cout << "Call forward of " << func->function()->name() << "."
     //           << std::endl;
@@ -316,9 +354,10 @@ public:
     history_.push_back(func->function()->name());
 
     this->on_outputs(func);
+  }
 
-    // Clear input buffers where possible.
-    auto clear_flags = get_clear_flags(func);
+  // Clear input buffers by the flags given by get_clear_flags.
+  void finish(CgFunctionPtr func, const vector<bool> &clear_flags) {
     clear_inputs(func->inputs(), clear_flags);
 
     // Record when inputs and outputs are cleared.
@@ -350,6 +389,10 @@ class BackwardCallback {
   unordered_set<CgVariablePtr> initial_variable_set_;
   vector<string> history_;
 
+  // Variables recomputed during backward. They are cleared again after the
+  // backward of their parent functions, which are the last to use them.
+  unordered_set<CgVariablePtr> recomputed_;
+
   vector<bool> get_accum(const vector<CgVariablePtr> &inputs,
                          const vector<bool> &first_visit_flags) {
     vector<bool> accum(inputs.size(), false);
@@ -507,6 +550,69 @@ class BackwardCallback {
     return ret;
   }
 
+  bool need_recompute(const CgVariablePtr &v) {
+    return v->recompute() && v->parent() &&
+           v->variable()->data()->array()->clear_called();
+  }
+
+  // Execute forward of the parent function again after recomputing its inputs
+  // cleared during forward.
+  void recompute(const CgVariablePtr &v) {
+    auto p = v->parent();
+    for (auto &i : p->inputs()) {
+      if (need_recompute(i)) {
+        recompute(i);
+      }
+    }
+    vector<CgVariablePtr> outputs;
+    vector<Variable *> voutputs;
+    std::tie(outputs, voutputs) = p->function_outputs();
+    try {
+      p->function()->forward(p->function_inputs(), voutputs);
+    } catch (...) {
+      error_trace(p->function()->name() + " (recompute)");
+      throw;
+    }
+    for (auto &o : outputs) {
+      if (o->recompute()) {
+        recomputed_.insert(o);
+      }
+    }
+  }
+
+  // Recompute the data of inputs and outputs required by backward of f.
+  void recompute_data(const CgFunctionPtr &f, const vector<bool> &prop_down) {
+    auto fn = f->function();
+    auto inputs = f->inputs();
+    auto outputs = f->outputs();
+    for (vector<CgVariablePtr>::size_type j = 0; j < inputs.size(); j++) {
+      if (!prop_down[j]) {
+        continue;
+      }
+      for (vector<CgVariablePtr>::size_type i = 0; i < inputs.size(); i++) {
+        if (fn->grad_depends_input_data(j, i) && need_recompute(inputs[i])) {
+          recompute(inputs[i]);
+        }
+      }
+      for (vector<CgVariablePtr>::size_type o = 0; o < outputs.size(); o++) {
+        if (fn->grad_depends_output_data(j, o) && need_recompute(outputs[o])) {
+          recompute(outputs[o]);
+        }
+      }
+    }
+  }
+
+  void clear_recomputed(const vector<CgVariablePtr> &outputs) {
+    for (auto &o : outputs) {
+      auto it = recomputed_.find(o);
+      if (it == recomputed_.end()) {
+        continue;
+      }
+      o->variable()->data()->array()->clear();
+      recomputed_.erase(it);
+    }
+  }
+
 public:
   BackwardCallback(CgFunctionPtr f, bool clear_buffer,
                    function_hook_type function_pre_hook,
@@ -521,6 +627,13 @@ public:
     }
   }
 
+  ~BackwardCallback() {
+    // Parents not requiring gradients are not visited during backward.
+    for (auto &v : recomputed_) {
+      v->variable()->data()->array()->clear();
+    }
+  }
+
   void error_trace(const string &name_on_error) {
     // TODO: Optional verbosity
     std::cerr << "Error during backward propagation:" << std::endl;
@@ -557,6 +670,10 @@ public:
     // std::cout << f->function()->name() << std::endl;
     // std::cout << "  " << string_join(prop_down, ",") << std::endl;
     // std::cout << "  " << string_join(accum, ",") << std::endl;
+
+    // Recompute data cleared during forward.
+    recompute_data(f, prop_down);
+
     try {
       auto call_callback = [f](function_hook_type &h) {
         if (h) {
@@ -586,6 +703,7 @@ public:
 
     // Clear outputs buffer
     clear_outputs(outputs, output_clear_flags);
+    clear_recomputed(outputs);
 
     // Record when inputs and outputs are cleared.
     // See the comment on ForwardCallback::operator().
@@ -595,6 +713,53 @@ public:
   }
 };
 
+/** Execution plan captured by a forward (and backward) of a compiled
+    CgVariable.
+
+    It holds the order of functions and the clear flags of their inputs, and
+    the versions of variables in the graph when it was captured. The plan is
+    replayed while none of the variables is modified.
+*/
+class CgExecutionPlan {
+public:
+  bool clear_buffer_{false};
+  bool clear_no_need_grad_{false};
+  // Functions in forward order with clear flags of their inputs.
+  vector<pair<CgFunctionPtr, vector<bool>>> forward_;
+  // Functions in backward order, captured by the first backward.
+  vector<CgFunctionPtr> backward_;
+  bool has_backward_{false};
+  // Variables are kept alive by the functions above (or the owner).
+  vector<pair<CgVariable *, uint64_t>> versions_;
+
+  CgExecutionPlan(bool clear_buffer, bool clear_no_need_grad)
+      : clear_buffer_(clear_buffer), clear_no_need_grad_(clear_no_need_grad) {}
+
+  void capture_versions(CgVariable *root) {
+    versions_.clear();
+    versions_.emplace_back(root, root->version());
+    for (auto &step : forward_) {
+      for (auto &v : step.first->inputs()) {
+        versions_.emplace_back(v.get(), v->version());
+      }
+    }
+  }
+
+  bool valid() const {
+    for (auto &v : versions_) {
+      if (v.first->version() != v.second) {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  bool valid(bool clear_buffer, bool clear_no_need_grad) const {
+    return clear_buffer == clear_buffer_ &&
+           clear_no_need_grad == clear_no_need_grad_ && valid();
+  }
+};
+
 void CgVariable::visit_function_recursive(
     CgFunctionPtr func, unordered_set<CgFunctionPtr> &fclosed,
     std::function<void(CgFunctionPtr)> forward_callback) {
@@ -735,6 +900,30 @@ void CgVariable::forward(bool clear_buffer, bool clear_no_need_grad,
   NBLA_CHECK(parent_, error_code::value, "The variable has no parent.");
   ForwardCallback forward_callback(clear_buffer, clear_no_need_grad,
                                    function_pre_hook, function_post_hook);
+  if (compiled_ && fclosed == &scoped_fclosed) {
+    // Replay the execution plan if the graph is not modified.
+    if (plan_ && plan_->valid(clear_buffer, clear_no_need_grad)) {
+      for (auto &step : plan_->forward_) {
+        forward_callback.execute(step.first);
+        forward_callback.finish(step.first, step.second);
+      }
+      return;
+    }
+    // Capture a new plan while executing forward.
+    plan_ = nullptr;
+    auto plan = make_shared<CgExecutionPlan>(clear_buffer, clear_no_need_grad);
+    visit_function_recursive(
+        parent_, *fclosed, [&forward_callback, &plan](CgFunctionPtr f) {
+          forward_callback.execute(f);
+          auto clear_flags = forward_callback.get_clear_flags(f);
+          forward_callback.finish(f, clear_flags);
+          plan->forward_.emplace_back(f, clear_flags);
+        });
+    // Versions are captured after the traversal because setup marks outputs.
+    plan->capture_versions(this);
+    plan_ = plan;
+    return;
+  }
   visit_function_recursive(
       parent_, *fclosed,
       [&forward_callback](CgFunctionPtr f) { forward_callback(f); });
@@ -792,12 +981,44 @@ void CgVariable::backward(
                                      function_post_hook,
                                      activate_clear_initial_grad);
 
+  if (compiled_ && plan_ && plan_->valid()) {
+    if (plan_->has_backward_) {
+      // Replay the execution plan.
+      for (auto &f : plan_->backward_) {
+        backward_callback(f);
+        for (auto &com_callback : communicator_callbacks) {
+          com_callback->on_finish_function_backward(f);
+        }
+      }
+      for (auto &com_callback : communicator_callbacks) {
+        com_callback->on_finish_backward();
+      }
+      return;
+    }
+    // Capture the order of functions while executing backward.
+    auto plan = plan_;
+    plan->backward_.clear();
+    visit_function_backward(parent_,
+                            [&backward_callback, &plan](CgFunctionPtr f) {
+                              backward_callback(f);
+                              plan->backward_.push_back(f);
+                            },
+                            communicator_callbacks);
+    plan->has_backward_ = true;
+    return;
+  }
+
   // Visit backward
   visit_function_backward(
       parent_, [&backward_callback](CgFunctionPtr f) { backward_callback(f); },
       communicator_callbacks);
 }
 
+void CgVariable::set_compiled(bool b) {
+  compiled_ = b;
+  plan_ = nullptr;
+}
+
 vector<CgFunctionPtr> CgVariable::function_references() {
   vector<CgFunctionPtr> ret;
   for (auto pair : function_references_) {
@@ -815,6 +1036,7 @@ size_t CgVariable::function_reference_count() const {
 void CgVariable::insert_function_reference(CgFunctionPtr func) {
   std::weak_ptr<CgFunction> wp(func);
   function_reference_count_++;
+  version_++;
   auto it = function_references_.find(func.get());
   if (it != function_references_.end()) {
     it->second.second.count++;
@@ -828,11 +1050,13 @@ void CgVariable::remove_function_reference(CgFunction *funcp) {
   auto it = function_references_.find(funcp);
   if (it == function_references_.end())
     return;
+  version_++;
   function_reference_count_ -= it->second.second.count;
   function_references_.erase(it);
 }
 
 void CgVariable::mark_need_setup() {
+  version_++;
   for (auto it = function_references_.begin(); it != function_references_.end();
        it++) {
     auto f = it->second.first.lock();
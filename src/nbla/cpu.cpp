@@ -12,8 +12,10 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <nbla/array/cpu_array.hpp>
 #include <nbla/cpu.hpp>
 #include <nbla/singleton_manager-internal.hpp>
+#include <nbla/thread_pool.hpp>
 
 #include <nbla/memory/caching_allocator_with_buckets.hpp>
 #include <nbla/memory/cpu_memory.hpp>
@@ -23,7 +25,9 @@ namespace nbla {
 Cpu::Cpu()
     : naive_allocator_(make_shared<NaiveAllocator<CpuMemory>>()),
       caching_allocator_(
-          make_shared<CachingAllocatorWithBuckets<CpuMemory>>()) {}
+          make_shared<CachingAllocatorWithBuckets<CpuMemory>>()),
+      disk_allocator_(make_shared<NaiveAllocator<CpuDiskMemory>>()),
+      thread_pool_(make_shared<ThreadPool>(0)) {}
 
 Cpu::~Cpu() {}
 
@@ -37,6 +41,8 @@ void Cpu::register_array_class(const string &name) {
 
 shared_ptr<Allocator> Cpu::caching_allocator() { return caching_allocator_; }
 shared_ptr<Allocator> Cpu::naive_allocator() { return naive_allocator_; }
+shared_ptr<Allocator> Cpu::disk_allocator() { return disk_allocator_; }
+shared_ptr<ThreadPool> Cpu::thread_pool() { return thread_pool_; }
 
 void Cpu::free_unused_host_caches() {
   caching_allocator_->free_unused_caches();
@@ -44,6 +50,7 @@ void Cpu::free_unused_host_caches() {
 }
 
 void Cpu::device_synchronize(const string &device) {
+  cpu_disk_array_synchronize();
   cpu_device_synchronize(device);
 }
 
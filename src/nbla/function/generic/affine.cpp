@@ -16,6 +16,7 @@
 
 #include <nbla/array.hpp>
 #include <nbla/function/affine.hpp>
+#include <nbla/thread_pool.hpp>
 #include <nbla/utils/eigen.hpp>
 #include <nbla/variable.hpp>
 
@@ -82,15 +83,23 @@ void Affine<T>::forward_impl(const Variables &inputs,
   const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
   const T *w = inputs[1]->get_data_pointer<T>(this->ctx_);
   T *y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
-  ConstMatrixMap<T> mx(x, i_row_, i_col_);
-  ConstMatrixMap<T> mw(w, w_row_, w_col_);
-  MatrixMap<T> my(y, o_row_, o_col_);
-  my = mx * mw;
+  const T *b = nullptr;
   if (inputs.size() == 3) {
-    // With bias
-    const T *b = inputs[2]->get_data_pointer<T>(this->ctx_);
-    my.rowwise() += ConstRowVectorMap<T>(b, o_col_);
+    b = inputs[2]->get_data_pointer<T>(this->ctx_);
   }
+  ConstMatrixMap<T> mw(w, w_row_, w_col_);
+  // Rows of the output are computed in parallel.
+  const Size_t grain =
+      parallel_grain_size / std::max<Size_t>(1, i_col_ * o_col_);
+  parallel_for(o_row_, grain, [&](Size_t begin, Size_t end) {
+    ConstMatrixMap<T> mx(x + begin * i_col_, end - begin, i_col_);
+    MatrixMap<T> my(y + begin * o_col_, end - begin, o_col_);
+    my = mx * mw;
+    if (b) {
+      // With bias
+      my.rowwise() += ConstRowVectorMap<T>(b, o_col_);
+    }
+  });
 }
 
 template <class T>
@@ -107,22 +116,33 @@ void Affine<T>::backward_impl(const Variables &inputs, const Variables &outputs,
   if (propagate_down[0]) {
     T *dx = inputs[0]->cast_grad_and_get_pointer<T>(this->ctx_, !accum[0]);
     const T *w = inputs[1]->get_data_pointer<T>(this->ctx_);
-    MatrixMap<T> mdx(dx, i_row_, i_col_);
     ConstMatrixMap<T> mw(w, w_row_, w_col_);
-    if (accum[0])
-      mdx += mdy * mw.transpose();
-    else
-      mdx = mdy * mw.transpose();
+    const Size_t grain =
+        parallel_grain_size / std::max<Size_t>(1, i_col_ * o_col_);
+    parallel_for(i_row_, grain, [&](Size_t begin, Size_t end) {
+      ConstMatrixMap<T> mdy_r(dy + begin * o_col_, end - begin, o_col_);
+      MatrixMap<T> mdx(dx + begin * i_col_, end - begin, i_col_);
+      if (accum[0])
+        mdx += mdy_r * mw.transpose();
+      else
+        mdx = mdy_r * mw.transpose();
+    });
   }
   if (propagate_down[1]) {
     const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
     T *dw = inputs[1]->cast_grad_and_get_pointer<T>(this->ctx_, !accum[1]);
     ConstMatrixMap<T> mx(x, i_row_, i_col_);
     MatrixMap<T> mdw(dw, w_row_, w_col_);
-    if (accum[1])
-      mdw += mx.transpose() * mdy;
-    else
-      mdw = mx.transpose() * mdy;
+    // Columns of the weight gradient are computed in parallel.
+    const Size_t grain =
+        parallel_grain_size / std::max<Size_t>(1, i_row_ * w_row_);
+    parallel_for(w_col_, grain, [&](Size_t begin, Size_t end) {
+      const Size_t n = end - begin;
+      if (accum[1])
+        mdw.middleCols(begin, n) += mx.transpose() * mdy.middleCols(begin, n);
+      else
+        mdw.middleCols(begin, n) = mx.transpose() * mdy.middleCols(begin, n);
+    });
   }
   if (inputs.size() == 3 && propagate_down[2]) {
     // With bias.
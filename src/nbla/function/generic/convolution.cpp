@@ -17,6 +17,7 @@
 #include "../../utils/im2col-internal.hpp"
 #include <nbla/array.hpp>
 #include <nbla/function/convolution.hpp>
+#include <nbla/thread_pool.hpp>
 #include <nbla/utils/eigen.hpp>
 #include <nbla/variable.hpp>
 
@@ -163,34 +164,42 @@ void Convolution<T>::forward_impl(const Variables &inputs,
              "Convolution.");
 
   using namespace ::nbla::eigen;
+  // Each chunk of samples has its own col buffer.
+  const Size_t chunks = parallel_num_chunks(outer_size_, 1);
+  const Size_t col_size = inner_size_k_ * group_ * col_col_;
+  col_.reshape(Shape_t{chunks * inner_size_k_ * group_, col_col_}, true);
   // Getting variable pointers
   const T *x = inputs[0]->get_data_pointer<T>(this->ctx_);
   const T *w = inputs[1]->get_data_pointer<T>(this->ctx_);
-  T *col = col_.cast_data_and_get_pointer<T>(this->ctx_, true);
+  T *col_base = col_.cast_data_and_get_pointer<T>(this->ctx_, true);
   T *y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
   const T *b = nullptr;
   if (inputs.size() == 3) {
     b = inputs[2]->get_data_pointer<T>(this->ctx_);
   }
   // Sample loop
-  for (int n = 0; n < outer_size_; ++n) {
-    // Im2col
-    unfold_to_patches<T>(x + n * inner_size_i_, col, channels_i_,
-                         spatial_shape_i_, kernel_, pad_, stride_, dilation_);
-    // Convolution by matrix multiplication
-    T *y_n = y + n * inner_size_o_;
-    for (int g = 0; g < group_; ++g) {
-      MatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_, col_col_);
-      ConstMatrixMap<T> mk(w + g * row_w_ * col_w_, row_w_, col_w_);
-      MatrixMap<T> my(y_n + g * row_y_ * col_y_, row_y_, col_y_);
-      my = mk * mcol;
-    }
-    // Adding bias
-    if (inputs.size() == 3) {
-      MatrixMap<T> my(y_n, channels_o_, col_y_);
-      my.colwise() += ConstColVectorMap<T>(b, channels_o_);
+  parallel_for_chunks(outer_size_, 1, [&](Size_t c, Size_t begin, Size_t end) {
+    T *col = col_base + c * col_size;
+    for (Size_t n = begin; n < end; ++n) {
+      // Im2col
+      unfold_to_patches<T>(x + n * inner_size_i_, col, channels_i_,
+                           spatial_shape_i_, kernel_, pad_, stride_,
+                           dilation_);
+      // Convolution by matrix multiplication
+      T *y_n = y + n * inner_size_o_;
+      for (int g = 0; g < group_; ++g) {
+        MatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_, col_col_);
+        ConstMatrixMap<T> mk(w + g * row_w_ * col_w_, row_w_, col_w_);
+        MatrixMap<T> my(y_n + g * row_y_ * col_y_, row_y_, col_y_);
+        my = mk * mcol;
+      }
+      // Adding bias
+      if (b) {
+        MatrixMap<T> my(y_n, channels_o_, col_y_);
+        my.colwise() += ConstColVectorMap<T>(b, channels_o_);
+      }
     }
-  }
+  });
   col_.data()->array()->clear();
 }
 
@@ -215,11 +224,19 @@ void Convolution<T>::backward_impl(const Variables &inputs,
   T *dx = nullptr;
   T *dw = nullptr;
   T *db = nullptr;
-  T *col = nullptr;
+  T *col_base = nullptr;
+  T *dw_parts_base = nullptr;
   std::unique_ptr<ColVectorMap<T>> mdb;
 
+  // Each chunk of samples has its own col buffer, and chunks other than the
+  // first accumulate the weight gradient into their own buffers.
+  const Size_t chunks = parallel_num_chunks(outer_size_, 1);
+  const Size_t col_size = inner_size_k_ * group_ * col_col_;
+  const Size_t w_size = inputs[1]->size();
+  Variable dw_parts;
   if (propagate_down[0] || propagate_down[1]) {
-    col = col_.cast_data_and_get_pointer<T>(this->ctx_, true);
+    col_.reshape(Shape_t{chunks * inner_size_k_ * group_, col_col_}, true);
+    col_base = col_.cast_data_and_get_pointer<T>(this->ctx_, true);
   }
   if (propagate_down[0]) {
     if (!accum[0])
@@ -232,6 +249,11 @@ void Convolution<T>::backward_impl(const Variables &inputs,
       inputs[1]->grad()->zero();
     x = inputs[0]->get_data_pointer<T>(this->ctx_);
     dw = inputs[1]->cast_grad_and_get_pointer<T>(this->ctx_, false);
+    if (chunks > 1) {
+      dw_parts.reshape(Shape_t{chunks - 1, w_size}, true);
+      dw_parts.data()->zero();
+      dw_parts_base = dw_parts.cast_data_and_get_pointer<T>(this->ctx_, false);
+    }
   }
   if (inputs.size() == 3 && propagate_down[2]) {
     if (!accum[2])
@@ -240,38 +262,52 @@ void Convolution<T>::backward_impl(const Variables &inputs,
     mdb.reset(new ColVectorMap<T>(db, channels_o_));
   }
   // Sample loop
-  for (int n = 0; n < outer_size_; ++n) {
-    const T *dy_n = dy + n * inner_size_o_;
-    if (propagate_down[0]) {
-      // Backprop to image
-      T *dx_n = dx + n * inner_size_i_;
-      for (int g = 0; g < group_; ++g) {
-        ConstMatrixMap<T> mdy(dy_n + g * row_y_ * col_y_, row_y_, col_y_);
-        ConstMatrixMap<T> mw(w + g * row_w_ * col_w_, row_w_, col_w_);
-        MatrixMap<T> mdx(col + g * row_col_ * col_col_, row_col_, col_col_);
-        mdx = mw.transpose() * mdy;
+  parallel_for_chunks(outer_size_, 1, [&](Size_t c, Size_t begin, Size_t end) {
+    T *col = col_base + c * col_size;
+    T *dw_c = c == 0 ? dw : dw_parts_base + (c - 1) * w_size;
+    for (Size_t n = begin; n < end; ++n) {
+      const T *dy_n = dy + n * inner_size_o_;
+      if (propagate_down[0]) {
+        // Backprop to image
+        T *dx_n = dx + n * inner_size_i_;
+        for (int g = 0; g < group_; ++g) {
+          ConstMatrixMap<T> mdy(dy_n + g * row_y_ * col_y_, row_y_, col_y_);
+          ConstMatrixMap<T> mw(w + g * row_w_ * col_w_, row_w_, col_w_);
+          MatrixMap<T> mdx(col + g * row_col_ * col_col_, row_col_, col_col_);
+          mdx = mw.transpose() * mdy;
+        }
+        // col2im
+        fold_from_patches<T>(col, dx_n, channels_i_, spatial_shape_i_, kernel_,
+                             pad_, stride_, dilation_);
       }
-      // col2im
-      fold_from_patches<T>(col, dx_n, channels_i_, spatial_shape_i_, kernel_,
-                           pad_, stride_, dilation_);
-    }
-    if (propagate_down[1]) {
-      // Backprop to weights
-      // im2col
-      unfold_to_patches<T>(x + n * inner_size_i_, col, channels_i_,
-                           spatial_shape_i_, kernel_, pad_, stride_, dilation_);
-      // Weight convolution by matrix multiplication
-      for (int g = 0; g < group_; ++g) {
-        ConstMatrixMap<T> mdy(dy_n + g * row_y_ * col_y_, row_y_, col_y_);
-        ConstMatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_,
-                               col_col_);
-        MatrixMap<T> mdw(dw + g * row_w_ * col_w_, row_w_, col_w_);
-        mdw += mdy * mcol.transpose();
+      if (propagate_down[1]) {
+        // Backprop to weights
+        // im2col
+        unfold_to_patches<T>(x + n * inner_size_i_, col, channels_i_,
+                             spatial_shape_i_, kernel_, pad_, stride_,
+                             dilation_);
+        // Weight convolution by matrix multiplication
+        for (int g = 0; g < group_; ++g) {
+          ConstMatrixMap<T> mdy(dy_n + g * row_y_ * col_y_, row_y_, col_y_);
+          ConstMatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_,
+                                 col_col_);
+          MatrixMap<T> mdw(dw_c + g * row_w_ * col_w_, row_w_, col_w_);
+          mdw += mdy * mcol.transpose();
+        }
       }
     }
-    if (inputs.size() == 3 && propagate_down[2]) {
-      // Backprop to bias
-      ConstMatrixMap<T> mdy(dy_n, channels_o_, col_y_);
+  });
+  if (dw_parts_base) {
+    // Reduce the weight gradients of chunks.
+    ColVectorMap<T> mdw(dw, w_size);
+    for (Size_t c = 1; c < chunks; ++c) {
+      mdw += ConstColVectorMap<T>(dw_parts_base + (c - 1) * w_size, w_size);
+    }
+  }
+  if (inputs.size() == 3 && propagate_down[2]) {
+    // Backprop to bias
+    for (int n = 0; n < outer_size_; ++n) {
+      ConstMatrixMap<T> mdy(dy + n * inner_size_o_, channels_o_, col_y_);
       *mdb += mdy.rowwise().sum();
     }
   }
@@ -17,6 +17,7 @@
 #include "../../utils/im2col-internal.hpp"
 #include <nbla/array.hpp>
 #include <nbla/function/deconvolution.hpp>
+#include <nbla/thread_pool.hpp>
 #include <nbla/utils/eigen.hpp>
 #include <nbla/variable.hpp>
 
@@ -184,10 +185,14 @@ void Deconvolution<T>::forward_impl(const Variables &inputs,
              "Deconvolution.");
 
   using namespace ::nbla::eigen;
+  // Each chunk of samples has its own col buffer.
+  const Size_t chunks = parallel_num_chunks(outer_size_, 1);
+  const Size_t col_size = row_col_ * group_ * col_col_;
+  col_.reshape(Shape_t{chunks * row_col_ * group_, col_col_}, true);
   // Getting variable pointers
   const T *y = inputs[0]->get_data_pointer<T>(this->ctx_);
   const T *w = inputs[1]->get_data_pointer<T>(this->ctx_);
-  T *col = col_.cast_data_and_get_pointer<T>(this->ctx_, true);
+  T *col_base = col_.cast_data_and_get_pointer<T>(this->ctx_, true);
   T *x = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, true);
   const T *b = nullptr;
   if (inputs.size() == 3) {
@@ -195,29 +200,32 @@ void Deconvolution<T>::forward_impl(const Variables &inputs,
   }
 
   // Sample loop
-  for (int n = 0; n < outer_size_; ++n) {
-
-    // matrix multiplication
-    const T *y_n = y + n * inner_size_o_;
-    for (int g = 0; g < group_; ++g) {
-      ConstMatrixMap<T> mw(w + g * row_w_ * col_w_, row_w_, col_w_);
-      ConstMatrixMap<T> my(y_n + g * row_y_ * col_y_, row_y_, col_y_);
-      MatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_, col_col_);
-      mcol = mw.transpose() * my;
-    }
+  parallel_for_chunks(outer_size_, 1, [&](Size_t c, Size_t begin, Size_t end) {
+    T *col = col_base + c * col_size;
+    for (Size_t n = begin; n < end; ++n) {
 
-    // col2im for w * x
-    T *x_n = x + n * inner_size_i_;
-    memset((void *)x_n, 0, sizeof(*x_n) * inner_size_i_);
-    fold_from_patches<T>(col, x_n, channels_i_, spatial_shape_i_, kernel_, pad_,
-                         stride_, dilation_);
+      // matrix multiplication
+      const T *y_n = y + n * inner_size_o_;
+      for (int g = 0; g < group_; ++g) {
+        ConstMatrixMap<T> mw(w + g * row_w_ * col_w_, row_w_, col_w_);
+        ConstMatrixMap<T> my(y_n + g * row_y_ * col_y_, row_y_, col_y_);
+        MatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_, col_col_);
+        mcol = mw.transpose() * my;
+      }
 
-    // adding bias
-    if (inputs.size() == 3) {
-      MatrixMap<T> mx(x_n, channels_i_, inner_size_i_ / channels_i_);
-      mx.colwise() += ConstColVectorMap<T>(b, channels_i_);
+      // col2im for w * x
+      T *x_n = x + n * inner_size_i_;
+      memset((void *)x_n, 0, sizeof(*x_n) * inner_size_i_);
+      fold_from_patches<T>(col, x_n, channels_i_, spatial_shape_i_, kernel_,
+                           pad_, stride_, dilation_);
+
+      // adding bias
+      if (b) {
+        MatrixMap<T> mx(x_n, channels_i_, inner_size_i_ / channels_i_);
+        mx.colwise() += ConstColVectorMap<T>(b, channels_i_);
+      }
     }
-  }
+  });
   col_.data()->array()->clear();
 }
 
@@ -243,11 +251,19 @@ void Deconvolution<T>::backward_impl(const Variables &inputs,
   T *dy = nullptr;
   T *dw = nullptr;
   T *db = nullptr;
-  T *col = nullptr;
+  T *col_base = nullptr;
+  T *dw_parts_base = nullptr;
   std::unique_ptr<ColVectorMap<T>> mdb;
 
+  // Each chunk of samples has its own col buffer, and chunks other than the
+  // first accumulate the weight gradient into their own buffers.
+  const Size_t chunks = parallel_num_chunks(outer_size_, 1);
+  const Size_t col_size = row_col_ * group_ * col_col_;
+  const Size_t w_size = inputs[1]->size();
+  Variable dw_parts;
   if (propagate_down[0] || propagate_down[1]) {
-    col = col_.cast_data_and_get_pointer<T>(this->ctx_, true);
+    col_.reshape(Shape_t{chunks * row_col_ * group_, col_col_}, true);
+    col_base = col_.cast_data_and_get_pointer<T>(this->ctx_, true);
   }
   if (propagate_down[0]) {
     w = inputs[1]->get_data_pointer<T>(this->ctx_);
@@ -258,6 +274,11 @@ void Deconvolution<T>::backward_impl(const Variables &inputs,
       inputs[1]->grad()->zero();
     y = inputs[0]->get_data_pointer<T>(this->ctx_);
     dw = inputs[1]->cast_grad_and_get_pointer<T>(this->ctx_, false);
+    if (chunks > 1) {
+      dw_parts.reshape(Shape_t{chunks - 1, w_size}, true);
+      dw_parts.data()->zero();
+      dw_parts_base = dw_parts.cast_data_and_get_pointer<T>(this->ctx_, false);
+    }
   }
   if (inputs.size() == 3 && propagate_down[2]) {
     if (!accum[2])
@@ -267,45 +288,58 @@ void Deconvolution<T>::backward_impl(const Variables &inputs,
   }
 
   // Sample loop
-  for (int n = 0; n < outer_size_; ++n) {
-    const T *dx_n = dx + n * inner_size_i_;
-
-    if (propagate_down[0] || propagate_down[1]) {
-      // im2col
-      unfold_to_patches<T>(dx_n, col, channels_i_, spatial_shape_i_, kernel_,
-                           pad_, stride_, dilation_);
-    }
+  parallel_for_chunks(outer_size_, 1, [&](Size_t c, Size_t begin, Size_t end) {
+    T *col = col_base + c * col_size;
+    T *dw_c = c == 0 ? dw : dw_parts_base + (c - 1) * w_size;
+    for (Size_t n = begin; n < end; ++n) {
+      const T *dx_n = dx + n * inner_size_i_;
+
+      if (propagate_down[0] || propagate_down[1]) {
+        // im2col
+        unfold_to_patches<T>(dx_n, col, channels_i_, spatial_shape_i_,
+                             kernel_, pad_, stride_, dilation_);
+      }
 
-    if (propagate_down[0]) {
-      // Backprop to image
-      T *dy_n = dy + n * inner_size_o_;
-      for (int g = 0; g < group_; ++g) {
-        ConstMatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_,
-                               col_col_);
-        ConstMatrixMap<T> mw(w + g * row_w_ * col_w_, row_w_, col_w_);
-        MatrixMap<T> mdy(dy_n + g * row_y_ * col_y_, row_y_, col_y_);
-        if (accum[0])
-          mdy += mw * mcol;
-        else
-          mdy = mw * mcol;
+      if (propagate_down[0]) {
+        // Backprop to image
+        T *dy_n = dy + n * inner_size_o_;
+        for (int g = 0; g < group_; ++g) {
+          ConstMatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_,
+                                 col_col_);
+          ConstMatrixMap<T> mw(w + g * row_w_ * col_w_, row_w_, col_w_);
+          MatrixMap<T> mdy(dy_n + g * row_y_ * col_y_, row_y_, col_y_);
+          if (accum[0])
+            mdy += mw * mcol;
+          else
+            mdy = mw * mcol;
+        }
       }
-    }
 
-    if (propagate_down[1]) {
-      // Backprop to weights
-      const T *y_n = y + n * inner_size_o_;
-      for (int g = 0; g < group_; ++g) {
-        ConstMatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_,
-                               col_col_);
-        ConstMatrixMap<T> my(y_n + g * row_y_ * col_y_, row_y_, col_y_);
-        MatrixMap<T> mdw(dw + g * row_w_ * col_w_, row_w_, col_w_);
-        mdw += my * mcol.transpose();
+      if (propagate_down[1]) {
+        // Backprop to weights
+        const T *y_n = y + n * inner_size_o_;
+        for (int g = 0; g < group_; ++g) {
+          ConstMatrixMap<T> mcol(col + g * row_col_ * col_col_, row_col_,
+                                 col_col_);
+          ConstMatrixMap<T> my(y_n + g * row_y_ * col_y_, row_y_, col_y_);
+          MatrixMap<T> mdw(dw_c + g * row_w_ * col_w_, row_w_, col_w_);
+          mdw += my * mcol.transpose();
+        }
       }
     }
-
-    if (inputs.size() == 3 && propagate_down[2]) {
-      // Backprop to bias
-      ConstMatrixMap<T> mdx(dx_n, channels_i_, inner_size_i_ / channels_i_);
+  });
+  if (dw_parts_base) {
+    // Reduce the weight gradients of chunks.
+    ColVectorMap<T> mdw(dw, w_size);
+    for (Size_t c = 1; c < chunks; ++c) {
+      mdw += ConstColVectorMap<T>(dw_parts_base + (c - 1) * w_size, w_size);
+    }
+  }
+  if (inputs.size() == 3 && propagate_down[2]) {
+    // Backprop to bias
+    for (int n = 0; n < outer_size_; ++n) {
+      ConstMatrixMap<T> mdx(dx + n * inner_size_i_, channels_i_,
+                            inner_size_i_ / channels_i_);
       *mdb += mdx.rowwise().sum();
     }
   }
@@ -0,0 +1,192 @@
+// Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <nbla/array.hpp>
+#include <nbla/function/fused_elementwise.hpp>
+#include <nbla/thread_pool.hpp>
+#include <nbla/variable.hpp>
+
+#include <algorithm>
+#include <cmath>
+
+namespace nbla {
+
+NBLA_REGISTER_FUNCTION_SOURCE(FusedElementwise, const vector<int> &,
+                              const vector<int> &, const vector<float> &,
+                              bool);
+
+using namespace fused_elementwise;
+
+// Number of elements processed through the chain at a time.
+static const Size_t fused_elementwise_tile_size = 4096;
+
+static inline bool is_binary(int op) { return op <= RDIV2; }
+
+template <typename T>
+void FusedElementwise<T>::setup_impl(const Variables &inputs,
+                                     const Variables &outputs) {
+  NBLA_CHECK(ops_.size() == operands_.size() && ops_.size() == values_.size(),
+             error_code::value,
+             "Sizes of ops, operands and values must be the same. "
+             "ops: %d, operands: %d, values: %d.",
+             ops_.size(), operands_.size(), values_.size());
+  for (Variables::size_type i = 1; i < inputs.size(); i++) {
+    NBLA_CHECK(inputs[0]->shape() == inputs[i]->shape(), error_code::value,
+               "Shapes of all inputs must be the same.");
+  }
+  for (size_t k = 0; k < ops_.size(); k++) {
+    NBLA_CHECK(ops_[k] >= 0 && ops_[k] < NUM_OPS, error_code::value,
+               "Unknown operation %d.", ops_[k]);
+    if (!is_binary(ops_[k])) {
+      continue;
+    }
+    NBLA_CHECK(operands_[k] >= 0 &&
+                   operands_[k] < static_cast<int>(inputs.size()),
+               error_code::value, "Operand %d of operation %d is out of range.",
+               operands_[k], k);
+    NBLA_CHECK(!inplace_ || operands_[k] != 0, error_code::value,
+               "The first input cannot be an operand when inplace is true.");
+  }
+  outputs[0]->reshape(inputs[0]->shape(), true);
+  if (inplace_) {
+    outputs[0]->data()->set_array(inputs[0]->data()->array());
+  }
+}
+
+template <typename T>
+void FusedElementwise<T>::forward_impl(const Variables &inputs,
+                                       const Variables &outputs) {
+  vector<const T *> xs(inputs.size());
+  for (Variables::size_type i = 0; i < inputs.size(); i++) {
+    xs[i] = inputs[i]->get_data_pointer<T>(this->ctx_);
+  }
+  T *y = outputs[0]->cast_data_and_get_pointer<T>(this->ctx_, !inplace_);
+  const Size_t size = inputs[0]->size();
+  const Size_t num_tiles =
+      (size + fused_elementwise_tile_size - 1) / fused_elementwise_tile_size;
+  const Size_t grain = parallel_grain_size / fused_elementwise_tile_size;
+  parallel_for(num_tiles, grain, [&](Size_t tile_begin, Size_t tile_end) {
+    for (Size_t tile = tile_begin; tile < tile_end; tile++) {
+      const Size_t start = tile * fused_elementwise_tile_size;
+      const Size_t n = std::min(fused_elementwise_tile_size, size - start);
+      T *v = y + start;
+      if (v != xs[0] + start) {
+        std::copy(xs[0] + start, xs[0] + start + n, v);
+      }
+      for (size_t k = 0; k < ops_.size(); k++) {
+        const T s = (T)values_[k];
+        const T *a = is_binary(ops_[k]) ? xs[operands_[k]] + start : nullptr;
+        switch (ops_[k]) {
+        case ADD2:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = v[i] + a[i];
+          break;
+        case SUB2:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = v[i] - a[i];
+          break;
+        case RSUB2:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = a[i] - v[i];
+          break;
+        case MUL2:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = v[i] * a[i];
+          break;
+        case DIV2:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = v[i] / a[i];
+          break;
+        case RDIV2:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = a[i] / v[i];
+          break;
+        case ADD_SCALAR:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = v[i] + s;
+          break;
+        case MUL_SCALAR:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = v[i] * s;
+          break;
+        case RSUB_SCALAR:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = s - v[i];
+          break;
+        case RDIV_SCALAR:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = s / v[i];
+          break;
+        case POW_SCALAR:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = std::pow(v[i], s);
+          break;
+        case MAXIMUM_SCALAR:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = std::max(v[i], s);
+          break;
+        case MINIMUM_SCALAR:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = std::min(v[i], s);
+          break;
+        case RELU:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = std::max((T)0, v[i]);
+          break;
+        case LEAKY_RELU:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = v[i] > (T)0 ? v[i] : s * v[i];
+          break;
+        case SIGMOID:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = (T)1 / ((T)1 + std::exp(-v[i]));
+          break;
+        case TANH:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = std::tanh(v[i]);
+          break;
+        case EXP:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = std::exp(v[i]);
+          break;
+        case LOG:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = std::log(v[i]);
+          break;
+        case ABS:
+          for (Size_t i = 0; i < n; i++)
+            v[i] = std::abs(v[i]);
+          break;
+        default:
+          NBLA_ERROR(error_code::value, "Unknown operation %d.", ops_[k]);
+        }
+      }
+    }
+  });
+}
+
+template <typename T>
+void FusedElementwise<T>::backward_impl(const Variables &inputs,
+                                        const Variables &outputs,
+                                        const vector<bool> &propagate_down,
+                                        const vector<bool> &accum) {
+  if (std::none_of(propagate_down.begin(), propagate_down.end(),
+                   [](bool b) { return b; })) {
+    return;
+  }
+  NBLA_ERROR(error_code::not_implemented,
+             "FusedElementwise is for inference and does not support "
+             "backward.");
+}
+}
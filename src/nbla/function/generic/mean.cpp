@@ -25,9 +25,9 @@ template <typename T>
 void Mean<T>::forward_impl_reduce(const T *x, T *y, int outer_size,
                                   int reduction_size) {
   using namespace ::nbla::eigen;
-  ConstMatrixMap<T> mx(x, outer_size, reduction_size);
+  Sum<T>::forward_impl_reduce(x, y, outer_size, reduction_size);
   ColVectorMap<T> my(y, outer_size);
-  my = mx.rowwise().sum() / reduction_size;
+  my /= reduction_size;
 }
 
 template <typename T>
@@ -19,11 +19,12 @@
 #include <nbla/function/transpose.hpp>
 #include <nbla/imperative.hpp>
 #include <nbla/singleton_manager.hpp>
+#include <nbla/thread_pool.hpp>
 #include <nbla/utils/eigen.hpp>
 #include <nbla/variable.hpp>
 
 #include <algorithm>
-#include <numeric> // iota
+#include <numeric> // iota, accumulate
 
 namespace nbla {
 
@@ -120,21 +121,43 @@ template <typename T>
 void Sum<T>::forward_impl_reduce(const T *x, T *y, int outer_size,
                                  int reduction_size) {
   using namespace ::nbla::eigen;
-  ConstMatrixMap<T> mx(x, outer_size, reduction_size);
-  ColVectorMap<T> my(y, outer_size);
-  my = mx.rowwise().sum();
+  if (outer_size == 1) {
+    // Partial sums of chunks are reduced.
+    const Size_t chunks =
+        parallel_num_chunks(reduction_size, parallel_grain_size);
+    vector<T> partial(chunks, (T)0);
+    parallel_for_chunks(reduction_size, parallel_grain_size,
+                        [&](Size_t c, Size_t begin, Size_t end) {
+                          partial[c] =
+                              ConstColVectorMap<T>(x + begin, end - begin)
+                                  .sum();
+                        });
+    y[0] = std::accumulate(partial.begin(), partial.end(), (T)0);
+    return;
+  }
+  const Size_t grain = parallel_grain_size / std::max(1, reduction_size);
+  parallel_for(outer_size, grain, [&](Size_t begin, Size_t end) {
+    ConstMatrixMap<T> mx(x + begin * reduction_size, end - begin,
+                         reduction_size);
+    ColVectorMap<T> my(y + begin, end - begin);
+    my = mx.rowwise().sum();
+  });
 }
 
 template <typename T>
 void Sum<T>::backward_impl_reduce(const T *dy, T *dx, int outer_size,
                                   int reduction_size, bool accum) {
   using namespace ::nbla::eigen;
-  ConstColVectorMap<T> mdy(dy, outer_size);
-  MatrixMap<T> mdx(dx, outer_size, reduction_size);
-  if (accum)
-    mdx.colwise() += mdy;
-  else
-    mdx.colwise() = mdy;
+  const Size_t grain = parallel_grain_size / std::max(1, reduction_size);
+  parallel_for(outer_size, grain, [&](Size_t begin, Size_t end) {
+    ConstColVectorMap<T> mdy(dy + begin, end - begin);
+    MatrixMap<T> mdx(dx + begin * reduction_size, end - begin,
+                     reduction_size);
+    if (accum)
+      mdx.colwise() += mdy;
+    else
+      mdx.colwise() = mdy;
+  });
 }
 
 } // namespace nbla
@@ -80,9 +80,8 @@ void SyncBatchNormalization<T>::forward_impl_batch(const Variables &inputs,
                           this->group_);
 
   /*
-   * The all_reduce is conducted in GPU because the communicator for CPU
-   * extension is not
-   * implemented currently.
+   * The all_reduce may be conducted in GPU by the communicator of a device
+   * extension.
    * Synchronization between GPU array and CPU array is needed to get the
    * results of all_reduce in GPU.
    */
@@ -12,9 +12,11 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
+#include <chrono>
 #include <limits>
 #include <numeric>
 
+#include <nbla/array/cpu_array.hpp>
 #include <nbla/lms/swap_in_out_scheduler.hpp>
 #include <nbla/singleton_manager.hpp>
 
@@ -27,13 +29,37 @@ using std::endl;
 
 using std::accumulate;
 
+namespace {
+// Add the time elapsed in a scope to the stall time. The time waiting for
+// copies from disk is excluded, since it is counted in total separately.
+class StallTimer {
+  double &stall_time_;
+  const std::chrono::steady_clock::time_point start_;
+  const double disk_wait_time_;
+
+public:
+  explicit StallTimer(double &stall_time)
+      : stall_time_(stall_time), start_(std::chrono::steady_clock::now()),
+        disk_wait_time_(cpu_disk_array_wait_time()) {}
+  ~StallTimer() {
+    stall_time_ += std::chrono::duration<double>(
+                       std::chrono::steady_clock::now() - start_)
+                       .count() -
+                   (cpu_disk_array_wait_time() - disk_wait_time_);
+  }
+};
+}
+
 // Constructor
 SwapInOutScheduler::SwapInOutScheduler(const Context &h_ctx,
                                        const Context &d_ctx, const size_t max,
                                        const size_t prefetch_max,
                                        const bool save_host_mem,
                                        const bool save_host_mem_no_abort)
-    : host_ctx(h_ctx), device_ctx(d_ctx), max_bytes(max),
+    : host_ctx(h_ctx), device_ctx(d_ctx),
+      same_backend(BackendUtils::array_classes(h_ctx) ==
+                   BackendUtils::array_classes(d_ctx)),
+      max_bytes(max),
       max_prefetch_bytes(prefetch_max == 0 ? max * 1.5 : prefetch_max),
       cast_prefetch(save_host_mem),
       cast_prefetch_no_abort(save_host_mem_no_abort),
@@ -53,6 +79,12 @@ SwapInOutScheduler::SwapInOutScheduler(const Context &h_ctx,
 // Destructor
 SwapInOutScheduler::~SwapInOutScheduler() {}
 
+SwapInOutScheduler::Stats SwapInOutScheduler::stats() const {
+  return swap_stats;
+}
+
+void SwapInOutScheduler::reset_stats() { swap_stats = Stats(); }
+
 // User interface to start a scheduling code block
 void SwapInOutScheduler::start_scheduling() {
   if (second_iter) {
@@ -72,39 +104,45 @@ void SwapInOutScheduler::start_scheduling() {
   wrong_ordered.clear();
   precleared.clear();
   cast_prefetched.clear();
+  disk_wait_time = cpu_disk_array_wait_time();
   set_sa_callback(); // Set SyncedArrayCallback
 }
 
 // User interface to finish a scheduling code block
 void SwapInOutScheduler::end_scheduling() {
   unset_sa_callback(); // Unset a SyncedArrayCallback
+  {
+    StallTimer timer(swap_stats.stall_time);
 
-  // Post process of the last function.
-  if (first_iter) {
-    func_block_ends.push_back(order_idx); // Record the end of a function.
-    swap_out_first_iter(); // Swap out the arrays of the last function
-  } else {
-    if (order_idx < func_block_ends[func_idx]) {
-      /* If the number of get/cast/clear in this iteration is less than
-         the recorded, reset the index to the recorded start position of
-         the next function.
-      */
-      order_idx = func_block_ends[func_idx];
+    // Post process of the last function.
+    if (first_iter) {
+      func_block_ends.push_back(order_idx); // Record the end of a function.
+      swap_out_first_iter(); // Swap out the arrays of the last function
+    } else {
+      if (order_idx < func_block_ends[func_idx]) {
+        /* If the number of get/cast/clear in this iteration is less than
+           the recorded, reset the index to the recorded start position of
+           the next function.
+        */
+        order_idx = func_block_ends[func_idx];
+      }
+
+      run_on_end_schedule();
+      func_idx++;
+      run_on_beginning_schedule(); // Wait for all swap out here
+      swap_out_wrong_order();      // Swap out all disordered arrays
     }
 
-    run_on_end_schedule();
-    func_idx++;
-    run_on_beginning_schedule(); // Wait for all swap out here
-    swap_out_wrong_order();      // Swap out all disordered arrays
+    /* Host must wait for the all asynchronous memory manipulation for safety.
+       That is because data on CPU memory can be destroyed, for esample,
+       by the conflict between
+       1. asynchronous swap out
+       2. the loads of input data and label for the next iteration.
+    */
+    BackendUtils::device_synchronize(device_ctx);
   }
-
-  /* Host must wait for the all asynchronous memory manipulation for safety.
-     That is because data on CPU memory can be destroyed, for esample,
-     by the conflict between
-     1. asynchronous swap out
-     2. the loads of input data and label for the next iteration.
-  */
-  BackendUtils::device_synchronize(device_ctx);
+  // Time of waiting for the copies from disk in this iteration.
+  swap_stats.stall_time += cpu_disk_array_wait_time() - disk_wait_time;
 
   // After first itration, synced array callback is replaced.
   sa_callback = [&](SyncedArrayPtr saptr, const SyncedArrayCallbackTag sa_tag,
@@ -874,6 +912,7 @@ void SwapInOutScheduler::schedule_preclear(
 // Common implementation of pre callback
 void SwapInOutScheduler::pre_callback() {
   unset_sa_callback(); // Avoid unnecessary record and trace
+  StallTimer timer(swap_stats.stall_time);
 
   if (first_iter) {
     // Record the end of a function.
@@ -919,6 +958,12 @@ void SwapInOutScheduler::run(const ScheduleType &s) {
     cout << " count: " << s.r->sawptr.use_count() << endl;
 #endif
 
+    if ((s.tag == ScheduleTag::SWAP_IN_GET ||
+         s.tag == ScheduleTag::SWAP_IN_CAST) &&
+        on_host(p)) {
+      swap_stats.swap_in_bytes += s.r->size * sizeof_dtype(s.r->dtype);
+    }
+
     if (s.tag == ScheduleTag::SWAP_IN_GET) {
       p->get(s.r->dtype, device_ctx, AsyncFlag::ASYNC | AsyncFlag::UNSAFE);
     } else if (s.tag == ScheduleTag::SWAP_IN_CAST) {
@@ -928,6 +973,7 @@ void SwapInOutScheduler::run(const ScheduleType &s) {
     } else if (s.tag == ScheduleTag::SWAP_OUT) {
       // Swap out and preclear the arrays used in the previous function.
       if (is_not_cleared_yet(p)) {
+        count_swap_out(p);
         p->cast(p->dtype(), host_ctx, false,
                 AsyncFlag::ASYNC | AsyncFlag::UNSAFE);
       }
@@ -943,6 +989,17 @@ void SwapInOutScheduler::run(const ScheduleType &s) {
   }
 }
 
+bool SwapInOutScheduler::on_host(const SyncedArrayPtr p) {
+  return p->get_num_arrays() > 0 &&
+         context_checker(Context({}, p->head_array_class(), ""), host_ctx);
+}
+
+void SwapInOutScheduler::count_swap_out(const SyncedArrayPtr p) {
+  if (!on_host(p)) {
+    swap_stats.swap_out_bytes += p->size() * sizeof_dtype(p->dtype());
+  }
+}
+
 inline string SwapInOutScheduler::to_str(const ScheduleTag &st) {
   if (st == ScheduleTag::PRECLEAR)
     return "Preclear";
@@ -989,8 +1046,10 @@ void SwapInOutScheduler::swap_out_first_iter() {
         p->clear();
       } else if (auto p = r->sawptr.lock()) {
         // The array is not cleared yet. Swap it out.
-        if (is_not_cleared_yet(p))
+        if (is_not_cleared_yet(p)) {
+          count_swap_out(p);
           p->cast(p->dtype(), host_ctx, false);
+        }
       }
     }
   }
@@ -1010,6 +1069,7 @@ void SwapInOutScheduler::swap_out_wrong_order() {
       if (p && is_not_cleared_yet(p)) {
         // Swap out the array SYNCRONOUSLY because device synchronize will be
         // called just after this.
+        count_swap_out(p);
         p->cast(r->dtype, host_ctx, false);
       }
     } else if (!context_checker(r->ctx, host_ctx)) {
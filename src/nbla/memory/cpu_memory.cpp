@@ -15,7 +15,16 @@
 #include <nbla/exception.hpp>
 #include <nbla/memory/cpu_memory.hpp>
 
+#include <algorithm>
+#include <cstdlib>
 #include <memory>
+#include <mutex>
+#include <vector>
+
+#ifndef _WIN32
+#include <sys/mman.h>
+#include <unistd.h>
+#endif
 
 #if 0
 #include <cstdio>
@@ -78,4 +87,85 @@ void CpuMemory::merge_prev_impl(Memory *from) {
    */
   ptr_ = from->pointer();
 }
+
+// ----------------------------------------------------------------------
+// CpuDiskMemory implementation
+// ----------------------------------------------------------------------
+namespace {
+std::mutex disk_directory_mtx;
+string disk_directory;
+}
+
+CpuDiskMemory::CpuDiskMemory(size_t bytes, const string &device_id)
+    : Memory(bytes, device_id) {}
+
+CpuDiskMemory::~CpuDiskMemory() {
+  if (!ptr_) {
+    return;
+  }
+#ifndef _WIN32
+  DEBUG_LOG("%s: %zu at %p\n", __func__, this->bytes(), ptr_);
+  ::munmap(ptr_, std::max<size_t>(this->bytes(), 1));
+#endif
+}
+
+void CpuDiskMemory::set_directory(const string &directory) {
+  std::lock_guard<std::mutex> lock(disk_directory_mtx);
+  disk_directory = directory;
+}
+
+string CpuDiskMemory::directory() {
+  std::lock_guard<std::mutex> lock(disk_directory_mtx);
+  if (!disk_directory.empty()) {
+    return disk_directory;
+  }
+  for (auto name : {"NNABLA_DISK_ARRAY_DIR", "TMPDIR"}) {
+    const char *env = std::getenv(name);
+    if (env && *env) {
+      return env;
+    }
+  }
+  return "/tmp";
+}
+
+bool CpuDiskMemory::alloc_impl() {
+#ifdef _WIN32
+  NBLA_ERROR(error_code::not_implemented,
+             "CpuDiskMemory is not supported on Windows.");
+#else
+  const size_t bytes = std::max<size_t>(this->bytes(), 1);
+  string path = directory() + "/nnabla_disk_array_XXXXXX";
+  std::vector<char> name(path.begin(), path.end());
+  name.push_back('\0');
+  int fd = ::mkstemp(name.data());
+  NBLA_CHECK(fd >= 0, error_code::memory, "Failed to create a file in %s.",
+             directory().c_str());
+  // The file is removed when the mapping is released.
+  ::unlink(name.data());
+  void *ptr = nullptr;
+  if (::ftruncate(fd, bytes) == 0) {
+    ptr = ::mmap(nullptr, bytes, PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+  }
+  ::close(fd);
+  if (!ptr || ptr == MAP_FAILED) {
+    return false;
+  }
+  ptr_ = ptr;
+  DEBUG_LOG("%s: %zu at %p\n", __func__, this->bytes(), ptr_);
+  return true;
+#endif
+}
+
+shared_ptr<Memory> CpuDiskMemory::divide_impl(size_t second_start) {
+  NBLA_ERROR(error_code::not_implemented,
+             "CpuDiskMemory can not be divided.");
+}
+
+void CpuDiskMemory::merge_next_impl(Memory *from) {
+  NBLA_ERROR(error_code::not_implemented, "CpuDiskMemory can not be merged.");
+}
+
+void CpuDiskMemory::merge_prev_impl(Memory *from) {
+  NBLA_ERROR(error_code::not_implemented, "CpuDiskMemory can not be merged.");
+}
 }
@@ -16,8 +16,13 @@
 #include <nbla/global_solver_callback.hpp>
 #include <nbla/singleton_manager.hpp>
 #include <nbla/solver.hpp>
+#include <nbla/synced_array.hpp>
+#include <nbla/thread_pool.hpp>
+#include <nbla/utils/dlpack_utils.hpp>
 
 #include <algorithm>
+#include <atomic>
+#include <cstring>
 #include <memory>
 
 // Should be false, unless you want to executing larger model than allotted
@@ -77,8 +82,266 @@ operator=(const UpdateHookWithObject &rhs) {
 
 void UpdateHookWithObject::operator()() { callback_(obj_); }
 
+/** Flat parameter of the fused mode **/
+namespace {
+
+// Generic solvers compute in float.
+typedef float flat_type;
+const dtypes flat_dtype = dtypes::FLOAT;
+
+// Prefix of the keys of temporary states of flat parameters.
+const string flat_key_prefix = "__fused__/";
+
+bool is_bound(const shared_ptr<Array> &bound, const NdArrayPtr &ndarray) {
+  auto array = ndarray->array().get();
+  return bound && array->get_num_arrays() == 1 &&
+         array->head_array() == bound.get();
+}
+
+// Let `ndarray` borrow the arena from `offset` elements with its values.
+shared_ptr<Array> bind_arena(const NdArrayPtr &arena, Size_t offset,
+                             const NdArrayPtr &ndarray, const Context &ctx) {
+  auto dst = arena->cast(dtypes::BYTE, ctx)->pointer<flat_type>() + offset;
+  auto src = ndarray->get(flat_dtype, ctx)->const_pointer<flat_type>();
+  std::copy(src, src + ndarray->size(), dst);
+  borrow_array(arena.get(), offset * sizeof(flat_type), flat_dtype, ctx,
+               ndarray.get());
+  return ndarray->array()->head_array_sp();
+}
+
+NdArrayPtr create_arena(Size_t size, const Context &ctx) {
+  const Size_t bytes = size * sizeof(flat_type);
+  auto arena = make_shared<NdArray>(Shape_t{bytes});
+  std::memset(arena->cast(dtypes::BYTE, ctx, true)->pointer<void>(), 0, bytes);
+  return arena;
+}
+}
+
+struct Solver::FlatParams {
+  struct Segment {
+    string key;
+    VariablePtr p;
+    Size_t offset;
+    Size_t size;
+    shared_ptr<Array> data; ///< Arrays borrowing the arenas.
+    shared_ptr<Array> grad;
+    unordered_map<string, shared_ptr<Array>> states;
+    bool zeroed;       ///< Whether the gradient is zeroed by the solver.
+    size_t grad_count; ///< Modification count of the gradient when zeroed.
+  };
+  vector<Segment> segments;
+  vector<string> state_names;
+  Size_t size = 0;
+  NdArrayPtr data; ///< Arenas.
+  NdArrayPtr grad;
+  unordered_map<string, NdArrayPtr> states;
+  vector<pair<string, VariablePtr>> chunks; ///< Flat parameters of chunks.
+  vector<SolverState> chunk_states;
+
+  // Pack the parameters of a solver. nullptr is returned if they can not be
+  // packed.
+  static unique_ptr<FlatParams> create(Solver *solver) {
+    unique_ptr<FlatParams> flat(new FlatParams);
+    vector<string> keys;
+    for (auto &kv : solver->params_) {
+      if (kv.first.compare(0, flat_key_prefix.size(), flat_key_prefix) == 0 ||
+          kv.second.p->size() == 0) {
+        return nullptr;
+      }
+      keys.push_back(kv.first);
+    }
+    if (keys.empty()) {
+      return nullptr;
+    }
+    std::sort(keys.begin(), keys.end());
+    for (auto &kv : solver->states_.at(keys[0]).pstate) {
+      flat->state_names.push_back(kv.first);
+    }
+    for (auto &key : keys) {
+      Segment seg;
+      seg.key = key;
+      seg.p = solver->params_.at(key).p;
+      seg.offset = flat->size;
+      seg.size = seg.p->size();
+      auto &pstate = solver->states_.at(key).pstate;
+      if (pstate.size() != flat->state_names.size()) {
+        return nullptr;
+      }
+      for (auto &name : flat->state_names) {
+        auto it = pstate.find(name);
+        if (it == pstate.end() || it->second->size() != seg.size) {
+          return nullptr;
+        }
+      }
+      flat->size += seg.size;
+      flat->segments.push_back(seg);
+    }
+    const auto &ctx = solver->ctx_;
+    flat->data = create_arena(flat->size, ctx);
+    flat->grad = create_arena(flat->size, ctx);
+    for (auto &name : flat->state_names) {
+      flat->states[name] = create_arena(flat->size, ctx);
+    }
+    flat->sync(solver, true);
+    return flat;
+  }
+
+  // Let the parameters and states borrow the arenas again if they are
+  // released by clear, zero, fill or cast to another dtype or device. States
+  // are checked only if `with_states` is true. false is returned if the
+  // parameters must be packed again.
+  bool sync(Solver *solver, bool with_states) {
+    const auto &ctx = solver->ctx_;
+    for (auto &seg : segments) {
+      if (seg.p->size() != seg.size) {
+        return false;
+      }
+      if (!is_bound(seg.data, seg.p->data())) {
+        seg.data = bind_arena(data, seg.offset, seg.p->data(), ctx);
+      }
+      if (!is_bound(seg.grad, seg.p->grad())) {
+        // The zeroing flag is kept by `zeroed` since the bound array is not
+        // zeroing.
+        auto g = seg.p->grad()->array();
+        seg.zeroed = g->zeroing();
+        seg.grad = bind_arena(grad, seg.offset, seg.p->grad(), ctx);
+        seg.grad_count = g->modification_count();
+      }
+      if (!with_states) {
+        continue;
+      }
+      auto &pstate = solver->states_.at(seg.key).pstate;
+      for (auto &name : state_names) {
+        auto it = pstate.find(name);
+        if (it == pstate.end() || it->second->size() != seg.size) {
+          return false;
+        }
+        auto &state = seg.states[name];
+        if (!is_bound(state, it->second->data())) {
+          state = bind_arena(states[name], seg.offset, it->second->data(), ctx);
+        }
+      }
+    }
+    return true;
+  }
+
+  // Zero the gradients in the arena. The bound arrays are kept, and they are
+  // regarded as not computed until modified.
+  void zero_grad(const Context &ctx) {
+    auto g = grad->cast(dtypes::BYTE, ctx)->pointer<flat_type>();
+    std::fill(g, g + size, flat_type(0));
+    for (auto &seg : segments) {
+      seg.zeroed = true;
+      seg.grad_count = seg.p->grad()->array()->modification_count();
+    }
+  }
+
+  // Whether the gradient is computed after zeroed, like not zeroing in the
+  // per-parameter mode.
+  bool computed(const Segment &seg) const {
+    return !seg.zeroed ||
+           seg.p->grad()->array()->modification_count() != seg.grad_count;
+  }
+
+  bool all_computed() const {
+    for (auto &seg : segments) {
+      if (!computed(seg)) {
+        return false;
+      }
+    }
+    return true;
+  }
+
+  Size_t num_chunks(Solver *solver, Size_t size, Size_t grain) {
+    // Array callbacks (e.g. from Python) are not called from workers.
+    if (!solver->update_elementwise() ||
+        !SingletonManager::get<SyncedArrayCallback>()->empty()) {
+      return 1;
+    }
+    return parallel_num_chunks(size, grain);
+  }
+
+  // Call `f` with the flat parameters of chunks in parallel. Their states with
+  // the iteration `t` are temporarily added to the states of the solver, and
+  // the iteration of the first chunk after the call is returned.
+  uint32_t run(Solver *solver, uint32_t t,
+               const std::function<void(const string &, VariablePtr)> &f) {
+    const Size_t n = num_chunks(solver, size, parallel_grain_size);
+    if (static_cast<Size_t>(chunks.size()) != n) {
+      create_chunks(solver, n);
+    }
+    struct ScopedStates {
+      unordered_map<string, SolverState> &states;
+      const vector<pair<string, VariablePtr>> &chunks;
+      ~ScopedStates() {
+        for (auto &c : chunks) {
+          states.erase(c.first);
+        }
+      }
+    } scoped{solver->states_, chunks};
+    for (Size_t c = 0; c < n; c++) {
+      auto &state = solver->states_[chunks[c].first];
+      state = chunk_states[c];
+      state.t = t;
+    }
+    parallel_for_chunks(n, 1, [&](Size_t, Size_t begin, Size_t end) {
+      for (Size_t c = begin; c < end; c++) {
+        f(chunks[c].first, chunks[c].second);
+      }
+    });
+    return solver->states_.at(chunks[0].first).t;
+  }
+
+  void create_chunks(Solver *solver, Size_t n) {
+    const auto &ctx = solver->ctx_;
+    chunks.clear();
+    chunk_states.clear();
+    for (Size_t c = 0; c < n; c++) {
+      const Size_t begin = size * c / n;
+      const Size_t end = size * (c + 1) / n;
+      const Size_t offset = begin * sizeof(flat_type);
+      auto p = make_shared<Variable>(Shape_t{end - begin});
+      borrow_array(data.get(), offset, flat_dtype, ctx, p->data().get());
+      borrow_array(grad.get(), offset, flat_dtype, ctx, p->grad().get());
+      unordered_map<string, VariablePtr> pstate;
+      for (auto &name : state_names) {
+        auto s = make_shared<Variable>(Shape_t{end - begin});
+        borrow_array(states[name].get(), offset, flat_dtype, ctx,
+                     s->data().get());
+        pstate[name] = s;
+      }
+      chunks.push_back({flat_key_prefix + std::to_string(c), p});
+      chunk_states.push_back(SolverState{pstate, 0});
+    }
+  }
+
+  // Call `f` with the segments whose gradients are computed in parallel.
+  void run_segments(Solver *solver,
+                    const std::function<void(const Segment &)> &f) {
+    vector<const Segment *> segs;
+    Size_t total = 0;
+    for (auto &seg : segments) {
+      if (computed(seg)) {
+        segs.push_back(&seg);
+        total += seg.size;
+      }
+    }
+    if (segs.empty()) {
+      return;
+    }
+    const Size_t n = segs.size();
+    const Size_t chunks = num_chunks(solver, total, parallel_grain_size);
+    parallel_for(n, n / chunks, [&](Size_t begin, Size_t end) {
+      for (Size_t i = begin; i < end; i++) {
+        f(*segs[i]);
+      }
+    });
+  }
+};
+
 /** Solver Implementation**/
-Solver::Solver(const Context &ctx) : ctx_(ctx), setup_called_(false) {}
+Solver::Solver(const Context &ctx)
+    : ctx_(ctx), setup_called_(false), fused_(false) {}
 
 Solver::~Solver() {}
 
@@ -98,9 +361,33 @@ void Solver::setup() {
   setup_called_ = true;
 }
 
+void Solver::set_fused(bool fused) {
+  fused_ = fused;
+  flat_ = nullptr;
+}
+
+Solver::FlatParams *Solver::flat_params(bool with_states) {
+  if (!fused_) {
+    return nullptr;
+  }
+  auto cpu_classes = SingletonManager::get<Cpu>()->array_classes();
+  if (std::find(cpu_classes.begin(), cpu_classes.end(), ctx_.array_class) ==
+      cpu_classes.end()) {
+    return nullptr;
+  }
+  if (flat_ && !flat_->sync(this, with_states)) {
+    flat_ = nullptr;
+  }
+  if (!flat_) {
+    flat_ = FlatParams::create(this);
+  }
+  return flat_.get();
+}
+
 void Solver::set_parameters(const vector<pair<string, VariablePtr>> &params,
                             bool reset, bool retain_state) {
   setup();
+  flat_ = nullptr;
   if (reset) {
     clear_parameters();
   }
@@ -128,6 +415,7 @@ void Solver::set_parameters(const vector<pair<string, VariablePtr>> &params,
 }
 
 void Solver::remove_parameters(const vector<string> &keys) {
+  flat_ = nullptr;
   for (auto &key : keys) {
     params_.erase(key);
     remove_state_impl(key);
@@ -135,6 +423,7 @@ void Solver::remove_parameters(const vector<string> &keys) {
 }
 
 void Solver::clear_parameters() {
+  flat_ = nullptr;
   for (auto &kv : params_) {
     auto &key = kv.first;
     remove_state_impl(key);
@@ -160,6 +449,7 @@ vector<pair<string, Solver::SolverState>> Solver::get_states() {
 }
 
 void Solver::set_states(const vector<pair<string, SolverState>> &states) {
+  flat_ = nullptr;
   for (auto &kv0 : states) {
     auto it = states_.find(kv0.first);
     NBLA_CHECK(it != states_.end(), error_code::value,
@@ -169,6 +459,11 @@ void Solver::set_states(const vector<pair<string, SolverState>> &states) {
 }
 
 void Solver::zero_grad() {
+  auto flat = flat_params();
+  if (flat) {
+    flat->zero_grad(ctx_);
+    return;
+  }
   for (auto &kv : params_) {
     SyncedArrayPtr g = kv.second.p->grad()->array();
     g->zero();
@@ -200,7 +495,31 @@ struct ScopedCallback {
 
 void Solver::update(update_hook_type pre_callback,
                     update_hook_type post_callback) {
-
+  auto flat = flat_params(true);
+  if (flat) {
+    ScopedCallback scoped(pre_callback, post_callback);
+    // The flat parameter is updated at once if the iterations are the same.
+    const auto &segs = flat->segments;
+    const uint32_t t = states_.at(segs[0].key).t;
+    bool same_t = true;
+    for (auto &seg : segs) {
+      same_t = same_t && states_.at(seg.key).t == t;
+    }
+    if (update_elementwise() && same_t && flat->all_computed()) {
+      const uint32_t t_next =
+          flat->run(this, t, [this](const string &key, VariablePtr p) {
+            update_impl(key, p);
+          });
+      for (auto &seg : segs) {
+        states_.at(seg.key).t = t_next;
+      }
+    } else {
+      flat->run_segments(this, [this](const FlatParams::Segment &seg) {
+        update_impl(seg.key, seg.p);
+      });
+    }
+    return;
+  }
   for (auto &kv : params_) {
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
@@ -220,6 +539,21 @@ void Solver::weight_decay(float decay_rate, update_hook_type pre_callback,
                           update_hook_type post_callback) {
   if (decay_rate == 0)
     return;
+  auto flat = flat_params();
+  if (flat) {
+    ScopedCallback scoped(pre_callback, post_callback);
+    if (flat->all_computed()) {
+      flat->run(this, 0, [this, decay_rate](const string &key, VariablePtr p) {
+        weight_decay_impl(key, p, decay_rate);
+      });
+    } else {
+      flat->run_segments(
+          this, [this, decay_rate](const FlatParams::Segment &seg) {
+            weight_decay_impl(seg.key, seg.p, decay_rate);
+          });
+    }
+    return;
+  }
   for (auto &kv : params_) {
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
@@ -239,6 +573,15 @@ void Solver::clip_grad_by_norm(float norm, update_hook_type pre_callback,
                                update_hook_type post_callback) {
   if (norm == 0)
     return;
+  auto flat = flat_params();
+  if (flat) {
+    // Norms are computed for each parameter.
+    ScopedCallback scoped(pre_callback, post_callback);
+    flat->run_segments(this, [this, norm](const FlatParams::Segment &seg) {
+      clip_grad_by_norm_impl(seg.key, seg.p, norm);
+    });
+    return;
+  }
   for (auto &kv : params_) {
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
@@ -256,6 +599,18 @@ void Solver::clip_grad_by_norm(float norm, update_hook_type pre_callback,
 
 bool Solver::check_inf_grad(update_hook_type pre_callback,
                             update_hook_type post_callback) {
+  auto flat = flat_params();
+  if (flat) {
+    // Gradients not computed are zero in the arena.
+    ScopedCallback scoped(pre_callback, post_callback);
+    std::atomic<bool> found{false};
+    flat->run(this, 0, [this, &found](const string &key, VariablePtr p) {
+      if (check_inf_grad_impl(key, p)) {
+        found = true;
+      }
+    });
+    return found;
+  }
   for (auto &kv : params_) {
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
@@ -273,6 +628,18 @@ bool Solver::check_inf_grad(update_hook_type pre_callback,
 // TODO: potential to speed-up
 bool Solver::check_nan_grad(update_hook_type pre_callback,
                             update_hook_type post_callback) {
+  auto flat = flat_params();
+  if (flat) {
+    // Gradients not computed are zero in the arena.
+    ScopedCallback scoped(pre_callback, post_callback);
+    std::atomic<bool> found{false};
+    flat->run(this, 0, [this, &found](const string &key, VariablePtr p) {
+      if (check_nan_grad_impl(key, p)) {
+        found = true;
+      }
+    });
+    return found;
+  }
   for (auto &kv : params_) {
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
@@ -290,6 +657,18 @@ bool Solver::check_nan_grad(update_hook_type pre_callback,
 // TODO: potential to speed-up
 bool Solver::check_inf_or_nan_grad(update_hook_type pre_callback,
                                    update_hook_type post_callback) {
+  auto flat = flat_params();
+  if (flat) {
+    // Gradients not computed are zero in the arena.
+    ScopedCallback scoped(pre_callback, post_callback);
+    std::atomic<bool> found{false};
+    flat->run(this, 0, [this, &found](const string &key, VariablePtr p) {
+      if (check_inf_or_nan_grad_impl(key, p)) {
+        found = true;
+      }
+    });
+    return found;
+  }
   for (auto &kv : params_) {
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
@@ -307,6 +686,20 @@ bool Solver::check_inf_or_nan_grad(update_hook_type pre_callback,
 // Methods for the mixed-precision training
 void Solver::scale_grad(float scale, update_hook_type pre_callback,
                         update_hook_type post_callback) {
+  auto flat = flat_params();
+  if (flat) {
+    ScopedCallback scoped(pre_callback, post_callback);
+    if (flat->all_computed()) {
+      flat->run(this, 0, [this, scale](const string &key, VariablePtr p) {
+        scale_grad_impl(key, p, scale);
+      });
+    } else {
+      flat->run_segments(this, [this, scale](const FlatParams::Segment &seg) {
+        scale_grad_impl(seg.key, seg.p, scale);
+      });
+    }
+    return;
+  }
   for (auto &kv : params_) {
     SyncedArrayPtr g = kv.second.p->grad()->array();
     if (g->zeroing()) {
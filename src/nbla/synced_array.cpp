@@ -72,12 +72,13 @@ shared_ptr<Array> SyncedArray::cast_sp(dtypes dtype, const Context &ctx,
   head_ = sync(dtype, ctx, write_only, async_flags); // cast() changes head.
   // 2. Clear all previous arrays.
   auto created_array = array_[head_.key];
+  const auto modification_count = modification_count_;
   clear_all_array();
   created_array.second = true;
   array_[head_.key] = created_array;
   // 3. Increment modification count to let solver to know whether it's modified
   // or not
-  modification_count_++;
+  modification_count_ = modification_count + 1;
   clear_called_ = false;
 
   // 4. Call a callback function
@@ -0,0 +1,212 @@
+// Copyright (c) 2020 Sony Corporation. All Rights Reserved.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#include <nbla/thread_pool.hpp>
+
+#include <algorithm>
+#include <atomic>
+#include <condition_variable>
+#include <cstdlib>
+#include <exception>
+#include <new>
+#include <thread>
+#include <vector>
+
+#ifndef _WIN32
+#include <pthread.h>
+#endif
+
+namespace nbla {
+
+using std::vector;
+
+// True while the thread executes tasks of a run.
+static thread_local bool in_parallel_region_ = false;
+
+// The pool whose workers are forgotten in a forked child process.
+static std::atomic<ThreadPool *> fork_target_{nullptr};
+
+struct ThreadPool::Workers {
+  vector<std::thread> threads;
+  std::mutex mtx;
+  std::condition_variable cv_start;
+  std::condition_variable cv_done;
+  const std::function<void(Size_t)> *task{nullptr};
+  Size_t num_tasks{0};
+  std::atomic<Size_t> next{0};
+  int pending{0};
+  uint64_t generation{0};
+  bool stop{false};
+  std::exception_ptr error;
+
+  // Execute tasks until no task remains.
+  void execute(const std::function<void(Size_t)> *f, Size_t n) {
+    in_parallel_region_ = true;
+    for (Size_t i = next++; i < n; i = next++) {
+      try {
+        (*f)(i);
+      } catch (...) {
+        std::lock_guard<std::mutex> lock(mtx);
+        if (!error) {
+          error = std::current_exception();
+        }
+      }
+    }
+    in_parallel_region_ = false;
+  }
+
+  void work() {
+    uint64_t generation_done = 0;
+    while (true) {
+      std::unique_lock<std::mutex> lock(mtx);
+      cv_start.wait(lock,
+                    [&] { return stop || generation != generation_done; });
+      if (stop) {
+        return;
+      }
+      generation_done = generation;
+      auto f = task;
+      auto n = num_tasks;
+      lock.unlock();
+      execute(f, n);
+      lock.lock();
+      if (--pending == 0) {
+        cv_done.notify_one();
+      }
+    }
+  }
+};
+
+static int default_num_threads() {
+  const char *env = std::getenv("NNABLA_NUM_THREADS");
+  if (env) {
+    const int n = std::atoi(env);
+    if (n > 0) {
+      return n;
+    }
+  }
+  return std::max(1, static_cast<int>(std::thread::hardware_concurrency()));
+}
+
+ThreadPool::ThreadPool(int num_threads)
+    : num_threads_(num_threads > 0 ? num_threads : default_num_threads()) {
+#ifndef _WIN32
+  static std::once_flag once;
+  std::call_once(once, [] {
+    pthread_atfork(nullptr, nullptr, [] {
+      auto pool = fork_target_.load();
+      if (pool) {
+        pool->reset_after_fork();
+      }
+    });
+  });
+#endif
+  fork_target_ = this;
+}
+
+ThreadPool::~ThreadPool() {
+  ThreadPool *self = this;
+  fork_target_.compare_exchange_strong(self, nullptr);
+  std::lock_guard<std::mutex> lock(mtx_);
+  stop();
+}
+
+void ThreadPool::start() {
+  workers_.reset(new Workers);
+  auto w = workers_.get();
+  for (int i = 1; i < num_threads_; i++) {
+    w->threads.emplace_back([w] { w->work(); });
+  }
+}
+
+void ThreadPool::stop() {
+  if (!workers_) {
+    return;
+  }
+  {
+    std::lock_guard<std::mutex> lock(workers_->mtx);
+    workers_->stop = true;
+  }
+  workers_->cv_start.notify_all();
+  for (auto &t : workers_->threads) {
+    t.join();
+  }
+  workers_ = nullptr;
+}
+
+void ThreadPool::set_num_threads(int num_threads) {
+  std::lock_guard<std::mutex> lock(mtx_);
+  stop();
+  num_threads_ = num_threads > 0 ? num_threads : default_num_threads();
+}
+
+bool ThreadPool::in_parallel_region() { return in_parallel_region_; }
+
+void ThreadPool::reset_after_fork() {
+  // Threads other than the forking thread do not exist in the child. Their
+  // handles and the states of mutexes are unusable, so they are leaked.
+  workers_.release();
+  new (&mtx_) std::mutex;
+}
+
+void ThreadPool::run(Size_t num_tasks,
+                     const std::function<void(Size_t)> &task) {
+  if (num_tasks <= 0) {
+    return;
+  }
+  std::unique_lock<std::mutex> lock(mtx_, std::defer_lock);
+  if (num_tasks == 1 || num_threads_ == 1 || in_parallel_region_ ||
+      !lock.try_lock()) {
+    for (Size_t i = 0; i < num_tasks; i++) {
+      task(i);
+    }
+    return;
+  }
+  if (!workers_) {
+    start();
+  }
+  auto &w = *workers_;
+  {
+    std::lock_guard<std::mutex> lock_w(w.mtx);
+    w.task = &task;
+    w.num_tasks = num_tasks;
+    w.next = 0;
+    w.pending = static_cast<int>(w.threads.size());
+    w.error = nullptr;
+    w.generation++;
+  }
+  w.cv_start.notify_all();
+  w.execute(&task, num_tasks);
+  std::exception_ptr error;
+  {
+    std::unique_lock<std::mutex> lock_w(w.mtx);
+    w.cv_done.wait(lock_w, [&w] { return w.pending == 0; });
+    w.task = nullptr;
+    error = w.error;
+  }
+  if (error) {
+    std::rethrow_exception(error);
+  }
+}
+
+Size_t parallel_num_chunks(Size_t size, Size_t grain) {
+  if (ThreadPool::in_parallel_region()) {
+    return 1;
+  }
+  const Size_t num_threads =
+      SingletonManager::get<Cpu>()->thread_pool()->num_threads();
+  grain = std::max<Size_t>(grain, 1);
+  return std::max<Size_t>(1, std::min(num_threads, size / grain));
+}
+}
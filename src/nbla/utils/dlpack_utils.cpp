@@ -129,6 +129,14 @@ dtypes convert_dlpack_type_to_dtype(const DLDataType &dlp_type) {
              code, bits);
 }
 
+DLDataType convert_dtype_to_dlpack_type(const dtypes dtype) {
+  DLDataType dlp_type;
+  dlp_type.code = convert_dtype_to_dlpack_code(dtype);
+  dlp_type.bits = sizeof_dtype(dtype) * 8;
+  dlp_type.lanes = 1;
+  return dlp_type;
+}
+
 NdArrayPtr from_dlpack(DLManagedTensor *from) {
   auto to = make_shared<NdArray>();
   from_dlpack(from, to.get());
@@ -194,14 +202,7 @@ DLManagedTensor *to_dlpack_impl(const shared_ptr<Array> &arr_ptr,
   dl_tensor.ndim = static_cast<int>(shape.size());
 
   // DLDataType
-  // code
-  dl_tensor.dtype.code = convert_dtype_to_dlpack_code(dtype);
-
-  // bits
-  dl_tensor.dtype.bits = sizeof_dtype(dtype) * 8;
-
-  // lanes
-  dl_tensor.dtype.lanes = 1;
+  dl_tensor.dtype = convert_dtype_to_dlpack_type(dtype);
 
   // shape
   dl_tensor.shape = new int64_t[dl_tensor.ndim]; // will deleted in deleter.
@@ -245,5 +246,22 @@ DLManagedTensor *to_dlpack(NdArray *array, const dtypes dtype,
   return to_dlpack_impl(arr_ptr, array->shape(), array->strides());
 }
 
+void borrow_array(NdArray *from, Size_t byte_offset, const dtypes dtype,
+                  const Context &ctx, NdArray *to) {
+  const auto arr_ptr = from->cast_sp(dtypes::BYTE, ctx);
+  NBLA_CHECK(byte_offset + to->size() * (Size_t)sizeof_dtype(dtype) <=
+                 arr_ptr->size(),
+             error_code::value,
+             "The borrowed memory exceeds the array. byte_offset: %ld, "
+             "bytes: %ld, array bytes: %ld.",
+             byte_offset, to->size() * sizeof_dtype(dtype), arr_ptr->size());
+  auto dlp = to_dlpack_impl(arr_ptr, to->shape(), to->strides());
+  dlp->dl_tensor.dtype = convert_dtype_to_dlpack_type(dtype);
+  dlp->dl_tensor.byte_offset = byte_offset;
+  // An array of the same group would be reused by from_dlpack.
+  to->array()->clear();
+  from_dlpack(dlp, to);
+}
+
 void call_deleter(DLManagedTensor *dlp) { dlp->deleter(dlp); }
 }
@@ -31,7 +31,7 @@ std::vector<std::string> add_files_to_nnp(nbla::utils::nnp::Nnp &nnp,
     std::string ext = arg.substr(ep, arg.size() - ep);
 
     if (ext == ".h5" || ext == ".nntxt" || ext == ".protobuf" ||
-        ext == ".prototxt") {
+        ext == ".prototxt" || ext == ".params") {
       nnp.add(arg);
     } else if (ext == ".nnp") {
       if (on_memory) {
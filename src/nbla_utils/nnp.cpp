@@ -131,6 +131,8 @@ bool Nnp::add(const string &filename) {
     return impl_->add_prototxt(filename);
   } else if (extname == ".protobuf") {
     return impl_->add_protobuf(filename);
+  } else if (extname == ".params") {
+    return impl_->add_raw_parameters(filename);
   } else if (extname == ".h5") {
     std::ifstream file(filename.c_str(), std::ios::binary | std::ios::ate);
     std::streamsize size = file.tellg();
@@ -363,6 +363,8 @@ bool NnpImpl::add_archive(void *archive) {
       add_protobuf(buffer, size);
     } else if (ext == ".h5") {
       add_hdf5(buffer, size);
+    } else if (ext == ".params") {
+      add_raw_parameters(buffer, size);
     }
     delete[] buffer;
   }
@@ -447,6 +449,31 @@ bool NnpImpl::add_hdf5(char *buffer, int size) {
   return true;
 }
 
+bool NnpImpl::add_raw_parameters(std::string filename) {
+  ParameterVector pv;
+  bool ret = load_parameters_raw(pv, filename);
+  if (!ret) {
+    NBLA_ERROR(error_code::value, "Cannot load parameter file: %s",
+               filename.c_str());
+  }
+  for (auto it = pv.begin(); it != pv.end(); ++it) {
+    parameters_.insert({it->first, it->second});
+  }
+  return true;
+}
+
+bool NnpImpl::add_raw_parameters(char *buffer, size_t size) {
+  ParameterVector pv;
+  bool ret = load_parameters_raw(pv, buffer, size);
+  if (!ret) {
+    NBLA_ERROR(error_code::value, "Cannot load parameters from buffer.");
+  }
+  for (auto it = pv.begin(); it != pv.end(); ++it) {
+    parameters_.insert({it->first, it->second});
+  }
+  return true;
+}
+
 vector<string> NnpImpl::get_network_names() {
   vector<string> list;
   for (int i = 0; i < proto_->network_size(); i++) {
@@ -13,6 +13,7 @@
 // Include nnabla header files
 
 #include <assert.h>
+#include <cstring>
 #include <fstream>
 #include <iostream>
 #include <map>
@@ -22,6 +23,7 @@
 #include <vector>
 
 #include <nbla/computation_graph/variable.hpp>
+#include <nbla/half.hpp>
 #include <nbla/initializer.hpp>
 #include <nbla/logger.hpp>
 #include <nbla/parametric_functions.hpp>
@@ -206,6 +208,42 @@ void load_parameters_from_proto(NNablaProtoBuf &param, ParameterVector &pv) {
   }
 }
 
+// Raw tensor parameter format (.params), see
+// python/src/nnabla/utils/get_file_handle.py for the layout.
+const char RAW_PARAMETER_MAGIC[] = "NNBP";
+const uint32_t RAW_PARAMETER_VERSION = 1;
+
+template <typename T>
+T read_raw_value(const char *buffer, size_t size, size_t &pos) {
+  NBLA_CHECK(pos + sizeof(T) <= size, error_code::value,
+             "Unexpected end of parameter file.");
+  T value;
+  // Values are little-endian, as same as the supported platforms.
+  memcpy(&value, buffer + pos, sizeof(T));
+  pos += sizeof(T);
+  return value;
+}
+
+string read_raw_string(const char *buffer, size_t size, size_t &pos,
+                       size_t length) {
+  NBLA_CHECK(pos + length <= size, error_code::value,
+             "Unexpected end of parameter file.");
+  string value(buffer + pos, length);
+  pos += length;
+  return value;
+}
+
+// Data are stored in the dtype of the file.
+template <typename T>
+void copy_raw_data(const char *src, uint64_t nbytes, Variable *v,
+                   const string &name) {
+  Size_t size = v->size();
+  NBLA_CHECK(nbytes >= size * sizeof(T), error_code::value,
+             "Inconsistent size in parameter %s", name.c_str());
+  T *dst = v->template cast_data_and_get_pointer<T>(cpu_ctx, true);
+  memcpy(dst, src, size * sizeof(T));
+}
+
 } // private functions and variables
 
 // ----------------------------------------------------------------------
@@ -282,6 +320,80 @@ bool load_parameters_pb(ParameterVector &pv, string filename) {
   return true;
 }
 
+// ----------------------------------------------------------------------
+// load parameters from .params file's buffer
+// ----------------------------------------------------------------------
+bool load_parameters_raw(ParameterVector &pv, const char *buffer,
+                         size_t size) {
+  size_t pos = 0;
+  string magic = read_raw_string(buffer, size, pos, 4);
+  NBLA_CHECK(magic == RAW_PARAMETER_MAGIC, error_code::value,
+             "Not a raw parameter file.");
+  uint32_t version = read_raw_value<uint32_t>(buffer, size, pos);
+  NBLA_CHECK(version <= RAW_PARAMETER_VERSION, error_code::value,
+             "Unsupported raw parameter file version %d.", (int)version);
+  uint32_t num = read_raw_value<uint32_t>(buffer, size, pos);
+  for (uint32_t i = 0; i < num; i++) {
+    uint32_t name_length = read_raw_value<uint32_t>(buffer, size, pos);
+    string name = read_raw_string(buffer, size, pos, name_length);
+    uint8_t dtype_length = read_raw_value<uint8_t>(buffer, size, pos);
+    string dtype = read_raw_string(buffer, size, pos, dtype_length);
+    bool need_grad = read_raw_value<uint8_t>(buffer, size, pos) != 0;
+    uint32_t ndim = read_raw_value<uint32_t>(buffer, size, pos);
+    Shape_t shape;
+    for (uint32_t d = 0; d < ndim; d++) {
+      shape.push_back(read_raw_value<int64_t>(buffer, size, pos));
+    }
+    uint64_t offset = read_raw_value<uint64_t>(buffer, size, pos);
+    uint64_t nbytes = read_raw_value<uint64_t>(buffer, size, pos);
+    NBLA_CHECK(offset + nbytes <= size, error_code::value,
+               "Unexpected end of parameter file.");
+
+    CgVariablePtr cg_v = std::make_shared<CgVariable>(shape, need_grad);
+    Variable *v = cg_v->variable().get();
+    const char *src = buffer + offset;
+    if (dtype == "<f2") {
+      copy_raw_data<Half>(src, nbytes, v, name);
+    } else if (dtype == "<f4") {
+      copy_raw_data<float>(src, nbytes, v, name);
+    } else if (dtype == "<f8") {
+      copy_raw_data<double>(src, nbytes, v, name);
+    } else if (dtype == "<i4") {
+      copy_raw_data<int32_t>(src, nbytes, v, name);
+    } else if (dtype == "<i8") {
+      copy_raw_data<int64_t>(src, nbytes, v, name);
+    } else if (dtype == "|u1") {
+      copy_raw_data<uint8_t>(src, nbytes, v, name);
+    } else if (dtype == "|i1") {
+      copy_raw_data<char>(src, nbytes, v, name);
+    } else {
+      NBLA_ERROR(error_code::not_implemented,
+                 "Unsupported dtype %s of parameter %s.", dtype.c_str(),
+                 name.c_str());
+    }
+    pv.push_back({name, cg_v});
+  }
+  return true;
+}
+
+// ----------------------------------------------------------------------
+// load parameters from .params file
+// ----------------------------------------------------------------------
+bool load_parameters_raw(ParameterVector &pv, string filename) {
+  std::ifstream file(filename.c_str(), std::ios::binary | std::ios::ate);
+  if (!file.is_open()) {
+    NBLA_LOG_WARN("Error in opening file {}", filename);
+    return false;
+  }
+  std::streamsize size = file.tellg();
+  file.seekg(0, std::ios::beg);
+  std::vector<char> buffer(size);
+  if (file.read(buffer.data(), size)) {
+    return load_parameters_raw(pv, buffer.data(), size);
+  }
+  return false;
+}
+
 // ----------------------------------------------------------------------
 // load parameters from file which is specified by filename
 // choose the format by its file extension name.
@@ -293,6 +405,8 @@ bool load_parameters(ParameterVector &pv, string filename) {
     ret = load_parameters_h5(pv, filename);
   } else if (ext == ".protobuf") {
     ret = load_parameters_pb(pv, filename);
+  } else if (ext == ".params") {
+    ret = load_parameters_raw(pv, filename);
   } else {
     NBLA_ERROR(error_code::value, "Not supported file extension: %s",
                filename.c_str());
@@ -42,6 +42,10 @@ bool load_parameters_h5(ParameterVector &pv, char *buffer, int size);
  */
 bool load_parameters_pb(ParameterVector &pv, char *buffer, int size);
 
+/** load .params parameters from buffer
+ */
+bool load_parameters_raw(ParameterVector &pv, const char *buffer, size_t size);
+
 /** load .h5 parameters by filename
  */
 bool load_parameters_h5(ParameterVector &pv, string filename);
@@ -50,6 +54,10 @@ bool load_parameters_h5(ParameterVector &pv, string filename);
  */
 bool load_parameters_pb(ParameterVector &pv, string filename);
 
+/** load .params parameters by filename
+ */
+bool load_parameters_raw(ParameterVector &pv, string filename);
+
 /** load parameters by filename, judge file format by extension name.
  */
 bool load_parameters(ParameterVector &pv, string filename);
@@ -16,12 +16,15 @@
 
 #include "gtest/gtest.h"
 #include <algorithm>
+#include <cstring>
+#include <fstream>
 #include <numeric>
 #include <random>
 #include <string>
 #include <vector>
 
 #include <nbla/computation_graph/computation_graph.hpp>
+#include <nbla/half.hpp>
 #include <nbla/parametric_functions.hpp>
 #include <nbla/solver/adam.hpp>
 #include <nbla_utils/nnp.hpp>
@@ -222,5 +225,78 @@ TEST(test_save_and_load_parameters, test_nnp_save_pb) {
   check_result(x, y);
 }
 #endif
+
+template <typename T> void append_raw(string &buffer, const T &value) {
+  buffer.append(reinterpret_cast<const char *>(&value), sizeof(T));
+}
+
+// Writes .params in the layout of python/src/nnabla/utils/get_file_handle.py.
+void write_raw_parameters(const string &path,
+                          const vector<pair<string, string>> &entries,
+                          const vector<string> &data, int64_t size) {
+  const size_t align = 64;
+  string header("NNBP");
+  append_raw<uint32_t>(header, 1);
+  append_raw<uint32_t>(header, entries.size());
+  size_t header_size = header.size();
+  for (auto &e : entries) {
+    header_size += 4 + e.first.size() + 1 + e.second.size() + 1 + 4 + 8 + 16;
+  }
+  size_t offset = (header_size + align - 1) / align * align;
+  string body;
+  for (size_t i = 0; i < entries.size(); i++) {
+    append_raw<uint32_t>(header, entries[i].first.size());
+    header += entries[i].first;
+    append_raw<uint8_t>(header, entries[i].second.size());
+    header += entries[i].second;
+    append_raw<uint8_t>(header, 1);
+    append_raw<uint32_t>(header, 1);
+    append_raw<int64_t>(header, size);
+    append_raw<uint64_t>(header, offset);
+    append_raw<uint64_t>(header, data[i].size());
+    body.resize(offset - header_size);
+    body += data[i];
+    offset = (offset + data[i].size() + align - 1) / align * align;
+  }
+  std::ofstream ofs(path, std::ios::binary);
+  ofs << header << body;
+}
+
+template <typename T> string raw_data(const vector<T> &values) {
+  return string(reinterpret_cast<const char *>(values.data()),
+                values.size() * sizeof(T));
+}
+
+TEST(test_save_and_load_parameters, test_load_raw_keeps_dtype) {
+  const string filename_raw = "parameters.params";
+  vector<Half> h{Half(0.5f), Half(-1.25f), Half(3.0f)};
+  vector<int32_t> i{1, -2, 1 << 30};
+  vector<double> d{0.1, -0.2, 1e-300};
+  write_raw_parameters(filename_raw,
+                       {{"half", "<f2"}, {"int", "<i4"}, {"double", "<f8"}},
+                       {raw_data(h), raw_data(i), raw_data(d)}, 3);
+
+  ParameterDirectory params;
+  load_parameters(params, filename_raw);
+  auto pv = params.get_parameters();
+  ASSERT_EQ(pv.size(), 3);
+  for (auto &p : pv) {
+    auto v = p.second;
+    EXPECT_EQ(v->size(), 3);
+    if (p.first == "half") {
+      EXPECT_EQ(v->data()->array()->dtype(), dtypes::HALF);
+      EXPECT_EQ(0, memcmp(v->get_data_pointer<Half>(kCpuCtx), h.data(),
+                          3 * sizeof(Half)));
+      EXPECT_FLOAT_EQ(v->get_data_pointer<float>(kCpuCtx)[1], -1.25f);
+    } else if (p.first == "int") {
+      EXPECT_EQ(v->data()->array()->dtype(), dtypes::INT);
+      EXPECT_EQ(v->get_data_pointer<int32_t>(kCpuCtx)[2], 1 << 30);
+    } else {
+      EXPECT_EQ(p.first, "double");
+      EXPECT_EQ(v->data()->array()->dtype(), dtypes::DOUBLE);
+      EXPECT_EQ(v->get_data_pointer<double>(kCpuCtx)[2], 1e-300);
+    }
+  }
+}
 }
 }